@@ -1,7 +1,7 @@
 from django.conf import settings
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
-from gouthelper.users.api.views import UserViewSet
+from gouthelper.users.api.views import PseudopatientPanelViewSet, UserViewSet
 
 if settings.DEBUG:
     router = DefaultRouter()
@@ -9,6 +9,7 @@ else:
     router = SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("panel", PseudopatientPanelViewSet, basename="pseudopatient-panel")
 
 
 app_name = "api"
@@ -170,6 +170,7 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
     "simple_history.middleware.HistoryRequestMiddleware",
+    "gouthelper.utils.instrumentation.InstrumentationMiddleware",
 ]
 
 # STATIC
@@ -288,15 +289,22 @@ LOGGING = {
             "formatter": "verbose",
         }
     },
-    # "loggers": {
-    #     "rules": {
-    #         "handlers": ["console"],  # noqa
-    #         "level": "DEBUG",
-    #         "propagate": True,
-    #     },
-    # },
+    "loggers": {
+        # Per-request query counts and timings logged as JSON by the InstrumentationMiddleware,
+        # set INSTRUMENTATION_LOG_LEVEL to INFO to enable
+        "gouthelper.utils.instrumentation": {
+            "level": env("INSTRUMENTATION_LOG_LEVEL", default="WARNING"),
+        },
+        # "rules": {
+        #     "handlers": ["console"],  # noqa
+        #     "level": "DEBUG",
+        #     "propagate": True,
+        # },
+    },
     "root": {"level": "INFO", "handlers": ["console"]},
 }
+# Whether the InstrumentationMiddleware adds the X-GoutHelper-Metrics header to responses
+INSTRUMENTATION_HEADER = env.bool("INSTRUMENTATION_HEADER", default=False)
 
 
 # django-allauth
@@ -346,3 +354,12 @@ CORRESPONDANCE_EMAIL = env(
     "CORRESPONDANCE_EMAIL",
     default=None,
 )
+# Whether saves that don't change an object's fields skip its historical record, see gouthelper/utils/history.py
+HISTORY_DIFF_ONLY = env.bool("HISTORY_DIFF_ONLY", default=True)
+# Backend that updates an aid's related aids after it is edited, see gouthelper/users/deferred.py
+# DatabaseQueueBackend requires running the process_aids_recompute_jobs command. ThreadPoolBackend
+# loses the work still pending in a process when it restarts, so it has to be opted into.
+AIDS_RECOMPUTE_BACKEND = env(
+    "AIDS_RECOMPUTE_BACKEND",
+    default="gouthelper.users.deferred.SynchronousBackend",
+)
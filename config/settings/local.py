@@ -12,6 +12,8 @@ SECRET_KEY = env(
 )
 # https://docs.djangoproject.com/en/dev/ref/settings/#allowed-hosts
 ALLOWED_HOSTS = ["localhost", "0.0.0.0", "127.0.0.1"]
+# Add the X-GoutHelper-Metrics header (gouthelper/utils/instrumentation.py) to responses
+INSTRUMENTATION_HEADER = env.bool("INSTRUMENTATION_HEADER", default=True)
 
 # CACHES
 # ------------------------------------------------------------------------------
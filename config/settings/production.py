@@ -175,6 +175,11 @@ LOGGING = {
             "handlers": ["console"],
             "propagate": False,
         },
+        "gouthelper.utils.instrumentation": {
+            "level": env("INSTRUMENTATION_LOG_LEVEL", default="WARNING"),
+            "handlers": ["console"],
+            "propagate": False,
+        },
     },
 }
 
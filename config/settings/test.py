@@ -33,5 +33,9 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore # noqa: F405
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver"
+
+# AIDS RECOMPUTE
+# ------------------------------------------------------------------------------
+AIDS_RECOMPUTE_BACKEND = "gouthelper.users.deferred.SynchronousBackend"
 # Your stuff...
 # ------------------------------------------------------------------------------
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.6 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("akis", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aki",
+            name="inputs_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the inputs used the last time the aid was calculated.",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalaki",
+            name="inputs_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the inputs used the last time the aid was calculated.",
+                max_length=64,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.6 on 2026-10-17 05:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("akis", "0003_aki_inputs_fingerprint_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="aki",
+            name="inputs_fingerprint",
+        ),
+        migrations.RemoveField(
+            model_name="historicalaki",
+            name="inputs_fingerprint",
+        ),
+    ]
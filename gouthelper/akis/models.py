@@ -6,12 +6,12 @@ from django.utils.functional import cached_property  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..dateofbirths.helpers import age_calc
 from ..labs.helpers import labs_check_chronological_order_by_date_drawn
 from ..rules import add_object, change_object, delete_object, view_object
 from ..utils.helpers import get_qs_or_set
+from ..utils.history import GoutHelperHistoricalRecords
 from ..utils.models import GoutHelperAidModel, GoutHelperModel
 from .choices import Statuses
 
@@ -54,6 +54,9 @@ class Aki(
     Statuses = Statuses
     user_foreign_key_fields: list[Literal["creatinine"]] = ["creatinine"]
 
+    # Aki isn't calculated by an AidService, so it has no inputs to fingerprint
+    inputs_fingerprint = None
+
     status = models.CharField(
         choices=Statuses.choices,
         default=Statuses.ONGOING,
@@ -62,7 +65,7 @@ class Aki(
         verbose_name=_("Status"),
     )
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
 
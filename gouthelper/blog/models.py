@@ -6,25 +6,25 @@ from django_extensions.db.models import TimeStampedModel  # type: ignore
 from markdownfield.models import RenderedMarkdownField  # type: ignore
 from markdownfield.validators import VALIDATOR_CLASSY  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..utils.fields import GoutHelperMarkdownField
 from ..utils.helpers import now_date
-from ..utils.models import GoutHelperModel
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel
 from .choices import StatusChoices
 
 
-class Blogtag(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Blogtag(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Model to store tags for posts."""
 
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
     name = models.CharField(max_length=100, unique=True)
 
     def __str__(self):
         return self.name
 
 
-class Blogpost(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Blogpost(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Model to store Blog Posts as HTML Markdown pages."""
 
     class Meta:
@@ -42,7 +42,7 @@ class Blogpost(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=Rul
         ]
 
     author = models.ForeignKey(to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="blogposts")
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
     published_date = models.DateField(default=now_date)
     slug = AutoSlugField(populate_from="title", unique=True)
     status = models.CharField(max_length=20, choices=StatusChoices.choices, default="draft")
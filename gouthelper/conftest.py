@@ -1,10 +1,13 @@
 import pytest
 from django.apps import apps  # type: ignore
 
+from gouthelper.contents.selectors import contents_cache_clear
 from gouthelper.contents.services import create_or_update_contents
+from gouthelper.defaults.selectors import defaults_cache_clear
 from gouthelper.defaults.services import update_defaults
 from gouthelper.users.models import User
 from gouthelper.users.tests.factories import UserFactory
+from gouthelper.utils.instrumentation import query_budget as _query_budget
 
 
 @pytest.fixture(scope="session")
@@ -25,6 +28,30 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_defaults_cache():
+    """Clears the cached defaults, which would otherwise outlive the rolled back
+    transaction of the test that cached them."""
+    defaults_cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_contents_cache():
+    """Clears the cached Contents, which would otherwise outlive the rolled back
+    transaction of the test that cached them."""
+    contents_cache_clear()
+
+
+@pytest.fixture
+def query_budget():
+    """Returns the query_budget context manager, which fails the test if a request
+    made with the test client inside it exceeds the declared number of queries, i.e.:
+
+    with query_budget(20, view_name="ults:detail"):
+        client.get(url)"""
+    return _query_budget
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
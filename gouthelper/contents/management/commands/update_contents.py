@@ -1,6 +1,7 @@
 from django.apps import apps
 from django.core.management.base import BaseCommand
 
+from ...selectors import contents_cache_warm
 from ...services import create_or_update_contents
 
 
@@ -10,4 +11,5 @@ the contents of the markdown\\/contents directory."
 
     def handle(self, *args, **options):
         create_or_update_contents(apps, None)
+        contents_cache_warm()
         self.stdout.write(self.style.SUCCESS("Successfully updated contents."))
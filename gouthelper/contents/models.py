@@ -1,17 +1,19 @@
-from django.db import models  # type: ignore
+from django.db import models, transaction  # type: ignore
+from django.dispatch import receiver  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from markdownfield.models import RenderedMarkdownField  # type: ignore
 from markdownfield.validators import VALIDATOR_CLASSY  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..utils.fields import GoutHelperMarkdownField
-from ..utils.models import GoutHelperModel
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel
 from .choices import Contexts, Tags
+from .selectors import contents_cache_clear
 
 
-class Content(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Content(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Model to store HTML Markdown pages."""
 
     class Meta:
@@ -53,7 +55,7 @@ class Content(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=Rule
     context = models.CharField(
         _("Context"), choices=Contexts.choices, max_length=255, null=True, blank=True, editable=False
     )
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
     slug = models.SlugField(max_length=255)
     tag = models.CharField(max_length=255, choices=Tags.choices, null=True, blank=True)
     text = GoutHelperMarkdownField(rendered_field="text_rendered", validator=VALIDATOR_CLASSY)
@@ -61,3 +63,11 @@ class Content(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=Rule
 
     def __str__(self):
         return f"Content: {self.slug} ({self.context}, {self.tag})"
+
+
+# post_save() and post_delete() signals to invalidate the cached Contents whenever a change to
+# a Content, including reverting it to an earlier version from its history, is committed
+@receiver(models.signals.post_save, sender=Content)
+@receiver(models.signals.post_delete, sender=Content)
+def clear_contents_cache(sender, instance, **kwargs):
+    transaction.on_commit(contents_cache_clear)
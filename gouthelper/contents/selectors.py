@@ -0,0 +1,84 @@
+from typing import TYPE_CHECKING, Union
+
+from django.apps import apps  # type: ignore
+
+from ..utils.caches import VersionedCache
+
+if TYPE_CHECKING:
+    from .choices import Contexts, Tags
+    from .models import Content
+
+# Content only changes when update_contents is run or an admin edits it, so every Content
+# object is loaded with a single query and held, keyed by (slug, context, tag), in a
+# VersionedCache, which is cleared by contents_cache_clear() whenever a change to a Content
+# is committed.
+CONTENTS_CACHE_TIMEOUT = 60 * 60 * 24
+CONTENTS_CACHE_VERSION_KEY = "contents:version"
+CONTENTS_CACHE_KEY = "contents:all"
+CONTENTS_CACHE = VersionedCache(CONTENTS_CACHE_VERSION_KEY, timeout=CONTENTS_CACHE_TIMEOUT)
+
+ContentKey = tuple[str, str | None, str | None]
+
+
+def contents_cache_key(
+    slug: str,
+    context: Union["Contexts", str, None] = None,
+    tag: Union["Tags", str, None] = None,
+) -> ContentKey:
+    # TextChoices members hash on their name, not their value, so they are converted
+    # to plain strs in order to match the values loaded from the database
+    return (str(slug), str(context) if context is not None else None, str(tag) if tag is not None else None)
+
+
+def contents_cache_clear() -> None:
+    """Invalidates the cached Contents, in every process."""
+    CONTENTS_CACHE.clear()
+
+
+def contents_load() -> dict[ContentKey, "Content"]:
+    """Loads every Content object from the database, keyed by (slug, context, tag)."""
+    return {
+        contents_cache_key(content.slug, content.context, content.tag): content
+        for content in apps.get_model("contents.Content").objects.all()
+    }
+
+
+def contents_cache_warm() -> dict[ContentKey, "Content"]:
+    """Loads every Content object from the database into the caches and returns them."""
+    return CONTENTS_CACHE.set(CONTENTS_CACHE_KEY, contents_load())
+
+
+def contents_cached() -> dict[ContentKey, "Content"]:
+    """Returns the dict of cached Content objects from the process-local cache, the
+    Django cache, or the database, in that order."""
+    return CONTENTS_CACHE.get_or_set(CONTENTS_CACHE_KEY, contents_load)
+
+
+def content_get(
+    slug: str,
+    context: Union["Contexts", None] = None,
+    tag: Union["Tags", None] = None,
+) -> "Content":
+    """Method that returns the cached Content object for a slug, context, and tag.
+
+    Raises:
+        Content.DoesNotExist: if there is no Content object for the slug, context, and tag
+
+    Returns: Content object"""
+    try:
+        return contents_cached()[contents_cache_key(slug, context, tag)]
+    except KeyError as exc:
+        raise apps.get_model("contents.Content").DoesNotExist(
+            f"No Content with slug={slug}, context={context}, tag={tag}."
+        ) from exc
+
+
+def content_text_rendered(
+    slug: str,
+    context: Union["Contexts", None] = None,
+    tag: Union["Tags", None] = None,
+) -> str:
+    """Method that returns the rendered text of the cached Content object for a slug,
+    context, and tag, or an empty string if there isn't one."""
+    content = contents_cached().get(contents_cache_key(slug, context, tag), None)
+    return content.text_rendered if content else ""
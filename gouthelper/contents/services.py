@@ -1,6 +1,9 @@
 from pathlib import Path
 
+from django.db import transaction  # type: ignore
+
 from .choices import Contexts
+from .selectors import contents_cache_clear
 
 
 class CreateOrUpdateContents:
@@ -43,6 +46,8 @@ class CreateOrUpdateContents:
                 text = f.read()
             # Get the Content object, or create it if it doesn't exist
             Content.objects.update_or_create(slug=slug, context=context, tag=tag, defaults={"text": text})
+        # The historical models used in migrations don't send the Content signals
+        transaction.on_commit(contents_cache_clear)
 
 
 def create_or_update_contents(apps, schema_editor):
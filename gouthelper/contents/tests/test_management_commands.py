@@ -3,9 +3,16 @@ from io import StringIO
 from django.core.management import call_command
 from django.test import TestCase
 
+from ..selectors import content_get
+
 
 class TestUpdateContents(TestCase):
     def test_command_output(self):
         out = StringIO()
         call_command("update_contents", stdout=out)
         self.assertIn("Successfully updated contents.", out.getvalue())
+
+    def test_command_warms_cache(self):
+        call_command("update_contents", stdout=StringIO())
+        with self.assertNumQueries(0):
+            content_get(slug="about")
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest  # type: ignore
+from django.test import RequestFactory, TestCase  # type: ignore
+
+from ..choices import Contexts, Tags
+from ..models import Content
+from ..selectors import content_get, content_text_rendered, contents_cache_clear, contents_cache_warm
+from ..views import About
+from .factories import ContentFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestContentsCache(TestCase):
+    def setUp(self):
+        self.content = ContentFactory(context=Contexts.FLARE, tag=Tags.EXPLANATION)
+
+    def test__content_get(self):
+        with self.assertNumQueries(1):
+            about = content_get(slug="about", context=Contexts.FLARE)
+            self.assertEqual(content_get(self.content.slug, Contexts.FLARE, Tags.EXPLANATION), self.content)
+            self.assertEqual(content_get(self.content.slug, "FLARE", "explanation"), self.content)
+        self.assertEqual(about, Content.objects.get(slug="about", context=Contexts.FLARE, tag=None))
+
+    def test__content_get_raises_DoesNotExist(self):
+        with self.assertRaises(Content.DoesNotExist):
+            content_get(slug="about", context=Contexts.FLARE, tag=Tags.WARNING)
+
+    def test__content_text_rendered(self):
+        self.assertEqual(
+            content_text_rendered(self.content.slug, Contexts.FLARE, Tags.EXPLANATION), self.content.text_rendered
+        )
+        self.assertEqual(content_text_rendered("not-a-slug"), "")
+
+    def test__save_invalidates_cache(self):
+        contents_cache_warm()
+        self.content.text = "Updated text"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.content.save()
+        self.assertIn("Updated text", content_text_rendered(self.content.slug, Contexts.FLARE, Tags.EXPLANATION))
+
+    def test__delete_invalidates_cache(self):
+        contents_cache_warm()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.content.delete()
+        with self.assertRaises(Content.DoesNotExist):
+            content_get(self.content.slug, Contexts.FLARE, Tags.EXPLANATION)
+
+    def test__contents_cache_clear(self):
+        contents_cache_warm()
+        Content.objects.filter(pk=self.content.pk).update(text_rendered="<p>Bypassed the signals</p>")
+        self.assertNotIn("Bypassed", content_text_rendered(self.content.slug, Contexts.FLARE, Tags.EXPLANATION))
+        contents_cache_clear()
+        self.assertIn("Bypassed", content_text_rendered(self.content.slug, Contexts.FLARE, Tags.EXPLANATION))
+
+    def test__about_view_makes_no_queries_when_warm(self):
+        contents_cache_warm()
+        with self.assertNumQueries(0):
+            response = About.as_view()(RequestFactory().get("/about"))
+            response.render()
+        self.assertEqual(response.context_data["content"], Content.objects.get(slug="about", context=None, tag=None))
+
+    def test__cache_cleared_only_when_committed(self):
+        contents_cache_warm()
+        self.content.text = "Updated text"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.content.save()
+        self.assertNotIn("Updated text", content_text_rendered(self.content.slug, Contexts.FLARE, Tags.EXPLANATION))
+        callbacks[0]()
+        self.assertIn("Updated text", content_text_rendered(self.content.slug, Contexts.FLARE, Tags.EXPLANATION))
+
+    def test__local_hits_dont_read_the_django_cache(self):
+        contents_cache_warm()
+        with patch("gouthelper.utils.caches.cache") as mock_cache:
+            content_get(self.content.slug, Contexts.FLARE, Tags.EXPLANATION)
+        mock_cache.get.assert_not_called()
+        mock_cache.add.assert_not_called()
@@ -1,8 +1,9 @@
 from typing import Any
 
-from django.apps import apps  # type: ignore
 from django.views.generic import TemplateView  # type: ignore
 
+from .selectors import content_get
+
 
 class About(TemplateView):
     template_name = "contents/about.html"
@@ -14,7 +15,7 @@ class About(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=None, tag=None)
+        return content_get(slug="about")
 
 
 class DecisionAids(TemplateView):
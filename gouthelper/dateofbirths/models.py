@@ -7,15 +7,15 @@ from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
-from ..utils.models import GoutHelperModel  # type: ignore
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel  # type: ignore
 
 User = get_user_model()
 
 
 # Create your models here.
-class DateOfBirth(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class DateOfBirth(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Model definition for DateOfBirth.
     Optional user OneToOneField for easy access to user's date of birth."""
 
@@ -37,7 +37,7 @@ class DateOfBirth(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=
         ),
     )
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self):
         """Unicode representation of DateOfBirth."""
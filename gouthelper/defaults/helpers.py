@@ -1,8 +1,13 @@
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet  # type: ignore
 
+    from ..medhistorys.choices import Contraindications, MedHistoryTypes
+    from ..treatments.choices import Treatments, TrtTypes
+    from .models import DefaultMedHistory
+
 
 def defaults_treatments_create_dosing_dict(
     default_trts: "QuerySet",
@@ -31,3 +36,23 @@ def defaults_treatments_create_dosing_dict(
         }
         for default in default_trts
     }
+
+
+def defaults_compile_contraindication_index(
+    default_medhistorys: Iterable["DefaultMedHistory"],
+) -> dict["MedHistoryTypes", tuple[tuple["Treatments", "Contraindications", "TrtTypes"], ...]]:
+    """Method that compiles DefaultMedHistory objects into an index of their
+    (treatment, contraindication, trttype) rules by medhistorytype.
+
+    Args:
+        default_medhistorys (Iterable): of DefaultMedHistory objects
+
+    Returns:
+        dict: {MedHistoryTypes: tuple of (Treatments, Contraindications, TrtTypes)}
+    """
+    index: dict = {}
+    for default in default_medhistorys:
+        index.setdefault(default.medhistorytype, []).append(
+            (default.treatment, default.contraindication, default.trttype)
+        )
+    return {medhistorytype: tuple(rules) for medhistorytype, rules in index.items()}
@@ -3,11 +3,11 @@ from datetime import timedelta
 from django.conf import settings  # type: ignore
 from django.core.exceptions import ValidationError  # type: ignore
 from django.core.validators import MaxValueValidator, MinValueValidator  # type: ignore
-from django.db import models  # type: ignore
+from django.db import models, transaction  # type: ignore
+from django.dispatch import receiver  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..choices import BOOL_CHOICES
 from ..medhistorydetails.choices import Stages
@@ -29,7 +29,9 @@ from ..treatments.choices import (
     Treatments,
     TrtTypes,
 )
-from ..utils.models import GoutHelperModel  # type: ignore
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel  # type: ignore
+from .selectors import defaults_cache_clear
 
 
 class TreatmentMixin(models.Model):
@@ -227,6 +229,7 @@ Contraindication: {self.Contraindications(self.contraindication).label}"
 
 class DefaultTrt(
     RulesModelMixin,
+    DirtyFieldsMixin,
     GoutHelperModel,
     TimeStampedModel,
     TreatmentMixin,
@@ -449,7 +452,7 @@ class DefaultTrt(
         blank=True,
         default=None,
     )
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def clean(self):
         """Check that default doses are not larger than the maximum dose for a treatment."""
@@ -505,7 +508,7 @@ class DefaultTrt(
             return f"{def_str}"
 
 
-class FlareAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class FlareAidSettings(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Settings for default Flare Treatment options. Can be stored globally or on a per-User basis."""
 
     class Meta:
@@ -626,7 +629,7 @@ class FlareAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metac
         null=True,
         blank=True,
     )
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self):
         if self.user:
@@ -637,7 +640,7 @@ class FlareAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metac
             return "GoutHelper Default FlareAid Settings"
 
 
-class PpxAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class PpxAidSettings(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Settings for default PPx Treatment options. Can be stored globally or on a per-User basis."""
 
     class Meta:
@@ -756,7 +759,7 @@ class PpxAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metacla
         null=True,
         blank=True,
     )
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self):
         if self.user:
@@ -767,7 +770,7 @@ class PpxAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metacla
             return "GoutHelper Default PpxAid Settings"
 
 
-class UltAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class UltAidSettings(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Settings for default ULT Treatment options. Can be stored globally or on a per-User basis."""
 
     class Meta:
@@ -863,7 +866,7 @@ class UltAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metacla
         null=True,
         blank=True,
     )
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self):
         if self.user:
@@ -872,3 +875,20 @@ class UltAidSettings(RulesModelMixin, GoutHelperModel, TimeStampedModel, metacla
             return f"{self.ultaid}'s UltAid Settings"
         else:
             return "GoutHelper Default UltAid Settings"
+
+
+# post_save() and post_delete() signals to invalidate the cached defaults whenever a DefaultMedHistory,
+# DefaultTrt, or *AidSettings object changes, once the change is committed, so that another request
+# can't re-cache the rows from before the change under the new version
+@receiver(models.signals.post_save, sender=DefaultMedHistory)
+@receiver(models.signals.post_save, sender=DefaultTrt)
+@receiver(models.signals.post_save, sender=FlareAidSettings)
+@receiver(models.signals.post_save, sender=PpxAidSettings)
+@receiver(models.signals.post_save, sender=UltAidSettings)
+@receiver(models.signals.post_delete, sender=DefaultMedHistory)
+@receiver(models.signals.post_delete, sender=DefaultTrt)
+@receiver(models.signals.post_delete, sender=FlareAidSettings)
+@receiver(models.signals.post_delete, sender=PpxAidSettings)
+@receiver(models.signals.post_delete, sender=UltAidSettings)
+def clear_defaults_cache(sender, instance, **kwargs):
+    transaction.on_commit(defaults_cache_clear)
@@ -1,57 +1,102 @@
-from typing import TYPE_CHECKING, Any, Union
+import copy
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Union
 
 from django.apps import apps  # type: ignore
 from django.db.models import Q  # type: ignore
 
 from ..treatments.choices import TrtTypes
+from ..utils.caches import VersionedCache
+from .helpers import defaults_compile_contraindication_index
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet  # type: ignore
 
+    from ..defaults.models import DefaultMedHistory, DefaultTrt
     from ..medhistorys.models import MedHistory
     from ..users.models import User
 
+# Defaults (DefaultTrt, DefaultMedHistory, and the *AidSettings models) almost never change,
+# so the resolved objects for each User (or GoutHelper, if None) are held in a VersionedCache,
+# which is cleared by defaults_cache_clear() whenever a change to a defaults object is committed.
+# Lookups return copies of the cached objects, so callers can't change them for other lookups.
+DEFAULTS_CACHE_TIMEOUT = 60 * 60 * 24
+DEFAULTS_CACHE_VERSION_KEY = "defaults:version"
+DEFAULTS_CACHE = VersionedCache(DEFAULTS_CACHE_VERSION_KEY, timeout=DEFAULTS_CACHE_TIMEOUT)
+
+
+def defaults_cache_clear() -> None:
+    """Invalidates all cached defaults, in every process."""
+    DEFAULTS_CACHE.clear()
+
+
+def defaults_cache_get_or_set(key: str, resolve: Callable[[], Any]) -> Any:
+    """Method that returns the value for key from the cached defaults, or by calling resolve().
+
+    Args:
+        key (str): cache key, unique for the defaults model, User, and TrtType
+        resolve (Callable): function that fetches the value from the database
+
+    Returns: the cached or resolved value"""
+    return DEFAULTS_CACHE.get_or_set(key, resolve)
+
+
+def defaults_cache_key(name: str, user: Union["User", None], trttype: TrtTypes | None = None) -> str:
+    return f"defaults:{name}:{user.pk if user else 'gouthelper'}:{trttype if trttype is not None else ''}"
+
 
 def defaults_flareaidsettings(user: Union["User", None]) -> Any:
-    """Method that takes an optional User object and returns a QuerySet fetching the User's or
-    GoutHelper's default FlareAidSettings.
+    """Method that takes an optional User object and returns the User's or
+    GoutHelper's default FlareAidSettings, cached per User.
 
     Returns: FlareAidSettings object"""
-    return (
-        apps.get_model("defaults.FlareAidSettings")
-        .objects.filter(Q(user=user) | Q(user__isnull=True))
-        .order_by("user", "modified", "created")
-        .first()
-    )
+
+    def _resolve() -> Any:
+        return (
+            apps.get_model("defaults.FlareAidSettings")
+            .objects.filter(Q(user=user) | Q(user__isnull=True))
+            .order_by("user", "modified", "created")
+            .first()
+        )
+
+    return copy.copy(defaults_cache_get_or_set(defaults_cache_key("flareaidsettings", user), _resolve))
 
 
 def defaults_ppxaidsettings(user: Union["User", None]) -> Any:
-    """Method that takes an optional User object and returns a QuerySet fetching the User's or
-    GoutHelper's default PpxAidSettings.
+    """Method that takes an optional User object and returns the User's or
+    GoutHelper's default PpxAidSettings, cached per User.
 
     Returns: PpxAidSettings object"""
-    return (
-        apps.get_model("defaults.PpxAidSettings")
-        .objects.filter(Q(user=user) | Q(user__isnull=True))
-        .order_by("user", "modified", "created")
-        .first()
-    )
+
+    def _resolve() -> Any:
+        return (
+            apps.get_model("defaults.PpxAidSettings")
+            .objects.filter(Q(user=user) | Q(user__isnull=True))
+            .order_by("user", "modified", "created")
+            .first()
+        )
+
+    return copy.copy(defaults_cache_get_or_set(defaults_cache_key("ppxaidsettings", user), _resolve))
 
 
 def defaults_ultaidsettings(user: Union["User", None]) -> Any:
-    """Method that takes an optional User object and returns a QuerySet fetching the User's or
-    GoutHelper's default UltAidSettings.
+    """Method that takes an optional User object and returns the User's or
+    GoutHelper's default UltAidSettings, cached per User.
 
     Returns: UltAidSettings object"""
-    return (
-        apps.get_model("defaults.UltAidSettings")
-        .objects.filter(Q(user=user) | Q(user__isnull=True))
-        .order_by("user", "modified", "created")
-        .first()
-    )
 
+    def _resolve() -> Any:
+        return (
+            apps.get_model("defaults.UltAidSettings")
+            .objects.filter(Q(user=user) | Q(user__isnull=True))
+            .order_by("user", "modified", "created")
+            .first()
+        )
 
-def defaults_defaulttrts_trttype(trttype: TrtTypes, user: Union["User", None]) -> "QuerySet":
+    return copy.copy(defaults_cache_get_or_set(defaults_cache_key("ultaidsettings", user), _resolve))
+
+
+def defaults_defaulttrts_trttype_qs(trttype: TrtTypes, user: Union["User", None]) -> "QuerySet[DefaultTrt]":
     """Method that takes a TrtTypes enum and an optional User object and returns a
     QuerySet fetching all the DefaultTrt objects for that TrtType that don't have a
     user and custom DefaultTrt objects for the user.
@@ -77,43 +122,120 @@ def defaults_defaulttrts_trttype(trttype: TrtTypes, user: Union["User", None]) -
     )
 
 
-def defaults_defaultmedhistorys_trttype(
-    medhistorys: Union[list["MedHistory"], "QuerySet[MedHistory]"], trttype: TrtTypes, user: Union["User", None]
-) -> "QuerySet":
+def defaults_defaulttrts_trttype(trttype: TrtTypes, user: Union["User", None]) -> list["DefaultTrt"]:
+    """Returns a list of the DefaultTrt objects from defaults_defaulttrts_trttype_qs,
+    cached per User and TrtType.
+
+    Args:
+        trttype (TrtTypes): TrtTypes enum = FLARE, PPX, or ULT
+        user (User): User object
+
+    Returns: list[DefaultTrt]
+    """
+    return [
+        copy.copy(default)
+        for default in defaults_cache_get_or_set(
+            defaults_cache_key("defaulttrts", user, trttype),
+            lambda: list(defaults_defaulttrts_trttype_qs(trttype=trttype, user=user)),
+        )
+    ]
+
+
+def defaults_defaultmedhistorys_trttype_qs(
+    medhistorys: Union[list["MedHistory"], "QuerySet[MedHistory]"] | None,
+    trttype: TrtTypes,
+    user: Union["User", None],
+) -> "QuerySet[DefaultMedHistory]":
     """
     Returns a QuerySet of DefaultMedHistory objects filtered by the medhistorytype from a list
     of medhistorys, trttype, and optional User. Returns only a single DefaultMedHistory object
     for each medhistorytype and trttype, preferring custom User DefaultMedHistory objects over
     GoutHelper defaults.
 
-    If no medhistorys are passed, returns an empty QuerySet.
+    If medhistorys is None, the QuerySet isn't filtered by medhistorytype.
 
     Args:
+        medhistorys (list[MedHistory]): list or QuerySet of MedHistory objects, or None
         trttype (TrtTypes): TrtTypes enum = FLARE, PPX, or ULT
-        treatments (list[str]): list of Treatments enums
         user (User): optional User object
 
     Returns: QuerySet
     """
-    queryset = apps.get_model("defaults.DefaultMedHistory").objects
+    queryset = apps.get_model("defaults.DefaultMedHistory").objects.filter(
+        (Q(user=user) | Q(user=None)) & Q(trttype=trttype)
+    )
+    if medhistorys is not None:
+        queryset = queryset.filter(medhistorytype__in=[medhistory.medhistorytype for medhistory in medhistorys])
+    return queryset.order_by(
+        "medhistorytype",
+        "treatment",
+        "trttype",
+        "user",
+    ).distinct(
+        "medhistorytype",
+        "treatment",
+        "trttype",
+    )
+
+
+def defaults_defaultmedhistorys_trttype(
+    medhistorys: Union[list["MedHistory"], "QuerySet[MedHistory]"], trttype: TrtTypes, user: Union["User", None]
+) -> list["DefaultMedHistory"]:
+    """
+    Returns a list of DefaultMedHistory objects filtered by the medhistorytype from a list
+    of medhistorys, trttype, and optional User. Returns only a single DefaultMedHistory object
+    for each medhistorytype and trttype, preferring custom User DefaultMedHistory objects over
+    GoutHelper defaults. All of the User's DefaultMedHistorys for the trttype are cached and
+    then filtered by the medhistorys.
+
+    If no medhistorys are passed, returns an empty list.
+
+    Args:
+        medhistorys (list[MedHistory]): list or QuerySet of MedHistory objects
+        trttype (TrtTypes): TrtTypes enum = FLARE, PPX, or ULT
+        user (User): optional User object
+
+    Returns: list[DefaultMedHistory]
+    """
     if not medhistorys:
-        # Return empty QuerySet
-        return queryset.none()
-    # Otherwise filter the QuerySet by the medhistorys
-    mhQTerm = Q()
-    for medhistory in medhistorys:
-        mhQTerm = mhQTerm | Q(medhistorytype=medhistory.medhistorytype)
-    return (
-        queryset.filter((Q(user=user) | Q(user=None)) & Q(trttype=trttype) & mhQTerm)
-        .order_by(
-            "medhistorytype",
-            "treatment",
-            "trttype",
-            "user",
-        )
-        .distinct(
-            "medhistorytype",
-            "treatment",
-            "trttype",
+        return []
+    medhistorytypes = {medhistory.medhistorytype for medhistory in medhistorys}
+    return [
+        copy.copy(default)
+        for default in defaults_defaultmedhistorys_trttype_cached(trttype=trttype, user=user)
+        if default.medhistorytype in medhistorytypes
+    ]
+
+
+def defaults_defaultmedhistorys_trttype_cached(
+    trttype: TrtTypes, user: Union["User", None]
+) -> list["DefaultMedHistory"]:
+    """Returns the cached list of all of the User's DefaultMedHistory objects for the trttype,
+    which callers must not change."""
+    return defaults_cache_get_or_set(
+        defaults_cache_key("defaultmedhistorys", user, trttype),
+        lambda: list(defaults_defaultmedhistorys_trttype_qs(medhistorys=None, trttype=trttype, user=user)),
+    )
+
+
+def defaults_contraindication_index(trttype: TrtTypes, user: Union["User", None]) -> MappingProxyType:
+    """Returns an immutable index of all of the User's DefaultMedHistory (treatment, contraindication, trttype)
+    rules for the trttype by medhistorytype, compiled once per User and TrtType and cached with the
+    DefaultMedHistorys. Patients' MedHistorys are looked up in it by medhistorytype, so it doesn't
+    need to be filtered for each patient.
+
+    Args:
+        trttype (TrtTypes): TrtTypes enum = FLARE, PPX, or ULT
+        user (User): optional User object
+
+    Returns:
+        MappingProxyType: {MedHistoryTypes: tuple of (Treatments, Contraindications, TrtTypes)}
+    """
+    return MappingProxyType(
+        defaults_cache_get_or_set(
+            defaults_cache_key("contraindicationindex", user, trttype),
+            lambda: defaults_compile_contraindication_index(
+                defaults_defaultmedhistorys_trttype_cached(trttype=trttype, user=user)
+            ),
         )
     )
@@ -1,12 +1,23 @@
+from unittest.mock import patch
+
 import pytest  # type: ignore
-from django.db.models import QuerySet  # type: ignore
+from django.core.cache import cache  # type: ignore
 from django.test import TestCase  # type: ignore
 
 from ...medhistorys.choices import MedHistoryTypes
 from ...medhistorys.tests.factories import ChfFactory, GastricbypassFactory, HeartattackFactory
 from ...treatments.choices import TrtTypes
+from ...users.tests.factories import UserFactory
 from ..models import DefaultMedHistory, DefaultTrt, FlareAidSettings
-from ..selectors import defaults_defaultmedhistorys_trttype, defaults_defaulttrts_trttype, defaults_flareaidsettings
+from ..selectors import (
+    DEFAULTS_CACHE,
+    DEFAULTS_CACHE_VERSION_KEY,
+    defaults_contraindication_index,
+    defaults_defaultmedhistorys_trttype,
+    defaults_defaulttrts_trttype,
+    defaults_flareaidsettings,
+)
+from .factories import DefaultColchicineFlareFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -23,7 +34,7 @@ class TestDefaultsDefaultMedhistorysTrtType(TestCase):
         default_ult_historys = defaults_defaultmedhistorys_trttype(
             medhistorys=self.medhistorys, trttype=TrtTypes.ULT, user=None
         )
-        self.assertTrue(isinstance(default_ult_historys, QuerySet))
+        self.assertTrue(isinstance(default_ult_historys, list))
         self.assertEqual(len(default_ult_historys), 2)
         for default in default_ult_historys:
             self.assertTrue(isinstance(default, DefaultMedHistory))
@@ -40,7 +51,7 @@ class TestDefaultsDefaultMedhistorysTrtType(TestCase):
         default_flare_historys = defaults_defaultmedhistorys_trttype(
             medhistorys=self.medhistorys, trttype=TrtTypes.FLARE, user=None
         )
-        self.assertTrue(isinstance(default_flare_historys, QuerySet))
+        self.assertTrue(isinstance(default_flare_historys, list))
         self.assertEqual(len(default_flare_historys), 18)
         for default in default_flare_historys:
             self.assertTrue(isinstance(default, DefaultMedHistory))
@@ -55,10 +66,10 @@ class TestDefaultsDefaultMedhistorysTrtType(TestCase):
                 ],
             )
 
-    def test__empty_medhistorys_returns_empty_qs(self):
-        """Test empty medhistorys. Should return empty QuerySet"""
+    def test__empty_medhistorys_returns_empty_list(self):
+        """Test empty medhistorys. Should return an empty list"""
         default_medhistorys = defaults_defaultmedhistorys_trttype(medhistorys=[], trttype=TrtTypes.PPX, user=None)
-        self.assertTrue(isinstance(default_medhistorys, QuerySet))
+        self.assertTrue(isinstance(default_medhistorys, list))
         self.assertEqual(len(default_medhistorys), 0)
 
 
@@ -66,14 +77,14 @@ class TestDefaultsTrtTypeTrts(TestCase):
     def test__defaults_trttype_trts_no_user(self):
         """Test no user. Should return GoutHelper defaults for ULT"""
         default_ult_trts = defaults_defaulttrts_trttype(trttype=TrtTypes.ULT, user=None)
-        self.assertTrue(isinstance(default_ult_trts, QuerySet))
+        self.assertTrue(isinstance(default_ult_trts, list))
         self.assertEqual(len(default_ult_trts), 3)
         for default in default_ult_trts:
             self.assertTrue(isinstance(default, DefaultTrt))
             self.assertTrue(default.user is None)
             self.assertTrue(default.trttype == TrtTypes.ULT)
         default_flare_trts = defaults_defaulttrts_trttype(trttype=TrtTypes.FLARE, user=None)
-        self.assertTrue(isinstance(default_flare_trts, QuerySet))
+        self.assertTrue(isinstance(default_flare_trts, list))
         self.assertEqual(len(default_flare_trts), 9)
         for default in default_flare_trts:
             self.assertTrue(isinstance(default, DefaultTrt))
@@ -86,3 +97,93 @@ class TestDefaultsFlareAidSettings(TestCase):
         qs = defaults_flareaidsettings(user=None)
         self.assertTrue(isinstance(qs, FlareAidSettings))
         self.assertIsNone(qs.user)
+
+
+class TestDefaultsCache(TestCase):
+    def test__defaults_are_cached(self):
+        defaults_flareaidsettings(user=None)
+        defaults_defaulttrts_trttype(trttype=TrtTypes.FLARE, user=None)
+        defaults_defaultmedhistorys_trttype(medhistorys=[ChfFactory()], trttype=TrtTypes.FLARE, user=None)
+        heartattack = HeartattackFactory()
+        with self.assertNumQueries(0):
+            defaults_flareaidsettings(user=None)
+            defaults_defaulttrts_trttype(trttype=TrtTypes.FLARE, user=None)
+            default_mhs = defaults_defaultmedhistorys_trttype(
+                medhistorys=[heartattack], trttype=TrtTypes.FLARE, user=None
+            )
+        self.assertTrue(default_mhs)
+        self.assertTrue(all(default.medhistorytype == MedHistoryTypes.HEARTATTACK for default in default_mhs))
+
+    def test__contraindication_index_is_compiled_once_per_trttype_and_user(self):
+        index = defaults_contraindication_index(trttype=TrtTypes.FLARE, user=None)
+        with self.assertNumQueries(0):
+            self.assertEqual(defaults_contraindication_index(trttype=TrtTypes.FLARE, user=None), index)
+        self.assertNotEqual(defaults_contraindication_index(trttype=TrtTypes.ULT, user=None), index)
+        # The index isn't filtered by any patient's MedHistorys, and is looked up by their medhistorytypes
+        heartattack, chf = HeartattackFactory(), ChfFactory()
+        for medhistory in (heartattack, chf):
+            self.assertEqual(
+                index[medhistory.medhistorytype],
+                tuple(
+                    (default.treatment, default.contraindication, default.trttype)
+                    for default in defaults_defaultmedhistorys_trttype([medhistory], TrtTypes.FLARE, None)
+                ),
+            )
+        with self.assertRaises(TypeError):
+            index[MedHistoryTypes.GOUT] = ()  # type: ignore
+
+    def test__cache_cleared_on_save_and_delete(self):
+        user = UserFactory()
+        self.assertNotIn(user, [default.user for default in defaults_defaulttrts_trttype(TrtTypes.FLARE, user)])
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_default = DefaultColchicineFlareFactory(user=user)
+        self.assertIn(custom_default, defaults_defaulttrts_trttype(TrtTypes.FLARE, user))
+        self.assertNotIn(custom_default, defaults_defaulttrts_trttype(TrtTypes.FLARE, None))
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_default.delete()
+        self.assertNotIn(user, [default.user for default in defaults_defaulttrts_trttype(TrtTypes.FLARE, user)])
+        settings = defaults_flareaidsettings(user=None)
+        self.assertTrue(settings.nsaids_equivalent)
+        settings.nsaids_equivalent = False
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.save()
+        self.assertFalse(defaults_flareaidsettings(user=None).nsaids_equivalent)
+
+    def test__cache_cleared_only_when_committed(self):
+        settings = defaults_flareaidsettings(user=None)
+        with self.captureOnCommitCallbacks() as callbacks:
+            FlareAidSettings.objects.filter(pk=settings.pk).update(nsaids_equivalent=not settings.nsaids_equivalent)
+            FlareAidSettings.objects.get(pk=settings.pk).save()
+            # Until the transaction commits, the cached defaults aren't replaced with uncommitted rows
+            self.assertEqual(defaults_flareaidsettings(user=None).nsaids_equivalent, settings.nsaids_equivalent)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(defaults_flareaidsettings(user=None).nsaids_equivalent, settings.nsaids_equivalent)
+
+    def test__returns_copies_of_cached_objects(self):
+        chf = ChfFactory()
+        defaults_defaulttrts_trttype(trttype=TrtTypes.FLARE, user=None)[0].freq = "changed"
+        defaults_defaultmedhistorys_trttype(medhistorys=[chf], trttype=TrtTypes.FLARE, user=None)[
+            0
+        ].treatment = "changed"
+        self.assertNotIn("changed", [default.freq for default in defaults_defaulttrts_trttype(TrtTypes.FLARE, None)])
+        self.assertNotIn(
+            "changed",
+            [default.treatment for default in defaults_defaultmedhistorys_trttype([chf], TrtTypes.FLARE, None)],
+        )
+
+    def test__local_hits_dont_read_the_django_cache(self):
+        defaults_flareaidsettings(user=None)
+        with patch("gouthelper.utils.caches.cache") as mock_cache:
+            defaults_flareaidsettings(user=None)
+        mock_cache.get.assert_not_called()
+        mock_cache.add.assert_not_called()
+
+    def test__version_bumped_by_another_process_is_read_after_ttl(self):
+        settings = defaults_flareaidsettings(user=None)
+        FlareAidSettings.objects.filter(pk=settings.pk).update(nsaids_equivalent=not settings.nsaids_equivalent)
+        # Another process bumps the version, which this process only re-reads once its copy has expired
+        cache.incr(DEFAULTS_CACHE_VERSION_KEY)
+        self.assertEqual(defaults_flareaidsettings(user=None).nsaids_equivalent, settings.nsaids_equivalent)
+        DEFAULTS_CACHE.checked = 0.0
+        self.assertNotEqual(defaults_flareaidsettings(user=None).nsaids_equivalent, settings.nsaids_equivalent)
@@ -5,15 +5,15 @@ from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
-from ..utils.models import GoutHelperModel  # type: ignore
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel  # type: ignore
 from .choices import Ethnicitys
 
 User = get_user_model()
 
 
-class Ethnicity(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Ethnicity(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -34,7 +34,7 @@ class Ethnicity(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=Ru
         ),
     )
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self):
         return self.get_value_display()
@@ -1,9 +1,9 @@
 from typing import Any
 
-from django.apps import apps  # type: ignore
 from django.views.generic import TemplateView  # type: ignore
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 
 
 class EthnicityAbout(TemplateView):
@@ -18,4 +18,4 @@ class EthnicityAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.ETHNICITY, tag=None)
+        return content_get(slug="about", context=Contexts.ETHNICITY)
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from ...utils.migration_helpers import decisionaids_migrate_v1_v2
+
+
+def decisionaids_to_native(apps, schema_editor):
+    for model_name in ("FlareAid", "HistoricalFlareAid"):
+        decisionaids_migrate_v1_v2(apps.get_model("flareaids", model_name))
+
+
+def decisionaids_to_json_strings(apps, schema_editor):
+    for model_name in ("FlareAid", "HistoricalFlareAid"):
+        decisionaids_migrate_v1_v2(apps.get_model("flareaids", model_name), to_v2=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("flareaids", "0004_flareaid_inputs_fingerprint_and_more"),
+    ]
+
+    operations = [migrations.RunPython(decisionaids_to_native, decisionaids_to_json_strings)]
@@ -8,7 +8,6 @@ from django.utils.html import mark_safe  # type: ignore
 from django.utils.text import format_lazy
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..akis.choices import Statuses
 from ..defaults.models import FlareAidSettings
@@ -17,11 +16,13 @@ from ..medhistorys.choices import Contraindications
 from ..medhistorys.lists import FLAREAID_MEDHISTORYS
 from ..rules import add_object, change_object, delete_object, view_object
 from ..treatments.choices import FlarePpxChoices, NsaidChoices, Treatments, TrtTypes
+from ..utils.helpers import explanations_cached
+from ..utils.history import GoutHelperHistoricalRecords
 from ..utils.models import FlarePpxMixin, GoutHelperAidModel, GoutHelperModel, TreatmentAidMixin
 from ..utils.services import (
+    aids_decisionaid_to_trt_dict,
     aids_dose_adjust_colchicine,
     aids_get_colchicine_contraindication_for_stage,
-    aids_json_to_trt_dict,
     aids_options,
 )
 from .managers import FlareAidManager
@@ -90,7 +91,7 @@ class FlareAid(
         blank=True,
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = FlareAidManager()
@@ -125,7 +126,7 @@ class FlareAid(
         """cached_property that converts decisionaid field to a python dict for processing."""
         if not self.decisionaid:
             self.decisionaid = self.update_aid().decisionaid
-        return aids_json_to_trt_dict(decisionaid=self.decisionaid)
+        return aids_decisionaid_to_trt_dict(decisionaid=self.decisionaid)
 
     @classmethod
     def aid_medhistorys(cls) -> list["MedHistoryTypes"]:
@@ -220,6 +221,7 @@ treatment is typically very short and the risk of bleeding is low."
         )
 
     @cached_property
+    @explanations_cached
     def explanations(self) -> list[tuple[str, str, bool, str]]:
         """Method that returns a dictionary of tuples explanations for the FlareAid to use in templates."""
         return [
@@ -243,6 +245,10 @@ treatment is typically very short and the risk of bleeding is low."
             ("pud", "Peptic Ulcer Disease", self.pud, self.pud_interp()),
         ]
 
+    def get_fragment_cache_objects(self) -> list[models.Model]:
+        """Overwritten to use the related_flare, which may belong to the User, and its Aki."""
+        return [obj for obj in [self.related_flare, self.aki] if obj]
+
     def get_absolute_url(self):
         if self.user:
             return reverse("flareaids:pseudopatient-detail", kwargs={"pseudopatient": self.user.pk})
@@ -2,13 +2,12 @@ import random
 
 import pytest  # type: ignore
 from django.db import connection  # type: ignore
-from django.db.models import QuerySet
 from django.test import TestCase  # type: ignore
 from django.test.utils import CaptureQueriesContext  # type: ignore
 
 from ...dateofbirths.helpers import age_calc
 from ...defaults.models import DefaultMedHistory, DefaultTrt, FlareAidSettings
-from ...defaults.selectors import defaults_defaultmedhistorys_trttype
+from ...defaults.selectors import defaults_cache_clear, defaults_defaultmedhistorys_trttype, defaults_flareaidsettings
 from ...defaults.tests.factories import (
     DefaultColchicineFlareFactory,
     DefaultMedHistoryFactory,
@@ -19,7 +18,7 @@ from ...medallergys.tests.factories import MedAllergyFactory
 from ...medhistorys.choices import Contraindications, MedHistoryTypes
 from ...medhistorys.lists import FLAREAID_MEDHISTORYS
 from ...treatments.choices import FlarePpxChoices, NsaidChoices, Treatments, TrtTypes
-from ...utils.services import aids_dict_to_json
+from ...utils.services import DECISIONAID_VERSION, aids_decisionaid_to_trt_dict, aids_trt_dict_to_decisionaid
 from ..models import FlareAid
 from ..selectors import flareaid_user_qs, flareaid_userless_qs
 from ..services import FlareAidDecisionAid
@@ -41,10 +40,12 @@ class TestFlareAidMethods(TestCase):
     def test__init_no_user(self):
         """Test that the __init__ method sets the attrs on the service class correctly
         when there is no user and that the custom settings are set correctly."""
+        # Cache the GoutHelper default FlareAidSettings so they aren't queried in the loop
+        defaults_flareaidsettings(user=None)
         for fa in self.fas_userless:
             with CaptureQueriesContext(connection) as context:
                 decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=fa.pk))
-            self.assertEqual(len(context.captured_queries), 4)  # 3 queries for medhistorys
+            self.assertEqual(len(context.captured_queries), 3)  # 3 queries for medhistorys, settings are cached
             self.assertEqual(age_calc(fa.dateofbirth.value), decisionaid.age)
             if hasattr(fa, "gender"):
                 self.assertEqual(fa.gender, decisionaid.gender)
@@ -134,7 +135,7 @@ class TestFlareAidMethods(TestCase):
             FlareAidDecisionAid(qs="Hogwarts is not the place for me...")
 
     def test__defaulttrts_no_user(self):
-        """Check that the default_trts property returns a QuerySet of DefaultTrts that is correct."""
+        """Check that the default_trts property returns a list of DefaultTrts that is correct."""
         fa = FlareAid.objects.filter(user=None).last()
         default_trt_qs = DefaultTrt.objects.filter(
             user=None,
@@ -143,7 +144,7 @@ class TestFlareAidMethods(TestCase):
         ).all()
         da = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=fa.pk))
         default_trts = da.default_trts
-        self.assertTrue(isinstance(default_trts, QuerySet))
+        self.assertTrue(isinstance(default_trts, list))
         for default in list(default_trts):
             self.assertTrue(isinstance(default, DefaultTrt))
             self.assertIsNone(default.user)
@@ -153,7 +154,7 @@ class TestFlareAidMethods(TestCase):
         self.assertEqual(len(default_trts), len(default_trt_qs))
 
     def test__defaulttrts_with_user(self):
-        """Check that the default_trts property returns a QuerySet of DefaultTrts that is correct and filtered
+        """Check that the default_trts property returns a list of DefaultTrts that is correct and filtered
         by the FlareAid or it's users default_trts."""
         fa = FlareAid.objects.filter(user__isnull=False).last()
         custom_colchicine_default = DefaultColchicineFlareFactory(user=fa.user)
@@ -162,7 +163,7 @@ class TestFlareAidMethods(TestCase):
         self.assertIn(custom_colchicine_default, da.default_trts)
 
     def test__defaultmedhistorys_no_user(self):
-        """Test that the default_medhistorys property returns a QuerySet of DefaultMedHistorys
+        """Test that the default_medhistorys property returns a list of DefaultMedHistorys
         that is correct and filtered by trttype=FLARE and the FlareAid or it's users medhistorys."""
         for fa in self.fas_userless:
             da = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=fa.pk))
@@ -186,7 +187,7 @@ class TestFlareAidMethods(TestCase):
             self.assertEqual(len(default_mhs), len(mhs_qs))
 
     def test__defaultmedhistorys_with_user(self):
-        """Test that the default_medhistorys property returns a QuerySet of DefaultMedHistorys
+        """Test that the default_medhistorys property returns a list of DefaultMedHistorys
         that is correct and filtered by trttype=FLARE and the FlareAid or it's users medhistorys."""
         for fa in self.fas_user:
             da = FlareAidDecisionAid(qs=flareaid_user_qs(pseudopatient=fa.user.pk))
@@ -264,6 +265,8 @@ class TestFlareAidMethods(TestCase):
         the decisionaid_dict will contraindicate each NSAID independently. Clinical note: this is probably not a good
         practice to default to."""
         FlareAidSettings.objects.filter(user=None).update(nsaids_equivalent=False)
+        # QuerySet.update() doesn't send post_save, so the cached defaults need to be cleared
+        defaults_cache_clear()
         medallergy = MedAllergyFactory(treatment=Treatments.IBUPROFEN)
         flareaid = create_flareaid(mas=[medallergy], mhs=[])
         decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))
@@ -289,6 +292,8 @@ class TestFlareAidMethods(TestCase):
         the decisionaid_dict will contraindicate steroids independently. Clinical note: this is probably not a good
         practice to default to."""
         FlareAidSettings.objects.filter(user=None).update(steroids_equivalent=False)
+        # QuerySet.update() doesn't send post_save, so the cached defaults need to be cleared
+        defaults_cache_clear()
         medallergy = MedAllergyFactory(treatment=Treatments.METHYLPREDNISOLONE)
         flareaid = create_flareaid(mas=[medallergy])
         decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))
@@ -297,8 +302,8 @@ class TestFlareAidMethods(TestCase):
         self.assertFalse(decisionaid_dict[Treatments.PREDNISONE]["contra"])
 
     def test__save_decisionaid_dict_to_decisionaid_saves(self):
-        """Test that the _save_decisionaid_dict_to_decisionaid method saves the decisionaid field as a JSON string.
-        Also test that the decisionaid field is an empty dict, as this is the default for the field."""
+        """Test that the _save_decisionaid_dict_to_decisionaid method saves the decisionaid field in its
+        native JSON schema."""
         fa_user = flareaid_user_qs(pseudopatient=FlareAid.objects.filter(user__isnull=False).last().user.pk).get()
         fa = fa_user.flareaid
         da = FlareAidDecisionAid(qs=fa_user)
@@ -306,9 +311,10 @@ class TestFlareAidMethods(TestCase):
         da._save_decisionaid_dict_to_decisionaid(
             da_dict, commit=True
         )  # pylint: disable=w0212, line-too-long # noqa: E501
-        # Assert that the decisionaid field is a str
-        self.assertTrue(isinstance(fa.decisionaid, str))
-        self.assertEqual(aids_dict_to_json(da_dict), fa.decisionaid)
+        self.assertEqual(aids_trt_dict_to_decisionaid(da_dict), fa.decisionaid)
+        fa.refresh_from_db()
+        self.assertEqual(fa.decisionaid["version"], DECISIONAID_VERSION)
+        self.assertEqual(aids_decisionaid_to_trt_dict(fa.decisionaid), da_dict)
 
     def test__save_decisionaid_dict_to_decisionaid_commit_False_doesnt_save(self):
         """Test that the _save_decisionaid_dict_to_decisionaid method doesn't save the decisionaid field
@@ -321,9 +327,9 @@ class TestFlareAidMethods(TestCase):
         da._save_decisionaid_dict_to_decisionaid(
             da_dict, commit=False
         )  # pylint: disable=w0212, line-too-long # noqa: E501
-        # Assert that the decisionaid field is an empty dict, as this is the default for the field
-        self.assertTrue(isinstance(fa.decisionaid, str))
+        self.assertTrue(fa.decisionaid)
         fa.refresh_from_db()
+        # Assert that the decisionaid field is an empty dict, as this is the default for the field
         self.assertFalse(fa.decisionaid)
 
     def test__update(self):
@@ -363,3 +369,26 @@ class TestFlareAidMethods(TestCase):
         decisionaid = FlareAidDecisionAid(qs=flareaid)
         decisionaid.update_decision_aid_dict_and_model_attr()
         self.assertTrue(decisionaid.aid_needs_2_be_saved())
+
+    def test__aid_is_stale(self) -> None:
+        flareaid = create_flareaid(mhs=[], mas=[])
+        decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))
+        self.assertTrue(decisionaid.aid_is_stale())
+        decisionaid._update()  # pylint: disable=w0212
+        flareaid.refresh_from_db()
+        self.assertTrue(flareaid.inputs_fingerprint)
+        decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))
+        self.assertFalse(decisionaid.aid_is_stale())
+        MedAllergy.objects.create(flareaid=flareaid, treatment=Treatments.PREDNISONE)
+        decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))
+        self.assertTrue(decisionaid.aid_is_stale())
+
+    def test__update_saves_when_only_inputs_fingerprint_changed(self) -> None:
+        flareaid = create_flareaid(mhs=[], mas=[])
+        FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))._update()  # pylint: disable=w0212
+        FlareAid.objects.filter(pk=flareaid.pk).update(inputs_fingerprint=None)
+        decisionaid = FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk))
+        decisionaid._update()  # pylint: disable=w0212
+        self.assertFalse(decisionaid.aid_needs_2_be_saved())
+        flareaid.refresh_from_db()
+        self.assertEqual(flareaid.inputs_fingerprint, decisionaid.get_inputs_fingerprint())
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest  # pylint: disable=e0401 # type: ignore
 from django.contrib.auth import get_user_model  # pylint: disable=e0401 # type: ignore
@@ -7,9 +8,11 @@ from django.contrib.auth.models import AnonymousUser  # pylint: disable=e0401 #
 from django.contrib.messages.middleware import MessageMiddleware  # pylint: disable=e0401 # type: ignore
 from django.contrib.sessions.middleware import SessionMiddleware  # pylint: disable=e0401 # type: ignore
 from django.core.exceptions import ObjectDoesNotExist  # pylint: disable=e0401 # type: ignore
+from django.db import connection  # pylint: disable=e0401 # type: ignore
 from django.db.models import Q, QuerySet  # pylint: disable=e0401 # type: ignore
 from django.http import HttpResponse  # pylint: disable=e0401 # type: ignore
 from django.test import RequestFactory, TestCase  # pylint: disable=e0401 # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=e0401 # type: ignore
 from django.urls import reverse  # pylint: disable=e0401 # type: ignore
 from django.utils import timezone  # pylint: disable=e0401 # type: ignore
 
@@ -40,12 +43,13 @@ from ...utils.factories import (
     medhistory_diff_obj_data,
 )
 from ...utils.forms import forms_print_response_errors
-from ...utils.test_helpers import dummy_get_response
+from ...utils.test_helpers import captured_writes, dummy_get_response
 from ..models import FlareAid
 from ..views import (
     FlareAidAbout,
     FlareAidCreate,
     FlareAidDetail,
+    FlareAidEvaluate,
     FlareAidPseudopatientCreate,
     FlareAidPseudopatientDetail,
     FlareAidPseudopatientUpdate,
@@ -357,6 +361,48 @@ class TestFlareAidCreate(TestCase):
         self.assertIn(naproxen_allergy, flareaid_medallergys)
 
 
+class TestFlareAidEvaluate(TestCase):
+    def setUp(self):
+        self.view = FlareAidEvaluate
+
+    def test__get_not_allowed(self):
+        response = self.client.get(reverse("flareaids:evaluate"))
+        self.assertEqual(response.status_code, 405)
+
+    def test__post_evaluates_without_saving(self):
+        for _ in range(5):
+            data = flareaid_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("flareaids:evaluate"), data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["aid"], "flareaid")
+            self.assertFalse(captured_writes(context.captured_queries))
+        self.assertFalse(FlareAid.objects.exists())
+        self.assertFalse(MedHistory.objects.exists())
+
+    def test__post_matches_create(self):
+        data = flareaid_data_factory()
+        evaluation = self.client.post(reverse("flareaids:evaluate"), data).json()
+        response = self.client.post(reverse("flareaids:create"), data)
+        self.assertEqual(response.status_code, 302)
+        flareaid = FlareAid.related_objects.get()
+        self.assertEqual(evaluation["results"]["decisionaid"], flareaid.decisionaid)
+        self.assertEqual(
+            evaluation["recommendation"]["treatment"] if evaluation["recommendation"] else None,
+            flareaid.recommendation[0] if flareaid.recommendation else None,
+        )
+        self.assertEqual(
+            [(explanation["id"], explanation["value"]) for explanation in evaluation["explanations"]],
+            [(exp_id, None if value is None else bool(value)) for exp_id, _, value, _ in flareaid.explanations],
+        )
+
+    def test__post_invalid_returns_errors(self):
+        response = self.client.post(reverse("flareaids:evaluate"), {})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
+        self.assertFalse(FlareAid.objects.exists())
+
+
 class TestFlareAidPseudopatientCreate(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -1159,6 +1205,23 @@ class TestFlareAidPseudopatientDetail(TestCase):
         # This needs to be manually refetched from the db
         self.assertIn(Treatments.COLCHICINE, FlareAid.objects.get(user=psp).options)
 
+    def test__get_updated_refreshes_related_objects_with_deferred_backend(self):
+        """Test that the ?updated=True redirect still refreshes the stale related objects
+        when the AIDS_RECOMPUTE_BACKEND defers them, but leaves the FlareAid alone."""
+        psp = create_psp()
+        create_flareaid(user=psp).update_aid()
+        url = reverse("flareaids:pseudopatient-detail", kwargs={"pseudopatient": psp.pk}) + "?updated=True"
+        with patch.object(FlareAid, "update_aid") as update_aid, patch.object(
+            FlareAid, "update_related_objects"
+        ) as update_related_objects:
+            self.client.get(url)
+            update_related_objects.assert_not_called()
+            with patch("gouthelper.utils.views.aids_recompute_is_deferred", return_value=True):
+                self.client.get(url)
+        update_aid.assert_not_called()
+        update_related_objects.assert_called_once()
+        self.assertTrue(update_related_objects.call_args.kwargs["stale_only"])
+
     def test__get_with_flare_adds_flare_qs_to_view_object(self):
         flare = CustomFlareFactory(user=True).create_object()
         create_flareaid(user=flare.user)
@@ -1840,6 +1903,14 @@ class TestFlareAidDetail(TestCase):
         # This needs to be manually refetched from the db
         self.assertTrue(FlareAid.objects.get().recommendation[0] == Treatments.NAPROXEN)
 
+    def test__get_object_does_not_save_if_inputs_unchanged(self):
+        self.flareaid.update_aid()
+        modified = FlareAid.objects.get().modified
+        request = self.factory.get(reverse("flareaids:detail", kwargs={"pk": self.flareaid.pk}))
+        request.user = AnonymousUser()
+        self.view.as_view()(request, pk=self.flareaid.pk)
+        self.assertEqual(FlareAid.objects.get().modified, modified)
+
     def test__get(self):
         request = self.factory.get(reverse("flareaids:detail", kwargs={"pk": self.flareaid.pk}))
         request.user = AnonymousUser()
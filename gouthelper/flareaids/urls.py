@@ -4,6 +4,7 @@ from .views import (
     FlareAidAbout,
     FlareAidCreate,
     FlareAidDetail,
+    FlareAidEvaluate,
     FlareAidPseudopatientCreate,
     FlareAidPseudopatientDetail,
     FlareAidPseudopatientUpdate,
@@ -15,6 +16,7 @@ app_name = "flareaids"
 urlpatterns = [
     path("about/", FlareAidAbout.as_view(), name="about"),
     path("create/", FlareAidCreate.as_view(), name="create"),
+    path("evaluate/", FlareAidEvaluate.as_view(), name="evaluate"),
     path("<uuid:pk>/", FlareAidDetail.as_view(), name="detail"),
     path("update/<uuid:pk>/", FlareAidUpdate.as_view(), name="update"),
     path("flare/<uuid:flare>/create", FlareAidCreate.as_view(), name="flare-create"),
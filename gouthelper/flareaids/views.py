@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Any
 
-from django.apps import apps  # pylint: disable=E0401  # type: ignore
 from django.contrib.auth import get_user_model  # pylint: disable=E0401  # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # pylint: disable=E0401  # type: ignore
 from django.urls import reverse  # pylint: disable=E0401  # type: ignore
@@ -17,10 +16,12 @@ from rules.contrib.views import (  # pylint: disable=W0611, E0401  # type: ignor
 )
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..flares.models import Flare
 from ..users.models import Pseudopatient
 from ..utils.views import (
     GoutHelperDetailMixin,
+    GoutHelperEvaluateMixin,
     GoutHelperPseudopatientDetailMixin,
     MedAllergyFormMixin,
     MedHistoryFormMixin,
@@ -59,7 +60,7 @@ class FlareAidAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.FLAREAID, tag=None)
+        return content_get(slug="about", context=Contexts.FLAREAID)
 
 
 class FlareAidEditBase(MedAllergyFormMixin, MedHistoryFormMixin, OneToOneFormMixin):
@@ -115,6 +116,10 @@ class FlareAidCreate(FlareAidEditBase, PermissionRequiredMixin, CreateView, Succ
         return self.flare
 
 
+class FlareAidEvaluate(GoutHelperEvaluateMixin, FlareAidCreate):
+    """Evaluates a FlareAid in memory from the same POST data as FlareAidCreate without saving anything."""
+
+
 class FlareAidDetailBase(AutoPermissionRequiredMixin, DetailView):
     """DetailView for FlareAids."""
 
@@ -2,10 +2,12 @@ from datetime import timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING, Union
 
+from django.db.models import Q  # type: ignore
+
 from ..genders.choices import Genders
 from ..medhistorys.choices import CVDiseases, MedHistoryTypes
 from ..medhistorys.helpers import medhistorys_get
-from .choices import LessLikelys, Likelihoods, LimitedJointChoices, MoreLikelys, Prevalences
+from .choices import DiagnosedChoices, LessLikelys, Likelihoods, LimitedJointChoices, MoreLikelys, Prevalences
 from .lists import COMMON_GOUT_JOINTS
 
 if TYPE_CHECKING:
@@ -196,3 +198,19 @@ def flares_uncommon_joints(joints: list[LimitedJointChoices]) -> list[LimitedJoi
     """Method that takes a list of joints and returns a list of those joints that are
     NOT in COMMON_GOUT_JOINTS."""
     return [joint for joint in joints if joint not in COMMON_GOUT_JOINTS]
+
+
+def flares_may_be_gout(diagnosed: DiagnosedChoices | None, likelihood: Likelihoods | None) -> bool:
+    """Returns True if a Flare with diagnosed and likelihood may have been gout, and so counts toward
+    its User's FlareCount and the ULT indication. Flares a provider diagnosed as not gout never count.
+    Flares calculated to be unlikely gout only count if a provider diagnosed them as gout."""
+    return diagnosed != DiagnosedChoices.NO and (
+        likelihood != Likelihoods.UNLIKELY or diagnosed == DiagnosedChoices.YES
+    )
+
+
+def flares_may_be_gout_q() -> Q:
+    """Returns a Q that filters a Flare QuerySet to the Flares for which flares_may_be_gout() is True."""
+    return ~Q(diagnosed=DiagnosedChoices.NO) & (
+        ~Q(likelihood=Likelihoods.UNLIKELY) | Q(diagnosed=DiagnosedChoices.YES)
+    )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Flare, FlareCount
+from ...services import flarecounts_reconcile
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FlareCounts of every User with Flares or a FlareCount from their Flares, in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of Users whose FlareCounts are rebuilt per chunk.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+        user_ids = sorted(
+            set(Flare.objects.filter(user__isnull=False).values_list("user_id", flat=True).distinct())
+            | set(FlareCount.objects.values_list("user_id", flat=True))
+        )
+        rebuilt = 0
+        for start in range(0, len(user_ids), chunk_size):
+            rebuilt += flarecounts_reconcile(user_ids=user_ids[start : start + chunk_size])
+            self.stdout.write(f"{rebuilt}/{len(user_ids)} FlareCounts")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} FlareCounts."))
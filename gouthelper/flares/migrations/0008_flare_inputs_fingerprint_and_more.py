@@ -0,0 +1,34 @@
+# Generated by Django 4.2.6 on 2026-10-17 00:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("flares", "0007_alter_flare_diagnosed_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flare",
+            name="inputs_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the inputs used the last time the aid was calculated.",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalflare",
+            name="inputs_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the inputs used the last time the aid was calculated.",
+                max_length=64,
+                null=True,
+            ),
+        ),
+    ]
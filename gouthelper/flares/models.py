@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model  # type: ignore
 from django.contrib.postgres.constraints import ExclusionConstraint
 from django.contrib.postgres.fields import DateRangeField, RangeBoundary, RangeOperators
 from django.db import models  # type: ignore
+from django.dispatch import receiver  # type: ignore
 from django.urls import reverse  # type: ignore
 from django.utils.functional import cached_property  # type: ignore
 from django.utils.html import mark_safe  # type: ignore
@@ -14,16 +15,25 @@ from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from multiselectfield import MultiSelectField  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..choices import BOOL_CHOICES
 from ..genders.choices import Genders
+from ..labs.models import Urate
+from ..labs.services import urates_set_effective_date
 from ..medhistorys.choices import MedHistoryTypes
 from ..medhistorys.lists import FLARE_MEDHISTORYS
 from ..medhistorys.models import MedHistory
 from ..rules import add_object, change_object, delete_object, view_object
 from ..users.models import Pseudopatient
-from ..utils.helpers import calculate_duration, first_letter_lowercase, now_date, shorten_date_for_str
+from ..utils.helpers import (
+    calculate_duration,
+    explanations_cached,
+    first_letter_lowercase,
+    now_date,
+    shorten_date_for_str,
+)
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.links import links_constant_html, links_reverse
 from ..utils.models import GoutHelperAidModel, GoutHelperModel
 from .choices import DiagnosedChoices, LessLikelys, Likelihoods, LimitedJointChoices, MoreLikelys, Prevalences
 from .helpers import (
@@ -33,10 +43,11 @@ from .helpers import (
     flares_diagnostic_rule_urate_high,
     flares_get_less_likelys,
     flares_get_more_likelys,
+    flares_may_be_gout,
     flares_uncommon_joints,
 )
 from .managers import FlareManager
-from .services import FlareDecisionAid
+from .services import FlareDecisionAid, flarecounts_add
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet  # type: ignore
@@ -250,7 +261,7 @@ monosodium urate crystals on polarized microscopy?"
         verbose_name=_("Flare Urate"),
     )
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = FlareManager()
@@ -282,8 +293,8 @@ monosodium urate crystals on polarized microscopy?"
 It's important to consider in the context of a flare because several flare treatments are \
 contraindicated (<a href={}>NSAIDs</a>) or require dose adjustment (<a href={}>colchicine</a>) in the setting of \
 kidney injury. <br> <br>""",
-            reverse("treatments:about-flare") + "#nsaids",
-            reverse("treatments:about-flare") + "#colchicine",
+            links_reverse("treatments:about-flare", "nsaids"),
+            links_reverse("treatments:about-flare", "colchicine"),
         )
 
         if self.aki:
@@ -460,7 +471,7 @@ so the presence or absence of monosodium urate crystals in the synovial fluid is
 href={}>urate</a> crystals were observed in {} synovial fluid, consistent with a high likelihood of gout, \
 though this is a non-empiric determination made by GoutHelper and not based in Diagnostic Rule evidence.""",
                 self,
-                reverse("labs:about-urate"),
+                links_reverse("labs:about-urate"),
                 subject_the_pos,
             )
         )
@@ -642,7 +653,12 @@ and as such GoutHelper did not adjust the likelihood that these symptoms were du
 and as such GoutHelper did not adjust the likelihood that these symptoms were due to gout. "
         return mark_safe(duration_str)
 
+    def get_fragment_cache_objects(self) -> list[models.Model]:
+        """Overwritten to add the Flare's Aki, whose status is explained in the aki_interp."""
+        return [*super().get_fragment_cache_objects(), *([self.aki] if self.aki else [])]
+
     @cached_property
+    @explanations_cached
     def explanations(self) -> list[tuple[str, str, bool, str]]:
         """Method that returns a dictionary of tuples explanations for the Flare to use in templates."""
         return [
@@ -702,9 +718,8 @@ symptoms were due to gout."
             return reverse("flares:detail", kwargs={"pk": self.pk})
 
     def get_pseudopatient_queryset(self) -> "QuerySet[Pseudopatient]":
-        """Overwritten to pass the flare_pk kwarg to the flares_qs manager."""
-        model_name = self._meta.model_name
-        return getattr(Pseudopatient.objects, f"{model_name}_qs").filter(user=self.user, flare_pk=self.pk).get()
+        """Overwritten to pass the flare_pk kwarg to the flare_qs manager."""
+        return Pseudopatient.objects.flare_qs(flare_pk=self.pk).filter(pk=self.user.pk)
 
     def gout_interp(self):
         """Method that returns a str interpretation of the gout cached_property."""
@@ -733,7 +748,7 @@ This does not affect the Diagnostic Rule score."
             hyperuricemia_str = format_lazy(
                 """<strong>{} serum <a target='_next' href={}>uric acid</a> level was {} during the flare, """,
                 Subject_the_pos,
-                reverse("labs:about-urate"),
+                links_reverse("labs:about-urate"),
                 self.urate,
             )
             if self.hyperuricemia:
@@ -883,6 +898,7 @@ score."
             raise ValueError("Unsupported MoreLikelys")
 
     @staticmethod
+    @links_constant_html
     def less_likely_demographics_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -896,6 +912,7 @@ score."
         )
 
     @staticmethod
+    @links_constant_html
     def less_likely_joints_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -905,6 +922,7 @@ score."
         )
 
     @staticmethod
+    @links_constant_html
     def less_likely_negcrystals_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -916,6 +934,7 @@ score."
         )
 
     @staticmethod
+    @links_constant_html
     def less_likely_toolong_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -925,6 +944,7 @@ score."
         )
 
     @staticmethod
+    @links_constant_html
     def less_likely_tooshort_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -934,6 +954,7 @@ score."
         )
 
     @staticmethod
+    @links_constant_html
     def less_likely_tooyoung_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -943,6 +964,7 @@ score."
         )
 
     @staticmethod
+    @links_constant_html
     def more_likely_crystals_explanation(samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -1246,3 +1268,87 @@ started treatment early (immediately at flare onset), it may have resolved the s
         """Method that returns a str of the joints of a Flare that are
         NOT in COMMON_GOUT_JOINTS."""
         return self.stringify_joints([getattr(LimitedJointChoices, joint) for joint in self.uncommon_joints])
+
+
+class FlareCount(GoutHelperModel, TimeStampedModel):
+    """Counts of a User's Flares that may have been gout (see flares_may_be_gout()), kept up to date
+    incrementally as the User's Flares are created, edited, and deleted, so that the ULT indication doesn't
+    require fetching or counting the Flares. Rebuilt in bulk by the reconcile_flare_counts management command.
+
+    last_year is only decremented when a Flare is deleted or moved, so it is recounted once the
+    last_year_expires date, when the oldest Flare it counts is no longer within the last year,
+    is reached."""
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="flarecount")
+    total = models.PositiveIntegerField(default=0)
+    last_year = models.PositiveIntegerField(default=0)
+    last_year_expires = models.DateField(null=True, blank=True, default=None)
+
+    def __str__(self):
+        return f"FlareCount: {self.total} ({self.last_year} in the last year)"
+
+
+def flare_flarecount_key(user_id, date_started, diagnosed, likelihood) -> tuple | None:
+    """Returns the (user_id, date_started) a Flare with the given values is counted under in FlareCount,
+    or None if it isn't counted."""
+    return (user_id, date_started) if user_id and flares_may_be_gout(diagnosed, likelihood) else None
+
+
+def flare_values_before_save(instance: Flare, *attnames: str) -> list:
+    """Returns the values of attnames the Flare had when it was loaded or last saved, which
+    DirtyFieldsMixin only replaces with the saved values after the post_save signal."""
+    saved_field_values = instance.__dict__.get("_saved_field_values", {})
+    return [saved_field_values.get(attname, instance.__dict__.get(attname)) for attname in attnames]
+
+
+# post_save() signal to update the effective_date of the Flare's Urate, and of the Urate it had before,
+# if either the Urate or the date_started has changed
+@receiver(models.signals.post_save, sender=Flare)
+def update_urate_effective_date_via_flare(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    urate_id_before, date_started_before = (
+        (None, None) if created else flare_values_before_save(instance, "urate_id", "date_started")
+    )
+    if urate_id_before == instance.urate_id and date_started_before == instance.date_started:
+        return
+    urate_ids = {instance.urate_id, urate_id_before} - {None}
+    if urate_ids:
+        urates_set_effective_date(Urate.objects.filter(pk__in=urate_ids))
+        if sender.urate.is_cached(instance) and instance.urate is not None:
+            instance.urate.effective_date = instance.date_started
+
+
+# post_delete() signal to revert the effective_date of the deleted Flare's Urate to its date_drawn
+@receiver(models.signals.post_delete, sender=Flare)
+def update_urate_effective_date_via_deleted_flare(sender, instance, **kwargs):
+    if instance.urate_id:
+        urates_set_effective_date(Urate.objects.filter(pk=instance.urate_id))
+
+
+# post_save() signal to move the Flare between the FlareCounts of the User(s) and date(s) it had and has
+@receiver(models.signals.post_save, sender=Flare)
+def update_flarecount_via_flare(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    before = (
+        None
+        if created
+        else flare_flarecount_key(
+            *flare_values_before_save(instance, "user_id", "date_started", "diagnosed", "likelihood")
+        )
+    )
+    after = flare_flarecount_key(instance.user_id, instance.date_started, instance.diagnosed, instance.likelihood)
+    if before != after:
+        if before:
+            flarecounts_add(*before, delta=-1)
+        if after:
+            flarecounts_add(*after, delta=1)
+
+
+# post_delete() signal to remove the deleted Flare from its User's FlareCount
+@receiver(models.signals.post_delete, sender=Flare)
+def update_flarecount_via_deleted_flare(sender, instance, **kwargs):
+    key = flare_flarecount_key(instance.user_id, instance.date_started, instance.diagnosed, instance.likelihood)
+    if key:
+        flarecounts_add(*key, delta=-1)
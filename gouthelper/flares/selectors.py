@@ -1,7 +1,10 @@
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Union
 
 from django.apps import apps  # type: ignore
-from django.db.models import Prefetch, Q
+from django.contrib.postgres.fields import ArrayField  # type: ignore
+from django.db.models import Aggregate, CharField, Count, DurationField, F, Func, Prefetch, Q, Value
+from django.db.models.functions import Coalesce, ExtractYear
+from django.utils import timezone  # type: ignore
 
 from ..medhistorys.lists import FLARE_MEDHISTORYS, FLAREAID_MEDHISTORYS
 from ..treatments.choices import FlarePpxChoices
@@ -11,6 +14,16 @@ if TYPE_CHECKING:
 
     from django.db.models import QuerySet  # type: ignore
 
+    from ..users.models import User
+
+
+class Median(Aggregate):
+    """PostgreSQL percentile_cont(0.5) ordered-set aggregate, i.e. the median of the expression."""
+
+    function = "PERCENTILE_CONT"
+    name = "Median"
+    template = "%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)"
+
 
 def creatinines_prefetch() -> Prefetch:
     return Prefetch(
@@ -172,3 +185,52 @@ def flares_user_qs(pseudopatient: str, flare_pk: Union["UUID", None] = None) ->
         apps.get_model("users.Pseudopatient").objects.filter(pk=pseudopatient),
         flare_pk,
     )
+
+
+def flares_timeline_qs(user: "User") -> "QuerySet":
+    """QuerySet of a User's Flares, most recent first, with the related objects the Flare cards
+    in the User's list of Flares use."""
+    return (
+        apps.get_model("flares.Flare")
+        .objects.filter(user=user)
+        .select_related("urate", "user")
+        .order_by("-date_started", "-pk")
+    )
+
+
+def flares_summary(flares: "QuerySet", most_common_joints: int = 3) -> dict[str, Any]:
+    """Summarizes a QuerySet of Flares with aggregate queries, rather than by fetching the Flares:
+    - total: the number of Flares
+    - flares_per_year: list of {"year", "count"} dicts, most recent year first
+    - median_duration: the median Flare duration, as a timedelta, with ongoing Flares lasting
+      until today, as in Flare.duration, or None if there are no Flares
+    - most_common_joints: list of (LimitedJointChoices value, count) tuples, most common first
+    - crystal_proven: the number of Flares with a positive crystal analysis
+    - crystal_proven_fraction: crystal_proven / total, or None if there are no Flares"""
+    flares = flares.order_by()
+    summary = flares.aggregate(
+        total=Count("pk"),
+        crystal_proven=Count("pk", filter=Q(crystal_analysis=True)),
+        median_duration=Median(
+            Coalesce("date_ended", Value(timezone.now().date())) - F("date_started"),
+            output_field=DurationField(),
+        ),
+    )
+    summary["crystal_proven_fraction"] = summary["crystal_proven"] / summary["total"] if summary["total"] else None
+    summary["flares_per_year"] = list(
+        flares.annotate(year=ExtractYear("date_started")).values("year").annotate(count=Count("pk")).order_by("-year")
+    )
+    # MultiSelectField stores the joints as a comma-separated string
+    joint = Func(
+        Func(F("joints"), Value(","), function="string_to_array", output_field=ArrayField(CharField())),
+        function="unnest",
+        output_field=CharField(),
+    )
+    summary["most_common_joints"] = list(
+        flares.annotate(joint=joint)
+        .values("joint")
+        .annotate(count=Count("pk"))
+        .order_by("-count", "joint")
+        .values_list("joint", "count")[:most_common_joints]
+    )
+    return summary
@@ -1,9 +1,15 @@
-from typing import TYPE_CHECKING, Union
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Union
 
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Case, Count, F, Min, PositiveIntegerField, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
+from ..dateofbirths.helpers import check_for_datetime_and_convert_to_date
 from ..medhistorys.choices import CVDiseases, MedHistoryTypes
 from ..medhistorys.helpers import medhistorys_get
 from ..utils.services import AidService, aids_assign_baselinecreatinine, aids_assign_ckddetail
@@ -12,17 +18,27 @@ from .helpers import (
     flares_calculate_prevalence,
     flares_calculate_prevalence_points,
     flares_get_less_likelys,
+    flares_may_be_gout,
+    flares_may_be_gout_q,
 )
 
 User = get_user_model()
 
 if TYPE_CHECKING:
-    from ..flares.models import Flare
+    from datetime import date
+    from uuid import UUID
+
+    from ..flares.models import Flare, FlareCount
+
+# Number of days a Flare counts toward its User's FlareCount.last_year
+FLARECOUNT_LAST_YEAR_DAYS = 365
 
 
 class FlareDecisionAid(AidService):
     """Class method for creating/updating Flare likelihood and prevalence fields."""
 
+    result_fields = ("likelihood", "prevalence")
+
     def __init__(
         self,
         qs: Union["Flare", User, QuerySet],
@@ -51,6 +67,13 @@ class FlareDecisionAid(AidService):
         self.update_likelihood()
         return super()._update(commit=commit)
 
+    def get_fingerprint_inputs(self) -> dict[str, Any]:
+        """Overwritten to add the urate and the Flare's duration, which changes
+        daily for Flares that haven't ended."""
+        inputs = super().get_fingerprint_inputs()
+        inputs.update({"duration": self.model_attr.duration, "urate": self.urate})
+        return inputs
+
     def get_aid_object_from_user_qs(
         self,
         model_attr_str: str = "flare",
@@ -112,3 +135,122 @@ class FlareDecisionAid(AidService):
     def aid_needs_2_be_saved(self) -> bool:
         """Returns True if the Flare likelihood or prevalence has changed, False if not."""
         return self.likelihood_has_changed() or self.prevalence_has_changed()
+
+
+def flarecounts_last_year_start() -> "date":
+    """Returns the date_started of the oldest Flare that counts toward FlareCount.last_year today."""
+    return (timezone.now() - timedelta(days=FLARECOUNT_LAST_YEAR_DAYS)).date()
+
+
+def flarecounts_last_year_expires(date_started: "date") -> "date":
+    """Returns the date on which a Flare that started on date_started stops counting toward
+    FlareCount.last_year."""
+    return date_started + timedelta(days=FLARECOUNT_LAST_YEAR_DAYS + 1)
+
+
+def flarecounts_add(user_id: "UUID", date_started: "date", delta: Literal[1, -1]) -> None:
+    """Adds (delta=1) or removes (delta=-1) a Flare that started on date_started to / from the
+    User's FlareCount with a single UPDATE. A User without a FlareCount gets one counted from
+    their Flares when a Flare is added. When a Flare is removed, i.e. while the User is being
+    deleted, a missing FlareCount is left to flarecounts_reconcile()."""
+    FlareCount = apps.get_model("flares", "FlareCount")
+    date_started = check_for_datetime_and_convert_to_date(date_started)
+    updates = {
+        "total": Greatest(F("total") + delta, Value(0), output_field=PositiveIntegerField()),
+        "modified": timezone.now(),
+    }
+    if date_started >= flarecounts_last_year_start():
+        updates["last_year"] = Greatest(F("last_year") + delta, Value(0), output_field=PositiveIntegerField())
+        if delta > 0:
+            expires = flarecounts_last_year_expires(date_started)
+            updates["last_year_expires"] = Least(Coalesce("last_year_expires", Value(expires)), Value(expires))
+        else:
+            # A last_year that drops to 0 (last_year is the value before the UPDATE) has no Flare left to expire
+            updates["last_year_expires"] = Case(
+                When(last_year__lte=1, then=Value(None)),
+                default=F("last_year_expires"),
+            )
+    if not FlareCount.objects.filter(user_id=user_id).update(**updates) and delta > 0:
+        flarecounts_reconcile(user_ids=[user_id])
+
+
+def flarecounts_get(user: User) -> Union["FlareCount", None]:
+    """Returns the User's FlareCount, or None if the User doesn't have one. If the oldest Flare
+    counted in its last_year has since aged out of the last year, it is recounted first."""
+    try:
+        flarecount = user.flarecount
+    except ObjectDoesNotExist:
+        return None
+    if flarecount.last_year_expires and flarecount.last_year_expires <= timezone.now().date():
+        flarecounts_reconcile(user_ids=[user.pk])
+        flarecount.refresh_from_db()
+    return flarecount
+
+
+def flarecounts_recount(flarecount: "FlareCount", flares: Iterable["Flare"]) -> list[str]:
+    """Recounts flarecount in memory from flares, all of its User's Flares, with their current, possibly
+    unsaved, diagnosed and likelihood. Doesn't save it.
+
+    Returns:
+        list[str]: names of the FlareCount fields that changed
+    """
+    last_year_start = flarecounts_last_year_start()
+    counted = [flare.date_started for flare in flares if flares_may_be_gout(flare.diagnosed, flare.likelihood)]
+    last_year = [date_started for date_started in counted if date_started >= last_year_start]
+    values = {
+        "total": len(counted),
+        "last_year": len(last_year),
+        "last_year_expires": flarecounts_last_year_expires(min(last_year)) if last_year else None,
+    }
+    changed = [field for field, value in values.items() if getattr(flarecount, field) != value]
+    for field in changed:
+        setattr(flarecount, field, values[field])
+    return changed
+
+
+def flarecounts_reconcile(user_ids: Iterable["UUID"] | None = None) -> int:
+    """Rebuilds the FlareCounts of the Users with user_ids, or of every User with Flares or a FlareCount,
+    from their Flares that may have been gout, with an aggregate query, an INSERT ... ON CONFLICT for
+    the Users with Flares, and an UPDATE that zeroes the FlareCounts of Users without any.
+
+    Returns:
+        int: number of FlareCounts rebuilt
+    """
+    Flare = apps.get_model("flares", "Flare")
+    FlareCount = apps.get_model("flares", "FlareCount")
+    flares = Flare.objects.filter(flares_may_be_gout_q(), user__isnull=False)
+    flarecounts = FlareCount.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        flares = flares.filter(user_id__in=user_ids)
+        flarecounts = flarecounts.filter(user_id__in=user_ids)
+    last_year = Q(date_started__gte=flarecounts_last_year_start())
+    counts = (
+        flares.order_by()
+        .values("user_id")
+        .annotate(
+            total=Count("pk"),
+            last_year=Count("pk", filter=last_year),
+            oldest_last_year=Min("date_started", filter=last_year),
+        )
+    )
+    rebuilt = FlareCount.objects.bulk_create(
+        [
+            FlareCount(
+                user_id=count["user_id"],
+                total=count["total"],
+                last_year=count["last_year"],
+                last_year_expires=(
+                    flarecounts_last_year_expires(count["oldest_last_year"]) if count["oldest_last_year"] else None
+                ),
+            )
+            for count in counts
+        ],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["total", "last_year", "last_year_expires", "modified"],
+    )
+    emptied = flarecounts.exclude(user_id__in=[flarecount.user_id for flarecount in rebuilt]).update(
+        total=0, last_year=0, last_year_expires=None, modified=timezone.now()
+    )
+    return len(rebuilt) + emptied
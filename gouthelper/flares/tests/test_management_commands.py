@@ -0,0 +1,49 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.core.management import CommandError, call_command  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+from django.utils import timezone  # pylint: disable=E0401 # type: ignore
+
+from ...users.tests.factories import create_psp
+from ..choices import DiagnosedChoices
+from ..models import Flare, FlareCount
+from .factories import create_flare
+
+pytestmark = pytest.mark.django_db
+
+
+class TestReconcileFlareCounts(TestCase):
+    def setUp(self):
+        self.psp = create_psp()
+        self.flare = create_flare(
+            user=self.psp, date_started=(timezone.now() - timedelta(days=30)).date(), diagnosed=DiagnosedChoices.YES
+        )
+        self.other_psp = create_psp()
+        create_flare(
+            user=self.other_psp,
+            date_started=(timezone.now() - timedelta(days=400)).date(),
+            diagnosed=DiagnosedChoices.YES,
+        )
+        FlareCount.objects.all().delete()
+
+    def test__command_output(self):
+        out = StringIO()
+        call_command("reconcile_flare_counts", "--chunk-size", "1", stdout=out)
+        self.assertIn("1/2 FlareCounts", out.getvalue())
+        self.assertIn("Rebuilt 2 FlareCounts.", out.getvalue())
+        self.assertEqual(FlareCount.objects.get(user=self.psp).last_year, 1)
+        self.assertEqual(FlareCount.objects.get(user=self.other_psp).total, 1)
+        self.assertEqual(FlareCount.objects.get(user=self.other_psp).last_year, 0)
+
+    def test__zeroes_flarecount_of_user_without_flares(self):
+        call_command("reconcile_flare_counts", stdout=StringIO())
+        Flare.objects.filter(pk=self.flare.pk).delete()
+        FlareCount.objects.filter(user=self.psp).update(total=3, last_year=3)
+        call_command("reconcile_flare_counts", stdout=StringIO())
+        self.assertEqual(FlareCount.objects.get(user=self.psp).total, 0)
+
+    def test__invalid_chunk_size(self):
+        with self.assertRaises(CommandError):
+            call_command("reconcile_flare_counts", "--chunk-size", "0")
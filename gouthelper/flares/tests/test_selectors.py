@@ -1,3 +1,4 @@
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest  # type: ignore
@@ -5,6 +6,7 @@ from django.db import connection  # type: ignore
 from django.db.models import QuerySet  # type: ignore
 from django.test import TestCase  # type: ignore
 from django.test.utils import CaptureQueriesContext  # type: ignore
+from django.utils import timezone  # type: ignore
 
 from ...dateofbirths.helpers import age_calc
 from ...dateofbirths.tests.factories import DateOfBirthFactory
@@ -28,8 +30,10 @@ from ...medhistorys.tests.factories import (
     StrokeFactory,
 )
 from ...users.models import Pseudopatient
+from ...users.tests.factories import create_psp
+from ..choices import LimitedJointChoices
 from ..models import Flare
-from ..selectors import flare_userless_qs, flares_user_qs
+from ..selectors import flare_userless_qs, flares_summary, flares_timeline_qs, flares_user_qs
 from .factories import create_flare
 
 pytestmark = pytest.mark.django_db
@@ -172,3 +176,66 @@ class TestFlaresUserQuerySet(TestCase):
                     self.assertTrue(isinstance(flare, Flare))
                     self.assertIsNone(getattr(flare, "dateofbirth", None))
                     self.assertIsNone(getattr(flare, "gender", None))
+
+
+class TestFlaresSummary(TestCase):
+    def setUp(self):
+        self.psp = create_psp()
+        self.today = timezone.now().date()
+        for days_ago, duration, joints, crystal_analysis in [
+            (30, 5, [LimitedJointChoices.MTP1R], True),
+            (100, 10, [LimitedJointChoices.MTP1R, LimitedJointChoices.KNEER], False),
+            (500, 3, [LimitedJointChoices.KNEER, LimitedJointChoices.ANKLEL], False),
+        ]:
+            create_flare(
+                user=self.psp,
+                date_started=self.today - timedelta(days=days_ago),
+                date_ended=self.today - timedelta(days=days_ago - duration),
+                joints=joints,
+                crystal_analysis=crystal_analysis,
+            )
+        # Another patient's Flare shouldn't be counted
+        create_flare(user=create_psp())
+
+    def test__summary(self):
+        with CaptureQueriesContext(connection) as queries:
+            summary = flares_summary(flares_timeline_qs(self.psp))
+        self.assertEqual(len(queries.captured_queries), 3)
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual(summary["crystal_proven"], 1)
+        self.assertAlmostEqual(summary["crystal_proven_fraction"], 1 / 3)
+        self.assertEqual(summary["median_duration"], timedelta(days=5))
+        years = {}
+        for days_ago in (30, 100, 500):
+            year = (self.today - timedelta(days=days_ago)).year
+            years[year] = years.get(year, 0) + 1
+        self.assertEqual(
+            summary["flares_per_year"],
+            [{"year": year, "count": count} for year, count in sorted(years.items(), reverse=True)],
+        )
+        self.assertEqual(
+            summary["most_common_joints"],
+            [
+                (LimitedJointChoices.KNEER.value, 2),
+                (LimitedJointChoices.MTP1R.value, 2),
+                (LimitedJointChoices.ANKLEL.value, 1),
+            ],
+        )
+
+    def test__ongoing_flare_lasts_until_today(self):
+        psp = create_psp()
+        create_flare(
+            user=psp, date_started=self.today - timedelta(days=200), date_ended=self.today - timedelta(days=190)
+        )
+        create_flare(user=psp, date_started=self.today - timedelta(days=20), date_ended=None)
+        # Durations are 10 days and 20 days (ongoing), so the median is interpolated between them
+        self.assertEqual(flares_summary(flares_timeline_qs(psp))["median_duration"], timedelta(days=15))
+
+    def test__no_flares(self):
+        summary = flares_summary(flares_timeline_qs(create_psp()))
+        self.assertEqual(summary["total"], 0)
+        self.assertEqual(summary["crystal_proven"], 0)
+        self.assertIsNone(summary["crystal_proven_fraction"])
+        self.assertIsNone(summary["median_duration"])
+        self.assertEqual(summary["flares_per_year"], [])
+        self.assertEqual(summary["most_common_joints"], [])
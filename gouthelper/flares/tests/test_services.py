@@ -21,9 +21,16 @@ from ...medhistorys.models import MedHistory
 from ...medhistorys.tests.factories import CkdFactory
 from ...users.models import Pseudopatient
 from ...users.tests.factories import UserFactory, create_psp
-from ..choices import Likelihoods, LimitedJointChoices, Prevalences
+from ..choices import DiagnosedChoices, Likelihoods, LimitedJointChoices, Prevalences
+from ..models import Flare, FlareCount
 from ..selectors import flare_userless_qs, flares_user_qs
-from ..services import FlareDecisionAid
+from ..services import (
+    FlareDecisionAid,
+    flarecounts_get,
+    flarecounts_last_year_expires,
+    flarecounts_reconcile,
+    flarecounts_recount,
+)
 from .factories import CustomFlareFactory, create_flare
 
 pytestmark = pytest.mark.django_db
@@ -188,3 +195,117 @@ class TestFlareMethods(TestCase):
         decisionaid.update_prevalence()
         decisionaid.update_likelihood()
         self.assertTrue(decisionaid.aid_needs_2_be_saved())
+
+
+class TestFlareCounts(TestCase):
+    def setUp(self):
+        self.psp = create_psp()
+        self.today = timezone.now().date()
+
+    def create_flare(self, days_ago: int, user=None, **kwargs) -> Flare:
+        kwargs.setdefault("diagnosed", DiagnosedChoices.YES)
+        return create_flare(
+            user=user or self.psp,
+            date_started=self.today - timedelta(days=days_ago),
+            date_ended=self.today - timedelta(days=days_ago - 5),
+            **kwargs,
+        )
+
+    def assertFlareCount(self, user, total: int, last_year: int) -> FlareCount:  # pylint: disable=C0103
+        flarecount = FlareCount.objects.get(user=user)
+        self.assertEqual((flarecount.total, flarecount.last_year), (total, last_year))
+        return flarecount
+
+    def test__created_edited_and_deleted_flares_are_counted(self):
+        flare = self.create_flare(30)
+        flarecount = self.assertFlareCount(self.psp, 1, 1)
+        self.assertEqual(flarecount.last_year_expires, flarecounts_last_year_expires(flare.date_started))
+        old_flare = self.create_flare(400)
+        self.assertFlareCount(self.psp, 2, 1)
+        old_flare.date_started = self.today - timedelta(days=60)
+        old_flare.date_ended = self.today - timedelta(days=55)
+        old_flare.save()
+        self.assertFlareCount(self.psp, 2, 2)
+        other_psp = create_psp()
+        flare.user = other_psp
+        flare.save()
+        self.assertFlareCount(self.psp, 1, 1)
+        self.assertFlareCount(other_psp, 1, 1)
+        old_flare.delete()
+        self.assertFlareCount(self.psp, 0, 0)
+
+    def test__last_year_expires_cleared_when_last_year_drops_to_zero(self):
+        flare = self.create_flare(30)
+        flare_2 = self.create_flare(100)
+        flare.delete()
+        flarecount = self.assertFlareCount(self.psp, 1, 1)
+        self.assertIsNotNone(flarecount.last_year_expires)
+        flare_2.delete()
+        flarecount = self.assertFlareCount(self.psp, 0, 0)
+        self.assertIsNone(flarecount.last_year_expires)
+
+    def test__saving_unchanged_flare_does_not_change_count(self):
+        flare = self.create_flare(30)
+        flare.save()
+        self.assertFlareCount(self.psp, 1, 1)
+
+    def test__flares_that_are_not_gout_are_not_counted(self):
+        self.create_flare(30, diagnosed=DiagnosedChoices.NO)
+        unlikely = self.create_flare(60, diagnosed=DiagnosedChoices.UNSURE, likelihood=Likelihoods.UNLIKELY)
+        self.create_flare(90, diagnosed=DiagnosedChoices.YES, likelihood=Likelihoods.UNLIKELY)
+        self.assertFlareCount(self.psp, 1, 1)
+        # A Flare whose likelihood is recalculated is moved into or out of the FlareCount
+        unlikely.likelihood = Likelihoods.EQUIVOCAL
+        unlikely.save()
+        self.assertFlareCount(self.psp, 2, 2)
+        unlikely.diagnosed = DiagnosedChoices.NO
+        unlikely.save()
+        self.assertFlareCount(self.psp, 1, 1)
+        unlikely.delete()
+        self.assertFlareCount(self.psp, 1, 1)
+        flarecounts_reconcile(user_ids=[self.psp.pk])
+        self.assertFlareCount(self.psp, 1, 1)
+
+    def test__flarecounts_recount(self):
+        flare = self.create_flare(30)
+        self.create_flare(400)
+        flarecount = FlareCount.objects.get(user=self.psp)
+        flares = list(Flare.objects.filter(user=self.psp))
+        self.assertEqual(flarecounts_recount(flarecount, flares), [])
+        next(flare_ for flare_ in flares if flare_.pk == flare.pk).diagnosed = DiagnosedChoices.NO
+        self.assertEqual(flarecounts_recount(flarecount, flares), ["total", "last_year", "last_year_expires"])
+        self.assertEqual((flarecount.total, flarecount.last_year, flarecount.last_year_expires), (1, 0, None))
+
+    def test__userless_flare_is_not_counted(self):
+        create_flare()
+        self.assertFalse(FlareCount.objects.exists())
+
+    def test__flarecounts_get_recounts_expired_last_year(self):
+        flare = self.create_flare(30)
+        self.create_flare(100)
+        # Age the first Flare out of the last year without signals, as the passage of time would
+        Flare.objects.filter(pk=flare.pk).update(
+            date_started=self.today - timedelta(days=500), date_ended=self.today - timedelta(days=495)
+        )
+        FlareCount.objects.filter(user=self.psp).update(last_year_expires=self.today)
+        flarecount = flarecounts_get(Pseudopatient.objects.get(pk=self.psp.pk))
+        self.assertEqual((flarecount.total, flarecount.last_year), (2, 1))
+        self.assertEqual(flarecount.last_year_expires, flarecounts_last_year_expires(self.today - timedelta(days=100)))
+
+    def test__flarecounts_get_without_flarecount(self):
+        self.assertIsNone(flarecounts_get(self.psp))
+
+    def test__flarecounts_reconcile(self):
+        self.create_flare(30)
+        self.create_flare(400)
+        other_psp = create_psp()
+        other_flare = self.create_flare(30, user=other_psp)
+        FlareCount.objects.filter(user=self.psp).delete()
+        Flare.objects.filter(pk=other_flare.pk).delete()
+        FlareCount.objects.filter(user=other_psp).update(total=5, last_year=5)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flarecounts_reconcile(), 2)
+        self.assertEqual(len(queries.captured_queries), 3)
+        self.assertFlareCount(self.psp, 2, 1)
+        flarecount = self.assertFlareCount(other_psp, 0, 0)
+        self.assertIsNone(flarecount.last_year_expires)
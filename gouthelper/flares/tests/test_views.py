@@ -38,7 +38,7 @@ from ...users.models import Pseudopatient
 from ...users.tests.factories import AdminFactory, UserFactory, create_psp
 from ...utils.factories import medhistory_diff_obj_data, oto_random_age, oto_random_gender, oto_random_urate_or_None
 from ...utils.forms import forms_print_response_errors
-from ...utils.test_helpers import dummy_get_response
+from ...utils.test_helpers import captured_writes, dummy_get_response
 from ..choices import DiagnosedChoices, Likelihoods, LimitedJointChoices, Prevalences
 from ..models import Flare
 from ..selectors import flares_user_qs
@@ -46,6 +46,7 @@ from ..views import (
     FlareAbout,
     FlareCreate,
     FlareDetail,
+    FlareEvaluate,
     FlarePseudopatientCreate,
     FlarePseudopatientDelete,
     FlarePseudopatientDetail,
@@ -451,6 +452,44 @@ If you don't know the value, please uncheck the Uric Acid Lab Check box.",
         )
 
 
+class TestFlareEvaluate(TestCase):
+    def setUp(self):
+        self.view = FlareEvaluate
+
+    def test__get_not_allowed(self):
+        response = self.client.get(reverse("flares:evaluate"))
+        self.assertEqual(response.status_code, 405)
+
+    def test__post_evaluates_without_saving(self):
+        for _ in range(5):
+            data = flare_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("flares:evaluate"), data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["aid"], "flare")
+            self.assertFalse(captured_writes(context.captured_queries))
+        self.assertFalse(Flare.objects.exists())
+        self.assertFalse(MedHistory.objects.exists())
+
+    def test__post_matches_create(self):
+        data = flare_data_factory()
+        evaluation = self.client.post(reverse("flares:evaluate"), data).json()
+        response = self.client.post(reverse("flares:create"), data)
+        self.assertEqual(response.status_code, 302)
+        flare = Flare.related_objects.get()
+        self.assertEqual(evaluation["results"], {"likelihood": flare.likelihood, "prevalence": flare.prevalence})
+        self.assertEqual(
+            [(explanation["id"], explanation["value"]) for explanation in evaluation["explanations"]],
+            [(exp_id, None if value is None else bool(value)) for exp_id, _, value, _ in flare.explanations],
+        )
+
+    def test__post_invalid_returns_errors(self):
+        response = self.client.post(reverse("flares:evaluate"), {})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
+        self.assertFalse(Flare.objects.exists())
+
+
 class TestFlareDetail(TestCase):
     def setUp(self):
         self.flare = create_flare()
@@ -1559,9 +1598,37 @@ class TestFlarePseudopatientList(TestCase):
         qs = qs.get()
         self.assertTrue(isinstance(qs, Pseudopatient))
         self.assertEqual(qs, self.psp)
-        self.assertTrue(hasattr(qs, "flares_qs"))
+        # The Flares are fetched a page at a time, not prefetched
+        self.assertFalse(hasattr(qs, "flares_qs"))
         self.assertTrue(hasattr(qs, "pseudopatientprofile"))
 
+    def test__paginated_with_summary(self):
+        """Test that the view paginates the Flares and summarizes all of them."""
+        for i in range(10):
+            create_flare(
+                user=self.psp,
+                date_started=timezone.now().date() - timedelta(days=400 + 10 * i),
+                date_ended=timezone.now().date() - timedelta(days=397 + 10 * i),
+                crystal_analysis=True,
+            )
+        self.client.force_login(self.provider)
+        url = reverse("flares:pseudopatient-list", kwargs={"pseudopatient": self.psp.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["flares"]), 10)
+        self.assertTrue(response.context["is_paginated"])
+        self.assertEqual(
+            list(response.context["flares"]),
+            list(Flare.objects.filter(user=self.psp).order_by("-date_started", "-pk")[:10]),
+        )
+        summary = response.context["summary"]
+        self.assertEqual(summary["total"], 15)
+        self.assertEqual(sum(year["count"] for year in summary["flares_per_year"]), 15)
+        self.assertEqual(summary["crystal_proven"], Flare.objects.filter(user=self.psp, crystal_analysis=True).count())
+        self.assertContains(response, "Summary")
+        response = self.client.get(url, {"page": 2})
+        self.assertEqual(len(response.context["flares"]), 5)
+
     def test__rules(self):
         """Test that django-rules permissions are set correctly and working for the view."""
         # Create a Provider and Admin, each with their own Pseudopatient
@@ -4,6 +4,7 @@ from .views import (
     FlareAbout,
     FlareCreate,
     FlareDetail,
+    FlareEvaluate,
     FlarePseudopatientCreate,
     FlarePseudopatientDelete,
     FlarePseudopatientDetail,
@@ -17,6 +18,7 @@ app_name = "flares"
 urlpatterns = [
     path("about/", FlareAbout.as_view(), name="about"),
     path("create/", FlareCreate.as_view(), name="create"),
+    path("evaluate/", FlareEvaluate.as_view(), name="evaluate"),
     path("<uuid:pk>/", FlareDetail.as_view(), name="detail"),
     path("update/<uuid:pk>/", FlareUpdate.as_view(), name="update"),
     path("goutpatient-list/<uuid:pseudopatient>/", view=FlarePseudopatientList.as_view(), name="pseudopatient-list"),
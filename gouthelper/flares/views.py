@@ -1,7 +1,6 @@
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, Union  # pylint: disable=E0015, E0013 # type: ignore
 
-from django.apps import apps  # pylint: disable=e0401 # type: ignore
 from django.contrib import messages  # type: ignore
 from django.contrib.auth import get_user_model  # pylint: disable=e0401 # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # pylint: disable=e0401 # type: ignore
@@ -26,6 +25,7 @@ from rules.contrib.views import (  # pylint: disable=e0401 # type: ignore
 from ..akis.choices import Statuses
 from ..akis.services import AkiProcessor
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..labs.helpers import (
     labs_formset_has_one_or_more_valid_labs,
     labs_formset_order_by_date_drawn_remove_deleted_and_blank_forms,
@@ -37,11 +37,13 @@ from ..users.models import Pseudopatient
 from ..utils.helpers import wrap_in_samepage_links_anchor
 from ..utils.views import (
     GoutHelperDetailMixin,
+    GoutHelperEvaluateMixin,
     GoutHelperPseudopatientDetailMixin,
     LabFormSetsMixin,
     MedHistoryFormMixin,
     OneToOneFormMixin,
 )
+from .choices import LimitedJointChoices
 from .dicts import (
     LAB_FORMSETS,
     MEDHISTORY_DETAIL_FORMS,
@@ -54,6 +56,7 @@ from .dicts import (
 )
 from .forms import FlareForm
 from .models import Flare
+from .selectors import flares_summary, flares_timeline_qs
 
 if TYPE_CHECKING:
     from decimal import Decimal
@@ -79,7 +82,7 @@ class FlareAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.FLARE, tag=None)
+        return content_get(slug="about", context=Contexts.FLARE)
 
 
 class FlareEditBase(LabFormSetsMixin, MedHistoryFormMixin, OneToOneFormMixin):
@@ -258,7 +261,7 @@ class FlareAnonEditBase(FlareEditBase):
         # Compare urate date_drawn to flare_date_started and date_ended
         if self.errors or self.errors_bool:
             if self.errors_bool and not self.errors:
-                return super().render_errors()
+                return self.render_errors()
             else:
                 return self.errors
         else:
@@ -281,6 +284,10 @@ class FlareCreate(FlareAnonEditBase, AutoPermissionRequiredMixin, CreateView, Su
         return initial
 
 
+class FlareEvaluate(GoutHelperEvaluateMixin, FlareCreate):
+    """Evaluates a Flare in memory from the same POST data as FlareCreate without saving anything."""
+
+
 class FlareDetail(GoutHelperDetailMixin):
     model = Flare
     object: Flare
@@ -391,8 +398,13 @@ class FlarePatientEditBase(FlareEditBase):
 
 
 class FlarePseudopatientList(PermissionRequiredMixin, ListView):
+    """Paginated timeline of a Pseudopatient's Flares, most recent first, with a summary
+    of all of them (flares per year, median duration, most common joints, and crystal-proven
+    fraction) computed with aggregate queries rather than from the Flare objects."""
+
     context_object_name = "flares"
     model = Flare
+    paginate_by = 10
     permission_required = "flares.can_view_flare_list"
     template_name = "flares/flare_list.html"
 
@@ -401,20 +413,27 @@ class FlarePseudopatientList(PermissionRequiredMixin, ListView):
         return super().dispatch(request, *args, **kwargs)
 
     def get(self, request, *args, **kwargs):
-        self.object_list = self.user.flares_qs
+        self.object_list = flares_timeline_qs(self.user)
         context = self.get_context_data()
         return self.render_to_response(context)
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context["patient"] = self.user
+        summary = flares_summary(flares_timeline_qs(self.user))
+        summary["most_common_joints"] = [
+            (LimitedJointChoices(joint).label, count) for joint, count in summary["most_common_joints"]
+        ]
+        context["summary"] = summary
         return context
 
     def get_permission_object(self):
         return self.user
 
     def get_queryset(self):
-        return Pseudopatient.objects.flares_qs().filter(pk=self.kwargs["pseudopatient"])
+        return Pseudopatient.objects.select_related("dateofbirth", "gender", "pseudopatientprofile__provider").filter(
+            pk=self.kwargs["pseudopatient"]
+        )
 
 
 class FlarePseudopatientCreate(FlarePatientEditBase, PermissionRequiredMixin, CreateView, SuccessMessageMixin):
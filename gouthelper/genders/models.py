@@ -7,15 +7,15 @@ from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
-from ..utils.models import GoutHelperModel
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel
 from .choices import Genders
 
 User = get_user_model()
 
 
-class Gender(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Gender(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Model representing biological gender.
     Gender is stored as an integer in value field. Male=0, Female=1."""
 
@@ -38,7 +38,7 @@ class Gender(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=Rules
         ),
     )
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self) -> Genders | Literal["Gender unknown"]:
         if self.value is not None:
@@ -7,10 +7,11 @@ from django.utils.functional import cached_property
 from django.utils.html import mark_safe  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..medhistorys.lists import GOALURATE_MEDHISTORYS
 from ..rules import add_object, change_object, delete_object, view_object
+from ..utils.helpers import explanations_cached
+from ..utils.history import GoutHelperHistoricalRecords
 from ..utils.models import GoutHelperAidModel, GoutHelperModel
 from .choices import GoalUrates
 from .managers import GoalUrateManager
@@ -83,7 +84,7 @@ class GoalUrate(
         blank=True,
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = GoalUrateManager()
@@ -108,6 +109,7 @@ individuals who have erosions. This results in the treatment being slightly more
         )
 
     @cached_property
+    @explanations_cached
     def explanations(self) -> list[tuple[str, str, bool, str]]:
         """Method that returns a dictionary of tuples explanations for the Flare to use in templates."""
         return [
@@ -15,6 +15,8 @@ User = get_user_model()
 class GoalUrateDecisionAid(AidService):
     """Class method for creating/updating a GoalUrate's goal_urate field."""
 
+    result_fields = ("goal_urate",)
+
     def __init__(
         self,
         qs: Union["GoalUrate", User, None] = None,
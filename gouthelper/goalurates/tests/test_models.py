@@ -91,5 +91,5 @@ class TestGoalUrateMethods(TestCase):
 
     def test__update_with_qs_5_queries(self):
         goal_urate = create_goalurate(mhs=[MedHistoryTypes.TOPHI])
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(5):
             goal_urate.update_aid(qs=goalurate_userless_qs(goal_urate.pk).get())
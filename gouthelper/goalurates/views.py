@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Any
 
-from django.apps import apps  # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # type: ignore
 from django.utils.functional import cached_property  # type: ignore
 from django.views.generic import CreateView, TemplateView, UpdateView  # type: ignore
@@ -8,6 +7,7 @@ from django_htmx.http import HttpResponseClientRefresh  # type: ignore
 from rules.contrib.views import AutoPermissionRequiredMixin, PermissionRequiredMixin  # type: ignore
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..ppxs.models import Ppx
 from ..ultaids.models import UltAid
 from ..users.models import Pseudopatient
@@ -37,7 +37,7 @@ class GoalUrateAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.GOALURATE, tag=None)
+        return content_get(slug="about", context=Contexts.GOALURATE)
 
 
 class GoalUrateEditBase(MedHistoryFormMixin):
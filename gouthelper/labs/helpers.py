@@ -1,16 +1,20 @@
+import math
 import random
 from datetime import datetime, timedelta  # type: ignore
 from decimal import Decimal
-from typing import TYPE_CHECKING, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Union
 
 from django.core.exceptions import ValidationError  # type: ignore
 from django.forms.models import BaseModelFormSet  # type: ignore
 from django.utils import timezone  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 
+from ..dateofbirths.helpers import check_for_datetime_and_convert_to_date
 from ..genders.choices import Genders
 from ..goalurates.choices import GoalUrates
 from ..medhistorydetails.choices import Stages
+from .series import UrateSeries
 
 if TYPE_CHECKING:
     from django.db.models.query import QuerySet  # type: ignore
@@ -19,6 +23,13 @@ if TYPE_CHECKING:
     from .forms import PpxUrateFormSet, UrateForm
     from .models import BaselineCreatinine, Creatinine, Lab, Urate
 
+# 2021 CKD-EPI Creatinine Equation constants, CKD_EPI_CONSTANTS is keyed by whether
+# the patient is male and holds the sex modifier, alpha, and kappa
+CKD_EPI_AGE_BASE = 0.9938
+CKD_EPI_COEFFICIENT = 142
+CKD_EPI_CONSTANTS = {True: (1.000, -0.302, 0.9), False: (1.012, -0.241, 0.7)}
+CKD_EPI_EXPONENT = -1.200
+
 
 def labs_calculate_baseline_creatinine_range_from_ckd_stage(
     stage: Stages,
@@ -32,26 +43,17 @@ def labs_calculate_baseline_creatinine_range_from_ckd_stage(
     )
 
 
+@lru_cache(maxsize=4096)
 def labs_calculate_baseline_creatinine_from_eGFR_age_gender(
-    eGFR: Decimal,
+    eGFR: Decimal | int,
     age: int,
     gender: Genders,
-    value: Decimal = Decimal(2.50),
 ) -> Decimal:
-    eGFR_calc = labs_eGFR_calculator(value, age, gender)
-    if abs(eGFR_calc - eGFR) >= 1:
-        if eGFR_calc < eGFR:
-            return labs_calculate_baseline_creatinine_from_eGFR_age_gender(
-                eGFR=eGFR,
-                age=age,
-                gender=gender,
-                value=value - value / 2,
-            )
-        else:
-            return labs_calculate_baseline_creatinine_from_eGFR_age_gender(
-                eGFR=eGFR, age=age, gender=gender, value=value + value / 2
-            )
-    return value if value < Decimal(10) else Decimal("9.99")
+    """Method that calculates the creatinine whose (unrounded) CKD-EPI eGFR is eGFR for
+    a given age and gender, rounded to 4 decimal places so that its eGFR rounds back to eGFR.
+    Creatinines of 10 mg/dL or greater are returned as 9.99."""
+    value = labs_ckd_epi_creatinine(float(eGFR), age, gender)
+    return labs_round_decimal(Decimal(value), 4) if value < 10 else Decimal("9.99")
 
 
 def labs_creatinine_is_at_baseline_creatinine(
@@ -237,35 +239,21 @@ def labs_eGFR_calculator(
             raise TypeError(
                 f"labs_eGFR_calculator() was called on a non-lab, non-Decimal object: {creatinine}"
             ) from exc
-    # Set gender-based variables for CKD-EPI Creatinine Equation
-    sex_modifier, alpha, kappa = get_sex_modifier_alpha_kappa(gender)
-    # Calculate eGFR
-    eGFR = (
-        Decimal(142)
-        * min(value / kappa, Decimal(1.00)) ** alpha
-        * max(value / kappa, Decimal(1.00)) ** Decimal(-1.200)
-        * Decimal("0.9938") ** age
-        * sex_modifier
-    )
-    # Return eGFR rounded to 0 decimal points
-    return labs_round_decimal(eGFR, 0)
+    return _labs_eGFR_calculator(value, age, gender)
 
 
-def get_sex_modifier_alpha_kappa(gender: Genders) -> tuple[Decimal, Decimal, Decimal]:
-    if gender == Genders.MALE:
-        return Decimal(1.000), Decimal(-0.302), Decimal(0.9)
-    else:
-        return Decimal(1.012), Decimal(-0.241), Decimal(0.7)
+@lru_cache(maxsize=4096)
+def _labs_eGFR_calculator(value: Decimal, age: int, gender: Genders) -> Decimal:
+    return Decimal(round(labs_ckd_epi_eGFR(float(value), age, gender)))
 
 
 def labs_baselinecreatinine_calculator(
     stage: Stages,
     age: int,
     gender: Genders,
-    creat: Decimal = Decimal(random.uniform(0, 10)),
 ) -> Decimal:
-    """Method that calculates a baseline creatinine range based on the a CKD stage,
-    an age, and a Gender.
+    """Method that calculates a random baseline creatinine, rounded to 2 decimal places,
+    whose eGFR falls within the eGFR range for a CKD stage, an age, and a Gender.
 
     Args:
         stage (Stages enum): CKD stage
@@ -274,15 +262,65 @@ def labs_baselinecreatinine_calculator(
 
     Returns:
         Decimal: a baseline creatinine value that falls within the eGFR range for the CKD stage"""
-    min_eGFR, max_eGFR = labs_eGFR_range_for_stage(stage)
-    creat = Decimal(random.uniform(0, 10))
-    eGFR = labs_eGFR_calculator(creat, age, gender)
-    while eGFR < min_eGFR or eGFR > max_eGFR:
-        if eGFR < min_eGFR:
-            return labs_baselinecreatinine_calculator(stage, age, gender, Decimal(random.uniform(0, float(creat))))
-        else:
-            return labs_baselinecreatinine_calculator(stage, age, gender, Decimal(random.uniform(float(creat), 10)))
-    return labs_round_decimal(creat, 2)
+    min_creat, max_creat = labs_creatinine_calculate_min_max_creatinine_from_stage_age_gender(stage, age, gender)
+    min_cents, max_cents = math.ceil(min_creat * 100), math.floor(max_creat * 100)
+    if min_cents > max_cents:
+        return labs_round_decimal((min_creat + max_creat) / 2, 2)
+    return Decimal(random.randint(min_cents, max_cents)) / 100
+
+
+def labs_ckd_epi_eGFR(value: float, age: int, gender: Genders) -> float:
+    """Calculates the unrounded 2021 CKD-EPI Creatinine Equation eGFR for a creatinine value."""
+    sex_modifier, alpha, kappa = CKD_EPI_CONSTANTS[gender == Genders.MALE]
+    scr_kappa = value / kappa
+    return (
+        CKD_EPI_COEFFICIENT
+        * min(scr_kappa, 1.0) ** alpha
+        * max(scr_kappa, 1.0) ** CKD_EPI_EXPONENT
+        * CKD_EPI_AGE_BASE**age
+        * sex_modifier
+    )
+
+
+def labs_ckd_epi_creatinine(eGFR: float, age: int, gender: Genders) -> float:
+    """Inverts the 2021 CKD-EPI Creatinine Equation: returns the creatinine whose unrounded eGFR
+    is eGFR, or infinity if eGFR isn't positive. The equation is a power of creatinine / kappa,
+    with the exponent alpha below 1 and -1.2 above, so it is solved by a root on either side."""
+    if eGFR <= 0:
+        return math.inf
+    sex_modifier, alpha, kappa = CKD_EPI_CONSTANTS[gender == Genders.MALE]
+    # Ratio of eGFR to the eGFR when creatinine == kappa
+    ratio = eGFR / (CKD_EPI_COEFFICIENT * CKD_EPI_AGE_BASE**age * sex_modifier)
+    return kappa * ratio ** (1 / alpha if ratio >= 1 else 1 / CKD_EPI_EXPONENT)
+
+
+class CkdEpiResult(NamedTuple):
+    eGFR: Decimal
+    stage: Stages
+    min_creatinine: Decimal
+    max_creatinine: Decimal
+
+
+def labs_ckd_epi_batch(
+    creatinines: Iterable[Decimal | float],
+    ages: Iterable[int],
+    genders: Iterable[Genders],
+) -> list[CkdEpiResult]:
+    """Method that calculates the eGFR, CKD stage, and the min and max creatinines for that stage,
+    for each creatinine, age, and gender, i.e. for a panel of patients. Creatinines, ages and
+    genders are paired up in order and must be the same length."""
+    results = []
+    for value, age, gender in zip(creatinines, ages, genders, strict=True):
+        eGFR = _labs_eGFR_calculator(Decimal(value), age, gender)
+        stage = labs_stage_calculator(eGFR)
+        results.append(
+            CkdEpiResult(
+                eGFR,
+                stage,
+                *labs_creatinine_calculate_min_max_creatinine_from_stage_age_gender(stage, age, gender),
+            )
+        )
+    return results
 
 
 def labs_stage_calculator(eGFR: Decimal) -> "Stages":
@@ -309,7 +347,9 @@ def labs_stage_calculator(eGFR: Decimal) -> "Stages":
 
 
 def labs_urate_is_newer_than_goutdetail_set_date(urate, goutdetail):
-    return labs_urate_date_drawn_newer_than_set_date(urate.date, goutdetail.medhistory.set_date)
+    return labs_urate_date_drawn_newer_than_set_date(
+        urate.date, check_for_datetime_and_convert_to_date(goutdetail.medhistory.set_date)
+    )
 
 
 def labs_check_chronological_order_by_date_drawn(
@@ -335,10 +375,7 @@ def labs_compare_chronological_order_by_date_drawn(
 def labs_urates_check_chronological_order_by_date(
     urates: Union["QuerySet[Urate]", list["Urate"]],
 ) -> ValueError | None:
-    for urate_i, urate in enumerate(urates):
-        labs_urates_compare_chronological_order_by_date(
-            current_urate=urate, previous_urate=urates[urate_i - 1] if urate_i > 0 else None, first_urate=urates[0]
-        )
+    UrateSeries(urates).check_chronological_order()
 
 
 def labs_urates_compare_chronological_order_by_date(
@@ -365,8 +402,7 @@ def labs_urates_last_at_goal(
     """Methot that takes a list or QuerySet of urates and returns True if the last Urate
     is less than the goal_urate, False if not. Raises a ValueError if the urates are not
     in chronological order."""
-    labs_urates_check_chronological_order_by_date(urates)
-    return urates[0].value <= goal_urate if urates else False
+    return UrateSeries(urates).at_goal(goal_urate)
 
 
 def labs_check_date_drawn_is_date(
@@ -560,8 +596,7 @@ def labs_urates_at_goal(
     goal_urate: GoalUrates = GoalUrates.SIX,
 ) -> bool:
     """Checks if the most recent urate in a list or QuerySet of Urates is at goal."""
-    labs_urates_check_chronological_order_by_date(urates)
-    return urates[0].value <= goal_urate if urates else False
+    return UrateSeries(urates).at_goal(goal_urate)
 
 
 def labs_urates_not_at_goal(
@@ -569,8 +604,7 @@ def labs_urates_not_at_goal(
     goal_urate: GoalUrates = GoalUrates.SIX,
 ) -> bool:
     """Checks if the most recent urate in a list or QuerySet of Urates is not at goal."""
-    labs_urates_check_chronological_order_by_date(urates)
-    return urates[0].value > goal_urate if urates else False
+    return UrateSeries(urates).not_at_goal(goal_urate)
 
 
 def labs_urates_at_goal_within_last_month(
@@ -608,11 +642,9 @@ def labs_urates_at_goal_x_months(
     urates: Union["QuerySet[Urate]", list["Urate"]],
     x: int,
     goal_urate: GoalUrates = GoalUrates.SIX,
-    r: int = 0,
 ) -> bool:
-    """Recursive function that determines if a set of Urates indicate the Uric acid has been
-    "at goal" for a variable number of months or longer. Raises a ValueError if the Urates are not
-    in chronological order.
+    """Determines if a set of Urates indicate the Uric acid has been "at goal" for a variable
+    number of months or longer. Raises a ValueError if the Urates are not in chronological order.
 
     Args:
         urates (QuerySet[Urate] or list[Urate]): QuerySet or list of Urates,
@@ -620,38 +652,13 @@ def labs_urates_at_goal_x_months(
             either from the Urate.date_drawn or the Urate.flare.date_started.
         goal_urate (GoalUrates enum): goal urate for the user, defaults to 6.0 mg/dL
         x (int): number of months to check for, defaults to 6
-        r (int): recursion counter, defaults to 0
 
     Returns:
         bool: True if there is a 6 or greater month period where the current
         and all other preceding Urates were < goal_urate. Must contain Urate
         values at least 6 months apart.
     """
-    # If index + r is greater than the length of the list
-    # The recursion has run beyond the end of the list
-    # Has not found a 6 month period where > 1 Urates were < goal_urate, thus returns False
-    if r >= len(urates):
-        return False
-    # Check if urate at LabCheck[r] is under goal_urate
-    if urates[r].value <= goal_urate:
-        # Return True if urates[r] is greater than x months apart from current urate at urates[0]
-        labs_urates_compare_chronological_order_by_date(
-            current_urate=urates[r], previous_urate=urates[r - 1] if r > 0 else None, first_urate=urates[0]
-        )
-        if (urates[0].flare_date_or_date_drawn - urates[r].flare_date_or_date_drawn) >= timedelta(days=30 * x):
-            return True
-        # If Urates aren't x months apart but both are below goal_urate
-        # Recurse to the next urate further back in time urates[r+1]
-        else:
-            return labs_urates_at_goal_x_months(
-                urates=urates,
-                goal_urate=goal_urate,
-                x=x,
-                r=r + 1,
-            )
-    # If urate isn't at goal, return False
-    else:
-        return False
+    return UrateSeries(urates).at_goal_x_months(x, goal_urate)
 
 
 def labs_urate_date_drawn_newer_than_set_date(
@@ -665,14 +672,12 @@ def labs_urate_date_drawn_newer_than_set_date(
 def labs_urates_six_months_at_goal(
     urates: Union["QuerySet[Urate]", list["Urate"]],
     goal_urate: GoalUrates = GoalUrates.SIX,
-    r: int = 0,
 ) -> bool:
     """Calls the labs_urates_at_goal_x_months function with a default of 6 months."""
     return labs_urates_at_goal_x_months(
         urates=urates,
         goal_urate=goal_urate,
         x=6,
-        r=r,
     )
 
 
@@ -681,14 +686,7 @@ def labs_urate_within_x_days(
     x: int,
     sorted_by_date: bool = False,
 ) -> bool:
-    if not sorted_by_date:
-        labs_urates_check_chronological_order_by_date(urates)
-    return (
-        urates[0].flare_date_or_date_drawn
-        and urates[0].flare_date_or_date_drawn > (timezone.now() - timedelta(days=x)).date()
-        if urates
-        else False
-    )
+    return UrateSeries(urates).within_x_days(x, sorted_by_date=sorted_by_date)
 
 
 def labs_urate_within_last_month(
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, Q
+
+from ...models import Urate
+from ...services import urates_effective_date_expression, urates_set_effective_date
+
+
+class Command(BaseCommand):
+    help = "Re-sync the effective_date of Urates that don't have one, or whose effective_date doesn't match \
+their Flare's date_started or their date_drawn, in chunks. Existing Urates are set by migration labs 0004."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of Urates updated per UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+        stale_pks = list(
+            Urate.objects.alias(expected_date=urates_effective_date_expression())
+            .filter(Q(effective_date__isnull=True) | ~Q(effective_date=F("expected_date")))
+            .values_list("pk", flat=True)
+        )
+        updated = 0
+        for start in range(0, len(stale_pks), chunk_size):
+            updated += urates_set_effective_date(Urate.objects.filter(pk__in=stale_pks[start : start + chunk_size]))
+            self.stdout.write(f"{updated}/{len(stale_pks)} Urates")
+        self.stdout.write(self.style.SUCCESS(f"Set the effective_date of {updated} Urates."))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.6 on 2026-10-17 03:33
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def set_urates_effective_date(apps, schema_editor):
+    """Sets the effective_date of the existing Urates to their Flare's date_started, if they
+    have a Flare, otherwise to the date of their date_drawn, with a single UPDATE. Frozen copy
+    of labs.services.urates_set_effective_date()."""
+    Flare = apps.get_model("flares", "Flare")
+    Urate = apps.get_model("labs", "Urate")
+    Urate.objects.using(schema_editor.connection.alias).update(
+        effective_date=Coalesce(
+            Subquery(Flare.objects.filter(urate=OuterRef("pk")).values("date_started")[:1]),
+            TruncDate("date_drawn"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("flares", "0003_initial"),
+        ("labs", "0003_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalurate",
+            name="effective_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="urate",
+            name="effective_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(set_urates_effective_date, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="urate",
+            index=models.Index(fields=["user", "-effective_date", "-date_drawn"], name="labs_urate_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="urate",
+            index=models.Index(fields=["ppx", "-effective_date", "-date_drawn"], name="labs_urate_ppx_date_idx"),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING, Literal, Union
 
@@ -8,13 +9,13 @@ from django.utils.functional import cached_property  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..choices import BOOL_CHOICES
 from ..dateofbirths.helpers import age_calc
 from ..medhistorys.choices import MedHistoryTypes
 from ..medhistorys.helpers import medhistory_attr, medhistorys_get_or_none
-from ..utils.models import GoalUrateMixin, GoutHelperModel
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoalUrateMixin, GoutHelperModel
 from .choices import Abnormalitys, LowerLimits, Units, UpperLimits
 from .helpers import (
     labs_creatinine_is_at_baseline_creatinine,
@@ -84,7 +85,7 @@ class CreatinineBase(models.Model):
         return labs_stage_calculator(self.calculate_eGFR(age=age, gender=gender))
 
 
-class LabBase(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class LabBase(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     class Meta:
         abstract = True
 
@@ -109,7 +110,7 @@ class BaselineLab(LabBase):
         abstract = True
 
     medhistory = models.OneToOneField("medhistorys.MedHistory", on_delete=models.CASCADE)
-    history = HistoricalRecords(inherit=True)
+    history = GoutHelperHistoricalRecords(inherit=True)
 
 
 class Lab(LabBase):
@@ -129,7 +130,7 @@ class Lab(LabBase):
         null=True,
         blank=True,
     )
-    history = HistoricalRecords(inherit=True)
+    history = GoutHelperHistoricalRecords(inherit=True)
     objects = models.Manager()
 
     def var_x_high(
@@ -327,11 +328,19 @@ class Urate(Lab, GoalUrateMixin):
                 name="%(app_label)s_%(class)s_units_upper_lower_limits_valid",
             ),
         ]
+        indexes = [
+            # Index range scans for dated_urates(), which filters and orders each user's or Ppx's Urates by date
+            models.Index(fields=["user", "-effective_date", "-date_drawn"], name="labs_urate_user_date_idx"),
+            models.Index(fields=["ppx", "-effective_date", "-date_drawn"], name="labs_urate_ppx_date_idx"),
+        ]
 
     LowerLimits = LowerLimits
     Units = Units
     UpperLimits = UpperLimits
 
+    # The Flare.date_started of the Urate's Flare, if it has one, otherwise the date of its date_drawn,
+    # set by save() and prepare_save() and updated when the Flare's date_started or urate changes
+    effective_date = models.DateField(null=True, blank=True, editable=False)
     lower_limit = models.DecimalField(max_digits=3, decimal_places=1, default=LowerLimits.URATEMGDL)
     ppx = models.ForeignKey(
         "ppxs.Ppx",
@@ -356,6 +365,23 @@ class Urate(Lab, GoalUrateMixin):
     def at_goal(self) -> bool:
         return self.value <= self.goal_urate
 
+    def get_effective_date(self) -> date | None:
+        """Returns the date_started of the Urate's Flare, if it has one, otherwise the date of its date_drawn.
+        New Urates only have a Flare if it has already been assigned to it, so the database isn't queried."""
+        if self._meta.get_field("flare").is_cached(self) or not self._state.adding:
+            if hasattr(self, "flare"):
+                return self.flare.date_started
+        return self.date_drawn.date() if self.date_drawn else None
+
+    def prepare_save(self) -> None:
+        """Sets the effective_date, for save() and the UnitOfWork (utils/persistence.py), which saves
+        Urates in bulk without calling save()."""
+        self.effective_date = self.get_effective_date()
+
+    def save(self, *args, **kwargs):
+        self.prepare_save()
+        super().save(*args, **kwargs)
+
     @cached_property
     def flare_date_or_date_drawn(self):
         if hasattr(self, "flare"):
@@ -378,7 +404,7 @@ class Urate(Lab, GoalUrateMixin):
         return f"{self.value.quantize(Decimal('1.0'))} {self.get_units_display()}"
 
 
-class Hlab5801(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Hlab5801(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -400,7 +426,7 @@ class Hlab5801(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=Rul
         blank=True,
     )
 
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
     objects = models.Manager()
 
     def __str__(self):
@@ -2,31 +2,49 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from django.apps import apps  # type: ignore
-from django.db.models import DateField, Prefetch  # type: ignore
-from django.db.models.functions import Coalesce  # type: ignore
+from django.db.models import (  # type: ignore
+    BooleanField,
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+    When,
+    Window,
+)
+from django.db.models.functions import Coalesce, ExtractDay, FirstValue  # type: ignore
 from django.utils import timezone  # type: ignore
 
+from ..goalurates.choices import GoalUrates
+
 if TYPE_CHECKING:
     from django.db.models import QuerySet  # type: ignore
 
+# Days without a Urate after which a patient's urate is overdue, as in Ppx.recent_urate
+URATE_OVERDUE_DAYS = 90
+
 
 def dated_urates(queryset: "QuerySet") -> "QuerySet":
-    """Method that annotates Urate.date_drawn with Flare.date_started
-    if Urate.date_drawn is null. This is because Flare objects don't
-    require reporting a date_drawn for the Urate, but Urate's entered
-    elsewhere do. Orders QuerySet by date."""
+    """Method that annotates Urates with their effective_date, which is the Flare's
+    date_started if the Urate has a Flare, otherwise the date of the Urate.date_drawn.
+    This is because Flare objects don't require reporting a date_drawn for the Urate,
+    but Urate's entered elsewhere do. Filters and orders the QuerySet by the stored
+    effective_date, which is indexed by user and by ppx."""
     # select_related Flare objects
     queryset = queryset.select_related("flare")
-    # Check if the Urate has a date_drawn and annotate the date_drawn with the Flare's date_started if not
-    queryset = queryset.annotate(
-        date=Coalesce("flare__date_started", "date_drawn", output_field=DateField()),
-    )
+    queryset = queryset.annotate(date=F("effective_date"))
     # Filter out values greater than 2 years old
     queryset = queryset.filter(
-        date__gte=timezone.now() - timezone.timedelta(days=730),
+        effective_date__gte=(timezone.now() - timezone.timedelta(days=730)).date(),
     )
-    # Order by date
-    queryset = queryset.order_by("-date")
+    # Order by date, then by date_drawn for Urates on the same date
+    queryset = queryset.order_by("-effective_date", "-date_drawn")
     return queryset
 
 
@@ -69,3 +87,68 @@ def hyperuricemia_urates_prefetch(dated: bool = True) -> Prefetch:
 def dated_urates_relation(qs: "QuerySet") -> "QuerySet":
     """Adds prefetch for dated urates."""
     return qs.prefetch_related(urates_prefetch(dated=True))
+
+
+def urates_goal_window_qs() -> "QuerySet":
+    """QuerySet for dated Urate objects annotated with their user's goal_urate and, by window
+    functions over each user's Urates, the value and date of the user's most recent Urate,
+    the date of their most recent Urate above goal, and the number of Urates above goal on or
+    after each Urate's date. Urates with an above_goal_after of 0 are the run of Urates at goal
+    that ends with the most recent Urate."""
+    user_urates = {"partition_by": [F("user")]}
+    return (
+        urates_dated_qs()
+        .annotate(
+            goal_urate=Coalesce("user__goalurate__goal_urate", Value(GoalUrates.SIX)),
+        )
+        .annotate(
+            last_value=Window(FirstValue("value"), order_by=[F("date").desc(), F("date_drawn").desc()], **user_urates),
+            last_date=Window(Max("date"), **user_urates),
+            last_date_above_goal=Window(Max(Case(When(value__gt=F("goal_urate"), then=F("date")))), **user_urates),
+            above_goal_after=Window(
+                Count(Case(When(value__gt=F("goal_urate"), then=Value(1)))), order_by=F("date").desc(), **user_urates
+            ),
+        )
+    )
+
+
+def urates_goal_status_annotations(qs: "QuerySet", overdue_days: int = URATE_OVERDUE_DAYS) -> "QuerySet":
+    """Annotates a User QuerySet with the status of each user's dated Urates, computed in the
+    database so the QuerySet can be filtered or ordered by it:
+    - urate_goal: the user's GoalUrate.goal_urate, or GoalUrates.SIX if they don't have one
+    - urate_last_value / urate_last_date: the most recent Urate
+    - urate_at_goal: the most recent Urate is at or below goal (UrateSeries.at_goal)
+    - urate_months_at_goal: whole months (of 30 days) over which every Urate, ending with the most
+      recent, was at or below goal (UrateSeries.at_goal_x_months(x) for x <= urate_months_at_goal)
+    - urate_at_goal_long_term: urate_months_at_goal is 6 or more (GoutHelperBaseModel.urates_at_goal_long_term)
+    - urate_overdue: no Urate within the last overdue_days (UrateSeries.within_x_days)
+    Urates drawn on the same day as a Urate above goal are not counted as at goal."""
+    urates = urates_goal_window_qs().filter(user=OuterRef("pk"))
+    at_goal_since = urates.filter(above_goal_after=0).order_by("date").values("date")[:1]
+    qs = qs.annotate(
+        urate_goal=Coalesce("goalurate__goal_urate", Value(GoalUrates.SIX)),
+        urate_last_value=Subquery(urates.values("last_value")[:1]),
+        urate_last_date=Subquery(urates.values("last_date")[:1]),
+        urate_at_goal_since=Subquery(at_goal_since),
+    )
+    return qs.annotate(
+        urate_at_goal=Case(
+            When(urate_last_value__lte=F("urate_goal"), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+        urate_months_at_goal=Coalesce(
+            ExtractDay(F("urate_last_date") - F("urate_at_goal_since")) / Value(30),
+            Value(0),
+            output_field=IntegerField(),
+        ),
+    ).annotate(
+        urate_at_goal_long_term=ExpressionWrapper(Q(urate_months_at_goal__gte=6), output_field=BooleanField()),
+        urate_overdue=Case(
+            When(
+                urate_last_date__gt=(timezone.now() - timezone.timedelta(days=overdue_days)).date(), then=Value(False)
+            ),
+            default=Value(True),
+            output_field=BooleanField(),
+        ),
+    )
@@ -0,0 +1,142 @@
+from array import array
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Union
+
+from django.utils import timezone  # type: ignore
+
+from ..goalurates.choices import GoalUrates
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet  # type: ignore
+
+    from .models import Urate
+
+# Lowest uric acid value that hyperuricemia_urates_prefetch() considers hyperuricemic
+HYPERURICEMIA_URATE = Decimal("9.0")
+
+
+class UrateSeries:
+    """Dates and values of a list or QuerySet of Urates, ordered by date (most recent first),
+    in compact arrays, built in a single pass over the Urates so that at-goal, long-term at-goal,
+    recency, and hyperuricemia checks don't each re-walk (and re-check the order of) the Urates.
+
+    Each Urate's date is its dated_urates() date annotation or its stored effective_date. The order
+    and dates of the Urates are checked when the series is built, but, like the labs_urates_*
+    helpers, a ValueError is only raised by the methods that rely on them."""
+
+    # Ordinal stored for Urates without a date, which is older than any real date
+    UNDATED = 0
+
+    def __init__(self, urates: Union["QuerySet[Urate]", list["Urate"], Iterable["Urate"]]):
+        # The list or QuerySet the series was built from
+        self.urates_source = urates
+        self.urates: list["Urate"] = list(urates)
+        # Dates as ordinals and values as floats, which compare the same way the Decimals do
+        self.dates = array("l")
+        self.values = array("d")
+        # Index of the first Urate that is newer than the first or the previous Urate, if any
+        self.unordered_at: int | None = None
+        # Index of the first Urate without a date, if any, whose date is stored as UNDATED
+        self.undated_at: int | None = None
+        self.max_value: float | None = None
+        for urate_i, urate in enumerate(self.urates):
+            urate_date = self.get_urate_date(urate)
+            ordinal = urate_date.toordinal() if urate_date else self.UNDATED
+            value = float(urate.value)
+            if urate_date is None:
+                if self.undated_at is None:
+                    self.undated_at = urate_i
+            elif self.unordered_at is None and urate_i > 0 and (ordinal > self.dates[0] or ordinal > self.dates[-1]):
+                self.unordered_at = urate_i
+            self.dates.append(ordinal)
+            self.values.append(value)
+            if self.max_value is None or value > self.max_value:
+                self.max_value = value
+
+    @staticmethod
+    def get_urate_date(urate: "Urate") -> date | None:
+        """Returns the Urate's date annotation, if it has one, otherwise its effective_date. Urates that haven't
+        been saved yet, and so have no effective_date, get theirs without querying the database."""
+        urate_date = getattr(urate, "date", None) or urate.effective_date
+        if urate_date is None and urate._state.adding:
+            urate_date = urate.get_effective_date()
+        return urate_date
+
+    def __len__(self) -> int:
+        return len(self.urates)
+
+    @classmethod
+    def group_by(
+        cls,
+        urates: Union["QuerySet[Urate]", Iterable["Urate"]],
+        key: Callable[["Urate"], Hashable] = attrgetter("user_id"),
+    ) -> dict[Hashable, "UrateSeries"]:
+        """Builds a UrateSeries for each of many patients from a single list or QuerySet of their
+        Urates, i.e. urates_dated_qs().filter(user__in=...), grouped by key, which defaults to the
+        Urate's user_id. The Urates should be ordered by date, most recent first."""
+        grouped: dict[Hashable, list["Urate"]] = defaultdict(list)
+        for urate in urates:
+            grouped[key(urate)].append(urate)
+        return {group: cls(group_urates) for group, group_urates in grouped.items()}
+
+    def check_dated(self, until: int | None = None) -> None:
+        """Raises a ValueError if any of the Urates, or of the Urates up to and including the until index,
+        has no date."""
+        if self.undated_at is not None and (until is None or self.undated_at <= until):
+            raise ValueError(f"Urate ({self.urates[self.undated_at]}) has no date_drawn or associated flare.")
+
+    def check_chronological_order(self, until: int | None = None) -> None:
+        """Raises a ValueError if the Urates, or the Urates up to and including the until index,
+        don't all have dates or aren't in chronological order."""
+        self.check_dated(until)
+        if self.unordered_at is not None and (until is None or self.unordered_at <= until):
+            raise ValueError("The Urates are not in chronological order. QuerySet must be ordered by date.")
+
+    def at_goal(self, goal_urate: GoalUrates = GoalUrates.SIX) -> bool:
+        """Returns True if the most recent Urate is at or below the goal_urate."""
+        self.check_chronological_order()
+        return self.values[0] <= float(goal_urate) if self.values else False
+
+    def not_at_goal(self, goal_urate: GoalUrates = GoalUrates.SIX) -> bool:
+        """Returns True if the most recent Urate is above the goal_urate."""
+        self.check_chronological_order()
+        return self.values[0] > float(goal_urate) if self.values else False
+
+    def at_goal_x_months(self, x: int, goal_urate: GoalUrates = GoalUrates.SIX) -> bool:
+        """Returns True if there is a period of x months or longer, ending with the most recent Urate,
+        over which every Urate was at or below the goal_urate. Requires Urates at least x months apart."""
+        goal, days = float(goal_urate), 30 * x
+        for urate_i, value in enumerate(self.values):
+            if value > goal:
+                return False
+            self.check_chronological_order(until=urate_i)
+            if self.dates[0] - self.dates[urate_i] >= days:
+                return True
+        return False
+
+    def within_x_days(self, x: int, sorted_by_date: bool = False) -> bool:
+        """Returns True if the most recent Urate was drawn within the last x days. If sorted_by_date,
+        the order of the Urates isn't checked."""
+        if not sorted_by_date:
+            self.check_chronological_order()
+        elif self.dates:
+            self.check_dated(until=0)
+        return self.dates[0] > (timezone.now() - timedelta(days=x)).date().toordinal() if self.dates else False
+
+    def hyperuricemic(self, hyperuricemia_urate: Decimal = HYPERURICEMIA_URATE) -> bool:
+        """Returns True if any of the Urates is at or above the hyperuricemia_urate."""
+        return self.max_value is not None and self.max_value >= float(hyperuricemia_urate)
+
+    def summary(self, goal_urate: GoalUrates = GoalUrates.SIX) -> dict[str, Any]:
+        """Returns the at-goal, long-term at-goal, recency, and hyperuricemia checks that the
+        decision aids use, i.e. for each series in a batch from group_by()."""
+        return {
+            "at_goal": self.at_goal(goal_urate),
+            "at_goal_long_term": self.at_goal_x_months(6, goal_urate),
+            "within_last_month": self.within_x_days(30),
+            "within_90_days": self.within_x_days(90),
+            "hyperuricemic": self.hyperuricemic(),
+        }
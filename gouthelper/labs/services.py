@@ -1,10 +1,31 @@
 from typing import TYPE_CHECKING, Union
 
+from django.apps import apps  # type: ignore
+from django.db.models import OuterRef, Subquery  # type: ignore
+from django.db.models.functions import Coalesce, TruncDate  # type: ignore
+
+from ..akis.choices import Statuses
 from ..labs.helpers import labs_check_chronological_order_by_date_drawn
-from .choices import Statuses
 
 if TYPE_CHECKING:
-    from ..labs.models import BaselineCreatinine, Creatinine
+    from django.db.models import Func, QuerySet  # type: ignore
+
+    from ..labs.models import BaselineCreatinine, Creatinine, Urate
+
+
+def urates_effective_date_expression() -> "Func":
+    """Expression for what a Urate's effective_date should be: its Flare's date_started,
+    if it has a Flare, otherwise the date of its date_drawn."""
+    return Coalesce(
+        Subquery(apps.get_model("flares.Flare").objects.filter(urate=OuterRef("pk")).values("date_started")[:1]),
+        TruncDate("date_drawn"),
+    )
+
+
+def urates_set_effective_date(queryset: "QuerySet[Urate]") -> int:
+    """Updates the effective_date of the Urates in the queryset with a single UPDATE and
+    returns the number of Urates updated."""
+    return queryset.update(effective_date=urates_effective_date_expression())
 
 
 class CreatinineProcessor:
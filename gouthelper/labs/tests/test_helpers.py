@@ -1,3 +1,4 @@
+import random
 from datetime import timedelta
 from decimal import Decimal
 
@@ -14,8 +15,10 @@ from ...medhistorydetails.choices import Stages
 from ...medhistorydetails.tests.factories import GoutDetailFactory
 from ...medhistorys.tests.factories import GoutFactory
 from ..helpers import (
+    labs_baselinecreatinine_calculator,
     labs_baselinecreatinine_max_value,
     labs_calculate_baseline_creatinine_from_eGFR_age_gender,
+    labs_ckd_epi_batch,
     labs_creatinine_calculate_min_max_creatinine_from_stage_age_gender,
     labs_creatinine_within_range_for_stage,
     labs_creatinines_are_drawn_more_than_1_day_apart,
@@ -40,6 +43,28 @@ from .factories import UrateFactory
 pytestmark = pytest.mark.django_db
 
 
+def decimal_eGFR_calculator(value: Decimal, age: int, gender: Genders) -> Decimal:
+    """The Decimal implementation of the CKD-EPI equation that labs_eGFR_calculator replaced,
+    which the closed-form implementation is checked against."""
+    if gender == Genders.MALE:
+        sex_modifier, alpha, kappa = Decimal(1.000), Decimal(-0.302), Decimal(0.9)
+    else:
+        sex_modifier, alpha, kappa = Decimal(1.012), Decimal(-0.241), Decimal(0.7)
+    eGFR = (
+        Decimal(142)
+        * min(value / kappa, Decimal(1.00)) ** alpha
+        * max(value / kappa, Decimal(1.00)) ** Decimal(-1.200)
+        * Decimal("0.9938") ** age
+        * sex_modifier
+    )
+    return labs_round_decimal(eGFR, 0)
+
+
+def random_creatinine_age_gender(rng: random.Random) -> tuple[Decimal, int, Genders]:
+    """Returns a random creatinine, at the 2 decimal places creatinines are stored with, age and gender."""
+    return Decimal(rng.randint(1, 999)) / 100, rng.randint(18, 100), rng.choice(Genders.values)
+
+
 class TestLabsBaselineCreatinineMaxValue(TestCase):
     def test__raises_ValidationError(self):
         with self.assertRaises(ValidationError) as error:
@@ -206,6 +231,59 @@ class TestLabsCalculateBaselineCreatinineFromEGFRStageAgeGender(TestCase):
         self.assertEqual(eGFR_calc, eGFR)
 
 
+class TestLabsCKDEPIAgreesWithDecimal(TestCase):
+    """Checks the closed-form CKD-EPI calculations against the Decimal implementation for a
+    seeded random sample of creatinines, ages and genders, and every eGFR a stage can have."""
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.samples = [random_creatinine_age_gender(self.rng) for _ in range(2000)] + [
+            (value, age, gender)
+            for value in [Decimal("0.01"), Decimal("0.70"), Decimal("0.90"), Decimal("9.99")]
+            for age in [18, 100]
+            for gender in Genders.values
+        ]
+
+    def test__eGFR_calculator(self):
+        for value, age, gender in self.samples:
+            self.assertEqual(
+                labs_eGFR_calculator(value, age, gender), decimal_eGFR_calculator(value, age, gender), (value, age)
+            )
+
+    def test__baseline_creatinine_from_eGFR_round_trips(self):
+        for eGFR in range(1, 121):
+            age, gender = self.rng.randint(18, 100), self.rng.choice(Genders.values)
+            creatinine = labs_calculate_baseline_creatinine_from_eGFR_age_gender(eGFR, age, gender)
+            if creatinine < Decimal("9.99"):
+                self.assertEqual(decimal_eGFR_calculator(creatinine, age, gender), eGFR, (eGFR, age, gender))
+            else:
+                self.assertGreaterEqual(decimal_eGFR_calculator(creatinine, age, gender), eGFR)
+
+    def test__baselinecreatinine_calculator(self):
+        for stage in [stage for stage in Stages.values if stage is not None]:
+            for _ in range(20):
+                age, gender = self.rng.randint(18, 100), self.rng.choice(Genders.values)
+                creatinine = labs_baselinecreatinine_calculator(stage, age, gender)
+                self.assertEqual(creatinine, labs_round_decimal(creatinine, 2))
+                self.assertEqual(
+                    labs_stage_calculator(decimal_eGFR_calculator(creatinine, age, gender)), stage, (age, gender)
+                )
+
+    def test__batch(self):
+        values, ages, genders = zip(*self.samples[:200])
+        for result, value, age, gender in zip(labs_ckd_epi_batch(values, ages, genders), values, ages, genders):
+            self.assertEqual(result.eGFR, decimal_eGFR_calculator(value, age, gender))
+            self.assertEqual(result.stage, labs_stage_calculator(result.eGFR))
+            self.assertEqual(
+                (result.min_creatinine, result.max_creatinine),
+                labs_creatinine_calculate_min_max_creatinine_from_stage_age_gender(result.stage, age, gender),
+            )
+
+    def test__batch_raises_ValueError_for_unequal_lengths(self):
+        with self.assertRaises(ValueError):
+            labs_ckd_epi_batch([Decimal("1.0")], [50, 60], [Genders.MALE])
+
+
 class TestLabsCreatinineCalculateMinMaxCreatinineFromStageAgeGender(TestCase):
     def test__returns_correct_value(self):
         age = 50
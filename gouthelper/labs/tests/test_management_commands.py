@@ -0,0 +1,48 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.core.management import CommandError, call_command  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+from django.utils import timezone  # pylint: disable=E0401 # type: ignore
+
+from ...flares.tests.factories import create_flare
+from ..models import Urate
+from .factories import UrateFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBackfillUrateEffectiveDates(TestCase):
+    def setUp(self):
+        self.urate = UrateFactory(value=Decimal("5.0"), date_drawn=timezone.now() - timedelta(days=20))
+        self.flare = create_flare(
+            date_started=(timezone.now() - timedelta(days=150)).date(), urate=UrateFactory(value=Decimal("8.0"))
+        )
+        self.current = UrateFactory(value=Decimal("6.0"), date_drawn=timezone.now() - timedelta(days=5))
+        Urate.objects.filter(pk__in=[self.urate.pk, self.flare.urate.pk]).update(effective_date=None)
+
+    def test__command_output(self):
+        out = StringIO()
+        call_command("backfill_urate_effective_dates", "--chunk-size", "1", stdout=out)
+        self.assertIn("1/2 Urates", out.getvalue())
+        self.assertIn("Set the effective_date of 2 Urates.", out.getvalue())
+        self.assertEqual(
+            Urate.objects.get(pk=self.urate.pk).effective_date, (timezone.now() - timedelta(days=20)).date()
+        )
+        self.assertEqual(Urate.objects.get(pk=self.flare.urate.pk).effective_date, self.flare.date_started)
+
+    def test__fixes_out_of_sync_effective_date(self):
+        call_command("backfill_urate_effective_dates", stdout=StringIO())
+        Urate.objects.filter(pk=self.current.pk).update(effective_date=timezone.now().date() - timedelta(days=400))
+        out = StringIO()
+        call_command("backfill_urate_effective_dates", stdout=out)
+        self.assertIn("Set the effective_date of 1 Urates.", out.getvalue())
+        self.assertEqual(
+            Urate.objects.get(pk=self.current.pk).effective_date, (timezone.now() - timedelta(days=5)).date()
+        )
+
+    def test__invalid_chunk_size(self):
+        with self.assertRaises(CommandError):
+            call_command("backfill_urate_effective_dates", "--chunk-size", "0")
@@ -2,11 +2,14 @@ from datetime import timedelta
 from decimal import Decimal
 
 import pytest  # type: ignore
+from django.db import connection  # type: ignore
 from django.db.utils import IntegrityError  # type: ignore
-from django.test import TestCase  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
 from django.utils import timezone  # type: ignore
 
 from ...akis.tests.factories import AkiFactory
+from ...flares.models import Flare
 from ...flares.tests.factories import create_flare
 from ...genders.choices import Genders
 from ...goalurates.choices import GoalUrates
@@ -15,6 +18,7 @@ from ...medhistorydetails.tests.factories import CkdDetailFactory
 from ...medhistorys.choices import MedHistoryTypes
 from ...medhistorys.tests.factories import CkdFactory
 from ...users.tests.factories import create_psp
+from ...utils.persistence import UnitOfWork
 from ..choices import Abnormalitys, Units
 from ..models import Urate
 from .factories import BaselineCreatinineFactory, CreatinineFactory, Hlab5801Factory, UrateFactory
@@ -97,6 +101,17 @@ class TestLab(TestCase):
 
     def test__save_creates_lab_history(self):
         self.assertEqual(Urate.history.count(), 1)
+        self.urate.value = Decimal("9")
+        self.urate.save()
+        self.assertEqual(Urate.history.count(), 2)
+
+    def test__save_unchanged_does_not_create_lab_history(self):
+        self.urate.save()
+        self.urate_lab.save()
+        self.assertEqual(Urate.history.count(), 1)
+
+    @override_settings(HISTORY_DIFF_ONLY=False)
+    def test__save_unchanged_creates_lab_history_without_diff_only(self):
         self.urate.save()
         self.assertEqual(Urate.history.count(), 2)
 
@@ -169,6 +184,70 @@ class TestUrate(TestCase):
         )
 
 
+class TestUrateEffectiveDate(TestCase):
+    def setUp(self):
+        self.urate = UrateFactory(value=Decimal("5.0"), date_drawn=timezone.now() - timedelta(days=20))
+
+    def get_effective_date(self, urate: Urate):
+        return Urate.objects.values_list("effective_date", flat=True).get(pk=urate.pk)
+
+    def test__set_on_save(self):
+        self.assertEqual(self.get_effective_date(self.urate), (timezone.now() - timedelta(days=20)).date())
+        self.urate.date_drawn = timezone.now() - timedelta(days=40)
+        self.urate.save()
+        self.assertEqual(self.get_effective_date(self.urate), (timezone.now() - timedelta(days=40)).date())
+
+    def test__updated_with_flare(self):
+        flare = create_flare(date_started=(timezone.now() - timedelta(days=150)).date(), urate=self.urate)
+        self.assertEqual(self.get_effective_date(self.urate), flare.date_started)
+        flare.date_started = (timezone.now() - timedelta(days=120)).date()
+        flare.date_ended = flare.date_started + timedelta(days=7)
+        flare.save()
+        self.assertEqual(self.get_effective_date(self.urate), flare.date_started)
+        self.assertEqual(flare.urate.effective_date, flare.date_started)
+        # Saving the Urate keeps the Flare's date_started
+        urate = Urate.objects.get(pk=self.urate.pk)
+        urate.save()
+        self.assertEqual(self.get_effective_date(urate), flare.date_started)
+
+    def test__flare_save_only_updates_urate_when_needed(self):
+        flare = create_flare(date_started=(timezone.now() - timedelta(days=150)).date(), urate=self.urate)
+        flare = Flare.objects.get(pk=flare.pk)
+        flare.crystal_analysis = not flare.crystal_analysis
+        with CaptureQueriesContext(connection) as context:
+            flare.save()
+        # Neither the Urate nor date_started changed, so the Flare isn't re-read and the Urate isn't updated
+        self.assertFalse([query for query in context.captured_queries if 'FROM "flares_flare"' in query["sql"]])
+        self.assertFalse([query for query in context.captured_queries if 'UPDATE "labs_urate"' in query["sql"]])
+        flare.date_started = (timezone.now() - timedelta(days=120)).date()
+        flare.date_ended = flare.date_started + timedelta(days=7)
+        flare.save()
+        self.assertEqual(self.get_effective_date(self.urate), flare.date_started)
+
+    def test__reverts_to_date_drawn_when_flare_urate_changes(self):
+        flare = create_flare(date_started=(timezone.now() - timedelta(days=150)).date(), urate=self.urate)
+        new_urate = UrateFactory(value=Decimal("7.0"))
+        flare.urate = new_urate
+        flare.save()
+        self.assertEqual(self.get_effective_date(self.urate), (timezone.now() - timedelta(days=20)).date())
+        self.assertEqual(self.get_effective_date(new_urate), flare.date_started)
+
+    def test__reverts_to_date_drawn_when_flare_deleted(self):
+        flare = create_flare(date_started=(timezone.now() - timedelta(days=150)).date(), urate=self.urate)
+        flare.delete()
+        self.assertEqual(self.get_effective_date(self.urate), (timezone.now() - timedelta(days=20)).date())
+
+    def test__unit_of_work(self):
+        flare = create_flare(date_started=(timezone.now() - timedelta(days=150)).date(), urate=self.urate)
+        urate = Urate.objects.select_related("flare").get(pk=self.urate.pk)
+        new_urate = Urate(value=Decimal("6.0"), date_drawn=timezone.now() - timedelta(days=5))
+        with UnitOfWork() as uow:
+            uow.save(urate)
+            uow.save(new_urate)
+        self.assertEqual(self.get_effective_date(urate), flare.date_started)
+        self.assertEqual(self.get_effective_date(new_urate), (timezone.now() - timedelta(days=5)).date())
+
+
 class TestHlab5801(TestCase):
     def setUp(self):
         self.hlab5801 = Hlab5801Factory()
@@ -1,3 +1,4 @@
+import random
 from datetime import timedelta
 from decimal import Decimal
 
@@ -6,8 +7,13 @@ from django.test import TestCase  # type: ignore
 from django.utils import timezone  # type: ignore
 
 from ...flares.tests.factories import create_flare
+from ...goalurates.choices import GoalUrates
+from ...goalurates.tests.factories import create_goalurate
+from ...users.models import Pseudopatient
+from ...users.tests.factories import create_psp
 from ..models import Urate
 from ..selectors import dated_urates, urates_dated_qs
+from ..series import UrateSeries
 from .factories import UrateFactory
 
 pytestmark = pytest.mark.django_db
@@ -42,11 +48,11 @@ class TestUrateUserlessQuerySet(TestCase):
             self.assertTrue(hasattr(urate, "date"))
             self.assertTrue(urate.date)
         # assert that the date is the date_drawn if it exists, otherwise is the Flare.date_started
-        self.assertEqual(qs[0].date, self.urate1.date_drawn)
-        self.assertEqual(qs[1].date, self.urate2.date_drawn)
-        self.assertEqual(qs[2].date.date(), self.urate5.flare.date_started)
-        self.assertEqual(qs[3].date, self.urate3.date_drawn)
-        self.assertEqual(qs[4].date, self.urate4.date_drawn)
+        self.assertEqual(qs[0].date, self.urate1.date_drawn.date())
+        self.assertEqual(qs[1].date, self.urate2.date_drawn.date())
+        self.assertEqual(qs[2].date, self.urate5.flare.date_started)
+        self.assertEqual(qs[3].date, self.urate3.date_drawn.date())
+        self.assertEqual(qs[4].date, self.urate4.date_drawn.date())
 
 
 class TestDatedUrates(TestCase):
@@ -60,7 +66,7 @@ class TestDatedUrates(TestCase):
         qs = dated_urates(qs)
         for urate in qs:
             self.assertTrue(hasattr(urate, "date"))
-            self.assertEqual(urate.date, urate.date_drawn)
+            self.assertEqual(urate.date, urate.date_drawn.date())
 
     def test__no_date_drawns(self):
         # Create a few urates without date_drawns
@@ -76,7 +82,7 @@ class TestDatedUrates(TestCase):
         qs = dated_urates(qs)
         for urate in qs:
             self.assertTrue(hasattr(urate, "date"))
-            self.assertEqual(urate.date.date(), urate.flare.date_started)
+            self.assertEqual(urate.date, urate.flare.date_started)
 
     def test__date_drawns_and_flares(self):
         # Create a few urates without date_drawns
@@ -94,7 +100,7 @@ class TestDatedUrates(TestCase):
         for urate in qs:
             self.assertTrue(hasattr(urate, "date"))
             if urate.flare:
-                self.assertEqual(urate.date.date(), urate.flare.date_started)
+                self.assertEqual(urate.date, urate.flare.date_started)
             else:
                 self.assertEqual(urate.date.date(), urate.date_drawn)
 
@@ -109,3 +115,96 @@ class TestDatedUrates(TestCase):
         qs = dated_urates(qs)
         self.assertEqual(qs.count(), 3)
         self.assertNotIn(old_urate, qs)
+
+
+class TestUratesGoalStatusAnnotations(TestCase):
+    def setUp(self):
+        self.psp = create_psp()
+        for value, days_ago in [("5.0", 10), ("5.5", 100), ("6.0", 200), ("7.0", 250), ("5.0", 400)]:
+            UrateFactory(user=self.psp, value=Decimal(value), date_drawn=timezone.now() - timedelta(days=days_ago))
+
+    def get_annotated(self, psp: Pseudopatient) -> Pseudopatient:
+        return Pseudopatient.objects.urates_goal_status_qs().get(pk=psp.pk)
+
+    def assertMatchesPython(self, psp: Pseudopatient) -> None:
+        annotated = self.get_annotated(psp)
+        psp = Pseudopatient.objects.urates_dated_qs().get(pk=psp.pk)
+        series = UrateSeries(psp.dated_urates)
+        self.assertEqual(annotated.urate_goal, psp.goal_urate)
+        self.assertEqual(annotated.urate_last_value, series.urates[0].value if series.urates else None)
+        self.assertEqual(
+            annotated.urate_last_date, series.urates[0].flare_date_or_date_drawn if series.urates else None
+        )
+        self.assertEqual(annotated.urate_at_goal, psp.urates_at_goal)
+        self.assertEqual(annotated.urate_at_goal_long_term, psp.urates_at_goal_long_term)
+        self.assertEqual(annotated.urate_overdue, not psp.urate_within_90_days)
+        for months in range(1, 25):
+            self.assertEqual(annotated.urate_months_at_goal >= months, series.at_goal_x_months(months, psp.goal_urate))
+
+    def test__annotations(self):
+        annotated = self.get_annotated(self.psp)
+        self.assertEqual(annotated.urate_goal, GoalUrates.SIX)
+        self.assertEqual(annotated.urate_last_value, Decimal("5.0"))
+        self.assertEqual(annotated.urate_last_date, (timezone.now() - timedelta(days=10)).date())
+        self.assertTrue(annotated.urate_at_goal)
+        self.assertEqual(annotated.urate_months_at_goal, 6)
+        self.assertTrue(annotated.urate_at_goal_long_term)
+        self.assertFalse(annotated.urate_overdue)
+        self.assertMatchesPython(self.psp)
+
+    def test__goal_urate(self):
+        create_goalurate(user=self.psp, goal_urate=GoalUrates.FIVE)
+        annotated = self.get_annotated(self.psp)
+        self.assertEqual(annotated.urate_goal, GoalUrates.FIVE)
+        self.assertEqual(annotated.urate_months_at_goal, 0)
+        self.assertFalse(annotated.urate_at_goal_long_term)
+        self.assertMatchesPython(self.psp)
+
+    def test__no_urates(self):
+        psp = create_psp()
+        annotated = self.get_annotated(psp)
+        self.assertIsNone(annotated.urate_last_value)
+        self.assertIsNone(annotated.urate_last_date)
+        self.assertFalse(annotated.urate_at_goal)
+        self.assertEqual(annotated.urate_months_at_goal, 0)
+        self.assertTrue(annotated.urate_overdue)
+        self.assertMatchesPython(psp)
+
+    def test__flare_date_started_and_not_at_goal(self):
+        psp = create_psp()
+        create_flare(
+            user=psp,
+            date_started=(timezone.now() - timedelta(days=120)).date(),
+            urate=UrateFactory(user=psp, value=Decimal("8.0")),
+        )
+        UrateFactory(user=psp, value=Decimal("4.0"), date_drawn=timezone.now() - timedelta(days=300))
+        annotated = self.get_annotated(psp)
+        self.assertEqual(annotated.urate_last_date, (timezone.now() - timedelta(days=120)).date())
+        self.assertFalse(annotated.urate_at_goal)
+        self.assertTrue(annotated.urate_overdue)
+        self.assertMatchesPython(psp)
+
+    def test__filter_and_order_by_annotations(self):
+        psp_2 = create_psp()
+        UrateFactory(user=psp_2, value=Decimal("9.0"), date_drawn=timezone.now() - timedelta(days=5))
+        qs = Pseudopatient.objects.urates_goal_status_qs()
+        self.assertEqual(list(qs.filter(urate_at_goal=True)), [self.psp])
+        self.assertEqual(
+            list(qs.filter(pk__in=[self.psp.pk, psp_2.pk]).order_by("-urate_last_value")), [psp_2, self.psp]
+        )
+
+    def test__matches_python_for_random_urates(self):
+        psps = [create_psp() for _ in range(10)]
+        for psp in psps:
+            if random.getrandbits(1):
+                create_goalurate(user=psp, goal_urate=random.choice(GoalUrates.values))
+            for days_ago in random.sample(range(800), random.randint(0, 8)):
+                UrateFactory(
+                    user=psp,
+                    value=Decimal(random.randint(30, 90)) / 10,
+                    date_drawn=timezone.now() - timedelta(days=days_ago),
+                )
+        with self.assertNumQueries(1):
+            list(Pseudopatient.objects.urates_goal_status_qs().filter(pk__in=[psp.pk for psp in psps]))
+        for psp in psps:
+            self.assertMatchesPython(psp)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+from django.test import TestCase  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from ...goalurates.choices import GoalUrates
+from ...users.tests.factories import create_psp
+from ..models import Urate
+from ..selectors import urates_dated_qs
+from ..series import UrateSeries
+from .factories import UrateFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def urate(value: str, days_ago: int) -> SimpleNamespace:
+    """Returns an object with the Urate attributes a UrateSeries uses."""
+    return SimpleNamespace(value=Decimal(value), date=(timezone.now() - timedelta(days=days_ago)).date())
+
+
+class TestUrateSeries(TestCase):
+    def test__from_dated_urates(self):
+        UrateFactory(value=Decimal("5.0"), date_drawn=timezone.now() - timedelta(days=10))
+        UrateFactory(value=Decimal("6.0"), date_drawn=timezone.now() - timedelta(days=100))
+        UrateFactory(value=Decimal("9.0"), date_drawn=timezone.now() - timedelta(days=200))
+        series = UrateSeries(urates_dated_qs().all())
+        self.assertEqual(len(series), 3)
+        self.assertTrue(series.at_goal())
+        self.assertFalse(series.at_goal(GoalUrates.FIVE - Decimal("0.1")))
+        self.assertFalse(series.not_at_goal())
+        self.assertTrue(series.within_x_days(30))
+        self.assertFalse(series.within_x_days(10))
+        self.assertTrue(series.hyperuricemic())
+        self.assertFalse(series.at_goal_x_months(6))
+        self.assertTrue(series.at_goal_x_months(3))
+
+    def test__empty(self):
+        series = UrateSeries([])
+        self.assertFalse(series.at_goal())
+        self.assertFalse(series.not_at_goal())
+        self.assertFalse(series.at_goal_x_months(6))
+        self.assertFalse(series.within_x_days(90))
+        self.assertFalse(series.hyperuricemic())
+
+    def test__goal_urate_equal_to_value_is_at_goal(self):
+        series = UrateSeries([urate("6.0", 0), urate("5.0", 200)])
+        self.assertTrue(series.at_goal(GoalUrates.SIX))
+        self.assertFalse(series.at_goal(GoalUrates.FIVE))
+        self.assertTrue(series.at_goal_x_months(6, GoalUrates.SIX))
+
+    def test__at_goal_x_months_stops_at_urate_above_goal(self):
+        series = UrateSeries([urate("5.0", 0), urate("5.0", 100), urate("7.0", 150), urate("5.0", 300)])
+        self.assertTrue(series.at_goal_x_months(3))
+        self.assertFalse(series.at_goal_x_months(6))
+
+    def test__at_goal_x_months_has_no_recursion_limit(self):
+        series = UrateSeries([urate("5.0", days_ago // 10) for days_ago in range(5000)])
+        self.assertTrue(series.at_goal_x_months(12))
+
+    def test__out_of_order_raises_ValueError(self):
+        series = UrateSeries([urate("5.0", 50), urate("5.0", 10), urate("5.0", 300)])
+        with self.assertRaises(ValueError):
+            series.at_goal()
+        with self.assertRaises(ValueError):
+            series.within_x_days(90)
+        with self.assertRaises(ValueError):
+            series.at_goal_x_months(6)
+        self.assertTrue(series.within_x_days(90, sorted_by_date=True))
+
+    def test__out_of_order_after_long_term_goal_is_not_checked(self):
+        # Like labs_urates_at_goal_x_months, order is only checked up to the Urate that meets the goal
+        series = UrateSeries([urate("5.0", 0), urate("5.0", 200), urate("5.0", 100)])
+        self.assertTrue(series.at_goal_x_months(6))
+
+    def test__from_effective_dates(self):
+        UrateFactory(value=Decimal("5.0"), date_drawn=timezone.now() - timedelta(days=10))
+        UrateFactory(value=Decimal("9.0"), date_drawn=timezone.now() - timedelta(days=200))
+        urates = list(Urate.objects.order_by("-effective_date"))
+        with self.assertNumQueries(0):
+            series = UrateSeries(urates)
+            self.assertTrue(series.at_goal())
+            self.assertTrue(series.within_x_days(30))
+
+    def test__undated_urate_only_raises_ValueError_for_dates(self):
+        undated = Urate(value=Decimal("5.0"), date_drawn=None)
+        series = UrateSeries([urate("9.5", 10), undated])
+        self.assertTrue(series.hyperuricemic())
+        self.assertFalse(series.at_goal_x_months(6))
+        self.assertTrue(series.within_x_days(30, sorted_by_date=True))
+        with self.assertRaisesMessage(ValueError, "has no date_drawn or associated flare"):
+            series.at_goal()
+        with self.assertRaises(ValueError):
+            UrateSeries([urate("5.0", 10), undated]).at_goal_x_months(6)
+        with self.assertRaises(ValueError):
+            UrateSeries([undated]).within_x_days(30, sorted_by_date=True)
+
+    def test__group_by(self):
+        psp, psp_2 = create_psp(), create_psp()
+        UrateFactory(user=psp, value=Decimal("5.0"), date_drawn=timezone.now() - timedelta(days=5))
+        UrateFactory(user=psp_2, value=Decimal("10.0"), date_drawn=timezone.now() - timedelta(days=20))
+        UrateFactory(user=psp, value=Decimal("5.0"), date_drawn=timezone.now() - timedelta(days=200))
+        with self.assertNumQueries(1):
+            series = UrateSeries.group_by(urates_dated_qs().filter(user__in=[psp, psp_2]))
+        self.assertEqual(set(series.keys()), {psp.pk, psp_2.pk})
+        self.assertEqual(
+            series[psp.pk].summary(),
+            {
+                "at_goal": True,
+                "at_goal_long_term": True,
+                "within_last_month": True,
+                "within_90_days": True,
+                "hyperuricemic": False,
+            },
+        )
+        self.assertTrue(series[psp_2.pk].not_at_goal())
+        self.assertTrue(series[psp_2.pk].hyperuricemic())
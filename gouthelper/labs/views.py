@@ -1,9 +1,9 @@
 from typing import Any
 
-from django.apps import apps  # type: ignore
 from django.views.generic import TemplateView  # type: ignore
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 
 
 class LabAbout(TemplateView):
@@ -19,7 +19,7 @@ class LabAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.LAB, tag=None)
+        return content_get(slug="about", context=Contexts.LAB)
 
 
 class AboutHlab5801(LabAbout):
@@ -27,7 +27,7 @@ class AboutHlab5801(LabAbout):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="hlab5801", context=Contexts.LAB, tag=None)
+        return content_get(slug="hlab5801", context=Contexts.LAB)
 
 
 class AboutUrate(LabAbout):
@@ -35,4 +35,4 @@ class AboutUrate(LabAbout):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="urate", context=Contexts.LAB, tag=None)
+        return content_get(slug="urate", context=Contexts.LAB)
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING, Union
 
 from ..treatments.choices import Treatments
+from ..utils.indexes import AttrIndexedList
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet  # type: ignore
@@ -9,13 +10,26 @@ if TYPE_CHECKING:
     from .models import MedAllergy
 
 
+class MedAllergysList(AttrIndexedList):
+    """List of MedAllergy objects indexed by their treatment. Prefetches with
+    to_attr="medallergys_qs" are converted to one when set on a GoutHelper model."""
+
+    index_attr = "treatment"
+
+
 def medallergys_get(
     medallergys: Union[list["MedAllergy"], "QuerySet[MedAllergy]"],
     treatment: Treatments | list[Treatments],
 ) -> Union["MedAllergy", list["MedAllergy"]] | None:
+    """Method that returns the MedAllergy for treatment, or the list of MedAllergys for a list of
+    treatments. Uses the index of a MedAllergysList rather than iterating over it."""
     if isinstance(treatment, Treatments):
+        if isinstance(medallergys, MedAllergysList):
+            return medallergys.get(treatment)
         return next(iter(medallergy for medallergy in medallergys if medallergy.treatment == treatment), None)
     elif isinstance(treatment, list):
+        if isinstance(medallergys, MedAllergysList):
+            return medallergys.filter(treatment)
         return [medallergy for medallergy in medallergys if medallergy.treatment in treatment]
     else:
         return None
@@ -3,17 +3,18 @@ from django.db import models  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..rules import add_object, change_object, delete_object, view_object
 from ..treatments.choices import FlarePpxChoices, Treatments, UltChoices
-from ..utils.models import GoutHelperModel, TreatmentAidRelation
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel, TreatmentAidRelation
 from .choices import MaTypes
 from .lists import XOI_MATYPES
 
 
 class MedAllergy(
     RulesModelMixin,
+    DirtyFieldsMixin,
     GoutHelperModel,
     TreatmentAidRelation,
     TimeStampedModel,
@@ -164,7 +165,7 @@ class MedAllergy(
         blank=True,
     )
     objects = models.Manager()
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     def __str__(self):
         if self.matype and self.matype == MaTypes.HYPERSENSITIVITY:
@@ -6,13 +6,13 @@ from django.utils.safestring import mark_safe  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..choices import BOOL_CHOICES
 from ..goalurates.choices import GoalUrates
-from ..labs.helpers import labs_urates_six_months_at_goal
+from ..labs.series import UrateSeries
 from ..medhistorys.choices import MedHistoryTypes
-from ..utils.models import GoutHelperModel
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel
 from .choices import DialysisChoices, DialysisDurations, Stages
 
 if TYPE_CHECKING:
@@ -21,14 +21,14 @@ if TYPE_CHECKING:
     from ..labs.models import Urate
 
 
-class MedHistoryDetail(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class MedHistoryDetail(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     """Base model for models that save extra information on a History object."""
 
     class Meta:
         abstract = True
 
     medhistory = models.OneToOneField("medhistorys.MedHistory", on_delete=models.CASCADE)
-    history = HistoricalRecords(inherit=True)
+    history = GoutHelperHistoricalRecords(inherit=True)
 
 
 class CkdDetail(MedHistoryDetail):
@@ -203,7 +203,7 @@ dose adjustment (titration) phase?",
         goal_urate: GoalUrates = GoalUrates.SIX,
     ) -> bool:
         """Returns True if the at_goal_long_term field needs updating."""
-        return self.at_goal_long_term != labs_urates_six_months_at_goal(urates, goal_urate)
+        return self.at_goal_long_term != UrateSeries(urates).at_goal_x_months(6, goal_urate)
 
     def update_at_goal(
         self,
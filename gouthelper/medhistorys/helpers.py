@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Union
 
+from ..utils.indexes import AttrIndexedList
 from .choices import CVDiseases, MedHistoryTypes
 
 if TYPE_CHECKING:
@@ -9,19 +10,31 @@ if TYPE_CHECKING:
     from ..utils.models import GoutHelperAidModel
 
 
+class MedHistorysList(AttrIndexedList):
+    """List of MedHistory objects indexed by their medhistorytype. Prefetches with
+    to_attr="medhistorys_qs" are converted to one when set on a GoutHelper model."""
+
+    index_attr = "medhistorytype"
+
+
 def medhistorys_get(
     medhistorys: Union[list["MedHistory"], "QuerySet[MedHistory]"],
     medhistorytype: MedHistoryTypes | list[MedHistoryTypes],
     null_return: bool | None = False,
 ) -> Union[bool, "MedHistory"] | list["MedHistory"]:
     """Method that iterates over a list of MedHistory objects and returns
-    one whose MedHistoryType is medhistorytype or False."""
+    one whose MedHistoryType is medhistorytype or False. Uses the index of a
+    MedHistorysList rather than iterating over it."""
     if isinstance(medhistorytype, MedHistoryTypes):
+        if isinstance(medhistorys, MedHistorysList):
+            return medhistorys.get(medhistorytype, null_return)
         return next(
             iter([medhistory for medhistory in medhistorys if medhistory.medhistorytype == medhistorytype]),
             null_return,
         )
     elif isinstance(medhistorytype, list):
+        if isinstance(medhistorys, MedHistorysList):
+            return medhistorys.filter(medhistorytype)
         return [medhistory for medhistory in medhistorys if medhistory.medhistorytype in medhistorytype]
     else:
         return null_return
@@ -102,10 +115,8 @@ def medhistorys_get_ckd_3_or_higher(
         iter(
             [
                 medhistory
-                for medhistory in medhistorys
-                if medhistory.medhistorytype == mhtype
-                and hasattr(medhistory, "ckddetail")
-                and medhistory.ckddetail.stage >= medhistory.ckddetail.Stages.THREE
+                for medhistory in medhistorys_get(medhistorys, [mhtype])
+                if hasattr(medhistory, "ckddetail") and medhistory.ckddetail.stage >= medhistory.ckddetail.Stages.THREE
             ]
         ),
         False,
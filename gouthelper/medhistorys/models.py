@@ -6,7 +6,6 @@ from django.utils import timezone  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..medhistorys.lists import (
     FLARE_MEDHISTORYS,
@@ -17,7 +16,8 @@ from ..medhistorys.lists import (
     ULT_MEDHISTORYS,
     ULTAID_MEDHISTORYS,
 )
-from ..utils.models import DecisionAidRelation, GoutHelperModel, TreatmentAidRelation
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DecisionAidRelation, DirtyFieldsMixin, GoutHelperModel, TreatmentAidRelation
 from .choices import MedHistoryTypes
 from .helpers import medhistorys_get_default_medhistorytype
 from .managers import (
@@ -55,6 +55,7 @@ User = get_user_model()
 
 class MedHistory(
     RulesModelMixin,
+    DirtyFieldsMixin,
     GoutHelperModel,
     DecisionAidRelation,
     TreatmentAidRelation,
@@ -247,7 +248,7 @@ class MedHistory(
         blank=True,
     )
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
     objects = models.Manager()
 
     def __str__(self):
@@ -283,15 +284,24 @@ class MedHistory(
         so Django-Simple-History works.
         """
         # Add medhistorytype on initial save
-        if self._state.adding is True:
-            if not self.medhistorytype:
-                self.medhistorytype = medhistorys_get_default_medhistorytype(self)
+        self.set_medhistorytype()
         # Change class to MedHistory, call super().save(), then change class back
         # to proxy model class in order for Django-Simple-History to work properly
         self.__class__ = MedHistory
         super().save(*args, **kwargs)
         self.__class__ = apps.get_model(f"medhistorys.{self.medhistorytype}")
 
+    def set_medhistorytype(self) -> None:
+        if self._state.adding is True:
+            if not self.medhistorytype:
+                self.medhistorytype = medhistorys_get_default_medhistorytype(self)
+
+    def prepare_save(self) -> None:
+        """Does to the MedHistory what save() does, for the UnitOfWork (utils/persistence.py),
+        which saves MedHistorys in bulk without calling save()."""
+        self.set_medhistorytype()
+        self.__class__ = apps.get_model(f"medhistorys.{self.medhistorytype}")
+
     def update_set_date_and_save(self, commit: bool = True) -> None:
         """Update the set_date field to the current date and time."""
         self.set_date = timezone.now()
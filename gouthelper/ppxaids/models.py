@@ -6,7 +6,6 @@ from django.urls import reverse  # type: ignore
 from django.utils.functional import cached_property  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..defaults.models import PpxAidSettings
 from ..defaults.selectors import defaults_ppxaidsettings
@@ -14,9 +13,10 @@ from ..medhistorys.lists import PPXAID_MEDHISTORYS
 from ..rules import add_object, change_object, delete_object, view_object
 from ..treatments.choices import FlarePpxChoices, TrtTypes
 from ..users.models import Pseudopatient
-from ..utils.helpers import TrtDictStr
+from ..utils.helpers import TrtDictStr, explanations_cached
+from ..utils.history import GoutHelperHistoricalRecords
 from ..utils.models import FlarePpxMixin, GoutHelperAidModel, GoutHelperModel, TreatmentAidMixin
-from ..utils.services import aids_json_to_trt_dict
+from ..utils.services import aids_decisionaid_to_trt_dict
 from .managers import PpxAidManager
 from .services import PpxAidDecisionAid
 
@@ -82,7 +82,7 @@ class PpxAid(
         blank=True,
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = PpxAidManager()
@@ -102,7 +102,7 @@ class PpxAid(
         """cached_property that converts decisionaid field to a python dict for processing."""
         if not self.decisionaid:
             self.decisionaid = self.update_aid().decisionaid
-        return aids_json_to_trt_dict(decisionaid=self.decisionaid)
+        return aids_decisionaid_to_trt_dict(decisionaid=self.decisionaid)
 
     @classmethod
     def aid_medhistorys(cls) -> list["MedHistoryTypes"]:
@@ -123,6 +123,7 @@ class PpxAid(
         return defaults_ppxaidsettings(user=self.user)
 
     @cached_property
+    @explanations_cached
     def explanations(self) -> list[tuple[str, str, bool, str]]:
         """Returns a list of tuples to use as explanations for the FlareAid Detail template."""
         return [
@@ -6,7 +6,7 @@ from ...defaults.tests.factories import PpxAidSettingsFactory
 from ...medhistorys.lists import PPXAID_MEDHISTORYS
 from ...medhistorys.tests.factories import CkdFactory
 from ...treatments.choices import FlarePpxChoices, Treatments
-from ...utils.services import aids_json_to_trt_dict
+from ...utils.services import aids_decisionaid_to_trt_dict
 from ..models import PpxAid
 from .factories import create_ppxaid
 
@@ -27,7 +27,7 @@ class TestPpxAidMethods(TestCase):
         self.assertTrue(self.ppxaid.decisionaid)
         # Test that the decisionaid jsonfield is converted to a python dict
         self.assertEqual(
-            aids_json_to_trt_dict(decisionaid=self.ppxaid.decisionaid),
+            aids_decisionaid_to_trt_dict(decisionaid=self.ppxaid.decisionaid),
             self.ppxaid.aid_dict,
         )
 
@@ -57,7 +57,8 @@ class TestPpxAidMethods(TestCase):
         self.assertEqual(self.ppxaid.defaulttrtsettings, gouthelper_default)
         self.assertTrue(isinstance(self.ppxaid.defaulttrtsettings, PpxAidSettings))
         self.assertEqual(self.user_ppxaid.defaulttrtsettings, gouthelper_default)
-        user_defaults = PpxAidSettingsFactory(user=self.user_ppxaid.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            user_defaults = PpxAidSettingsFactory(user=self.user_ppxaid.user)
         # Need to delete the attr for a cached_property
         delattr(self.user_ppxaid, "defaulttrtsettings")
         self.assertEqual(self.user_ppxaid.defaulttrtsettings, user_defaults)
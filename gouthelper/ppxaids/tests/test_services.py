@@ -55,7 +55,7 @@ class TestPpxAidMethods(TestCase):
             with CaptureQueriesContext(connection) as context:
                 ppxaid_qs = ppxaid_userless_qs(pk=ppxaid.pk).get()
                 decisionaid = PpxAidDecisionAid(qs=ppxaid_qs)
-            self.assertEqual(len(context.captured_queries), 4)  # 4 queries for medhistorys
+            self.assertEqual(len(context.captured_queries), 3)  # 3 queries for medhistorys, settings are cached
             self.assertEqual(age_calc(ppxaid_qs.dateofbirth.value), decisionaid.age)
             self.assertEqual(ppxaid_qs.gender, decisionaid.gender)
             self.assertTrue(hasattr(decisionaid, "defaultsettings"))
@@ -274,7 +274,8 @@ class TestPpxAidMethods(TestCase):
         # frequency be adjusted for CKD, not the dose
         default_ppx_trt_settings = PpxAidSettings.objects.get()
         default_ppx_trt_settings.colch_dose_adjust = False
-        default_ppx_trt_settings.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            default_ppx_trt_settings.save()
 
         # Update the PpxAid
         ppxaid.update_aid()
@@ -304,8 +305,9 @@ class TestPpxAidMethods(TestCase):
         ppxaid.update_aid()
         ppxaid.refresh_from_db()
 
-        # Assert that the decisionaid field is not empty, should be a str because it's a JSONField
-        self.assertTrue(isinstance(ppxaid.decisionaid, str))
+        # Assert that the decisionaid field is not empty, should be a native versioned dict
+        self.assertTrue(isinstance(ppxaid.decisionaid, dict))
+        self.assertIn("version", ppxaid.decisionaid)
 
     def test__aid_dict_returns_dict(self):
         """Test that the aid_dict property returns a dict with the correct keys."""
@@ -7,9 +7,11 @@ from django.contrib.auth.models import AnonymousUser  # pylint: disable=e0401 #
 from django.contrib.messages.middleware import MessageMiddleware  # pylint: disable=e0401 # type: ignore
 from django.contrib.sessions.middleware import SessionMiddleware  # pylint: disable=e0401 # type: ignore
 from django.core.exceptions import ObjectDoesNotExist  # pylint: disable=e0401 # type: ignore
+from django.db import connection  # pylint: disable=e0401 # type: ignore
 from django.db.models import Q, QuerySet  # pylint: disable=e0401 # type: ignore
 from django.http import HttpResponse  # pylint: disable=e0401 # type: ignore
 from django.test import RequestFactory, TestCase  # pylint: disable=e0401 # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=e0401 # type: ignore
 from django.urls import reverse  # pylint: disable=e0401 # type: ignore
 from django.utils import timezone  # pylint: disable=e0401 # type: ignore
 
@@ -34,12 +36,13 @@ from ...users.models import Pseudopatient
 from ...users.tests.factories import AdminFactory, UserFactory, create_psp
 from ...utils.factories import form_data_colchicine_contra, form_data_nsaid_contra, medhistory_diff_obj_data
 from ...utils.forms import forms_print_response_errors
-from ...utils.test_helpers import dummy_get_response
+from ...utils.test_helpers import captured_writes, dummy_get_response
 from ..models import PpxAid
 from ..views import (
     PpxAidAbout,
     PpxAidCreate,
     PpxAidDetail,
+    PpxAidEvaluate,
     PpxAidPseudopatientCreate,
     PpxAidPseudopatientDetail,
     PpxAidPseudopatientUpdate,
@@ -258,6 +261,48 @@ class TestPpxAidCreate(TestCase):
         self.assertEqual(MedAllergy.objects.count(), medallergy_count + 3)
 
 
+class TestPpxAidEvaluate(TestCase):
+    def setUp(self):
+        self.view = PpxAidEvaluate
+
+    def test__get_not_allowed(self):
+        response = self.client.get(reverse("ppxaids:evaluate"))
+        self.assertEqual(response.status_code, 405)
+
+    def test__post_evaluates_without_saving(self):
+        for _ in range(5):
+            data = ppxaid_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("ppxaids:evaluate"), data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["aid"], "ppxaid")
+            self.assertFalse(captured_writes(context.captured_queries))
+        self.assertFalse(PpxAid.objects.exists())
+        self.assertFalse(MedHistory.objects.exists())
+
+    def test__post_matches_create(self):
+        data = ppxaid_data_factory()
+        evaluation = self.client.post(reverse("ppxaids:evaluate"), data).json()
+        response = self.client.post(reverse("ppxaids:create"), data)
+        self.assertEqual(response.status_code, 302)
+        ppxaid = PpxAid.related_objects.get()
+        self.assertEqual(evaluation["results"]["decisionaid"], ppxaid.decisionaid)
+        self.assertEqual(
+            evaluation["recommendation"]["treatment"] if evaluation["recommendation"] else None,
+            ppxaid.recommendation[0] if ppxaid.recommendation else None,
+        )
+        self.assertEqual(
+            [(explanation["id"], explanation["value"]) for explanation in evaluation["explanations"]],
+            [(exp_id, None if value is None else bool(value)) for exp_id, _, value, _ in ppxaid.explanations],
+        )
+
+    def test__post_invalid_returns_errors(self):
+        response = self.client.post(reverse("ppxaids:evaluate"), {})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
+        self.assertFalse(PpxAid.objects.exists())
+
+
 class TestPpxAidDetail(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -4,6 +4,7 @@ from .views import (
     PpxAidAbout,
     PpxAidCreate,
     PpxAidDetail,
+    PpxAidEvaluate,
     PpxAidPseudopatientCreate,
     PpxAidPseudopatientDetail,
     PpxAidPseudopatientUpdate,
@@ -15,6 +16,7 @@ app_name = "ppxaids"
 urlpatterns = [
     path("about/", PpxAidAbout.as_view(), name="about"),
     path("create/", PpxAidCreate.as_view(), name="create"),
+    path("evaluate/", PpxAidEvaluate.as_view(), name="evaluate"),
     path("<uuid:pk>/", PpxAidDetail.as_view(), name="detail"),
     path("update/<uuid:pk>/", PpxAidUpdate.as_view(), name="update"),
     path("ppx/<uuid:ppx>/create", PpxAidCreate.as_view(), name="ppx-create"),
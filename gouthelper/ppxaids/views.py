@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Any  # pylint: disable=e0401, e0015 # type: ignore
 
-from django.apps import apps  # pylint: disable=e0401 # type: ignore
 from django.contrib.auth import get_user_model  # pylint: disable=e0401 # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # pylint: disable=e0401 # type: ignore
 from django.utils.functional import cached_property  # pylint: disable=e0401 # type: ignore
@@ -11,10 +10,12 @@ from rules.contrib.views import (  # pylint: disable=e0401 # type: ignore
 )
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..ppxs.models import Ppx
 from ..users.models import Pseudopatient
 from ..utils.views import (
     GoutHelperDetailMixin,
+    GoutHelperEvaluateMixin,
     GoutHelperPseudopatientDetailMixin,
     MedAllergyFormMixin,
     MedHistoryFormMixin,
@@ -51,7 +52,7 @@ class PpxAidAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.PPXAID, tag=None)
+        return content_get(slug="about", context=Contexts.PPXAID)
 
 
 class PpxAidEditBase(MedAllergyFormMixin, MedHistoryFormMixin, OneToOneFormMixin):
@@ -102,6 +103,10 @@ class PpxAidCreate(PpxAidEditBase, PermissionRequiredMixin, CreateView, SuccessM
         return self.ppx
 
 
+class PpxAidEvaluate(GoutHelperEvaluateMixin, PpxAidCreate):
+    """Evaluates a PpxAid in memory from the same POST data as PpxAidCreate without saving anything."""
+
+
 class PpxAidDetail(GoutHelperDetailMixin):
     model = PpxAid
     object: PpxAid
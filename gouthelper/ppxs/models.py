@@ -12,14 +12,15 @@ from django.utils.text import format_lazy  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..goalurates.helpers import goalurates_get_object_goal_urate
-from ..labs.helpers import labs_urate_within_90_days
 from ..labs.models import Urate
 from ..medhistorys.lists import PPX_MEDHISTORYS
 from ..rules import add_object, change_object, delete_object, view_object
 from ..ults.choices import Indications
+from ..utils.helpers import explanations_cached
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.links import links_reverse
 from ..utils.models import GoutHelperAidModel, GoutHelperModel
 from .helpers import ppxs_check_urate_at_goal_discrepant
 from .managers import PpxManager
@@ -75,7 +76,7 @@ class Ppx(
         blank=True,
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = PpxManager()
@@ -114,7 +115,7 @@ defaults to six months.
             (
                 reverse("goalurates:pseudopatient-detail", kwargs={"pseudopatient": self.user.pk})
                 if self.user
-                else reverse("goalurates:create")
+                else links_reverse("goalurates:create")
             ),
         )
         return mark_safe(at_goal_str)
@@ -143,7 +144,7 @@ defaults to six months.
             (
                 reverse("goalurates:pseudopatient-detail", kwargs={"pseudopatient": self.user.pk})
                 if self.user
-                else reverse("goalurates:create")
+                else links_reverse("goalurates:create")
             ),
         )
         return mark_safe(at_goal_str)
@@ -169,7 +170,7 @@ is not recommended. Instead, ULT should be utilized.""",
                     (
                         reverse("ults:pseudopatient-detail", kwargs={"pseudopatient": self.user.pk})
                         if self.user
-                        else reverse("ults:create")
+                        else links_reverse("ults:create")
                     ),
                 )
             )
@@ -251,6 +252,7 @@ Continued flare prophylaxis is recommended."
         return list(super().dated_urates)
 
     @cached_property
+    @explanations_cached
     def explanations(self) -> list[tuple[str, str, bool, str]]:
         """Returns a list of tuples containing information to display explanations in the PpxDetail template."""
         return [
@@ -324,7 +326,7 @@ therapy (<a href={}>ULT</a>) or having gout flares, as well as trends in {} seru
                 gender_pos,
                 gender_subject,
                 tobe,
-                reverse("treatments:about-ult"),
+                links_reverse("treatments:about-ult"),
                 gender_pos,
             )
         )
@@ -364,7 +366,7 @@ be due to gout flares. Given {} is on long-term urate-lowering therapy \
 not {} is experiencing symptoms that could be due to gout and require ULT adjustment.""",
                     subject_the,
                     subject_the,
-                    reverse("treatments:about-ult"),
+                    links_reverse("treatments:about-ult"),
                     gender_subject,
                 )
             )
@@ -433,16 +435,7 @@ starting ULT."
     def recent_urate(self) -> bool:
         """Method that returns True if the patient has had his or her uric acid checked
         in the last 3 months, False if not."""
-        if hasattr(self, "urates_qs"):
-            return labs_urate_within_90_days(
-                urates=self.dated_urates,
-                sorted_by_date=True,
-            )
-        else:
-            return labs_urate_within_90_days(
-                urates=self.dated_urates,
-                sorted_by_date=True,
-            )
+        return self.urate_series.within_x_days(90, sorted_by_date=True)
 
     def recommendations(self, samepage_links: bool = True) -> None:
         """Method that interprets the Ppx's information and returns a dictionary of
@@ -616,8 +609,8 @@ may benefit from flare prophylaxis in the interim."
 recommend starting flare <a href={}>prophylaxis</a> for all patients starting ULT. Prophylaxis should be continued \
 until {} has been at goal uric acid ({}) or lower for 6 months.""",
                     Subject_the,
-                    reverse("treatments:about-ult"),
-                    reverse("treatments:about-ppx"),
+                    links_reverse("treatments:about-ult"),
+                    links_reverse("treatments:about-ppx"),
                     subject_the,
                     self.goalurate_get_display,
                 )
@@ -658,8 +651,8 @@ uric acid stores from a patient's body."
     but is not on or starting urate-lowering therapy (<a href={} target='_blank'>ULT</a>). This is not recommended. \
     ULT should be utilized for long-term gout management. GoutHelper recommends stopping prophylaxis.""",
                         Subject_the,
-                        reverse("treatments:about-ppx"),
-                        reverse("treatments:about-ult"),
+                        links_reverse("treatments:about-ppx"),
+                        links_reverse("treatments:about-ult"),
                     )
                 )
             }
@@ -1,10 +1,10 @@
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Union
 
 from django.apps import apps  # type: ignore
 from django.contrib.auth import get_user_model
 from django.db.models.query import QuerySet
 
-from ..labs.helpers import labs_urate_within_90_days, labs_urate_within_last_month
+from ..labs.series import UrateSeries
 from ..medhistorys.choices import MedHistoryTypes
 from ..medhistorys.helpers import medhistorys_get
 from ..ults.choices import Indications
@@ -21,6 +21,8 @@ User = get_user_model()
 class PpxDecisionAid(AidService):
     """Class method for creating/updating Ppx indication field."""
 
+    result_fields = ("indication",)
+
     def __init__(
         self,
         qs: Union["Ppx", User, QuerySet] = None,
@@ -30,8 +32,9 @@ class PpxDecisionAid(AidService):
         self.goutdetail = aids_assign_goutdetail(medhistorys=[self.gout]) if self.gout else None
         self._check_for_gout_and_detail()
         self.urates = self.qs.urates_qs
-        self.urate_within_last_month = labs_urate_within_last_month(urates=self.urates, sorted_by_date=True)
-        self.urate_within_90_days: bool = labs_urate_within_90_days(urates=self.urates, sorted_by_date=True)
+        urate_series = UrateSeries(self.urates)
+        self.urate_within_last_month = urate_series.within_x_days(30, sorted_by_date=True)
+        self.urate_within_90_days: bool = urate_series.within_x_days(90, sorted_by_date=True)
         self.at_goal = self.model_attr.urates_at_goal
         self.at_goal_long_term = self.model_attr.urates_at_goal_long_term
         self.initial_indication = self.model_attr.indication
@@ -84,6 +87,20 @@ class PpxDecisionAid(AidService):
         else:
             return Indications.NOTINDICATED
 
+    def get_fingerprint_inputs(self) -> dict[str, Any]:
+        inputs = super().get_fingerprint_inputs()
+        inputs.update(
+            {
+                "at_goal": self.at_goal,
+                "at_goal_long_term": self.at_goal_long_term,
+                "goutdetail": self.goutdetail,
+                "urate_within_90_days": self.urate_within_90_days,
+                "urate_within_last_month": self.urate_within_last_month,
+                "urates": self.urates,
+            }
+        )
+        return inputs
+
     def _update(self, commit=True) -> "Ppx":
         """Updates Ppx indication fields.
 
@@ -106,11 +123,16 @@ class PpxDecisionAid(AidService):
         if _goutdetail_at_goal_needs_update() or _goutdetail_at_goal_long_term_needs_update():
             self.model_attr.goutdetail.update_at_goal(at_goal=self.at_goal)
             self.model_attr.goutdetail.update_at_goal_long_term(at_goal_long_term=self.at_goal_long_term)
-            self.model_attr.goutdetail.full_clean()
-            self.model_attr.goutdetail.save()
+        if commit:
+            for obj in self.related_objs_2_be_saved():
+                obj.save_dirty()
         self.set_model_attr_indication()
         return super()._update(commit=commit)
 
+    def related_objs_2_be_saved(self) -> list["GoutDetail"]:
+        goutdetail = self.model_attr.goutdetail
+        return [goutdetail] if not goutdetail._state.adding and goutdetail.get_dirty_fields() else []
+
     def aid_needs_2_be_saved(self) -> bool:
         return self.indication_has_changed()
 
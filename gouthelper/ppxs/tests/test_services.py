@@ -157,6 +157,26 @@ class TestPpxDecisionAid(TestCase):
         aid = PpxDecisionAid(ppx_userless_qs(pk=self.ppx.pk))
         self.assertTrue(aid.goutdetail.at_goal)
 
+    def test___update_commit_false_doesnt_save_goutdetail(self):
+        """Test that _update() with commit=False leaves the GoutDetail changes it makes
+        unsaved and returns the GoutDetail from related_objs_2_be_saved()."""
+        self.ppx.goutdetail.at_goal = False
+        self.ppx.goutdetail.save()
+        self.ppx.urate_set.all().delete()
+        UrateFactory(date_drawn=timezone.now(), value=Decimal("4.5"), ppx=self.ppx)
+
+        aid = PpxDecisionAid(ppx_userless_qs(pk=self.ppx.pk))
+        aid._update(commit=False)
+        self.assertTrue(aid.model_attr.goutdetail.at_goal)
+        self.assertEqual(aid.related_objs_2_be_saved(), [aid.model_attr.goutdetail])
+        self.ppx.goutdetail.refresh_from_db()
+        self.assertFalse(self.ppx.goutdetail.at_goal)
+
+        aid._update()
+        self.assertEqual(aid.related_objs_2_be_saved(), [])
+        self.ppx.goutdetail.refresh_from_db()
+        self.assertTrue(self.ppx.goutdetail.at_goal)
+
     def test__get_indication_not_on_ult(self):
         """Test that _get_indication returns NOTINDICATED when the patient is
         not on ULT."""
@@ -7,8 +7,10 @@ from django.contrib.auth.models import AnonymousUser  # pylint: disable=e0401 #
 from django.contrib.messages.middleware import MessageMiddleware  # pylint: disable=e0401 # type: ignore
 from django.contrib.sessions.middleware import SessionMiddleware  # pylint: disable=e0401 # type: ignore
 from django.core.exceptions import ObjectDoesNotExist  # pylint: disable=e0401 # type: ignore
+from django.db import connection  # pylint: disable=e0401 # type: ignore
 from django.db.models import Q, QuerySet  # pylint: disable=e0401 # type: ignore
 from django.test import RequestFactory, TestCase  # pylint: disable=e0401 # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=e0401 # type: ignore
 from django.urls import reverse  # pylint: disable=e0401 # type: ignore
 from django.utils import timezone  # pylint: disable=e0401 # type: ignore
 
@@ -29,13 +31,14 @@ from ...users.models import Pseudopatient
 from ...users.tests.factories import AdminFactory, UserFactory, create_psp
 from ...utils.factories import count_data_deleted
 from ...utils.forms import forms_print_response_errors
-from ...utils.test_helpers import dummy_get_response
+from ...utils.test_helpers import captured_writes, dummy_get_response
 from ..models import Ppx
 from ..selectors import ppx_userless_qs
 from ..views import (
     PpxAbout,
     PpxCreate,
     PpxDetail,
+    PpxEvaluate,
     PpxPseudopatientCreate,
     PpxPseudopatientDetail,
     PpxPseudopatientUpdate,
@@ -248,6 +251,38 @@ class TestPpxCreate(TestCase):
         assert response.context_data["urate_formset"].errors[0]["date_drawn"]
 
 
+class TestPpxEvaluate(TestCase):
+    def setUp(self):
+        self.view = PpxEvaluate
+
+    def test__get_not_allowed(self):
+        response = self.client.get(reverse("ppxs:evaluate"))
+        self.assertEqual(response.status_code, 405)
+
+    def test__post_matches_create_without_saving(self):
+        for _ in range(5):
+            data = ppx_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("ppxs:evaluate"), data)
+            self.assertFalse(captured_writes(context.captured_queries))
+            self.assertFalse(Ppx.objects.exists())
+            create_response = self.client.post(reverse("ppxs:create"), data)
+            # Data the create view rejects is rejected by the evaluate view with its errors
+            if response.status_code == 400:
+                self.assertEqual(create_response.status_code, 200)
+                self.assertIn("errors", response.json())
+                continue
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(create_response.status_code, 302)
+            ppx = Ppx.related_objects.get()
+            self.assertEqual(response.json()["results"]["indication"], ppx.indication)
+            self.assertEqual(
+                [(explanation["id"], explanation["value"]) for explanation in response.json()["explanations"]],
+                [(exp_id, None if value is None else bool(value)) for exp_id, _, value, _ in ppx.explanations],
+            )
+            ppx.delete()
+
+
 class TestPpxDetail(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
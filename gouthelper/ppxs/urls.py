@@ -4,6 +4,7 @@ from .views import (
     PpxAbout,
     PpxCreate,
     PpxDetail,
+    PpxEvaluate,
     PpxPseudopatientCreate,
     PpxPseudopatientDetail,
     PpxPseudopatientUpdate,
@@ -15,6 +16,7 @@ app_name = "ppxs"
 urlpatterns = [
     path("about/", PpxAbout.as_view(), name="about"),
     path("create/", PpxCreate.as_view(), name="create"),
+    path("evaluate/", PpxEvaluate.as_view(), name="evaluate"),
     path("<uuid:pk>/", PpxDetail.as_view(), name="detail"),
     path("update/<uuid:pk>/", PpxUpdate.as_view(), name="update"),
     path("ppxaid/<uuid:ppxaid>/create", PpxCreate.as_view(), name="ppxaid-create"),
@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Any  # pylint: disable=E0401, E0015, E0013 # type: ignore
 
-from django.apps import apps  # pylint: disable=e0401 # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # pylint: disable=e0401 # type: ignore
 from django.core.exceptions import ValidationError  # type: ignore
 from django.utils.functional import cached_property  # pylint: disable=e0401 # type: ignore
@@ -11,6 +10,7 @@ from rules.contrib.views import (  # pylint: disable=e0401 # type: ignore
 )
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..goalurates.choices import GoalUrates
 from ..labs.forms import PpxUrateFormSet, UrateFormHelper
 from ..labs.helpers import (
@@ -27,6 +27,7 @@ from ..ppxaids.models import PpxAid
 from ..users.models import Pseudopatient
 from ..utils.views import (
     GoutHelperDetailMixin,
+    GoutHelperEvaluateMixin,
     GoutHelperPseudopatientDetailMixin,
     LabFormSetsMixin,
     MedHistoryFormMixin,
@@ -56,7 +57,7 @@ class PpxAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.PPX, tag=None)
+        return content_get(slug="about", context=Contexts.PPX)
 
 
 class PpxEditBase(LabFormSetsMixin, MedHistoryFormMixin):
@@ -175,7 +176,7 @@ class PpxCreate(PpxEditBase, PermissionRequiredMixin, CreateView, SuccessMessage
         self.post_compare_urates_and_at_goal(**goal_urate_kwarg)
         if self.errors or self.errors_bool:
             if self.errors_bool and not self.errors:
-                return super().render_errors()
+                return self.render_errors()
             else:
                 return self.errors
         else:
@@ -192,6 +193,10 @@ class PpxCreate(PpxEditBase, PermissionRequiredMixin, CreateView, SuccessMessage
         return self.ppxaid
 
 
+class PpxEvaluate(GoutHelperEvaluateMixin, PpxCreate):
+    """Evaluates a Ppx in memory from the same POST data as PpxCreate without saving anything."""
+
+
 class PpxDetail(GoutHelperDetailMixin):
     model = Ppx
     object: Ppx
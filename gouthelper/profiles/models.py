@@ -4,11 +4,11 @@ from django.dispatch import receiver  # type: ignore
 from django.urls import reverse
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..users.choices import Roles
-from ..users.models import Admin, Provider
-from ..utils.models import GoutHelperModel
+from ..users.models import Admin, Provider, User
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel
 
 
 def get_user_change(instance, request, **kwargs):
@@ -31,7 +31,7 @@ def get_user_change(instance, request, **kwargs):
         return None
 
 
-class Profile(RulesModelMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
+class Profile(RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, metaclass=RulesModelBase):
     # If you do this you need to either have a post_save signal or redirect to a profile_edit view on initial login
     class Meta:
         abstract = True
@@ -58,7 +58,7 @@ class AdminProfile(ProviderBase):
     or contributors to GoutHelper.
     """
 
-    history = HistoricalRecords(get_user=get_user_change)
+    history = GoutHelperHistoricalRecords(get_user=get_user_change)
 
 
 # post_save() signal to create AdminProfile at User creation
@@ -89,7 +89,7 @@ class PatientProfile(Profile):
         blank=True,
         default=None,
     )
-    history = HistoricalRecords(get_user=get_user_change)
+    history = GoutHelperHistoricalRecords(get_user=get_user_change)
 
 
 class ProviderProfile(ProviderBase):
@@ -97,7 +97,7 @@ class ProviderProfile(ProviderBase):
     Meant for providers who want to keep track of their patients GoutHelper data.
     """
 
-    history = HistoricalRecords(get_user=get_user_change)
+    history = GoutHelperHistoricalRecords(get_user=get_user_change)
 
 
 # post_save() signal to create ProviderProfile at User creation
@@ -144,4 +144,20 @@ class PseudopatientProfile(Profile):
         default=None,
         editable=False,
     )
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
+
+
+# post_save() and post_delete() signals to copy a PseudopatientProfile's provider to its User's panel_provider
+@receiver(models.signals.post_save, sender=PseudopatientProfile)
+def update_user_panel_provider(sender, instance, raw, **kwargs):
+    if not raw:
+        User.objects.filter(pk=instance.user_id).exclude(panel_provider_id=instance.provider_id).update(
+            panel_provider_id=instance.provider_id
+        )
+        if sender.user.is_cached(instance):
+            instance.user.panel_provider_id = instance.provider_id
+
+
+@receiver(models.signals.post_delete, sender=PseudopatientProfile)
+def clear_user_panel_provider(sender, instance, **kwargs):
+    User.objects.filter(pk=instance.user_id, panel_provider__isnull=False).update(panel_provider=None)
@@ -1,8 +1,9 @@
 import pytest
 
 from ...users.choices import Roles
-from ...users.models import Admin, Provider
-from ..models import AdminProfile, ProviderProfile
+from ...users.models import Admin, Provider, User
+from ...users.tests.factories import UserFactory, create_psp
+from ..models import AdminProfile, ProviderProfile, PseudopatientProfile
 
 pytestmark = pytest.mark.django_db
 
@@ -29,3 +30,16 @@ def test__provider_post_save():
     assert ProviderProfile.objects.count() == 0
     provider.save()
     assert ProviderProfile.objects.count() == 1
+
+
+def test__pseudopatientprofile_provider_copied_to_user():
+    provider = UserFactory()
+    psp = create_psp(provider=provider)
+    assert User.objects.get(pk=psp.pk).panel_provider == provider
+    profile = PseudopatientProfile.objects.get(user=psp)
+    other_provider = UserFactory()
+    profile.provider = other_provider
+    profile.save()
+    assert User.objects.get(pk=psp.pk).panel_provider == other_provider
+    profile.delete()
+    assert User.objects.get(pk=psp.pk).panel_provider is None
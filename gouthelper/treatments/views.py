@@ -1,9 +1,9 @@
 from typing import Any
 
-from django.apps import apps  # type: ignore
 from django.views.generic import TemplateView  # type: ignore
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 
 
 class TreatmentAbout(TemplateView):
@@ -19,7 +19,7 @@ class TreatmentAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.TREATMENT, tag=None)
+        return content_get(slug="about", context=Contexts.TREATMENT)
 
 
 class AboutFlare(TreatmentAbout):
@@ -27,7 +27,7 @@ class AboutFlare(TreatmentAbout):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="flare", context=Contexts.TREATMENT, tag=None)
+        return content_get(slug="flare", context=Contexts.TREATMENT)
 
 
 class AboutPpx(TreatmentAbout):
@@ -35,7 +35,7 @@ class AboutPpx(TreatmentAbout):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="ppx", context=Contexts.TREATMENT, tag=None)
+        return content_get(slug="ppx", context=Contexts.TREATMENT)
 
 
 class AboutUlt(TreatmentAbout):
@@ -43,4 +43,4 @@ class AboutUlt(TreatmentAbout):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="ult", context=Contexts.TREATMENT, tag=None)
+        return content_get(slug="ult", context=Contexts.TREATMENT)
@@ -8,7 +8,6 @@ from django.utils.html import mark_safe  # type: ignore
 from django.utils.text import format_lazy  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..defaults.models import UltAidSettings
 from ..defaults.selectors import defaults_ultaidsettings
@@ -18,10 +17,11 @@ from ..medhistorys.lists import ULTAID_MEDHISTORYS
 from ..rules import add_object, change_object, delete_object, view_object
 from ..treatments.choices import Treatments, TrtTypes, UltChoices
 from ..ultaids.services import UltAidDecisionAid
-from ..utils.helpers import wrap_in_anchor, wrap_in_samepage_links_anchor
-from ..utils.links import get_link_febuxostat_cv_risk
+from ..utils.helpers import explanations_cached, wrap_in_anchor, wrap_in_samepage_links_anchor
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.links import get_link_febuxostat_cv_risk, links_reverse
 from ..utils.models import GoutHelperAidModel, GoutHelperModel, TreatmentAidMixin
-from ..utils.services import aids_json_to_trt_dict, aids_probenecid_ckd_contra, aids_xois_ckd_contra
+from ..utils.services import aids_decisionaid_to_trt_dict, aids_probenecid_ckd_contra, aids_xois_ckd_contra
 from .managers import UltAidManager
 
 if TYPE_CHECKING:
@@ -102,7 +102,7 @@ class UltAid(
         blank=True,
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = UltAidManager()
@@ -122,7 +122,7 @@ class UltAid(
         """cached_property that converts decisionaid field to a python dict for processing."""
         if not self.decisionaid:
             self.decisionaid = self.update_aid().decisionaid
-        return aids_json_to_trt_dict(decisionaid=self.decisionaid)
+        return aids_decisionaid_to_trt_dict(decisionaid=self.decisionaid)
 
     @classmethod
     def aid_medhistorys(cls) -> list["MedHistoryTypes"]:
@@ -142,8 +142,8 @@ class UltAid(
                 """<br> <br> <a target='_next' href={}>Allopurinol</a> and <a target='_next' href={}>febuxostat</a> \
 are are filtered out of the body by the kidney. Individuals with advanced chronic kidney disease should have a lower \
 initial dose and smaller dose increases than individuals with normal kidney function.""",
-                reverse("treatments:about-ult") + "#allopurinol",
-                reverse("treatments:about-ult") + "#febuxostat",
+                links_reverse("treatments:about-ult", "allopurinol"),
+                links_reverse("treatments:about-ult", "febuxostat"),
             )
         )
         if self.xoi_ckd_dose_reduction:
@@ -159,7 +159,7 @@ increasing ULT doses to compensate for less uric acid excretion."
 kidneys. People who have CKD don't benefit as much from it because their kidneys aren't capable of increasing \
 uric acid elimination. Probenecid is generally avoided in advanced CKD, and Gouthelper defaults to not recommending it
 in patients with CKD of unclear stage (severity).""",
-            reverse("treatments:about-ult") + "#probenecid",
+            links_reverse("treatments:about-ult", "probenecid"),
         )
         if self.probenecid_ckd_contra:
             ckd_str += " " + self.probenecid_ckd_contra_interp()
@@ -175,7 +175,7 @@ with an increased risk of cardiovascular events and mortality in late-stage clin
 not contraindicated in individuals with cardiovascular disease, \
 febuxostat should be used cautiously in these individuals, who should also have a discussion with their provider \
 about the risks and benefits. <br> <br> """,
-            reverse("treatments:about-ult") + "#febuxostat",
+            links_reverse("treatments:about-ult", "febuxostat"),
             (f"<sup>{wrap_in_samepage_links_anchor('cvdiseases_interp-ref1', '1')}</sup>" if samepage_links else ""),
         )
         if self.cvdiseases:
@@ -248,7 +248,7 @@ are a sign of advanced gout and more severe disease. While they don't influence
 ULT, they necessitate aggressive gout treatment by lowering the <a target='_next' \
 href={}>goal uric acid</a>.""",
                 "<a class='samepage-link' href='#tophi'>tophi</a>" if samepage_links else "tophi",
-                reverse("goalurates:about"),
+                links_reverse("goalurates:about"),
             )
         )
         if self.erosions:
@@ -256,6 +256,7 @@ href={}>goal uric acid</a>.""",
 {gender_subject} should be treated aggressively with ULT.</strong>"
         return mark_safe(erosions_interp_str)
 
+    @explanations_cached
     def explanations(self, samepage_links: bool = True) -> list[tuple[str, str, bool, str]]:
         """Method that returns a dictionary of tuples explanations for the UltAid to use in templates."""
         return [
@@ -364,7 +365,7 @@ not recommended for {subject_the}."
                 int(self.defaulttrtsettings.dose_adj_interval.days / 7),
                 wrap_in_samepage_links_anchor("goalurate", "at goal")
                 if samepage_links
-                else wrap_in_anchor(reverse("goalurates:about"), "at goal"),
+                else wrap_in_anchor(links_reverse("goalurates:about"), "at goal"),
             )
         )
 
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Union
 
 from django.apps import apps  # type: ignore  # pylint: disable=E0401
 from django.contrib.auth import get_user_model  # type: ignore  # pylint: disable=E0401
@@ -44,3 +44,8 @@ class UltAidDecisionAid(TreatmentAidService):
             ultaidsettings=self.defaultsettings,
         )
         return trt_dict
+
+    def get_fingerprint_inputs(self) -> dict[str, Any]:
+        inputs = super().get_fingerprint_inputs()
+        inputs["hlab5801"] = self.hlab5801
+        return inputs
@@ -5,6 +5,7 @@ from django.test.utils import CaptureQueriesContext
 
 from ...dateofbirths.helpers import age_calc
 from ...defaults.models import UltAidSettings
+from ...defaults.selectors import defaults_ultaidsettings
 from ...defaults.tests.factories import UltAidSettingsFactory
 from ...ethnicitys.choices import Ethnicitys
 from ...labs.tests.factories import Hlab5801Factory
@@ -15,7 +16,7 @@ from ...medhistorys.lists import ULTAID_MEDHISTORYS
 from ...treatments.choices import FebuxostatDoses, Freqs, Treatments, UltChoices
 from ...users.models import Pseudopatient
 from ...users.tests.factories import create_psp
-from ...utils.services import aids_dict_to_json, aids_process_medhistorys
+from ...utils.services import aids_process_medhistorys, aids_trt_dict_to_decisionaid
 from ..models import UltAid
 from ..selectors import ultaid_user_qs
 from ..services import UltAidDecisionAid
@@ -37,11 +38,13 @@ class TestUltAidDecisionAid(TestCase):
         self.default_ultaidsettings = UltAidSettings.objects.filter(user__isnull=True).get()
 
     def test__init_without_user(self):
+        # Cache the GoutHelper default UltAidSettings so they aren't queried in the loop
+        defaults_ultaidsettings(user=None)
         for ultaid in UltAid.related_objects.filter(user__isnull=True).all():
             with CaptureQueriesContext(connection) as context:
                 decisionaid = UltAidDecisionAid(qs=ultaid)
             self.assertEqual(decisionaid.ultaid, ultaid)
-            self.assertEqual(len(context.captured_queries), 1)
+            self.assertEqual(len(context.captured_queries), 0)
             if getattr(ultaid, "dateofbirth", None):
                 self.assertEqual(age_calc(ultaid.dateofbirth.value), decisionaid.age)
             else:
@@ -191,7 +194,7 @@ class TestUltAidDecisionAid(TestCase):
         trt_dict = decisionaid._create_trts_dict()
         decisionaid._save_decisionaid_dict_to_decisionaid(trt_dict)
         self.ultaid.refresh_from_db()
-        self.assertEqual(self.ultaid.decisionaid, aids_dict_to_json(trt_dict))
+        self.assertEqual(self.ultaid.decisionaid, aids_trt_dict_to_decisionaid(trt_dict))
 
     def test___update(self):
         self.assertFalse(self.ultaid.decisionaid)
@@ -5,9 +5,11 @@ import pytest  # pylint: disable=e0401 # type: ignore
 from django.contrib.auth.models import AnonymousUser  # pylint: disable=e0401 # type: ignore
 from django.contrib.messages.middleware import MessageMiddleware  # pylint: disable=e0401 # type: ignore
 from django.contrib.sessions.middleware import SessionMiddleware  # pylint: disable=e0401 # type: ignore
+from django.db import connection  # pylint: disable=e0401 # type: ignore
 from django.db.models import Q, QuerySet  # pylint: disable=e0401 # type: ignore
 from django.http import HttpResponse, HttpResponseRedirect  # pylint: disable=e0401 # type: ignore
 from django.test import RequestFactory, TestCase  # pylint: disable=e0401 # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=e0401 # type: ignore
 from django.urls import reverse  # pylint: disable=e0401 # type: ignore
 from django.utils import timezone  # pylint: disable=e0401 # type: ignore
 
@@ -36,12 +38,13 @@ from ...ults.tests.factories import create_ult
 from ...users.models import Pseudopatient
 from ...users.tests.factories import AdminFactory, UserFactory, create_psp
 from ...utils.forms import forms_print_response_errors
-from ...utils.test_helpers import dummy_get_response
+from ...utils.test_helpers import captured_writes, dummy_get_response
 from ..models import UltAid
 from ..views import (
     UltAidAbout,
     UltAidCreate,
     UltAidDetail,
+    UltAidEvaluate,
     UltAidPseudopatientCreate,
     UltAidPseudopatientDetail,
     UltAidPseudopatientUpdate,
@@ -214,6 +217,48 @@ class TestUltAidCreate(TestCase):
         self.assertEqual(response.context_data["gender"], ult.gender.value)
 
 
+class TestUltAidEvaluate(TestCase):
+    def setUp(self):
+        self.view = UltAidEvaluate
+
+    def test__get_not_allowed(self):
+        response = self.client.get(reverse("ultaids:evaluate"))
+        self.assertEqual(response.status_code, 405)
+
+    def test__post_evaluates_without_saving(self):
+        for _ in range(5):
+            data = ultaid_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("ultaids:evaluate"), data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["aid"], "ultaid")
+            self.assertFalse(captured_writes(context.captured_queries))
+        self.assertFalse(UltAid.objects.exists())
+        self.assertFalse(MedHistory.objects.exists())
+
+    def test__post_matches_create(self):
+        data = ultaid_data_factory()
+        evaluation = self.client.post(reverse("ultaids:evaluate"), data).json()
+        response = self.client.post(reverse("ultaids:create"), data)
+        self.assertEqual(response.status_code, 302)
+        ultaid = UltAid.related_objects.get()
+        self.assertEqual(evaluation["results"]["decisionaid"], ultaid.decisionaid)
+        self.assertEqual(
+            evaluation["recommendation"]["treatment"] if evaluation["recommendation"] else None,
+            ultaid.recommendation[0] if ultaid.recommendation else None,
+        )
+        self.assertEqual(
+            [(explanation["id"], explanation["value"]) for explanation in evaluation["explanations"]],
+            [(exp_id, None if value is None else bool(value)) for exp_id, _, value, _ in ultaid.explanations()],
+        )
+
+    def test__post_invalid_returns_errors(self):
+        response = self.client.post(reverse("ultaids:evaluate"), {})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
+        self.assertFalse(UltAid.objects.exists())
+
+
 class TestUltAidDetail(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -912,7 +957,7 @@ class TestUltAidPseudopatientDetail(TestCase):
             self.assertEqual(response.status_code, 200)
             ultaid.refresh_from_db()
             self.assertTrue(ultaid.decisionaid)
-            self.assertTrue(isinstance(ultaid.decisionaid, str))
+            self.assertTrue(isinstance(ultaid.decisionaid, dict))
 
     def test__get_context_data(self):
         for ultaid in UltAid.objects.filter(user__isnull=False).select_related("user"):
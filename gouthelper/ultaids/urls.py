@@ -4,6 +4,7 @@ from .views import (
     UltAidAbout,
     UltAidCreate,
     UltAidDetail,
+    UltAidEvaluate,
     UltAidPseudopatientCreate,
     UltAidPseudopatientDetail,
     UltAidPseudopatientUpdate,
@@ -15,6 +16,7 @@ app_name = "ultaids"
 urlpatterns = [
     path("about/", UltAidAbout.as_view(), name="about"),
     path("create/", UltAidCreate.as_view(), name="create"),
+    path("evaluate/", UltAidEvaluate.as_view(), name="evaluate"),
     path("<uuid:pk>/", UltAidDetail.as_view(), name="detail"),
     path("update/<uuid:pk>/", UltAidUpdate.as_view(), name="update"),
     path(
@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Any
 
-from django.apps import apps  # pylint: disable=E0401  # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # pylint: disable=E0401  # type: ignore
 from django.utils.functional import cached_property  # pylint: disable=E0401  # type: ignore
 from django.views.generic import CreateView, TemplateView, UpdateView  # pylint: disable=E0401  # type: ignore
@@ -10,10 +9,12 @@ from rules.contrib.views import (  # pylint: disable=e0401, E0611  # type: ignor
 )
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..ults.models import Ult
 from ..users.models import Pseudopatient
 from ..utils.views import (
     GoutHelperDetailMixin,
+    GoutHelperEvaluateMixin,
     GoutHelperPseudopatientDetailMixin,
     MedAllergyFormMixin,
     MedHistoryFormMixin,
@@ -52,7 +53,7 @@ class UltAidAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.ULTAID, tag=None)
+        return content_get(slug="about", context=Contexts.ULTAID)
 
 
 class UltAidEditBase(MedAllergyFormMixin, MedHistoryFormMixin, OneToOneFormMixin, PatientSessionMixin):
@@ -103,6 +104,10 @@ class UltAidCreate(UltAidEditBase, PermissionRequiredMixin, CreateView, SuccessM
         return self.ult
 
 
+class UltAidEvaluate(GoutHelperEvaluateMixin, UltAidCreate):
+    """Evaluates a UltAid in memory from the same POST data as UltAidCreate without saving anything."""
+
+
 class UltAidDetail(GoutHelperDetailMixin):
     model = UltAid
     object: UltAid
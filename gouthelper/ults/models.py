@@ -10,8 +10,8 @@ from django.utils.text import format_lazy  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin  # type: ignore
-from simple_history.models import HistoricalRecords  # type: ignore
 
+from ..flares.services import flarecounts_get
 from ..medhistorydetails.choices import Stages
 from ..medhistorys.choices import MedHistoryTypes
 from ..medhistorys.helpers import medhistory_attr, medhistorys_get_ckd_3_or_higher
@@ -19,9 +19,12 @@ from ..medhistorys.lists import ULT_MEDHISTORYS
 from ..rules import add_object, change_object, delete_object, view_object
 from ..utils.helpers import (
     add_indicator_badge_and_samepage_link,
+    explanations_cached,
     link_to_2020_ACR_guidelines,
     wrap_in_samepage_links_anchor,
 )
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.links import links_reverse
 from ..utils.models import GoutHelperAidModel, GoutHelperModel
 from .choices import FlareFreqs, FlareNums, Indications
 from .managers import UltManager
@@ -30,6 +33,7 @@ from .services import UltDecisionAid
 if TYPE_CHECKING:
     from django.contrib.auth import get_user_model
 
+    from ..flares.models import FlareCount
     from ..medhistorys.models import Ckd
 
     User = get_user_model()
@@ -132,7 +136,7 @@ class Ult(
         blank=True,
     )
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    history = HistoricalRecords()
+    history = GoutHelperHistoricalRecords()
 
     objects = models.Manager()
     related_objects = UltManager()
@@ -352,6 +356,24 @@ absence of a strong indication for ULT, such as <a class='samepage-link' href='#
 for it.{_get_contraindicated_interp_str()}"
         )
 
+    @cached_property
+    def effective_freq_flares(self) -> FlareFreqs | None:
+        """The Ult's freq_flares, raised to TWOORMORE if two or more Flares were recorded for the patient
+        in the last year, and defaulting to ONEORLESS if effective_num_flares was raised to TWOPLUS.
+        Used for the indication and its explanations; freq_flares stays as entered."""
+        if self.effective_num_flares != FlareNums.TWOPLUS:
+            return None
+        elif self.flarecount and self.flarecount.last_year >= 2:
+            return FlareFreqs.TWOORMORE
+        return self.freq_flares or FlareFreqs.ONEORLESS
+
+    @cached_property
+    def effective_num_flares(self) -> FlareNums:
+        """The Ult's num_flares, raised to the number of Flares recorded for the patient, if more.
+        Used for the indication and its explanations; num_flares stays as entered."""
+        recorded = min(self.flarecount.total, FlareNums.TWOPLUS) if self.flarecount else FlareNums.ZERO
+        return FlareNums(max(self.num_flares, recorded))
+
     @property
     def erosions_detail(self) -> str:
         return add_indicator_badge_and_samepage_link(self, "erosions", "Erosions")
@@ -368,6 +390,7 @@ ULT is strongly recommended for {gender_ref}.</strong>"
         return mark_safe(erosions_interp_str)
 
     @cached_property
+    @explanations_cached
     def explanations(self) -> list[tuple[str, str, bool, str]]:
         """Returns a list of tuples containing information to display explanations in the UltDetail template."""
         return [
@@ -388,7 +411,7 @@ ULT is strongly recommended for {gender_ref}.</strong>"
         has only had a single gout flare and does not have any secondary
         medical conditions that would conditionally indicate ULT. A single gout flare
         in the absence of any additional conditions is a contraindication to ULT."""
-        return self.num_flares == FlareNums.ONE
+        return self.effective_num_flares == FlareNums.ONE
 
     @property
     def firstflare_detail(self) -> str:
@@ -407,24 +430,24 @@ or <a class='samepage-link' href='#hyperuricemia'>hyperuricemia</a>"
         def _get_pretext():
             return (
                 "only "
-                if self.num_flares == self.FlareNums.ONE
+                if self.effective_num_flares == self.FlareNums.ONE
                 else "not "
-                if self.num_flares == self.FlareNums.ZERO
+                if self.effective_num_flares == self.FlareNums.ZERO
                 else ""
             )
 
         def _get_flares_text():
             return (
                 "a single gout flare"
-                if self.num_flares == self.FlareNums.ONE
+                if self.effective_num_flares == self.FlareNums.ONE
                 else "two or more gout flares"
-                if self.num_flares == self.FlareNums.TWOPLUS
+                if self.effective_num_flares == self.FlareNums.TWOPLUS
                 else "any gout flares"
             )
 
         def _get_firstflare_interp(samepage_links: bool = samepage_links) -> str:
             base_str = f"{Subject_the} {pos} {_get_pretext()}had {_get_flares_text()}"
-            if self.num_flares == self.FlareNums.TWOPLUS:
+            if self.effective_num_flares == self.FlareNums.TWOPLUS:
                 return (
                     base_str
                     + ", so conditional indications in the setting of the first flare \
@@ -486,13 +509,18 @@ exceptions. <strong>{_get_firstflare_interp()}</strong> <br> <br> {explanation_s
         """Method that returns True if a Ult indicates that the patient
         has only had a single gout flare but does have a secondary
         medical conditions that conditionally indicates ULT."""
-        return self.num_flares == FlareNums.ONE and (self.ckd3 or self.hyperuricemia or self.uratestones)
+        return self.effective_num_flares == FlareNums.ONE and (self.ckd3 or self.hyperuricemia or self.uratestones)
+
+    @cached_property
+    def flarecount(self) -> Union["FlareCount", None]:
+        """The FlareCount of the Ult's User, if it has one."""
+        return flarecounts_get(self.user) if self.user else None
 
     @cached_property
     def frequentflares(self) -> bool:
         """Method that returns True if a Ult indicates the
         patient is having frequent gout flares (2 or more per year)."""
-        return self.freq_flares and self.freq_flares == FlareFreqs.TWOORMORE
+        return self.effective_freq_flares and self.effective_freq_flares == FlareFreqs.TWOORMORE
 
     @property
     def frequentflares_detail(self) -> str:
@@ -535,7 +563,7 @@ indication for ULT. <strong>{Subject_the} {pos if self.frequentflares else pos_n
     @cached_property
     def has_conditional_indication_for_firstflare_and_comorbidity(self) -> bool:
         return (
-            self.num_flares == self.FlareNums.ONE
+            self.effective_num_flares == self.FlareNums.ONE
             and self.has_conditional_indication_for_ckd3
             and self.has_conditional_indication_for_hyperuricemia
             and self.has_conditional_indication_for_uratestones
@@ -543,7 +571,7 @@ indication for ULT. <strong>{Subject_the} {pos if self.frequentflares else pos_n
 
     @cached_property
     def has_conditional_indication_for_hyperuricemia(self) -> bool:
-        return self.num_flares == self.FlareNums.ONE and self.hyperuricemia
+        return self.effective_num_flares == self.FlareNums.ONE and self.hyperuricemia
 
     @cached_property
     def has_conditional_indication_for_hyperuricemia_only(self) -> bool:
@@ -556,7 +584,7 @@ indication for ULT. <strong>{Subject_the} {pos if self.frequentflares else pos_n
 
     @cached_property
     def has_conditional_indication_for_ckd3(self) -> bool:
-        return self.num_flares == self.FlareNums.ONE and self.ckd3
+        return self.effective_num_flares == self.FlareNums.ONE and self.ckd3
 
     @cached_property
     def has_conditional_indication_for_ckd3_or_higher_only(self) -> bool:
@@ -587,7 +615,7 @@ indication for ULT. <strong>{Subject_the} {pos if self.frequentflares else pos_n
 
     @cached_property
     def has_conditional_indication_for_uratestones(self) -> bool:
-        return self.num_flares == self.FlareNums.ONE and self.uratestones
+        return self.effective_num_flares == self.FlareNums.ONE and self.uratestones
 
     @cached_property
     def has_multiple_conditional_indications_for_ult(self) -> bool:
@@ -676,7 +704,7 @@ for ULT, hyperuricemia is a conditional indication for ULT with a very low certa
                 """{} has {} <a href={}>conditional indication{}</a> for ULT: {}.""",
                 Gender_subject,
                 "multiple" if self.has_multiple_conditional_indications_for_ult else "a",
-                reverse("ults:about") + "#conditional",
+                links_reverse("ults:about", "conditional"),
                 "s" if self.has_multiple_conditional_indications_for_ult else "",
                 self.get_conditional_indications_str(samepage_links=samepage_links),
             )
@@ -692,7 +720,7 @@ for ULT, hyperuricemia is a conditional indication for ULT with a very low certa
                         if samepage_links
                         else "never had a gout flare"
                     ),
-                    reverse("ults:about") + "#notindicated",
+                    links_reverse("ults:about", "notindicated"),
                 )
             elif self.one_flare_without_any_indication:
                 return format_lazy(
@@ -705,9 +733,9 @@ to gout or elevated <a href={}>uric acid</a> levels.""",
                         if samepage_links
                         else "one gout flare"
                     ),
-                    reverse("ults:about") + "#notindicated",
+                    links_reverse("ults:about", "notindicated"),
                     gender_ref,
-                    reverse("labs:about-urate"),
+                    links_reverse("labs:about-urate"),
                 )
 
         def _get_strong_indication_str(samepage_links: bool = samepage_links) -> str:
@@ -715,7 +743,7 @@ to gout or elevated <a href={}>uric acid</a> levels.""",
                 """{} has {} <a href={}>strong indication</a>{} for ULT: {}.""",
                 Gender_subject,
                 "multiple" if self.has_multiple_strong_indications_for_ult else "a",
-                reverse("ults:about") + "#strong",
+                links_reverse("ults:about", "strong"),
                 "s" if self.has_multiple_strong_indications_for_ult else "",
                 self.get_strong_indications_strs_with_links(samepage_links=samepage_links),
             )
@@ -733,7 +761,7 @@ to gout or elevated <a href={}>uric acid</a> levels.""",
                 """{} should {}<a href={}>ULT</a>. {}""",
                 Subject_the,
                 _get_should_statement(),
-                reverse("treatments:about-ult"),
+                links_reverse("treatments:about-ult"),
                 _get_indication_interp_str(),
             )
         )
@@ -756,7 +784,7 @@ to gout or elevated <a href={}>uric acid</a> levels.""",
         """Method that returns True if a Ult indicates the
         has only one flare per year but has a history of more than 1 gout flare,
         which is a conditional indication for ULT."""
-        return self.freq_flares == FlareFreqs.ONEORLESS and self.num_flares == FlareNums.TWOPLUS
+        return self.effective_freq_flares == FlareFreqs.ONEORLESS and self.effective_num_flares == FlareNums.TWOPLUS
 
     @property
     def multipleflares_detail(self) -> str:
@@ -794,7 +822,7 @@ ULT recommendation"
     def noflares(self) -> bool:
         """Method that returns True if a Ult indicates that the patient
         has never had a gout flare, which is a contraindication for ULT."""
-        if self.num_flares == FlareNums.ZERO:
+        if self.effective_num_flares == FlareNums.ZERO:
             return True
         return False
 
@@ -812,7 +840,7 @@ or tophi with no preceding flares, which is quite rare."
 
     @cached_property
     def one_flare_without_conditional_indication(self) -> bool:
-        return self.num_flares == FlareNums.ONE and not (self.ckd3 or self.hyperuricemia or self.uratestones)
+        return self.effective_num_flares == FlareNums.ONE and not (self.ckd3 or self.hyperuricemia or self.uratestones)
 
     @cached_property
     def one_flare_without_any_indication(self) -> bool:
@@ -909,4 +937,4 @@ for ULT, history of urate stones is a conditional indication for ULT with a very
 
     @cached_property
     def zero_flares_without_indication(self) -> bool:
-        return self.num_flares == FlareNums.ZERO and not self.erosions and not self.tophi
+        return self.effective_num_flares == FlareNums.ZERO and not self.erosions and not self.tophi
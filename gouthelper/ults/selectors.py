@@ -121,6 +121,7 @@ def ult_user_relations(qs: "QuerySet") -> "QuerySet":
         "dateofbirth",
         "ethnicity",
         "flareaid",
+        "flarecount",
         "gender",
         "goalurate",
         "ppxaid",
@@ -1,13 +1,16 @@
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Union
 
 from django.apps import apps  # pylint: disable=E0401 # type: ignore
 from django.contrib.auth import get_user_model  # pylint: disable=E0401 # type: ignore
 
+from ..flares.services import flarecounts_get
+from ..medhistorys.helpers import medhistorys_get
 from ..medhistorys.lists import ULT_MEDHISTORYS
 from ..utils.services import AidService, aids_assign_baselinecreatinine, aids_assign_ckddetail
 from .choices import FlareFreqs, FlareNums, Indications
 
 if TYPE_CHECKING:
+    from ..flares.models import FlareCount
     from ..medhistorydetails.models import CkdDetail
     from ..medhistorys.models import MedHistory
     from .models import Ult
@@ -18,6 +21,8 @@ User = get_user_model()
 class UltDecisionAid(AidService):
     """Class method for creating/updating Ult indication fields."""
 
+    result_fields = ("indication",)
+
     def __init__(
         self,
         qs: Union["Ult", User, None] = None,
@@ -26,11 +31,18 @@ class UltDecisionAid(AidService):
         self._assign_medhistorys()
         self.baselinecreatinine = aids_assign_baselinecreatinine(medhistorys=self.medhistorys)
         self.ckddetail = aids_assign_ckddetail(medhistorys=self.medhistorys)
+        self.flarecount = flarecounts_get(self.user) if self.user else None
+        # Share the FlareCount with the Ult, so its explanations match the indication,
+        # and drop any effective flare values it cached before the update
+        self.model_attr.flarecount = self.flarecount
+        for attr in ("effective_num_flares", "effective_freq_flares"):
+            self.model_attr.__dict__.pop(attr, None)
         self.initial_indication = self.model_attr.indication
 
     ckd: Union["MedHistory", None]
     ckddetail: Union["CkdDetail", None]
     erosions: Union["MedHistory", None]
+    flarecount: Union["FlareCount", None]
     hyperuricemia: Union["MedHistory", None]
     tophi: Union["MedHistory", None]
     uratestones: Union["MedHistory", None]
@@ -47,14 +59,7 @@ class UltDecisionAid(AidService):
             setattr(
                 self,
                 medhistorytype.lower(),
-                next(
-                    iter(
-                        [medhistory for medhistory in self.medhistorys if medhistory.medhistorytype == medhistorytype],
-                    ),
-                    None,
-                )
-                if self.medhistorys
-                else None,
+                medhistorys_get(self.medhistorys, medhistorytype, null_return=None) if self.medhistorys else None,
             )
 
     def _get_indication(self) -> Indications:
@@ -69,7 +74,7 @@ class UltDecisionAid(AidService):
                 # or more flares per year.
                 self.erosions
                 or self.tophi
-                or self.model_attr.freq_flares == FlareFreqs.TWOORMORE
+                or self.effective_freq_flares == FlareFreqs.TWOORMORE
             )
             else (
                 Indications.CONDITIONAL
@@ -78,9 +83,9 @@ class UltDecisionAid(AidService):
                     # but with a history of more than 1 gout flare, or if there is
                     # a first and only gout flare with either CKD >= III,
                     # hyperuricemia, or history of urate kidney stones.
-                    self.model_attr.freq_flares == FlareFreqs.ONEORLESS
-                    and self.model_attr.num_flares == FlareNums.TWOPLUS
-                    or self.model_attr.num_flares == FlareNums.ONE
+                    self.effective_freq_flares == FlareFreqs.ONEORLESS
+                    and self.effective_num_flares == FlareNums.TWOPLUS
+                    or self.effective_num_flares == FlareNums.ONE
                     and (
                         (self.ckddetail is not None and self.ckddetail.stage >= 3)
                         or self.hyperuricemia
@@ -92,11 +97,24 @@ class UltDecisionAid(AidService):
             )
         )
 
+    @property
+    def effective_freq_flares(self) -> FlareFreqs | None:
+        return self.model_attr.effective_freq_flares
+
+    @property
+    def effective_num_flares(self) -> FlareNums:
+        return self.model_attr.effective_num_flares
+
     def _update(self, commit=True) -> "Ult":
         """Overwritten to update the indication field."""
         self.set_model_attr_indication()
         return super()._update(commit=commit)
 
+    def get_fingerprint_inputs(self) -> dict[str, Any]:
+        inputs = super().get_fingerprint_inputs()
+        inputs["flarecount"] = (self.flarecount.total, self.flarecount.last_year) if self.flarecount else None
+        return inputs
+
     def set_model_attr_indication(self) -> None:
         self.model_attr.indication = self._get_indication()
 
@@ -1,7 +1,13 @@
+from datetime import timedelta
+
 import pytest  # pylint:disable=E0401  # type: ignore
 from django.test import TestCase  # pylint:disable=E0401  # type: ignore
+from django.utils import timezone  # pylint:disable=E0401  # type: ignore
 from factory.faker import faker  # pylint:disable=E0401  # type: ignore
 
+from ...flares.choices import DiagnosedChoices, Likelihoods
+from ...flares.models import Flare
+from ...flares.tests.factories import create_flare
 from ...users.models import Pseudopatient
 from ...users.tests.factories import create_psp
 from ..choices import FlareFreqs, FlareNums, Indications
@@ -172,3 +178,102 @@ class TestUltDecisionAid(TestCase):
         ult_decisionaid = UltDecisionAid(ult)
         ult_decisionaid.set_model_attr_indication()
         self.assertFalse(ult_decisionaid.aid_needs_2_be_saved())
+
+
+class TestUltDecisionAidRecordedFlares(TestCase):
+    def setUp(self):
+        self.psp = create_psp()
+        self.ult = create_ult(user=self.psp, mhs=[], num_flares=FlareNums.ZERO, freq_flares=None)
+        self.today = timezone.now().date()
+
+    def create_flare(self, days_ago: int, **kwargs) -> None:
+        kwargs.setdefault("diagnosed", DiagnosedChoices.YES)
+        create_flare(
+            user=self.psp,
+            date_started=self.today - timedelta(days=days_ago),
+            date_ended=self.today - timedelta(days=days_ago - 5),
+            **kwargs,
+        )
+
+    def update_ult(self) -> UltDecisionAid:
+        decisionaid = UltDecisionAid(Pseudopatient.objects.ult_qs().get(pk=self.psp.pk))
+        decisionaid._update()
+        self.ult.refresh_from_db()
+        return decisionaid
+
+    def assertEnteredFlares(self, num_flares: FlareNums, freq_flares: FlareFreqs | None) -> None:
+        self.assertEqual(self.ult.num_flares, num_flares)
+        self.assertEqual(self.ult.freq_flares, freq_flares)
+
+    def test__no_recorded_flares(self):
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.ZERO)
+        self.assertIsNone(decisionaid.effective_freq_flares)
+        self.assertEqual(self.ult.indication, Indications.NOTINDICATED)
+
+    def test__recorded_flares_raise_effective_num_flares_and_freq_flares(self):
+        self.create_flare(30)
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.ONE)
+        self.assertIsNone(decisionaid.effective_freq_flares)
+        self.create_flare(100)
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.TWOPLUS)
+        self.assertEqual(decisionaid.effective_freq_flares, FlareFreqs.TWOORMORE)
+        self.assertEqual(self.ult.indication, Indications.INDICATED)
+        # The entered values aren't changed
+        self.assertEnteredFlares(FlareNums.ZERO, None)
+
+    def test__flares_that_are_not_gout_are_not_counted(self):
+        self.create_flare(30, diagnosed=DiagnosedChoices.NO)
+        self.create_flare(100, diagnosed=DiagnosedChoices.UNSURE, likelihood=Likelihoods.UNLIKELY)
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.ZERO)
+        self.assertIsNone(decisionaid.effective_freq_flares)
+        self.assertEqual(self.ult.indication, Indications.NOTINDICATED)
+
+    def test__flares_more_than_a_year_ago_are_not_frequent(self):
+        self.create_flare(400)
+        self.create_flare(600)
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.TWOPLUS)
+        self.assertEqual(decisionaid.effective_freq_flares, FlareFreqs.ONEORLESS)
+        self.assertEqual(self.ult.indication, Indications.CONDITIONAL)
+
+    def test__entered_flares_are_not_lowered(self):
+        self.ult.num_flares = FlareNums.TWOPLUS
+        self.ult.freq_flares = FlareFreqs.TWOORMORE
+        self.ult.save()
+        self.create_flare(30)
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.TWOPLUS)
+        self.assertEqual(decisionaid.effective_freq_flares, FlareFreqs.TWOORMORE)
+        self.assertEqual(self.ult.indication, Indications.INDICATED)
+        self.assertEnteredFlares(FlareNums.TWOPLUS, FlareFreqs.TWOORMORE)
+
+    def test__indication_lowered_when_recorded_flares_are_deleted(self):
+        self.create_flare(30)
+        self.create_flare(100)
+        self.update_ult()
+        self.assertEqual(self.ult.indication, Indications.INDICATED)
+        Flare.objects.filter(user=self.psp).delete()
+        decisionaid = self.update_ult()
+        self.assertEqual(decisionaid.effective_num_flares, FlareNums.ZERO)
+        self.assertEqual(self.ult.indication, Indications.NOTINDICATED)
+        self.assertEnteredFlares(FlareNums.ZERO, None)
+
+    def test__ult_explanations_match_the_indication(self):
+        self.create_flare(30)
+        self.create_flare(100)
+        self.update_ult()
+        ult = Pseudopatient.objects.ult_qs().get(pk=self.psp.pk).ult
+        self.assertTrue(ult.indicated)
+        self.assertTrue(ult.frequentflares)
+        self.assertFalse(ult.noflares)
+        self.assertTrue(ult.explanations)
+        self.assertEnteredFlares(FlareNums.ZERO, None)
+
+    def test__recorded_flares_make_aid_stale(self):
+        self.update_ult()
+        self.create_flare(30)
+        self.assertTrue(UltDecisionAid(Pseudopatient.objects.ult_qs().get(pk=self.psp.pk)).aid_is_stale())
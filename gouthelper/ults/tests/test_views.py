@@ -5,9 +5,11 @@ import pytest  # pylint: disable=E0401  # type: ignore
 from django.contrib.auth.models import AnonymousUser  # pylint: disable=E0401  # type: ignore
 from django.contrib.messages.middleware import MessageMiddleware  # pylint: disable=e0401 # type: ignore
 from django.contrib.sessions.middleware import SessionMiddleware  # pylint: disable=e0401 # type: ignore
+from django.db import connection  # pylint: disable=E0401  # type: ignore
 from django.db.models import Q, QuerySet  # pylint: disable=E0401  # type: ignore
 from django.http import HttpResponse, HttpResponseRedirect  # pylint: disable=E0401  # type: ignore
 from django.test import RequestFactory, TestCase  # pylint: disable=E0401  # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=E0401  # type: ignore
 from django.urls import reverse  # pylint: disable=E0401  # type: ignore
 
 from ...contents.choices import Tags
@@ -25,13 +27,14 @@ from ...medhistorys.models import Ckd, Erosions, Hyperuricemia, MedHistory, Toph
 from ...users.models import Pseudopatient
 from ...users.tests.factories import AdminFactory, UserFactory, create_psp
 from ...utils.forms import forms_print_response_errors
-from ...utils.test_helpers import dummy_get_response
+from ...utils.test_helpers import captured_writes, dummy_get_response
 from ..choices import FlareFreqs, FlareNums
 from ..models import Ult
 from ..views import (
     UltAbout,
     UltCreate,
     UltDetail,
+    UltEvaluate,
     UltPseudopatientCreate,
     UltPseudopatientDetail,
     UltPseudopatientUpdate,
@@ -127,6 +130,38 @@ class TestUltCreate(TestCase):
         self.assertIn("freq_flares", response.context_data["form"].errors)
 
 
+class TestUltEvaluate(TestCase):
+    def setUp(self):
+        self.view = UltEvaluate
+
+    def test__get_not_allowed(self):
+        response = self.client.get(reverse("ults:evaluate"))
+        self.assertEqual(response.status_code, 405)
+
+    def test__post_matches_create_without_saving(self):
+        for _ in range(5):
+            data = ult_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("ults:evaluate"), data)
+            self.assertFalse(captured_writes(context.captured_queries))
+            self.assertFalse(Ult.objects.exists())
+            create_response = self.client.post(reverse("ults:create"), data)
+            # Data the create view rejects is rejected by the evaluate view with its errors
+            if response.status_code == 400:
+                self.assertEqual(create_response.status_code, 200)
+                self.assertIn("errors", response.json())
+                continue
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(create_response.status_code, 302)
+            ult = Ult.related_objects.get()
+            self.assertEqual(response.json()["results"]["indication"], ult.indication)
+            self.assertEqual(
+                [(explanation["id"], explanation["value"]) for explanation in response.json()["explanations"]],
+                [(exp_id, None if value is None else bool(value)) for exp_id, _, value, _ in ult.explanations],
+            )
+            ult.delete()
+
+
 class TestUltDetail(TestCase):
     def setUp(self):
         self.ult = create_ult(num_flares=FlareNums.TWOPLUS, freq_flares=FlareFreqs.TWOORMORE)
@@ -4,6 +4,7 @@ from .views import (
     UltAbout,
     UltCreate,
     UltDetail,
+    UltEvaluate,
     UltPseudopatientCreate,
     UltPseudopatientDetail,
     UltPseudopatientUpdate,
@@ -15,6 +16,7 @@ app_name = "ults"
 urlpatterns = [
     path("about/", UltAbout.as_view(), name="about"),
     path("create/", UltCreate.as_view(), name="create"),
+    path("evaluate/", UltEvaluate.as_view(), name="evaluate"),
     path("<uuid:pk>/", UltDetail.as_view(), name="detail"),
     path("update/<uuid:pk>/", UltUpdate.as_view(), name="update"),
     path("goutpatient-create/<uuid:pseudopatient>/", UltPseudopatientCreate.as_view(), name="pseudopatient-create"),
@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Any  # pylint: disable=E0013, E0015 # type: ignore
 
-from django.apps import apps  # pylint: disable=E0401 # type: ignore
 from django.contrib.messages.views import SuccessMessageMixin  # pylint: disable=E0401 # type: ignore
 from django.views.generic import CreateView, TemplateView, UpdateView  # pylint: disable=E0401 # type: ignore
 from rules.contrib.views import (  # pylint: disable=W0611, E0401  # type: ignore
@@ -9,10 +8,12 @@ from rules.contrib.views import (  # pylint: disable=W0611, E0401  # type: ignor
 )
 
 from ..contents.choices import Contexts
+from ..contents.selectors import content_get
 from ..labs.selectors import hyperuricemia_urates_prefetch
 from ..users.models import Pseudopatient
 from ..utils.views import (
     GoutHelperDetailMixin,
+    GoutHelperEvaluateMixin,
     GoutHelperPseudopatientDetailMixin,
     MedHistoryFormMixin,
     OneToOneFormMixin,
@@ -44,7 +45,7 @@ class UltAbout(TemplateView):
 
     @property
     def content(self):
-        return apps.get_model("contents.Content").objects.get(slug="about", context=Contexts.ULT, tag=None)
+        return content_get(slug="about", context=Contexts.ULT)
 
 
 class UltEditBase(MedHistoryFormMixin, OneToOneFormMixin):
@@ -73,6 +74,10 @@ class UltCreate(UltEditBase, PermissionRequiredMixin, CreateView, SuccessMessage
             return self.form_valid()
 
 
+class UltEvaluate(GoutHelperEvaluateMixin, UltCreate):
+    """Evaluates a Ult in memory from the same POST data as UltCreate without saving anything."""
+
+
 class UltDetail(GoutHelperDetailMixin):
     model = Ult
     object: Ult
@@ -0,0 +1,54 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from ...utils.pagination import InvalidCursor, KeysetPaginator, get_page_size
+
+
+class KeysetPagination(BasePagination):
+    """DRF pagination with the KeysetPaginator, i.e. by cursor on (modified, pk), most recently
+    modified first, with a page_size query parameter."""
+
+    cursor_query_param = "cursor"
+    ordering_field = "modified"
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = get_page_size(
+            request.query_params.get(self.page_size_query_param), self.page_size, self.max_page_size
+        )
+        try:
+            self.page = KeysetPaginator(queryset, page_size, self.ordering_field).page(
+                request.query_params.get(self.cursor_query_param)
+            )
+        except InvalidCursor as exc:
+            raise NotFound("Invalid cursor.") from exc
+        return self.page.object_list
+
+    def get_link(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from gouthelper.ults.choices import Indications
+from gouthelper.users.models import Pseudopatient
 from gouthelper.users.models import User as UserType
 
 User = get_user_model()
@@ -14,3 +16,37 @@ class UserSerializer(serializers.ModelSerializer[UserType]):
         extra_kwargs = {
             "url": {"view_name": "api:user-detail", "lookup_field": "username"},
         }
+
+
+class PseudopatientPanelSerializer(serializers.ModelSerializer[Pseudopatient]):
+    """Serializes a Pseudopatient from Pseudopatient.objects.panel_qs(), with its annotations."""
+
+    name = serializers.CharField(source="__str__", read_only=True)
+    url = serializers.CharField(source="get_absolute_url", read_only=True)
+    flares_last_year = serializers.IntegerField(read_only=True)
+    flare_open = serializers.BooleanField(read_only=True)
+    ult_indication = serializers.ChoiceField(choices=Indications.choices, read_only=True, allow_null=True)
+    ppx_indication = serializers.ChoiceField(choices=Indications.choices, read_only=True, allow_null=True)
+    urate_goal = serializers.DecimalField(max_digits=2, decimal_places=1, read_only=True)
+    urate_last_value = serializers.DecimalField(max_digits=3, decimal_places=1, read_only=True, allow_null=True)
+    urate_last_date = serializers.DateField(read_only=True, allow_null=True)
+    urate_at_goal = serializers.BooleanField(read_only=True)
+    urate_overdue = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Pseudopatient
+        fields = [
+            "id",
+            "name",
+            "url",
+            "modified",
+            "flares_last_year",
+            "flare_open",
+            "ult_indication",
+            "ppx_indication",
+            "urate_goal",
+            "urate_last_value",
+            "urate_last_date",
+            "urate_at_goal",
+            "urate_overdue",
+        ]
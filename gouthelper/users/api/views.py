@@ -7,7 +7,9 @@ from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, UpdateMode
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from .serializers import UserSerializer
+from ..models import Pseudopatient
+from .pagination import KeysetPagination
+from .serializers import PseudopatientPanelSerializer, UserSerializer
 
 User = get_user_model()
 
@@ -25,3 +27,15 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
     def me(self, request):
         serializer = UserSerializer(request.user, context={"request": request})
         return Response(status=status.HTTP_200_OK, data=serializer.data)
+
+
+class PseudopatientPanelViewSet(ListModelMixin, GenericViewSet):
+    """The requesting provider's panel of Pseudopatients, with the summaries of
+    Pseudopatient.objects.panel_qs(), paginated by cursor."""
+
+    serializer_class = PseudopatientPanelSerializer
+    pagination_class = KeysetPagination
+    queryset = Pseudopatient.objects.none()
+
+    def get_queryset(self, *args, **kwargs):
+        return Pseudopatient.objects.panel_qs().filter(panel_provider=self.request.user)
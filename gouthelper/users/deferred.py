@@ -0,0 +1,167 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Union
+
+from django.apps import apps  # pylint: disable=E0401  # type: ignore
+from django.conf import settings  # pylint: disable=E0401  # type: ignore
+from django.db import connections, transaction  # pylint: disable=E0401  # type: ignore
+from django.utils.module_loading import import_string  # pylint: disable=E0401  # type: ignore
+
+from .services import PseudopatientAidsRecompute
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from ..utils.types import Aids
+    from .models import AidsRecomputeJob
+
+logger = logging.getLogger(__name__)
+
+
+def recompute_user_aids(user_pk: "UUID") -> PseudopatientAidsRecompute:
+    """Recomputes all of a Pseudopatient's decision aids, saving the ones that changed."""
+    return PseudopatientAidsRecompute(
+        pseudopatients=apps.get_model("users.Pseudopatient").objects.filter(pk=user_pk),
+    ).run()
+
+
+class AidsRecomputeBackend:
+    """Base class for the backends that recompute an aid's related aids after it has been edited.
+    The backend is set with settings.AIDS_RECOMPUTE_BACKEND."""
+
+    deferred = False
+
+    def enqueue(self, aid: "Aids") -> None:
+        raise NotImplementedError
+
+
+class SynchronousBackend(AidsRecomputeBackend):
+    """Updates the related aids in the current thread, before enqueue() returns."""
+
+    def enqueue(self, aid: "Aids") -> None:
+        aid.update_related_objects(qs=aid.user if aid.user else aid)
+
+
+class DeferredBackend(AidsRecomputeBackend):
+    """Base class for backends that defer the work. Only aids with a User are deferred,
+    deduplicated per User; aids without a User have no other way of finding their
+    related aids later, so they are updated synchronously."""
+
+    deferred = True
+
+    def enqueue(self, aid: "Aids") -> None:
+        if aid.user:
+            self.enqueue_user(aid.user.pk)
+        else:
+            aid.update_related_objects(qs=aid)
+
+    def enqueue_user(self, user_pk: "UUID") -> None:
+        raise NotImplementedError
+
+
+class ThreadPoolBackend(DeferredBackend):
+    """Recomputes the User's aids in a pool of worker threads in the web process once the
+    current transaction commits. A User stays pending from submission until their run finishes,
+    so runs for the same User never overlap: submitting a User that is waiting in the pool does
+    nothing, and submitting one whose run has started makes that run go again once it finishes,
+    picking up the edit. Work still waiting in the pool is lost when the process restarts."""
+
+    def __init__(self, max_workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aids-recompute")
+        self.lock = threading.Lock()
+        self.pending: set["UUID"] = set()
+        self.running: set["UUID"] = set()
+        self.rerun: set["UUID"] = set()
+
+    def enqueue_user(self, user_pk: "UUID") -> None:
+        transaction.on_commit(lambda: self.submit(user_pk))
+
+    def submit(self, user_pk: "UUID") -> Union[Future, None]:
+        with self.lock:
+            if user_pk in self.pending:
+                if user_pk in self.running:
+                    self.rerun.add(user_pk)
+                return None
+            self.pending.add(user_pk)
+        return self.executor.submit(self.run, user_pk)
+
+    def run(self, user_pk: "UUID") -> None:
+        with self.lock:
+            self.running.add(user_pk)
+        try:
+            while True:
+                try:
+                    recompute_user_aids(user_pk)
+                except Exception:  # pylint: disable=W0718
+                    logger.exception("Recomputing the aids for User %s failed.", user_pk)
+                with self.lock:
+                    if user_pk in self.rerun:
+                        self.rerun.discard(user_pk)
+                        continue
+                    self.running.discard(user_pk)
+                    self.pending.discard(user_pk)
+                    return
+        finally:
+            connections.close_all()
+
+
+class DatabaseQueueBackend(DeferredBackend):
+    """Stores an AidsRecomputeJob per User, to be processed by the process_aids_recompute_jobs
+    management command. Enqueueing a User that already has a job only bumps its enqueued time."""
+
+    def enqueue_user(self, user_pk: "UUID") -> None:
+        job_model = apps.get_model("users.AidsRecomputeJob")
+        job_model.objects.bulk_create(
+            [job_model(user_id=user_pk)],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["enqueued"],
+        )
+
+    def claim(self, exclude: list[int]) -> Union["AidsRecomputeJob", None]:
+        """Locks and returns the oldest job not in exclude, skipping any locked by another worker.
+        Must be called in a transaction, which holds the lock until it ends."""
+        job_model = apps.get_model("users.AidsRecomputeJob")
+        return (
+            job_model.objects.select_for_update(skip_locked=True).exclude(pk__in=exclude).order_by("enqueued").first()
+        )
+
+    def process(self, limit: int = 100) -> int:
+        """Processes up to limit jobs and returns the number processed. Each job is claimed and deleted
+        in the same transaction as its User's aids are recomputed, so a job whose recompute raises, or
+        whose worker is killed, stays in the queue for a later run. Enqueueing the User of a job that
+        is being processed waits for the job's transaction to end and then queues a new job."""
+        failed: list[int] = []
+        processed = 0
+        while processed + len(failed) < limit:
+            with transaction.atomic():
+                job = self.claim(exclude=failed)
+                if job is None:
+                    break
+                try:
+                    with transaction.atomic():
+                        recompute_user_aids(job.user_id)
+                except Exception:  # pylint: disable=W0718
+                    logger.exception("Recomputing the aids for User %s failed.", job.user_id)
+                    failed.append(job.pk)
+                    continue
+                job.delete()
+            processed += 1
+        return processed
+
+
+@lru_cache(maxsize=None)
+def get_aids_recompute_backend() -> AidsRecomputeBackend:
+    return import_string(settings.AIDS_RECOMPUTE_BACKEND)()
+
+
+def aids_recompute_is_deferred() -> bool:
+    """Returns True if the configured backend updates related aids after the request has returned."""
+    return get_aids_recompute_backend().deferred
+
+
+def aids_recompute_enqueue(aid: "Aids") -> None:
+    """Hands the aid to the configured backend to have its related aids updated."""
+    get_aids_recompute_backend().enqueue(aid)
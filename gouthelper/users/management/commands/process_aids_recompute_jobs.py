@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...deferred import DatabaseQueueBackend
+
+
+class Command(BaseCommand):
+    help = "Process the AidsRecomputeJobs queued by the DatabaseQueueBackend."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Maximum number of jobs processed before checking the queue is empty.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new jobs instead of exiting once the queue is empty.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls of an empty queue when --loop is set.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        backend = DatabaseQueueBackend()
+        processed = 0
+        while True:
+            count = backend.process(limit=options["batch_size"])
+            processed += count
+            if not count:
+                if not options["loop"]:
+                    break
+                time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} AidsRecomputeJobs."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Pseudopatient
+from ...services import PseudopatientAidsRecompute
+
+
+class Command(BaseCommand):
+    help = "Recompute the decision aids for all Pseudopatients, or for those of one or more providers, \
+in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--provider",
+            action="append",
+            dest="providers",
+            help="Username of a provider whose Pseudopatients should be recomputed. Can be repeated.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of Pseudopatients fetched and updated per chunk.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+        pseudopatients = Pseudopatient.objects.all()
+        if options["providers"]:
+            pseudopatients = pseudopatients.filter(pseudopatientprofile__provider__username__in=options["providers"])
+        recompute = PseudopatientAidsRecompute(pseudopatients=pseudopatients, chunk_size=options["chunk_size"])
+        recompute.run(progress=self.write_progress)
+        updated = ", ".join(f"{model_name}: {count}" for model_name, count in sorted(recompute.aids_updated.items()))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed {recompute.aids_processed} aids for {recompute.pseudopatients_processed} Pseudopatients \
+in {recompute.elapsed:.2f}s ({recompute.throughput:.1f} Pseudopatients/s). Updated {updated or 'none'}."
+            )
+        )
+
+    def write_progress(self, recompute: PseudopatientAidsRecompute) -> None:
+        self.stdout.write(
+            f"{recompute.pseudopatients_processed}/{recompute.pseudopatients_total} Pseudopatients, \
+{recompute.aids_processed} aids, {recompute.throughput:.1f} Pseudopatients/s"
+        )
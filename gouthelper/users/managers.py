@@ -5,13 +5,13 @@ from django.contrib.auth.base_user import BaseUserManager  # pylint:disable=E040
 from ..flareaids.selectors import flareaid_user_relations
 from ..flares.selectors import flare_user_relations
 from ..goalurates.selectors import goalurate_user_relations
-from ..labs.selectors import dated_urates_relation
+from ..labs.selectors import dated_urates_relation, urates_goal_status_annotations
 from ..ppxaids.selectors import ppxaid_user_relations
 from ..ppxs.selectors import ppx_user_relations
 from ..ultaids.selectors import ultaid_user_relations
 from ..ults.selectors import ult_user_relations
 from .choices import Roles
-from .selectors import pseudopatient_related_aids, pseudopatient_relations
+from .selectors import pseudopatient_panel_annotations, pseudopatient_related_aids, pseudopatient_relations
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -87,6 +87,9 @@ class PseudopatientManager(BaseUserManager):
     def goalurate_qs(self):
         return goalurate_user_relations(self.get_queryset())
 
+    def panel_qs(self):
+        return pseudopatient_panel_annotations(self.get_queryset())
+
     def ppxaid_qs(self):
         return ppxaid_user_relations(self.get_queryset())
 
@@ -105,6 +108,9 @@ class PseudopatientManager(BaseUserManager):
     def urates_dated_qs(self):
         return dated_urates_relation(self.get_queryset())
 
+    def urates_goal_status_qs(self):
+        return urates_goal_status_annotations(self.get_queryset())
+
     def create(self, **kwargs):
         kwargs.update({"role": Roles.PSEUDOPATIENT})
         return super().create(**kwargs)
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.6 on 2026-10-17 05:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_aidsrecomputejob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["-modified", "-id"], name="users_user_modified_id_idx"),
+        ),
+    ]
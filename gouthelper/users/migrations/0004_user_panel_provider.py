@@ -0,0 +1,61 @@
+# Generated by Django 4.2.6 on 2026-10-17 06:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def set_users_panel_provider(apps, schema_editor):
+    """Copies the provider of each PseudopatientProfile to its User's panel_provider,
+    with a single UPDATE."""
+    PseudopatientProfile = apps.get_model("profiles", "PseudopatientProfile")
+    User = apps.get_model("users", "User")
+    User.objects.using(schema_editor.connection.alias).filter(pseudopatientprofile__provider__isnull=False).update(
+        panel_provider=Subquery(PseudopatientProfile.objects.filter(user=OuterRef("pk")).values("provider")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0002_initial"),
+        ("users", "0003_user_modified_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicaluser",
+            name="panel_provider",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                default=None,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="panel_provider",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                default=None,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(set_users_panel_provider, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["panel_provider", "-modified", "-id"], name="users_user_provider_modified_id_idx"
+            ),
+        ),
+    ]
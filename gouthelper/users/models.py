@@ -1,23 +1,40 @@
 from django.apps import apps  # type: ignore
 from django.contrib.auth.models import AbstractUser
-from django.db.models import CharField, CheckConstraint, Q
+from django.db.models import (
+    CASCADE,
+    SET_NULL,
+    CharField,
+    CheckConstraint,
+    DateTimeField,
+    ForeignKey,
+    Index,
+    Model,
+    OneToOneField,
+    Q,
+)
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel  # type: ignore
 from rules.contrib.models import RulesModelBase, RulesModelMixin
-from simple_history.models import HistoricalRecords  # type: ignore
 
 from ..genders.helpers import get_gender_abbreviation
+from ..medallergys.helpers import MedAllergysList
+from ..medhistorys.helpers import MedHistorysList
 from ..utils.helpers import shorten_date_for_str
-from ..utils.models import GoutHelperModel, GoutHelperPatientModel
+from ..utils.history import GoutHelperHistoricalRecords
+from ..utils.indexes import IndexedListAttribute
+from ..utils.models import DirtyFieldsMixin, GoutHelperModel, GoutHelperPatientModel
 from .choices import Roles
 from .helpers import get_user_change
 from .managers import AdminManager, GoutHelperUserManager, PatientManager, ProviderManager, PseudopatientManager
 from .rules import change_user, delete_user, view_user
 
 
-class User(RulesModelMixin, GoutHelperModel, TimeStampedModel, AbstractUser, metaclass=RulesModelBase):
+class User(
+    RulesModelMixin, DirtyFieldsMixin, GoutHelperModel, TimeStampedModel, AbstractUser, metaclass=RulesModelBase
+):
     """
     Default custom user model for GoutHelper.
     If adding fields that need to be filled at user signup,
@@ -31,6 +48,12 @@ class User(RulesModelMixin, GoutHelperModel, TimeStampedModel, AbstractUser, met
                 check=(Q(role__in=Roles.values)),
             ),
         ]
+        indexes = [
+            # For the keyset pagination of Users, most recently modified first
+            Index(fields=["-modified", "-id"], name="users_user_modified_id_idx"),
+            # For the keyset pagination of a provider's panel of Pseudopatients, most recently modified first
+            Index(fields=["panel_provider", "-modified", "-id"], name="users_user_provider_modified_id_idx"),
+        ]
         rules_permissions = {
             "change": change_user,
             "delete": delete_user,
@@ -44,11 +67,28 @@ class User(RulesModelMixin, GoutHelperModel, TimeStampedModel, AbstractUser, met
     first_name = None  # type: ignore
     last_name = None  # type: ignore
     role = CharField(_("Role"), max_length=50, choices=Roles.choices, default=Roles.PROVIDER)
+    # A Pseudopatient's PseudopatientProfile.provider, kept in sync by the profile's signals,
+    # so that the provider's panel can be read from users_user_provider_modified_id_idx, which
+    # leads with it and so replaces the ForeignKey's own index
+    panel_provider = ForeignKey(
+        "self",
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        related_name="+",
+        db_index=False,
+    )
     objects = GoutHelperUserManager()
-    history = HistoricalRecords(
+    history = GoutHelperHistoricalRecords(
         get_user=get_user_change,
     )
 
+    # Prefetched with to_attr and indexed by MedHistoryType / Treatment
+    medallergys_qs = IndexedListAttribute(MedAllergysList)
+    medhistorys_qs = IndexedListAttribute(MedHistorysList)
+
     def get_absolute_url(self) -> str:
         return reverse("users:detail", kwargs={"username": self.username})
 
@@ -183,3 +223,14 @@ class Pseudopatient(GoutHelperPatientModel, User):
         post_fix = f"#{self.provider_alias}" if self.provider_alias and self.provider_alias > 1 else ""
 
         return f"{pre_fix}" f"[{shorten_date_for_str(date=self.created.date(), month_abbrev=True)}]" f"{post_fix}"
+
+
+class AidsRecomputeJob(Model):
+    """Pending request to recompute a User's decision aids, used by the DatabaseQueueBackend.
+    One row per User, so repeated edits to the same User's aids are deduplicated."""
+
+    user = OneToOneField(User, on_delete=CASCADE, related_name="aidsrecomputejob")
+    enqueued = DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"AidsRecomputeJob: {self.user} ({self.enqueued})"
@@ -1,10 +1,23 @@
 from typing import TYPE_CHECKING
 
 from django.apps import apps  # type: ignore
-from django.db.models import Prefetch, Q  # pylint:disable=E0401  # type: ignore
-
+from django.db.models import (  # pylint:disable=E0401  # type: ignore
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce  # pylint:disable=E0401  # type: ignore
+from django.utils import timezone  # pylint:disable=E0401  # type: ignore
+
+from ..flares.helpers import flares_may_be_gout_q
 from ..flares.selectors import flares_prefetch, most_recent_flare_prefetch
-from ..labs.selectors import urates_prefetch
+from ..labs.selectors import urates_goal_status_annotations, urates_prefetch
 from ..medallergys.selectors import medallergys_prefetch
 from ..medhistorys.choices import MedHistoryTypes
 from ..medhistorys.selectors import medhistorys_prefetch
@@ -153,3 +166,34 @@ def pseudopatient_filter_age_gender(qs: "QuerySet", age: int, gender: "Genders")
         age=age,
         gender__value=gender,
     )
+
+
+def pseudopatient_panel_annotations(qs: "QuerySet") -> "QuerySet":
+    """Annotates a Pseudopatient QuerySet with the summaries a provider's panel of Pseudopatients
+    shows for each, with subqueries and joins rather than prefetches, so that a page of the panel
+    is fetched with a single query:
+    - flares_last_year: the number of Flares that may have been gout that started within the last year
+    - flare_open: whether or not any Flare hasn't ended
+    - ult_indication / ppx_indication: the Ult and Ppx indication, if the Pseudopatient has one
+    - the goal urate and last Urate annotations of urates_goal_status_annotations()
+    Selects the related objects Pseudopatient.__str__() uses."""
+    flares = apps.get_model("flares.Flare").objects.filter(user=OuterRef("pk"))
+    qs = qs.select_related("dateofbirth", "gender", "pseudopatientprofile__provider").annotate(
+        flares_last_year=Coalesce(
+            Subquery(
+                flares.filter(
+                    flares_may_be_gout_q(), date_started__gt=timezone.now().date() - timezone.timedelta(days=365)
+                )
+                .order_by()
+                .values("user")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            Value(0),
+            output_field=IntegerField(),
+        ),
+        flare_open=Exists(flares.filter(date_ended__isnull=True)),
+        ult_indication=F("ult__indication"),
+        ppx_indication=F("ppx__indication"),
+    )
+    return urates_goal_status_annotations(qs)
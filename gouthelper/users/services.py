@@ -0,0 +1,138 @@
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Callable, Union
+
+from django.apps import apps  # pylint: disable=E0401  # type: ignore
+from django.db import transaction  # pylint: disable=E0401  # type: ignore
+from django.utils import timezone  # pylint: disable=E0401  # type: ignore
+from simple_history.utils import bulk_update_with_history  # type: ignore
+
+from ..flares.services import flarecounts_get, flarecounts_recount
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet  # type: ignore
+
+    from ..utils.types import Aids
+    from .models import Pseudopatient
+
+
+class PseudopatientAidsRecompute:
+    """Recomputes the decision aids (FlareAid, Flares, GoalUrate, PpxAid, Ppx, UltAid, and Ult)
+    for a QuerySet of Pseudopatients in chunks. Each chunk is fetched with a single prefetched
+    Pseudopatient.objects.all_related_objects() QuerySet, the aids are calculated in memory
+    with their decision_aid_service, and the aids that changed, along with any related objects
+    their services changed (i.e. Ppx GoutDetails), are written back with one bulk_update (plus
+    history) per model per chunk. FlareCounts are recounted in memory from the recomputed Flares."""
+
+    def __init__(
+        self,
+        pseudopatients: Union["QuerySet[Pseudopatient]", None] = None,
+        chunk_size: int = 100,
+    ):
+        self.pseudopatient_model = apps.get_model("users.Pseudopatient")
+        self.pseudopatients = pseudopatients if pseudopatients is not None else self.pseudopatient_model.objects.all()
+        self.chunk_size = chunk_size
+        self.pseudopatients_total = 0
+        self.pseudopatients_processed = 0
+        self.aids_processed = 0
+        self.aids_updated: dict[str, int] = defaultdict(int)
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Returns the number of Pseudopatients processed per second."""
+        return self.pseudopatients_processed / self.elapsed if self.elapsed else 0.0
+
+    def get_chunks(self) -> list[list]:
+        pks = list(self.pseudopatients.order_by("pk").values_list("pk", flat=True))
+        self.pseudopatients_total = len(pks)
+        return [pks[i : i + self.chunk_size] for i in range(0, len(pks), self.chunk_size)]
+
+    def get_chunk_qs(self, pks: list) -> "QuerySet[Pseudopatient]":
+        return self.pseudopatient_model.objects.all_related_objects().filter(pk__in=pks)
+
+    def recompute_aid(
+        self,
+        aid: "Aids",
+        pseudopatient: "Pseudopatient",
+        pending: dict[type["Model"], tuple[list["Model"], tuple[str, ...]]],
+    ) -> None:
+        """Calculates the aid without saving it and adds it to pending if it changed."""
+        decisionaid = aid.decision_aid_service(qs=pseudopatient)
+        decisionaid._update(commit=False)  # pylint: disable=W0212
+        self.aids_processed += 1
+        if decisionaid.aid_needs_2_be_saved() or decisionaid.inputs_fingerprint_has_changed():
+            self.add_pending(decisionaid.model_attr, decisionaid.result_fields + ("inputs_fingerprint",), pending)
+        for obj in decisionaid.related_objs_2_be_saved():
+            self.add_pending(obj, tuple(obj.get_dirty_fields()), pending)
+
+    @staticmethod
+    def add_pending(
+        obj: "Model",
+        fields: tuple[str, ...],
+        pending: dict[type["Model"], tuple[list["Model"], tuple[str, ...]]],
+    ) -> None:
+        """Adds obj to the objects of its model to be bulk updated, along with the fields to update."""
+        obj.modified = timezone.now()
+        model = obj.__class__
+        objs, pending_fields = pending.get(model, ([], ()))
+        objs.append(obj)
+        pending[model] = (
+            objs,
+            pending_fields + tuple(field for field in fields + ("modified",) if field not in pending_fields),
+        )
+
+    def recompute_pseudopatient(
+        self,
+        pseudopatient: "Pseudopatient",
+        pending: dict[type["Model"], tuple[list["Model"], tuple[str, ...]]],
+    ) -> None:
+        # FlareDecisionAid fetches the Flare from the Pseudopatient's flare_qs attr
+        for flare in pseudopatient.flares_qs:
+            pseudopatient.flare_qs = flare
+            self.recompute_aid(flare, pseudopatient, pending)
+        if hasattr(pseudopatient, "flare_qs"):
+            del pseudopatient.flare_qs
+        # The Flares' likelihoods are bulk updated without the signals that keep the FlareCount up to date,
+        # so recount it from them before the Ult is recomputed from it
+        flarecount = flarecounts_get(pseudopatient)
+        if flarecount:
+            changed = flarecounts_recount(flarecount, pseudopatient.flares_qs)
+            if changed:
+                self.add_pending(flarecount, tuple(changed), pending)
+        for aid_attr in self.pseudopatient_model.list_of_related_aid_models():
+            aid = getattr(pseudopatient, aid_attr, None)
+            if aid:
+                self.recompute_aid(aid, pseudopatient, pending)
+
+    def recompute_chunk(self, pks: list) -> None:
+        pending: dict[type["Model"], tuple[list["Model"], tuple[str, ...]]] = {}
+        with transaction.atomic():
+            for pseudopatient in self.get_chunk_qs(pks):
+                self.recompute_pseudopatient(pseudopatient, pending)
+                self.pseudopatients_processed += 1
+            for model, (objs, fields) in pending.items():
+                if hasattr(model._meta, "simple_history_manager_attribute"):
+                    bulk_update_with_history(objs, model, fields, batch_size=self.chunk_size)
+                else:
+                    model.objects.bulk_update(objs, fields, batch_size=self.chunk_size)
+                self.aids_updated[model._meta.model_name] += len(objs)
+
+    def run(
+        self,
+        progress: Callable[["PseudopatientAidsRecompute"], None] | None = None,
+    ) -> "PseudopatientAidsRecompute":
+        """Recomputes the aids for all the Pseudopatients, calling progress (if provided)
+        after each chunk.
+
+        Returns:
+            PseudopatientAidsRecompute: self, with the counts and timing populated
+        """
+        start = time.perf_counter()
+        for pks in self.get_chunks():
+            self.recompute_chunk(pks)
+            self.elapsed = time.perf_counter() - start
+            if progress:
+                progress(self)
+        self.elapsed = time.perf_counter() - start
+        return self
@@ -0,0 +1,151 @@
+import threading
+from unittest.mock import patch
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+
+from ...flareaids.models import FlareAid
+from ...flareaids.tests.factories import create_flareaid
+from ...flares.tests.factories import create_flare
+from ..deferred import DatabaseQueueBackend, SynchronousBackend, ThreadPoolBackend
+from ..models import AidsRecomputeJob, Pseudopatient
+from .factories import create_psp
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSynchronousBackend(TestCase):
+    def test__enqueue_updates_related_objects(self):
+        psp = create_psp(plus=True)
+        flareaid = create_flareaid(user=psp)
+        flare = create_flare(user=psp)
+        FlareAid.objects.filter(pk=flareaid.pk).update(decisionaid={}, inputs_fingerprint=None)
+        # The views set the aid's user to the Pseudopatient fetched with its related objects
+        flare.user = Pseudopatient.objects.all_related_objects().get(pk=psp.pk)
+        SynchronousBackend().enqueue(flare)
+        self.assertTrue(FlareAid.objects.get(pk=flareaid.pk).inputs_fingerprint)
+
+
+class TestThreadPoolBackend(TestCase):
+    def test__submit_deduplicates_pending_users(self):
+        backend = ThreadPoolBackend(max_workers=1)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def recompute(user_pk):
+            calls.append(user_pk)
+            if user_pk == "running":
+                started.set()
+                release.wait(5)
+
+        with patch("gouthelper.users.deferred.recompute_user_aids", side_effect=recompute), patch(
+            "gouthelper.users.deferred.connections"
+        ):
+            running = backend.submit("running")
+            started.wait(5)
+            # "waiting" is queued behind "running" and isn't queued again
+            waiting = backend.submit("waiting")
+            self.assertIsNone(backend.submit("waiting"))
+            release.set()
+            running.result(5)
+            waiting.result(5)
+        self.assertEqual(calls, ["running", "waiting"])
+        self.assertFalse(backend.pending)
+
+    def test__submit_during_run_reruns_without_overlapping(self):
+        backend = ThreadPoolBackend(max_workers=2)
+        started, release = threading.Event(), threading.Event()
+        active, overlaps = [], []
+        calls = []
+
+        def recompute(user_pk):
+            if active:
+                overlaps.append(user_pk)
+            active.append(user_pk)
+            calls.append(user_pk)
+            started.set()
+            release.wait(5)
+            active.pop()
+
+        with patch("gouthelper.users.deferred.recompute_user_aids", side_effect=recompute), patch(
+            "gouthelper.users.deferred.connections"
+        ):
+            running = backend.submit("running")
+            started.wait(5)
+            # The User stays pending while their run is in progress, so an edit made during
+            # the run is picked up by the same run going again rather than by a second one
+            self.assertIsNone(backend.submit("running"))
+            self.assertIsNone(backend.submit("running"))
+            release.set()
+            running.result(5)
+        self.assertEqual(calls, ["running", "running"])
+        self.assertFalse(overlaps)
+        self.assertFalse(backend.pending)
+        self.assertFalse(backend.running)
+        self.assertFalse(backend.rerun)
+
+    def test__enqueue_waits_for_commit(self):
+        backend = ThreadPoolBackend(max_workers=1)
+        flareaid = create_flareaid(user=create_psp(plus=True))
+        with patch.object(backend, "submit") as submit:
+            with self.captureOnCommitCallbacks() as callbacks:
+                backend.enqueue(flareaid)
+            submit.assert_not_called()
+            for callback in callbacks:
+                callback()
+            submit.assert_called_once_with(flareaid.user.pk)
+
+    def test__enqueue_without_user_is_synchronous(self):
+        backend = ThreadPoolBackend(max_workers=1)
+        flareaid = create_flareaid()
+        with patch.object(backend, "submit") as submit, patch.object(flareaid, "update_related_objects") as update:
+            backend.enqueue(flareaid)
+        submit.assert_not_called()
+        update.assert_called_once_with(qs=flareaid)
+
+
+class TestDatabaseQueueBackend(TestCase):
+    def setUp(self):
+        self.backend = DatabaseQueueBackend()
+        self.psp = create_psp(plus=True)
+        self.flareaid = create_flareaid(user=self.psp)
+        self.flare = create_flare(user=self.psp)
+        FlareAid.objects.filter(pk=self.flareaid.pk).update(decisionaid={}, inputs_fingerprint=None)
+
+    def test__enqueue_deduplicates_per_user(self):
+        self.backend.enqueue(self.flare)
+        enqueued = AidsRecomputeJob.objects.get(user=self.psp).enqueued
+        self.backend.enqueue(self.flareaid)
+        self.assertEqual(AidsRecomputeJob.objects.count(), 1)
+        self.assertGreater(AidsRecomputeJob.objects.get(user=self.psp).enqueued, enqueued)
+
+    def test__process(self):
+        self.backend.enqueue(self.flare)
+        self.assertEqual(self.backend.process(), 1)
+        self.assertFalse(AidsRecomputeJob.objects.exists())
+        self.assertTrue(FlareAid.objects.get(pk=self.flareaid.pk).inputs_fingerprint)
+        self.assertEqual(self.backend.process(), 0)
+
+    def test__process_limit(self):
+        self.backend.enqueue(self.flare)
+        self.backend.enqueue(create_flareaid(user=create_psp(plus=True)))
+        self.assertEqual(self.backend.process(limit=1), 1)
+        self.assertEqual(AidsRecomputeJob.objects.count(), 1)
+
+    def test__process_keeps_failed_jobs(self):
+        other_psp = create_psp(plus=True)
+        self.backend.enqueue(self.flare)
+        self.backend.enqueue(create_flareaid(user=other_psp))
+
+        def recompute_user_aids(user_pk):
+            if user_pk == self.psp.pk:
+                raise ValueError
+
+        with patch("gouthelper.users.deferred.recompute_user_aids", side_effect=recompute_user_aids) as recompute:
+            self.assertEqual(self.backend.process(), 1)
+        self.assertEqual(recompute.call_count, 2)
+        self.assertEqual(list(AidsRecomputeJob.objects.values_list("user", flat=True)), [self.psp.pk])
+        # The job is processed by a later run
+        self.assertEqual(self.backend.process(), 1)
+        self.assertFalse(AidsRecomputeJob.objects.exists())
+        self.assertTrue(FlareAid.objects.get(pk=self.flareaid.pk).inputs_fingerprint)
@@ -16,3 +16,8 @@ def test_user_list():
 def test_user_me():
     assert reverse("api:user-me") == "/api/users/me/"
     assert resolve("/api/users/me/").view_name == "api:user-me"
+
+
+def test_pseudopatient_panel():
+    assert reverse("api:pseudopatient-panel-list") == "/api/panel/"
+    assert resolve("/api/panel/").view_name == "api:pseudopatient-panel-list"
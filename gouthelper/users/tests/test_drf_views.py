@@ -1,8 +1,11 @@
+from urllib.parse import parse_qs, urlparse
+
 import pytest
-from rest_framework.test import APIRequestFactory
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-from gouthelper.users.api.views import UserViewSet
+from gouthelper.users.api.views import PseudopatientPanelViewSet, UserViewSet
 from gouthelper.users.models import User
+from gouthelper.users.tests.factories import create_psp
 
 
 class TestUserViewSet:
@@ -33,3 +36,39 @@ class TestUserViewSet:
             "url": f"http://testserver/api/users/{user.username}/",
             "name": user.name,
         }
+
+
+class TestPseudopatientPanelViewSet:
+    @pytest.fixture
+    def api_rf(self) -> APIRequestFactory:
+        return APIRequestFactory()
+
+    def get_response(self, api_rf: APIRequestFactory, user: User, **params):
+        request = api_rf.get("/api/panel/", params)
+        force_authenticate(request, user=user)
+        return PseudopatientPanelViewSet.as_view({"get": "list"})(request)
+
+    def test_list(self, user: User, api_rf: APIRequestFactory):
+        psps = [create_psp(provider=user) for _ in range(3)]
+        create_psp()
+
+        response = self.get_response(api_rf, user, page_size=2)
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 2
+        assert response.data["previous"] is None
+        assert set(response.data["results"][0].keys()) >= {"flares_last_year", "ult_indication", "urate_last_value"}
+
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+        next_response = self.get_response(api_rf, user, page_size=2, cursor=cursor)
+
+        assert len(next_response.data["results"]) == 1
+        assert next_response.data["next"] is None
+        assert {row["id"] for row in response.data["results"] + next_response.data["results"]} == {
+            str(psp.pk) for psp in psps
+        }
+
+    def test_invalid_cursor(self, user: User, api_rf: APIRequestFactory):
+        response = self.get_response(api_rf, user, cursor="not-a-cursor")
+
+        assert response.status_code == 404
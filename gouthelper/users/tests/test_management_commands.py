@@ -0,0 +1,55 @@
+from io import StringIO
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.core.management import CommandError, call_command  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+
+from ...flareaids.models import FlareAid
+from ...flareaids.tests.factories import create_flareaid
+from ..deferred import DatabaseQueueBackend
+from ..models import AidsRecomputeJob
+from .factories import UserFactory, create_psp
+
+pytestmark = pytest.mark.django_db
+
+
+class TestRecomputeAids(TestCase):
+    def setUp(self):
+        self.provider = UserFactory()
+        self.provider_flareaid = create_flareaid(user=create_psp(plus=True, provider=self.provider))
+        self.flareaid = create_flareaid(user=create_psp(plus=True))
+
+    def test__command_output(self):
+        out = StringIO()
+        call_command("recompute_aids", stdout=out)
+        self.assertIn("2/2 Pseudopatients", out.getvalue())
+        self.assertIn("Recomputed 2 aids for 2 Pseudopatients", out.getvalue())
+
+    def test__provider(self):
+        out = StringIO()
+        call_command("recompute_aids", "--provider", self.provider.username, stdout=out)
+        self.assertIn("for 1 Pseudopatients", out.getvalue())
+        self.assertTrue(FlareAid.objects.get(pk=self.provider_flareaid.pk).inputs_fingerprint)
+        self.assertFalse(FlareAid.objects.get(pk=self.flareaid.pk).inputs_fingerprint)
+
+    def test__invalid_chunk_size(self):
+        with self.assertRaises(CommandError):
+            call_command("recompute_aids", "--chunk-size", "0")
+
+
+class TestProcessAidsRecomputeJobs(TestCase):
+    def setUp(self):
+        self.flareaid = create_flareaid(user=create_psp(plus=True))
+        FlareAid.objects.filter(pk=self.flareaid.pk).update(inputs_fingerprint=None)
+        DatabaseQueueBackend().enqueue(self.flareaid)
+
+    def test__command_output(self):
+        out = StringIO()
+        call_command("process_aids_recompute_jobs", stdout=out)
+        self.assertIn("Processed 1 AidsRecomputeJobs.", out.getvalue())
+        self.assertFalse(AidsRecomputeJob.objects.exists())
+        self.assertTrue(FlareAid.objects.get(pk=self.flareaid.pk).inputs_fingerprint)
+
+    def test__invalid_batch_size(self):
+        with self.assertRaises(CommandError):
+            call_command("process_aids_recompute_jobs", "--batch-size", "0")
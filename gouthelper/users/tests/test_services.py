@@ -0,0 +1,122 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+from django.utils import timezone  # pylint: disable=E0401 # type: ignore
+
+from ...flareaids.models import FlareAid
+from ...flareaids.tests.factories import create_flareaid
+from ...flares.choices import DiagnosedChoices
+from ...flares.models import Flare, FlareCount
+from ...flares.services import flarecounts_reconcile
+from ...flares.tests.factories import create_flare
+from ...goalurates.models import GoalUrate
+from ...goalurates.tests.factories import create_goalurate
+from ...labs.models import Urate
+from ...labs.tests.factories import UrateFactory
+from ...medhistorydetails.models import GoutDetail
+from ...ppxaids.models import PpxAid
+from ...ppxaids.tests.factories import create_ppxaid
+from ...ppxs.models import Ppx
+from ...ppxs.tests.factories import create_ppx
+from ...ultaids.models import UltAid
+from ...ultaids.tests.factories import create_ultaid
+from ...ults.models import Ult
+from ...ults.tests.factories import create_ult
+from ..models import Pseudopatient
+from ..services import PseudopatientAidsRecompute
+from .factories import UserFactory, create_psp
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPseudopatientAidsRecompute(TestCase):
+    def setUp(self):
+        self.provider = UserFactory()
+        for _ in range(5):
+            psp = create_psp(plus=True, provider=self.provider)
+            create_flareaid(user=psp)
+            create_flare(user=psp)
+            create_goalurate(user=psp)
+            create_ppxaid(user=psp)
+            create_ppx(user=psp)
+            create_ultaid(user=psp)
+            create_ult(user=psp)
+        self.other_psp = create_psp(plus=True)
+        create_flareaid(user=self.other_psp)
+        self.aid_models = [FlareAid, Flare, GoalUrate, PpxAid, Ppx, UltAid, Ult]
+        for model in self.aid_models:
+            model.objects.update(inputs_fingerprint=None)
+        FlareAid.objects.update(decisionaid={})
+        PpxAid.objects.update(decisionaid={})
+        UltAid.objects.update(decisionaid={})
+
+    def test__run(self):
+        progress = []
+        recompute = PseudopatientAidsRecompute(
+            pseudopatients=Pseudopatient.objects.filter(pseudopatientprofile__provider=self.provider),
+            chunk_size=2,
+        ).run(progress=lambda recompute: progress.append(recompute.pseudopatients_processed))
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(recompute.pseudopatients_total, 5)
+        self.assertEqual(recompute.aids_processed, 35)
+        self.assertEqual(
+            sum(recompute.aids_updated[model._meta.model_name] for model in self.aid_models),
+            35,
+        )
+        self.assertTrue(recompute.throughput)
+        for model in self.aid_models:
+            for aid in model.objects.filter(user__pseudopatientprofile__provider=self.provider):
+                self.assertTrue(aid.inputs_fingerprint)
+                self.assertTrue(aid.history.filter(inputs_fingerprint=aid.inputs_fingerprint).exists())
+        for model in [FlareAid, PpxAid, UltAid]:
+            for aid in model.objects.filter(user__pseudopatientprofile__provider=self.provider):
+                self.assertTrue(aid.decisionaid)
+        # Pseudopatients not in the QuerySet aren't recomputed
+        self.assertFalse(FlareAid.objects.get(user=self.other_psp).inputs_fingerprint)
+
+    def test__run_matches_update_aid(self):
+        PseudopatientAidsRecompute().run()
+        for model in self.aid_models:
+            for aid in model.objects.filter(user__isnull=False):
+                aid_dict = {field: getattr(aid, field) for field in aid.decision_aid_service.result_fields}
+                aid.update_aid()
+                aid.refresh_from_db()
+                self.assertEqual(
+                    aid_dict, {field: getattr(aid, field) for field in aid.decision_aid_service.result_fields}
+                )
+
+    def test__second_run_does_not_update(self):
+        PseudopatientAidsRecompute().run()
+        recompute = PseudopatientAidsRecompute().run()
+        self.assertTrue(recompute.aids_processed)
+        self.assertFalse(sum(recompute.aids_updated.values()))
+
+    def test__run_bulk_updates_goutdetails(self):
+        ppx = Ppx.objects.filter(user__pseudopatientprofile__provider=self.provider).first()
+        Urate.objects.filter(user=ppx.user).delete()
+        UrateFactory(user=ppx.user, date_drawn=timezone.now(), value=Decimal("4.5"))
+        UrateFactory(user=ppx.user, date_drawn=timezone.now() - timedelta(days=181), value=Decimal("4.5"))
+        GoutDetail.objects.filter(medhistory__user=ppx.user).update(at_goal=False, at_goal_long_term=False)
+        with patch.object(GoutDetail, "save_dirty") as save_dirty:
+            recompute = PseudopatientAidsRecompute().run()
+        save_dirty.assert_not_called()
+        self.assertTrue(recompute.aids_updated["goutdetail"])
+        goutdetail = GoutDetail.objects.get(medhistory__user=ppx.user)
+        self.assertTrue(goutdetail.at_goal)
+        self.assertTrue(goutdetail.at_goal_long_term)
+        self.assertTrue(goutdetail.history.filter(at_goal=True, at_goal_long_term=True).exists())
+
+    def test__run_recounts_flarecounts(self):
+        flare = Flare.objects.filter(user__pseudopatientprofile__provider=self.provider).first()
+        Flare.objects.filter(user=flare.user).update(diagnosed=DiagnosedChoices.YES)
+        flarecounts_reconcile(user_ids=[flare.user.pk])
+        PseudopatientAidsRecompute().run()
+        total = FlareCount.objects.get(user=flare.user).total
+        # Updating a Flare without signals leaves its User's FlareCount stale until it is recomputed
+        Flare.objects.filter(pk=flare.pk).update(diagnosed=DiagnosedChoices.NO)
+        recompute = PseudopatientAidsRecompute().run()
+        self.assertEqual(recompute.aids_updated["flarecount"], 1)
+        self.assertEqual(FlareCount.objects.get(user=flare.user).total, total - 1)
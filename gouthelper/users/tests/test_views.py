@@ -9,7 +9,7 @@ from django.contrib.auth.models import AnonymousUser
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -21,10 +21,13 @@ from ...dateofbirths.helpers import age_calc, yearsago
 from ...ethnicitys.choices import Ethnicitys
 from ...ethnicitys.forms import EthnicityForm
 from ...flareaids.tests.factories import CustomFlareAidFactory
+from ...flares.choices import DiagnosedChoices
 from ...flares.models import Flare
-from ...flares.tests.factories import CustomFlareFactory
+from ...flares.tests.factories import CustomFlareFactory, create_flare
 from ...genders.choices import Genders
 from ...genders.forms import GenderForm
+from ...goalurates.choices import GoalUrates
+from ...labs.tests.factories import UrateFactory
 from ...medhistorydetails.forms import GoutDetailForm
 from ...medhistorys.choices import MedHistoryTypes
 from ...medhistorys.forms import GoutForm, MenopauseForm
@@ -33,6 +36,8 @@ from ...medhistorys.models import Menopause
 from ...medhistorys.tests.factories import MenopauseFactory
 from ...profiles.models import PseudopatientProfile
 from ...treatments.choices import Treatments
+from ...ults.choices import Indications
+from ...ults.tests.factories import create_ult
 from ...utils.forms import forms_print_response_errors
 from ...utils.test_helpers import dummy_get_response
 from ..choices import Roles
@@ -43,6 +48,7 @@ from ..views import (
     PseudopatientDeleteView,
     PseudopatientFlareCreateView,
     PseudopatientListView,
+    PseudopatientPanelView,
     PseudopatientUpdateView,
     UserDeleteView,
     UserRedirectView,
@@ -740,6 +746,93 @@ class TestPseudopatientListView(TestCase):
             view.as_view()(request, **kwargs)
 
 
+class TestPseudopatientPanelView(TestCase):
+    def setUp(self):
+        self.rf = RequestFactory()
+        self.provider = UserFactory()
+        self.psps = [create_psp(provider=self.provider) for _ in range(4)]
+        self.other_psp = create_psp(provider=UserFactory())
+        self.psp = self.psps[0]
+        create_flare(
+            user=self.psp,
+            date_started=timezone.now().date() - timedelta(days=20),
+            date_ended=None,
+            urate=None,
+            diagnosed=DiagnosedChoices.YES,
+        )
+        # Flares that weren't gout aren't counted
+        create_flare(
+            user=self.psp,
+            date_started=timezone.now().date() - timedelta(days=40),
+            date_ended=timezone.now().date() - timedelta(days=35),
+            urate=None,
+            diagnosed=DiagnosedChoices.NO,
+        )
+        create_flare(
+            user=self.psp,
+            date_started=timezone.now().date() - timedelta(days=500),
+            date_ended=timezone.now().date() - timedelta(days=490),
+            urate=None,
+        )
+        UrateFactory(user=self.psp, value=Decimal("7.5"), date_drawn=timezone.now() - timedelta(days=100))
+        create_ult(user=self.psp)
+
+    def get_response(self, **params):
+        kwargs = {"username": self.provider.username}
+        request = self.rf.get(reverse("users:pseudopatient-panel", kwargs=kwargs), params)
+        request.user = self.provider
+        SessionMiddleware(dummy_get_response).process_request(request)
+        return PseudopatientPanelView.as_view()(request, **kwargs)
+
+    def test__annotates_summaries(self):
+        response = self.get_response()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({psp.pk for psp in response.context_data["object_list"]}, {psp.pk for psp in self.psps})
+        psp = next(psp for psp in response.context_data["object_list"] if psp.pk == self.psp.pk)
+        self.assertEqual(psp.flares_last_year, 1)
+        self.assertTrue(psp.flare_open)
+        self.assertEqual(psp.ult_indication, Pseudopatient.objects.get(pk=self.psp.pk).ult.indication)
+        self.assertIn(psp.ult_indication, Indications.values)
+        self.assertIsNone(psp.ppx_indication)
+        self.assertEqual(psp.urate_goal, GoalUrates.SIX)
+        self.assertEqual(psp.urate_last_value, Decimal("7.5"))
+        self.assertTrue(psp.urate_overdue)
+        self.assertFalse(psp.urate_at_goal)
+        response.render()
+        self.assertContains(response, "7.5 mg/dL")
+
+    def test__one_query_per_page(self):
+        with self.assertNumQueries(1):
+            response = self.get_response(page_size=2)
+            for psp in response.context_data["object_list"]:
+                str(psp)
+
+    def test__cursor_pagination(self):
+        response = self.get_response(page_size=3)
+        page_obj = response.context_data["page_obj"]
+        self.assertEqual(len(response.context_data["object_list"]), 3)
+        self.assertTrue(response.context_data["is_paginated"])
+        response = self.get_response(page_size=3, cursor=page_obj.next_cursor)
+        self.assertEqual(len(response.context_data["object_list"]), 1)
+        self.assertFalse(response.context_data["page_obj"].has_next)
+        seen = page_obj.object_list + response.context_data["object_list"]
+        self.assertEqual({psp.pk for psp in seen}, {psp.pk for psp in self.psps})
+        response.render()
+        self.assertContains(response, "previous")
+
+    def test__invalid_cursor_404s(self):
+        with self.assertRaises(Http404):
+            self.get_response(cursor="not-a-cursor")
+
+    def test__rules_provider_other_provider_panel(self):
+        provider2 = UserFactory()
+        kwargs = {"username": provider2.username}
+        request = self.rf.get(reverse("users:pseudopatient-panel", kwargs=kwargs))
+        request.user = self.provider
+        with pytest.raises(PermissionDenied):
+            PseudopatientPanelView.as_view()(request, **kwargs)
+
+
 class TestPseudopatientUpdateView(TestCase):
     def setUp(self):
         self.rf = RequestFactory()
@@ -6,6 +6,7 @@ from .views import (
     pseudopatient_detail_view,
     pseudopatient_flare_create_view,
     pseudopatient_list_view,
+    pseudopatient_panel_view,
     pseudopatient_update_view,
     user_delete_view,
     user_detail_view,
@@ -33,6 +34,7 @@ urlpatterns = [
     path("pseudopatients/<uuid:pseudopatient>/", view=pseudopatient_detail_view, name="pseudopatient-detail"),
     path("pseudopatients/<uuid:pseudopatient>/update/", view=pseudopatient_update_view, name="pseudopatient-update"),
     path("<str:username>/pseudopatients/", view=pseudopatient_list_view, name="pseudopatients"),
+    path("<str:username>/pseudopatients/panel/", view=pseudopatient_panel_view, name="pseudopatient-panel"),
     path("~redirect/", view=user_redirect_view, name="redirect"),
     path("~update/", view=user_update_view, name="update"),
     path("~delete/", view=user_delete_view, name="delete"),
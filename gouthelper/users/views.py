@@ -4,7 +4,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.forms import ModelForm
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -15,7 +15,9 @@ from ..flares.models import Flare
 from ..medhistorydetails.forms import GoutDetailForm
 from ..medhistorydetails.models import GoutDetail
 from ..medhistorys.choices import MedHistoryTypes
+from ..ults.choices import Indications
 from ..utils.exceptions import Continue
+from ..utils.pagination import InvalidCursor, KeysetPaginator, get_page_size
 from ..utils.views import GoutHelperUserDetailMixin, GoutHelperUserEditMixin
 from .choices import Roles
 from .dicts import (
@@ -251,13 +253,13 @@ class PseudopatientDetailView(AutoPermissionRequiredMixin, GoutHelperUserDetailM
         for onetoone in Pseudopatient.list_of_related_aid_models():
             related_onetoone = getattr(self.object, onetoone, None)
             if related_onetoone:
-                related_onetoone.update_aid(qs=self.object)
+                related_onetoone.update_aid(qs=self.object, stale_only=True)
 
     def update_most_recent_flare(self):
         most_recent_flare_qs = getattr(self.object, "most_recent_flare", None)
         most_recent_flare = most_recent_flare_qs[0] if most_recent_flare_qs else None
         if most_recent_flare and not most_recent_flare.date_ended:
-            most_recent_flare.update_aid(qs=self.object)
+            most_recent_flare.update_aid(qs=self.object, stale_only=True)
 
     def get_permission_object(self) -> Pseudopatient:
         return self.object
@@ -301,6 +303,38 @@ class PseudopatientListView(LoginRequiredMixin, PermissionRequiredMixin, GoutHel
 pseudopatient_list_view = PseudopatientListView.as_view()
 
 
+class PseudopatientPanelView(PseudopatientListView):
+    """ListView for a Provider or Admin's panel of Pseudopatients, with a summary of each
+    Pseudopatient's flares, ULT and PPX indications, goal urate, and last urate, fetched in one
+    query per page. Paginated by keyset (cursor) rather than by page number, with a page_size
+    query parameter, so that later pages are as fast as the first for large panels."""
+
+    template_name = "users/pseudopatient_panel.html"
+    paginate_by = 25
+    max_paginate_by = 100
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context.update({"Indications": Indications, "page_size": self.get_paginate_by(self.object_list)})
+        return context
+
+    def get_paginate_by(self, queryset) -> int:
+        return get_page_size(self.request.GET.get("page_size"), self.paginate_by, self.max_paginate_by)
+
+    def paginate_queryset(self, queryset, page_size):
+        try:
+            page = KeysetPaginator(queryset, page_size).page(self.request.GET.get("cursor"))
+        except InvalidCursor as exc:
+            raise Http404(_("Invalid cursor.")) from exc
+        return (None, page, page.object_list, page.has_next or page.has_previous)
+
+    def get_queryset(self):
+        return Pseudopatient.objects.panel_qs().filter(panel_provider=self.request.user)
+
+
+pseudopatient_panel_view = PseudopatientPanelView.as_view()
+
+
 class UserDeleteView(LoginRequiredMixin, AutoPermissionRequiredMixin, SuccessMessageMixin, DeleteView):
     model = User
 
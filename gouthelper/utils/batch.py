@@ -0,0 +1,130 @@
+import csv
+import json
+import multiprocessing
+from collections.abc import Iterable, Iterator
+from functools import cache, partial
+from itertools import islice
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+import django  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import DEFAULT_DB_ALIAS, connections  # type: ignore
+from django.http import QueryDict  # type: ignore
+from django.utils.module_loading import import_string  # type: ignore
+
+if TYPE_CHECKING:
+    from .types import AidNames
+    from .views import GoutHelperEvaluateMixin
+
+# Aids that can be evaluated in a batch, mapped to their in-memory evaluate view (see GoutHelperEvaluateMixin)
+BATCH_EVALUATE_VIEWS = {
+    "flare": "gouthelper.flares.views.FlareEvaluate",
+    "flareaid": "gouthelper.flareaids.views.FlareAidEvaluate",
+    "ppx": "gouthelper.ppxs.views.PpxEvaluate",
+    "ppxaid": "gouthelper.ppxaids.views.PpxAidEvaluate",
+    "ult": "gouthelper.ults.views.UltEvaluate",
+    "ultaid": "gouthelper.ultaids.views.UltAidEvaluate",
+}
+
+# Separator of the values of a multiple choice field, i.e. Flare joints, in a CSV cell
+BATCH_CSV_LIST_SEPARATOR = "|"
+
+
+def batch_read_records(file: IO[str], fmt: Literal["csv", "ndjson"]) -> Iterator[dict[str, Any]]:
+    """Lazily reads records, each the POST data of an aid's create form plus an optional "id" and "aid",
+    from a CSV file with a header row or from a file with one JSON object per line. In a CSV, empty cells
+    are empty values and cells containing BATCH_CSV_LIST_SEPARATOR are split into lists."""
+    if fmt == "csv":
+        for row in csv.DictReader(file):
+            yield {
+                key: value.split(BATCH_CSV_LIST_SEPARATOR) if BATCH_CSV_LIST_SEPARATOR in value else value
+                for key, value in row.items()
+                if key is not None
+            }
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Line {line_number} is not valid JSON: {exc}") from exc
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {line_number} is not a JSON object.")
+                yield record
+    else:
+        raise ValueError(f"Unsupported record format: {fmt}")
+
+
+@cache
+def batch_get_view(aid: "AidNames") -> type["GoutHelperEvaluateMixin"]:
+    try:
+        return import_string(BATCH_EVALUATE_VIEWS[aid])
+    except KeyError as exc:
+        raise ValueError(f"{aid} can't be evaluated in a batch.") from exc
+
+
+def batch_record_data(record: dict[str, Any]) -> QueryDict:
+    """Returns a record as the POST data of its aid's create form, with None as an empty value
+    and the values of lists (i.e. Flare joints) as multiple values."""
+    data = QueryDict(mutable=True)
+    for key, value in record.items():
+        if isinstance(value, list):
+            data.setlist(key, ["" if item is None else str(item) for item in value])
+        else:
+            data[key] = "" if value is None else str(value)
+    return data
+
+
+def batch_evaluate_record(record: dict[str, Any], aid: "AidNames | None" = None) -> dict[str, Any]:
+    """Evaluates a record in memory with its aid's evaluate view's forms and AidService.evaluate(), so that it
+    is validated and processed exactly like the aid's create form, without an HTTP request or writing to the
+    database. The record's "aid", if it has one, takes precedence over aid. Returns the evaluation, or the form
+    errors, with the record's id and aid."""
+    data = dict(record)
+    record_id = data.pop("id", None)
+    aid = data.pop("aid", None) or aid
+    if not aid:
+        raise ValueError("Records without an aid require a default aid.")
+    evaluation = batch_get_view(aid).evaluate_post_data(batch_record_data(data))
+    valid = "errors" not in evaluation
+    return {
+        "id": record_id,
+        "aid": aid,
+        "status": 200 if valid else 400,
+        "valid": valid,
+        **evaluation,
+    }
+
+
+def batch_init_worker(database_name: str, alias: str = DEFAULT_DB_ALIAS) -> None:
+    """Initializes a spawned worker process, pointing it at the parent's database, which differs from
+    the settings' when the parent is, for example, running against a test database."""
+    settings.DATABASES[alias]["NAME"] = database_name
+    django.setup()
+
+
+def batch_evaluate(
+    records: Iterable[dict[str, Any]],
+    aid: "AidNames | None" = None,
+    workers: int = 1,
+    chunk_size: int = 100,
+) -> Iterator[dict[str, Any]]:
+    """Lazily evaluates records with batch_evaluate_record, in the order they are read. With more than one
+    worker, the records are evaluated by a pool of spawned processes, chunk_size records per task, and no
+    more than workers * chunk_size * 2 records are read ahead of the results, so that large files are streamed
+    rather than read into memory."""
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be positive integers.")
+    evaluate = partial(batch_evaluate_record, aid=aid)
+    if workers == 1:
+        yield from map(evaluate, records)
+        return
+    records = iter(records)
+    window = workers * chunk_size * 2
+    with multiprocessing.get_context("spawn").Pool(
+        processes=workers,
+        initializer=batch_init_worker,
+        initargs=(connections[DEFAULT_DB_ALIAS].settings_dict["NAME"],),
+    ) as pool:
+        while batch := list(islice(records, window)):
+            yield from pool.imap(evaluate, batch, chunksize=chunk_size)
@@ -0,0 +1,231 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+import django  # type: ignore
+from django.apps import apps  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import connection  # type: ignore
+from django.test import Client, override_settings  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+from django.urls import reverse  # type: ignore
+
+from .instrumentation import capture_view_metrics
+
+if TYPE_CHECKING:
+    from ..users.models import Pseudopatient, User
+    from .types import Aids
+
+# Aid models whose decision aid services are benchmarked, in the order they are created for each Pseudopatient
+BENCHMARK_AID_MODELS = [
+    "flareaids.FlareAid",
+    "ppxaids.PpxAid",
+    "ultaids.UltAid",
+    "flares.Flare",
+    "ppxs.Ppx",
+    "ults.Ult",
+    "goalurates.GoalUrate",
+]
+
+
+def benchmarks_seed(seed: int) -> None:
+    """Seeds the stdlib random module, which the factories use directly, and FactoryBoy's
+    and Faker's random number generators, so that every run creates the same panel."""
+    from factory.random import reseed_random  # pylint: disable=E0401  # type: ignore
+
+    random.seed(seed)
+    reseed_random(seed)
+
+
+def benchmarks_git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmarks_create_provider() -> "User":
+    from ..users.tests.factories import UserFactory  # pylint: disable=E0401  # type: ignore
+
+    return UserFactory(username="benchmark-provider")
+
+
+def benchmarks_create_panel(
+    provider: "User",
+    size: int,
+    progress: Callable[[int], None] | None = None,
+) -> list["Pseudopatient"]:
+    """Creates size Pseudopatients for the provider with the test factories, each with
+    random MedHistorys, MedAllergys, and labs and one of each of the BENCHMARK_AID_MODELS."""
+    # Test factories are only installed with the local requirements
+    from ..flareaids.tests.factories import create_flareaid  # pylint: disable=E0401  # type: ignore
+    from ..flares.tests.factories import create_flare  # pylint: disable=E0401  # type: ignore
+    from ..goalurates.tests.factories import create_goalurate  # pylint: disable=E0401  # type: ignore
+    from ..ppxaids.tests.factories import create_ppxaid  # pylint: disable=E0401  # type: ignore
+    from ..ppxs.tests.factories import create_ppx  # pylint: disable=E0401  # type: ignore
+    from ..ultaids.tests.factories import create_ultaid  # pylint: disable=E0401  # type: ignore
+    from ..ults.tests.factories import create_ult  # pylint: disable=E0401  # type: ignore
+    from ..users.tests.factories import create_psp  # pylint: disable=E0401  # type: ignore
+
+    panel = []
+    for num in range(size):
+        psp = create_psp(provider=provider, plus=True)
+        for create in [create_flareaid, create_ppxaid, create_ultaid, create_flare, create_ppx, create_ult]:
+            create(user=psp)
+        create_goalurate(user=psp)
+        panel.append(psp)
+        if progress:
+            progress(num + 1)
+    return panel
+
+
+def benchmarks_summarize(name: str, size: int, timings: list[float], queries: list[int]) -> dict[str, Any]:
+    """Returns a result dict, with times in milliseconds, for a list of timings in seconds."""
+    timings_ms = sorted(timing * 1000 for timing in timings)
+    return {
+        "name": name,
+        "size": size,
+        "n": len(timings_ms),
+        "total_s": round(sum(timings) if timings else 0, 4),
+        "mean_ms": round(statistics.fmean(timings_ms), 3) if timings_ms else None,
+        "median_ms": round(statistics.median(timings_ms), 3) if timings_ms else None,
+        "p95_ms": round(timings_ms[min(int(len(timings_ms) * 0.95), len(timings_ms) - 1)], 3) if timings_ms else None,
+        "queries_mean": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+def benchmarks_time_services(panel: list["Pseudopatient"]) -> list[dict[str, Any]]:
+    """Times the construction and _update() of the decision aid service of each of the
+    panel's aids, in the same way GoutHelperAidModel.update_aid() calls them."""
+    results = []
+    for model_label in BENCHMARK_AID_MODELS:
+        model = apps.get_model(model_label)
+        timings: dict[str, list[float]] = defaultdict(list)
+        queries: dict[str, list[int]] = defaultdict(list)
+        aid: "Aids"
+        for aid in model.objects.filter(user__in=panel).select_related("user"):
+            with CaptureQueriesContext(connection) as init_queries:
+                start = time.perf_counter()
+                decisionaid = aid.decision_aid_service(qs=aid.get_update_qs())
+                timings["__init__"].append(time.perf_counter() - start)
+            with CaptureQueriesContext(connection) as update_queries:
+                start = time.perf_counter()
+                decisionaid._update()
+                timings["_update"].append(time.perf_counter() - start)
+            queries["__init__"].append(len(init_queries))
+            queries["_update"].append(len(update_queries))
+        for method in ["__init__", "_update"]:
+            results.append(
+                benchmarks_summarize(
+                    name=f"{model.decision_aid_service.__name__}.{method}",
+                    size=len(panel),
+                    timings=timings[method],
+                    queries=queries[method],
+                )
+            )
+    return results
+
+
+def benchmarks_view_urls(provider: "User", psp: "Pseudopatient") -> list[tuple[str, str]]:
+    """Returns a list of (view name, url) of the main detail and list views for a Pseudopatient."""
+    urls = [
+        ("users:pseudopatients", reverse("users:pseudopatients", kwargs={"username": provider.username})),
+        ("users:pseudopatient-detail", reverse("users:pseudopatient-detail", kwargs={"pseudopatient": psp.pk})),
+    ]
+    for model_label in BENCHMARK_AID_MODELS:
+        model = apps.get_model(model_label)
+        view_name = f"{model._meta.app_label}:pseudopatient-detail"
+        kwargs: dict[str, Any] = {"pseudopatient": psp.pk}
+        if model_label == "flares.Flare":
+            flare = model.objects.filter(user=psp).first()
+            if flare is None:
+                continue
+            kwargs["pk"] = flare.pk
+        urls.append((view_name, reverse(view_name, kwargs=kwargs)))
+    return urls
+
+
+def benchmarks_time_views(
+    provider: "User",
+    panel: list["Pseudopatient"],
+    sample: int,
+) -> list[dict[str, Any]]:
+    """Times GET requests, through the full middleware stack, to the main detail and list
+    views for up to sample of the panel's Pseudopatients."""
+    client = Client()
+    client.force_login(provider)
+    timings: dict[str, list[float]] = defaultdict(list)
+    queries: dict[str, list[int]] = defaultdict(list)
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]), capture_view_metrics() as captured:
+        for psp in panel[:sample]:
+            for _, url in benchmarks_view_urls(provider, psp):
+                client.get(url)
+    for metrics in captured:
+        timings[metrics.view_name].append(metrics.total_time)
+        queries[metrics.view_name].append(metrics.queries)
+    return [
+        benchmarks_summarize(
+            name=f"view {view_name}", size=len(panel), timings=timings[view_name], queries=queries[view_name]
+        )
+        for view_name in timings
+    ]
+
+
+def benchmarks_metadata(seed: int, sizes: list[int]) -> dict[str, Any]:
+    return {
+        "commit": benchmarks_git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "seed": seed,
+        "sizes": sizes,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+    }
+
+
+def benchmarks_compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    """Compares the median times of results to those of the same name and size in a baseline,
+    returning a list of dicts with the ratio of each and whether it is a regression, i.e. it
+    is slower than the baseline by more than threshold (0.1 = 10%) or makes more queries."""
+    baseline_dict = {(result["name"], result["size"]): result for result in baseline}
+    comparisons = []
+    for result in results:
+        base: Union[dict[str, Any], None] = baseline_dict.get((result["name"], result["size"]))
+        if base is None or not base["median_ms"] or result["median_ms"] is None:
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        more_queries = (result["queries_mean"] or 0) > (base["queries_mean"] or 0)
+        comparisons.append(
+            {
+                "name": result["name"],
+                "size": result["size"],
+                "baseline_median_ms": base["median_ms"],
+                "median_ms": result["median_ms"],
+                "ratio": round(ratio, 3),
+                "baseline_queries_mean": base["queries_mean"],
+                "queries_mean": result["queries_mean"],
+                "regression": ratio > 1 + threshold or more_queries,
+            }
+        )
+    return comparisons
+
+
+def benchmarks_load(path: str) -> dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
@@ -0,0 +1,71 @@
+import time
+from typing import Any, Callable
+
+from django.core.cache import cache  # pylint: disable=E0401  # type: ignore
+
+_MISSING = object()
+
+
+class VersionedCache:
+    """Two-level cache for objects that almost never change: values are held in the Django cache
+    and in a process-local dict, both keyed on a version stored in the Django cache under version_key.
+    clear() bumps the version, which invalidates every process's values. Each process re-reads the
+    version at most every version_ttl seconds, so local hits don't cost a round-trip to the Django
+    cache, and other processes see a change within that time."""
+
+    def __init__(self, version_key: str, timeout: int, version_ttl: int = 5):
+        self.version_key = version_key
+        self.timeout = timeout
+        self.version_ttl = version_ttl
+        self.version: Any = None
+        self.checked = 0.0
+        self.values: dict[Any, Any] = {}
+
+    def clear(self) -> None:
+        """Invalidates the values of every process by bumping the version in the Django cache.
+        Call it once the change is committed, i.e. with transaction.on_commit(), so that another
+        process can't re-cache the rows from before the change under the new version."""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), timeout=None)
+        self.version = None
+        self.values = {}
+
+    def get_version(self) -> Any:
+        """Returns the version, reading it from the Django cache only if the process-local copy is older
+        than version_ttl seconds, and discarding the process-local values if it has changed."""
+        now = time.monotonic()
+        if self.version is not None and now - self.checked < self.version_ttl:
+            return self.version
+        version = cache.get(self.version_key)
+        if version is None:
+            # If the version key has been evicted, start from a value that can't collide
+            # with a version held in any process-local cache
+            cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = cache.get(self.version_key)
+        if self.version != version:
+            self.version = version
+            self.values = {}
+        self.checked = now
+        return version
+
+    def get_or_set(self, key: str, resolve: Callable[[], Any]) -> Any:
+        """Returns the value for key from the process-local cache, the Django cache, or by calling
+        resolve(), in that order, populating the caches along the way."""
+        version = self.get_version()
+        value = self.values.get(key, _MISSING)
+        if value is _MISSING:
+            value = cache.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                value = resolve()
+                cache.set(key, value, timeout=self.timeout, version=version)
+            self.values[key] = value
+        return value
+
+    def set(self, key: str, value: Any) -> Any:
+        """Sets the value for key in both caches and returns it."""
+        version = self.get_version()
+        cache.set(key, value, timeout=self.timeout, version=version)
+        self.values[key] = value
+        return value
@@ -1,10 +1,17 @@
+import hashlib
 import re
+import sys
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Union
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Union
 
+from django.core.cache import cache  # type: ignore
+from django.db.models import F, Q  # type: ignore
+from django.db.models.constants import LOOKUP_SEP  # type: ignore
 from django.utils import timezone  # type: ignore
-from django.utils.html import mark_safe  # type: ignore
+from django.utils.html import conditional_escape, mark_safe  # type: ignore
 
 from ..genders.choices import Genders
 from ..treatments.choices import ColchicineDoses, Freqs, Treatments, TrtTypes
@@ -15,6 +22,8 @@ if TYPE_CHECKING:
 
     from django.contrib.auth import get_user_model
     from django.db.models import Model, QuerySet
+    from django.db.models.constraints import BaseConstraint
+    from django.db.models.options import Options
 
     from .models import GoutHelperAidModel, GoutHelperPatientModel
     from .types import Aids
@@ -356,6 +365,82 @@ def add_indicator_badge(indicator: bool) -> str:
     )
 
 
+# Rendered explanations only change when the aid's inputs or the text itself change. The
+# text's changes are picked up by the version, see explanations_cache_version().
+EXPLANATIONS_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def constraint_field_names(constraint: "BaseConstraint", opts: "Options") -> set[str]:
+    """Returns the names of the model fields a CheckConstraint or UniqueConstraint references, or of all
+    the model's concrete fields if it references them through expressions that aren't parsed."""
+
+    def q_field_names(q: Q) -> set[str]:
+        names = set()
+        for child in q.children:
+            if isinstance(child, Q):
+                names |= q_field_names(child)
+            else:
+                lookup, value = child
+                names.add(lookup.split(LOOKUP_SEP)[0])
+                if isinstance(value, F):
+                    names.add(value.name.split(LOOKUP_SEP)[0])
+        return names
+
+    if getattr(constraint, "expressions", None):
+        return {field.name for field in opts.concrete_fields}
+    names = set(getattr(constraint, "fields", None) or ())
+    for q in (getattr(constraint, "check", None), getattr(constraint, "condition", None)):
+        if isinstance(q, Q):
+            names |= q_field_names(q)
+        elif q is not None:
+            return {field.name for field in opts.concrete_fields}
+    return names
+
+
+def explanations_render(
+    explanations: list[tuple[str, str, Any, str]],
+) -> list[tuple[str, str, bool | None, str]]:
+    """Renders an aid's explanations() (id, label, value, interp) tuples to the form the
+    explanation_accordion_item.html template uses them in: the interp HTML as a str (escaped
+    unless it was marked safe) and the value reduced to True, False, or None."""
+    return [
+        (exp_id, label, None if value is None else bool(value), conditional_escape(interp))
+        for exp_id, label, value, interp in explanations
+    ]
+
+
+@lru_cache(maxsize=None)
+def explanations_cache_version(model: type["Model"]) -> str:
+    """Returns the version a model's rendered explanations are cached under: a hash of the source files
+    of the gouthelper modules the model and its bases are defined in, which contain the *_interp() methods
+    the explanations are rendered from, and of this module's. A deploy that edits the text changes the
+    version, so explanations cached by an earlier deploy aren't served."""
+    digest = hashlib.sha256()
+    modules = {base.__module__ for base in model.__mro__ if base.__module__.startswith("gouthelper.")} | {__name__}
+    for module in sorted(modules):
+        digest.update(Path(sys.modules[module].__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def explanations_cached(method: Callable) -> Callable:
+    """Decorator for an aid's explanations() method that caches the rendered (id, label, bool, interp)
+    tuples, rendered by explanations_render(), under the key returned by the aid's get_fragment_cache_key()."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs) -> list[tuple[str, str, bool | None, str]]:
+        key = self.get_fragment_cache_key(method.__name__, *args, **kwargs)
+        if key is None:
+            return method(self, *args, **kwargs)
+        version = explanations_cache_version(type(self))
+        explanations = cache.get(key, version=version)
+        if explanations is None:
+            explanations = explanations_render(method(self, *args, **kwargs))
+            cache.set(key, explanations, timeout=EXPLANATIONS_CACHE_TIMEOUT, version=version)
+        return explanations
+
+    return wrapper
+
+
 def wrap_in_anchor(attr: str, display_val: str) -> str:
     return mark_safe(f"<a href='{attr}'>{display_val}</a>")
 
@@ -375,3 +460,13 @@ def add_indicator_badge_and_samepage_link(self, attr: str, display_val: str | No
 
 def attr_is_in_model_fields(attr: str, obj: Union[type["Model"], "Model"]) -> bool:
     return attr in [field.name for field in obj._meta.get_fields()]
+
+
+def cache_empty_reverse_onetoones(obj: "Model") -> None:
+    """Caches None for each reverse one-to-one relation (i.e. MedHistory.ckddetail) of an unsaved
+    object that isn't already set on it, so that accessing the relation doesn't query the database
+    for a row that can't exist yet."""
+    if obj._state.adding:
+        for relation in obj._meta.related_objects:
+            if relation.one_to_one and not relation.is_cached(obj):
+                relation.set_cached_value(obj, None)
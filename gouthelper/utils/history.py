@@ -0,0 +1,266 @@
+import threading
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings  # type: ignore
+from django.core.exceptions import ValidationError  # type: ignore
+from django.db import connections, router, transaction  # type: ignore
+from django.utils import timezone  # type: ignore
+from simple_history.models import HistoricalRecords  # type: ignore
+from simple_history.signals import post_create_historical_record, pre_create_historical_record  # type: ignore
+from simple_history.utils import get_change_reason_from_object  # type: ignore
+
+if TYPE_CHECKING:
+    from django.db.models import Field, Model  # type: ignore
+
+# Fields that change on every save() and therefore don't make a historical record worth keeping on their own
+HISTORY_DIFF_IGNORED_FIELDS = ("modified",)
+
+# Fields of a historical record that describe the record itself rather than the object it is a snapshot of
+HISTORY_RECORD_FIELDS = (
+    "history_id",
+    "history_date",
+    "history_change_reason",
+    "history_type",
+    "history_user",
+    "history_relation",
+)
+
+_history_batch = threading.local()
+
+
+def history_diff_only() -> bool:
+    """Returns True if updates that don't change any tracked fields shouldn't create a historical record."""
+    return getattr(settings, "HISTORY_DIFF_ONLY", True)
+
+
+def history_tracked_fields(history_model: type["Model"]) -> list["Field"]:
+    """Returns the fields of a historical model whose changes are tracked, i.e. the fields copied
+    from the model, other than those in HISTORY_DIFF_IGNORED_FIELDS."""
+    return [
+        field
+        for field in history_model._meta.concrete_fields
+        if field.name not in HISTORY_RECORD_FIELDS and field.attname not in HISTORY_DIFF_IGNORED_FIELDS
+    ]
+
+
+def history_latest_values(history_model: type["Model"], pks: list[Any], using: str | None = None) -> dict[Any, dict]:
+    """Returns the tracked field values of the most recent historical record of each of pks, by pk,
+    with a single query. Pending records in an active history_batch() are more recent than any in the database."""
+    pk_attname = history_model.instance_type._meta.pk.attname
+    attnames = [field.attname for field in history_tracked_fields(history_model)]
+    latest = {}
+    pending_pks = []
+    batch = history_batch_current()
+    for pk in pks:
+        record = batch.latest.get((history_model, pk)) if batch else None
+        if record is not None:
+            latest[pk] = {attname: getattr(record, attname) for attname in attnames}
+        else:
+            pending_pks.append(pk)
+    if pending_pks:
+        queryset = history_model._default_manager.using(using or router.db_for_read(history_model))
+        if connections[queryset.db].features.can_distinct_on_fields:
+            queryset = queryset.order_by(pk_attname, "-history_date", "-history_id").distinct(pk_attname)
+        else:
+            queryset = queryset.order_by("history_date", "history_id")
+        for values in queryset.filter(**{f"{pk_attname}__in": pending_pks}).values(*attnames):
+            latest[values[pk_attname]] = values
+    return latest
+
+
+def history_has_changes(history_model: type["Model"], obj: "Model", latest: dict | None) -> bool:
+    """Returns True if any of obj's tracked fields differ from the latest (values) of its historical records."""
+    if latest is None:
+        return True
+    for field in history_tracked_fields(history_model):
+        try:
+            if field.to_python(getattr(obj, field.attname)) != latest[field.attname]:
+                return True
+        except ValidationError:
+            return True
+    return False
+
+
+def history_changed_objs(
+    history_model: type["Model"],
+    objs: list["Model"],
+    using: str | None = None,
+) -> list["Model"]:
+    """Returns the objs that have changed since their latest historical record, or all of them if
+    HISTORY_DIFF_ONLY is False. Objects that track their dirty fields (see DirtyFieldsMixin) are compared
+    to the values they were loaded with, which are those of their latest record, without a query."""
+    if not objs or not history_diff_only():
+        return objs
+    tracked_names = {field.name for field in history_tracked_fields(history_model)}
+    changed, untracked = [], []
+    for obj in objs:
+        if hasattr(obj, "get_dirty_fields"):
+            if tracked_names.intersection(obj.get_dirty_fields()):
+                changed.append(obj)
+        else:
+            untracked.append(obj)
+    if untracked:
+        latest = history_latest_values(history_model, [obj.pk for obj in untracked], using=using)
+        changed += [obj for obj in untracked if history_has_changes(history_model, obj, latest.get(obj.pk))]
+    changed_ids = {id(obj) for obj in changed}
+    return [obj for obj in objs if id(obj) in changed_ids]
+
+
+class HistoryBatch:
+    """Historical records queued by GoutHelperHistoricalRecords and bulk_history_create() while
+    a history_batch() is active, which are written with a bulk_create per historical model when it exits."""
+
+    def __init__(self):
+        self.records: dict[type["Model"], list["Model"]] = defaultdict(list)
+        self.latest: dict[tuple[type["Model"], Any], "Model"] = {}
+        self.signals: list[dict[str, Any]] = []
+
+    def add(self, record: "Model", signal_kwargs: dict[str, Any] | None = None) -> None:
+        history_model = record.__class__
+        self.records[history_model].append(record)
+        self.latest[(history_model, getattr(record, history_model.instance_type._meta.pk.attname))] = record
+        if signal_kwargs is not None:
+            self.signals.append({"history_instance": record, **signal_kwargs})
+
+    def flush(self) -> None:
+        records, signals = self.records, self.signals
+        self.records, self.latest, self.signals = defaultdict(list), {}, []
+        for history_model, history_records in records.items():
+            history_model._default_manager.using(router.db_for_write(history_model)).bulk_create(history_records)
+        for signal_kwargs in signals:
+            post_create_historical_record.send(sender=signal_kwargs["history_instance"].__class__, **signal_kwargs)
+
+
+def history_batch_current() -> HistoryBatch | None:
+    return getattr(_history_batch, "batch", None)
+
+
+@contextmanager
+def history_batch() -> Iterator[HistoryBatch]:
+    """Context manager that queues the historical records created while it is active and writes them
+    with one INSERT per historical model when it exits, rather than one INSERT per save() or delete().
+    Nested history_batch()es are part of the outermost one. Nothing is written if an exception is raised."""
+    batch = history_batch_current()
+    if batch is not None:
+        yield batch
+        return
+    batch = _history_batch.batch = HistoryBatch()
+    try:
+        yield batch
+        with transaction.atomic(savepoint=False):
+            batch.flush()
+    finally:
+        del _history_batch.batch
+
+
+class GoutHelperHistoricalRecords(HistoricalRecords):
+    """HistoricalRecords that doesn't create a historical record when an object is saved without
+    any of its tracked fields having changed, unless HISTORY_DIFF_ONLY is False, and that queues
+    its historical records while a history_batch() is active. The tracked models use DirtyFieldsMixin
+    so that the check compares the object to the values it was loaded with rather than querying
+    its latest historical record."""
+
+    def post_save(self, instance, created, using=None, **kwargs):
+        if (
+            not created
+            and not kwargs.get("raw", False)
+            and not hasattr(instance, "skip_history_when_saving")
+            and not history_changed_objs(getattr(instance, self.manager_name).model, [instance], using=using)
+        ):
+            return
+        super().post_save(instance, created, using=using, **kwargs)
+
+    def create_historical_record(self, instance, history_type, using=None):
+        batch = history_batch_current()
+        if batch is None:
+            return super().create_historical_record(instance, history_type, using=using)
+        # Same as HistoricalRecords.create_historical_record(), other than queuing the record
+        using = using if self.use_base_model_db else None
+        history_date = getattr(instance, "_history_date", timezone.now())
+        history_user = self.get_history_user(instance)
+        history_change_reason = get_change_reason_from_object(instance)
+        manager = getattr(instance, self.manager_name)
+        attrs = {field.attname: getattr(instance, field.attname) for field in self.fields_included(instance)}
+        if getattr(manager.model, "history_relation", None) is not None:
+            attrs["history_relation"] = instance
+        history_instance = manager.model(
+            history_date=history_date,
+            history_type=history_type,
+            history_user=history_user,
+            history_change_reason=history_change_reason,
+            **attrs,
+        )
+        signal_kwargs = {
+            "instance": instance,
+            "history_date": history_date,
+            "history_user": history_user,
+            "history_change_reason": history_change_reason,
+            "using": using,
+        }
+        pre_create_historical_record.send(
+            sender=manager.model,
+            history_instance=history_instance,
+            **signal_kwargs,
+        )
+        batch.add(history_instance, signal_kwargs)
+
+
+def history_redundant_ids(history_model: type["Model"], chunk_size: int = 2000) -> Iterator[Any]:
+    """Yields the history_ids of the update ("~") historical records whose tracked fields are the same as
+    those of the object's previous historical record, and that don't have a change reason, streaming the
+    records in (object, date) order."""
+    pk_attname = history_model.instance_type._meta.pk.attname
+    attnames = [field.attname for field in history_tracked_fields(history_model)]
+    previous_pk, previous_values = None, None
+    for record in (
+        history_model._default_manager.order_by(pk_attname, "history_date", "history_id")
+        .values("history_id", "history_type", "history_change_reason", *attnames)
+        .iterator(chunk_size=chunk_size)
+    ):
+        values = tuple(record[attname] for attname in attnames)
+        if (
+            record[pk_attname] == previous_pk
+            and record["history_type"] == "~"
+            and not record["history_change_reason"]
+            and values == previous_values
+        ):
+            yield record["history_id"]
+        else:
+            previous_pk, previous_values = record[pk_attname], values
+
+
+def history_records_size(history_model: type["Model"], history_ids: list[Any]) -> int | None:
+    """Returns the size in bytes of the historical records' rows, or None if the database can't tell."""
+    queryset = history_model._default_manager.filter(history_id__in=history_ids)
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    table = connection.ops.quote_name(history_model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COALESCE(SUM(pg_column_size(t.*)), 0) FROM {table} t WHERE t.history_id = ANY(%s)",
+            [list(history_ids)],
+        )
+        return cursor.fetchone()[0]
+
+
+def history_compact(
+    history_model: type["Model"],
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+) -> tuple[int, int | None]:
+    """Deletes the redundant historical records of history_model (see history_redundant_ids()) in
+    chunks. Returns the number of records deleted (or that would be) and the size of their rows in bytes."""
+    deleted, size = 0, 0
+    redundant_ids = history_redundant_ids(history_model, chunk_size=chunk_size * 2)
+    while chunk := [history_id for _, history_id in zip(range(chunk_size), redundant_ids)]:
+        chunk_bytes = history_records_size(history_model, chunk)
+        size = None if size is None or chunk_bytes is None else size + chunk_bytes
+        if not dry_run:
+            # Nothing refers to historical records, so delete() is a single DELETE without collecting them first
+            history_model._default_manager.filter(history_id__in=chunk).delete()
+        deleted += len(chunk)
+    return deleted, size
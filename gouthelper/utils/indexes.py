@@ -0,0 +1,120 @@
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Hashable, Iterable
+
+# The list methods that change its contents or their order and therefore invalidate the index
+INDEX_INVALIDATING_METHODS = (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "__setitem__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+)
+
+
+class AttrIndexedList(list):
+    """List that indexes its objects by the str() of their index_attr, so that getting the
+    objects with a given value, or any of several values, doesn't require scanning the list.
+
+    The index is built the first time it is needed and after the list is changed, so the list
+    can be mutated like any other. Objects whose index_attr isn't set yet (i.e. unsaved
+    MedHistorys) are checked on each lookup and the index rebuilt once they have one."""
+
+    index_attr: str
+
+    _index: dict[str, tuple[tuple[int, Any], ...]] | None = None
+    _pending: tuple[Any, ...] = ()
+
+    def _build_index(self) -> None:
+        index: dict[str, list[tuple[int, Any]]] = {}
+        pending = []
+        for position, obj in enumerate(self):
+            key = getattr(obj, self.index_attr, None)
+            if key:
+                index.setdefault(str(key), []).append((position, obj))
+            else:
+                pending.append(obj)
+        self._index = {key: tuple(entries) for key, entries in index.items()}
+        self._pending = tuple(pending)
+
+    def _get_index(self) -> dict[str, tuple[tuple[int, Any], ...]]:
+        if self._index is None or any(getattr(obj, self.index_attr, None) for obj in self._pending):
+            self._build_index()
+        return self._index
+
+    @property
+    def by_key(self) -> MappingProxyType:
+        """Read-only mapping of str(index_attr) to a tuple of (position, obj) tuples."""
+        return MappingProxyType(self._get_index())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the first object whose index_attr is key, or default."""
+        entries = self._get_index().get(str(key))
+        return entries[0][1] if entries else default
+
+    def filter(self, keys: Iterable[Hashable]) -> list[Any]:
+        """Returns the objects whose index_attr is in keys, in the order of the list."""
+        index = self._get_index()
+        entries = [entry for key in {str(key) for key in keys} for entry in index.get(key, ())]
+        if len(entries) > 1:
+            entries.sort(key=itemgetter(0))
+        return [obj for _, obj in entries]
+
+    def any_of(self, keys: Iterable[Hashable]) -> bool:
+        """Returns True if any object's index_attr is in keys."""
+        index = self._get_index()
+        return any(str(key) in index for key in keys)
+
+
+def _invalidates_index(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._index = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in INDEX_INVALIDATING_METHODS:
+    setattr(AttrIndexedList, _name, _invalidates_index(_name))
+
+
+class IndexedListAttribute:
+    """Descriptor for an attribute that holds a list of objects, i.e. one set by a Prefetch's
+    to_attr, that converts lists assigned to it to list_class. Lists that already are list_class
+    are stored as they are, so objects that share a list (see get_or_create_qs_attr) still do."""
+
+    def __init__(self, list_class: type[AttrIndexedList]):
+        self.list_class = list_class
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError as exc:
+            raise AttributeError(f"'{type(instance).__name__}' object has no attribute '{self.name}'") from exc
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        if isinstance(value, list) and not isinstance(value, self.list_class):
+            value = self.list_class(value)
+        instance.__dict__[self.name] = value
+
+    def __delete__(self, instance: Any) -> None:
+        try:
+            del instance.__dict__[self.name]
+        except KeyError as exc:
+            raise AttributeError(self.name) from exc
@@ -0,0 +1,190 @@
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Union
+
+from django.conf import settings  # type: ignore
+from django.db import connections  # type: ignore
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATION_HEADER = "X-GoutHelper-Metrics"
+
+_current_metrics: ContextVar[Union["ViewMetrics", None]] = ContextVar("gouthelper_view_metrics", default=None)
+_metrics_listeners: list[Callable[["ViewMetrics"], None]] = []
+
+
+@dataclass
+class SectionMetrics:
+    time: float = 0.0
+    queries: int = 0
+
+
+@dataclass
+class ViewMetrics:
+    """Query count, DB time, and section timings recorded for a single request."""
+
+    view_name: str | None = None
+    method: str | None = None
+    path: str | None = None
+    status_code: int | None = None
+    queries: int = 0
+    db_time: float = 0.0
+    total_time: float = 0.0
+    sections: dict[str, SectionMetrics] = field(default_factory=lambda: defaultdict(SectionMetrics))
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute_wrapper that counts and times every query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "view_name": self.view_name,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "total_ms": round(self.total_time * 1000, 2),
+            "sections": {
+                name: {"ms": round(section.time * 1000, 2), "queries": section.queries}
+                for name, section in self.sections.items()
+            },
+        }
+
+    def as_header(self) -> str:
+        return ";".join(
+            [
+                f"queries={self.queries}",
+                f"db={self.db_time * 1000:.1f}ms",
+                f"total={self.total_time * 1000:.1f}ms",
+                *(f"{name}={section.time * 1000:.1f}ms/{section.queries}q" for name, section in self.sections.items()),
+            ]
+        )
+
+
+def current_view_metrics() -> ViewMetrics | None:
+    return _current_metrics.get()
+
+
+@contextmanager
+def instrument(section: str) -> Iterator[None]:
+    """Context manager that adds the time and number of queries spent inside it to a section
+    of the current request's ViewMetrics. Does nothing outside of an instrumented request.
+    Sections can be nested, in which case the inner section's time is counted in both."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start, queries = time.perf_counter(), metrics.queries
+    try:
+        yield
+    finally:
+        metrics.sections[section].time += time.perf_counter() - start
+        metrics.sections[section].queries += metrics.queries - queries
+
+
+@contextmanager
+def capture_view_metrics() -> Iterator[list[ViewMetrics]]:
+    """Context manager that yields a list which is populated with the ViewMetrics of every
+    request that is completed while it is open, i.e. by the test client."""
+    captured: list[ViewMetrics] = []
+    _metrics_listeners.append(captured.append)
+    try:
+        yield captured
+    finally:
+        _metrics_listeners.remove(captured.append)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, view_name: str | None = None) -> Iterator[list[ViewMetrics]]:
+    """Context manager that raises QueryBudgetExceeded if any request made inside it (or only
+    those to view_name, if provided) makes more than max_queries queries."""
+    with capture_view_metrics() as captured:
+        yield captured
+    over_budget = [
+        metrics
+        for metrics in captured
+        if (view_name is None or metrics.view_name == view_name) and metrics.queries > max_queries
+    ]
+    if over_budget:
+        raise QueryBudgetExceeded(
+            "Query budget of {} exceeded: {}".format(
+                max_queries,
+                ", ".join(f"{metrics.view_name} ({metrics.method}) made {metrics.queries}" for metrics in over_budget),
+            )
+        )
+
+
+class InstrumentationMiddleware:
+    """Middleware that records the ViewMetrics of each request. The time spent in the view and
+    rendering its template are recorded as the "view" and "render" sections, and views and
+    services can add their own sections with instrument(). The metrics are logged as JSON to
+    the gouthelper.utils.instrumentation logger and, if settings.INSTRUMENTATION_HEADER is True,
+    added to the response in the X-GoutHelper-Metrics header."""
+
+    def __init__(self, get_response: Callable[["HttpRequest"], "HttpResponse"]):
+        self.get_response = get_response
+
+    def __call__(self, request: "HttpRequest") -> "HttpResponse":
+        metrics = ViewMetrics(method=request.method, path=request.path)
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+            if hasattr(request, "_instrumentation_render_start"):
+                render = metrics.sections["render"]
+                render.time += time.perf_counter() - request._instrumentation_render_start
+                render.queries += metrics.queries - request._instrumentation_render_queries
+        finally:
+            _current_metrics.reset(token)
+        metrics.total_time = time.perf_counter() - start
+        metrics.status_code = response.status_code
+        resolver_match = getattr(request, "resolver_match", None)
+        metrics.view_name = resolver_match.view_name if resolver_match else None
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(metrics.as_dict()), extra={"metrics": metrics.as_dict()})
+        if getattr(settings, "INSTRUMENTATION_HEADER", False):
+            response[INSTRUMENTATION_HEADER] = metrics.as_header()
+        for listener in list(_metrics_listeners):
+            listener(metrics)
+        return response
+
+    def process_view(self, request: "HttpRequest", view_func, view_args, view_kwargs) -> None:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            request._instrumentation_view_start = time.perf_counter()
+            request._instrumentation_view_queries = metrics.queries
+
+    def process_template_response(self, request: "HttpRequest", response: "HttpResponse") -> "HttpResponse":
+        metrics = _current_metrics.get()
+        if metrics is not None and hasattr(request, "_instrumentation_view_start"):
+            view = metrics.sections["view"]
+            view.time += time.perf_counter() - request._instrumentation_view_start
+            view.queries += metrics.queries - request._instrumentation_view_queries
+            del request._instrumentation_view_start
+            request._instrumentation_render_start = time.perf_counter()
+            request._instrumentation_render_queries = metrics.queries
+        return response
+
+    def process_exception(self, request: "HttpRequest", exception: Exception) -> None:
+        request.__dict__.pop("_instrumentation_view_start", None)
@@ -1,4 +1,60 @@
-from django.utils.safestring import mark_safe
+from functools import lru_cache, wraps
+from typing import Callable
+
+from django.core.signals import setting_changed  # type: ignore
+from django.dispatch import receiver  # type: ignore
+from django.urls import get_script_prefix, reverse  # type: ignore
+from django.utils.functional import Promise  # type: ignore
+from django.utils.safestring import SafeString, mark_safe
+
+
+def links_reverse(viewname: str, anchor: str | None = None) -> str:
+    """Returns the URL for a viewname that doesn't take any arguments, with an optional #anchor.
+    URLs are resolved once per script prefix and then served from a cache, which is cleared when
+    the ROOT_URLCONF changes. GoutHelper doesn't set per-request URLconfs (request.urlconf).
+
+    Args:
+        viewname (str): the namespaced URL name, e.g. "treatments:about-flare"
+        anchor (str, optional): the anchor to append to the URL, e.g. "nsaids"
+
+    Returns:
+        str: the URL, e.g. "/treatments/about/flare/#nsaids"
+    """
+    return _links_reverse(viewname, anchor, get_script_prefix())
+
+
+@lru_cache(maxsize=None)
+def _links_reverse(viewname: str, anchor: str | None, script_prefix: str) -> str:
+    url = reverse(viewname)
+    return f"{url}#{anchor}" if anchor else url
+
+
+@receiver(setting_changed)
+def links_clear_cache(*, setting, **kwargs) -> None:
+    """Clears the cached URLs when the ROOT_URLCONF is changed, i.e. with override_settings()."""
+    if setting == "ROOT_URLCONF":
+        _links_reverse.cache_clear()
+
+
+def links_constant_html(method: Callable) -> Callable:
+    """Decorator for methods that build the same str every time they are called with the same
+    arguments. The first result is rendered (lazy strs are evaluated, keeping them safe if they
+    were marked safe) and stored in a table keyed by the arguments, from which later calls are
+    served. Must not be used for strs that vary between objects, requests, or URLconfs."""
+    table: dict[tuple, str | SafeString] = {}
+
+    @wraps(method)
+    def wrapper(*args, **kwargs) -> str | SafeString:
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            return table[key]
+        except KeyError:
+            html = method(*args, **kwargs)
+            table[key] = str(html) if isinstance(html, Promise) else html
+            return table[key]
+
+    wrapper.cache_table = table
+    return wrapper
 
 
 def get_link_febuxostat_cv_risk():
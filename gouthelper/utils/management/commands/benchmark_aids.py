@@ -0,0 +1,106 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...benchmarks import (
+    benchmarks_compare,
+    benchmarks_create_panel,
+    benchmarks_create_provider,
+    benchmarks_load,
+    benchmarks_metadata,
+    benchmarks_seed,
+    benchmarks_time_services,
+    benchmarks_time_views,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the decision aid services and the main detail and list views on fixed-seed synthetic \
+panels of Pseudopatients created with the test factories. All objects are created in a transaction that is \
+rolled back when the benchmark finishes. Requires the local requirements (factory-boy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[100],
+            help="Panel sizes to benchmark, i.e. --sizes 100 1000 10000. Each panel extends the previous one.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed for the random number generators used by the factories.",
+        )
+        parser.add_argument(
+            "--view-sample",
+            type=int,
+            default=20,
+            help="Number of each panel's Pseudopatients whose views are requested.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of a JSON file to write the results to.",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Path of the JSON output of a previous run to compare the results to.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Fraction by which a median time can exceed the baseline's before it is a regression.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if --compare finds any regressions.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(options["sizes"])
+        if not sizes or sizes[0] < 1 or options["view_sample"] < 0:
+            raise CommandError("--sizes must be positive integers and --view-sample must not be negative.")
+        baseline = benchmarks_load(options["compare"])["results"] if options["compare"] else None
+        try:
+            benchmarks_seed(options["seed"])
+        except ImportError as exc:
+            raise CommandError("benchmark_aids requires factory-boy from the local requirements.") from exc
+        results = []
+        with transaction.atomic():
+            provider = benchmarks_create_provider()
+            panel = []
+            for size in sizes:
+                self.stdout.write(f"Creating panel of {size} Pseudopatients...")
+                panel.extend(benchmarks_create_panel(provider, size - len(panel)))
+                results.extend(benchmarks_time_services(panel))
+                if options["view_sample"]:
+                    results.extend(benchmarks_time_views(provider, panel, sample=options["view_sample"]))
+            transaction.set_rollback(True)
+        for result in results:
+            self.stdout.write(
+                f"{result['name']} (size={result['size']}, n={result['n']}): median {result['median_ms']}ms, \
+p95 {result['p95_ms']}ms, {result['queries_mean']} queries"
+            )
+        output = {"meta": benchmarks_metadata(seed=options["seed"], sizes=sizes), "results": results}
+        regressions = []
+        if baseline is not None:
+            output["comparison"] = benchmarks_compare(results, baseline, threshold=options["threshold"])
+            regressions = [comparison for comparison in output["comparison"] if comparison["regression"]]
+            for regression in regressions:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Regression: {regression['name']} (size={regression['size']}) median \
+{regression['baseline_median_ms']}ms -> {regression['median_ms']}ms, queries \
+{regression['baseline_queries_mean']} -> {regression['queries_mean']}"
+                    )
+                )
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(output, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}."))
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} benchmark regression(s) compared to {options['compare']}.")
@@ -0,0 +1,77 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from ...links import links_reverse
+from ...models import GoutHelperBaseModel
+
+# (viewname, anchor) of the links built by the GoutHelperBaseModel about_*_url methods
+ABOUT_LINKS = [
+    ("treatments:about-flare", "colchicine"),
+    ("treatments:about-flare", "nsaids"),
+    ("treatments:about-flare", "steroids"),
+    ("treatments:about-ult", "allopurinol"),
+    ("treatments:about-ult", "febuxostat"),
+    ("treatments:about-ult", "probenecid"),
+    ("labs:about-hlab5801", None),
+    ("labs:about-urate", None),
+    ("goalurates:about", None),
+]
+CONSTANT_HTML_METHODS = [
+    "colchicine_interactions",
+    "dose_reduced_for_ckd_info",
+    "hepatitis_warning",
+    "xoi_interactions",
+]
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark of building the explanation links and constant HTML with and without the \
+links registry (gouthelper/utils/links.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=1000,
+            help="Number of simulated renders to time.",
+        )
+        parser.add_argument(
+            "--calls-per-render",
+            type=int,
+            default=100,
+            help="Number of link / constant HTML calls a detail page render makes.",
+        )
+
+    def handle(self, *args, **options):
+        if options["number"] < 1 or options["calls_per_render"] < 1:
+            raise CommandError("--number and --calls-per-render must be positive integers.")
+        calls = len(ABOUT_LINKS) + len(CONSTANT_HTML_METHODS)
+        # Number of passes over all the links and methods that make up one render
+        passes = max(options["calls_per_render"] // calls, 1)
+
+        def uncached():
+            for viewname, anchor in ABOUT_LINKS:
+                str(reverse(viewname) + (f"#{anchor}" if anchor else ""))
+            for method in CONSTANT_HTML_METHODS:
+                str(getattr(GoutHelperBaseModel, method).__wrapped__(GoutHelperBaseModel))
+
+        def cached():
+            for viewname, anchor in ABOUT_LINKS:
+                str(links_reverse(viewname, anchor))
+            for method in CONSTANT_HTML_METHODS:
+                str(getattr(GoutHelperBaseModel, method)())
+
+        results = {}
+        for name, func in [("uncached", uncached), ("registry", cached)]:
+            func()
+            seconds = timeit.timeit(func, number=options["number"] * passes)
+            results[name] = seconds / options["number"] * 1_000_000
+            self.stdout.write(f"{name}: {results[name]:.1f}µs per render ({passes * calls} calls)")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {results['uncached'] - results['registry']:.1f}µs per render \
+({results['uncached'] / results['registry']:.1f}x faster)."
+            )
+        )
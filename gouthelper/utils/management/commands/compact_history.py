@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from simple_history.models import registered_models  # type: ignore
+from simple_history.utils import get_history_manager_for_model  # type: ignore
+
+from ...history import history_compact
+
+
+class Command(BaseCommand):
+    help = "Delete the historical records of updates that didn't change any of the object's tracked fields \
+since its previous historical record, in chunks that are each committed separately, and report the space \
+reclaimed. The space is returned to the database's free space map by the next VACUUM."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Models whose history is compacted, as app_label.ModelName. Defaults to all models with history.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of historical records deleted per DELETE.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the redundant historical records without deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+        history_models = {
+            model._meta.label: get_history_manager_for_model(model).model for model in registered_models.values()
+        }
+        if options["models"]:
+            unknown = set(options["models"]) - set(history_models)
+            if unknown:
+                raise CommandError(f"Models without history: {', '.join(sorted(unknown))}")
+            history_models = {label: history_models[label] for label in options["models"]}
+        total_deleted, total_bytes = 0, 0
+        for label, history_model in sorted(history_models.items()):
+            deleted, size = history_compact(history_model, chunk_size=chunk_size, dry_run=options["dry_run"])
+            total_deleted += deleted
+            total_bytes = None if total_bytes is None or size is None else total_bytes + size
+            if deleted:
+                self.stdout.write(f"{label}: {deleted} redundant records{self.format_bytes(size)}")
+        verb = "Found" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {total_deleted} redundant historical records{self.format_bytes(total_bytes)}.")
+        )
+
+    @staticmethod
+    def format_bytes(size: int | None) -> str:
+        return "" if size is None else f" ({size / 1024:.1f} KiB)"
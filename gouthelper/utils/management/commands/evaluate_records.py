@@ -0,0 +1,83 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...batch import BATCH_EVALUATE_VIEWS, batch_evaluate, batch_read_records
+
+
+class Command(BaseCommand):
+    help = "Evaluate patient records, each the POST data of an aid's create form, from a CSV or NDJSON file \
+in memory, without writing to the database, and write one JSON result per record, in input order."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "input",
+            help="Path of the CSV or NDJSON file of records, or - to read from stdin.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Format of the records. Defaults to the input file's extension.",
+        )
+        parser.add_argument(
+            "--aid",
+            choices=sorted(BATCH_EVALUATE_VIEWS),
+            help="Aid of records that don't have an aid column or key.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes that evaluate the records.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of records sent to a worker process at a time.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of the NDJSON file to write the results to. Defaults to stdout.",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--workers and --chunk-size must be positive integers.")
+        fmt = options["format"]
+        if fmt is None:
+            extension = options["input"].rsplit(".", 1)[-1].lower()
+            if extension in ("csv", "ndjson", "jsonl"):
+                fmt = "ndjson" if extension == "jsonl" else extension
+            else:
+                raise CommandError("--format is required when it can't be inferred from the input's extension.")
+        input_file = sys.stdin if options["input"] == "-" else open(options["input"], newline="")
+        output_file = open(options["output"], "w") if options["output"] else self.stdout
+        evaluated = invalid = 0
+        start = time.perf_counter()
+        try:
+            for result in batch_evaluate(
+                batch_read_records(input_file, fmt),
+                aid=options["aid"],
+                workers=options["workers"],
+                chunk_size=options["chunk_size"],
+            ):
+                output_file.write(json.dumps(result) + "\n")
+                evaluated += 1
+                invalid += not result["valid"]
+        except ValueError as exc:
+            raise CommandError(f"Record {evaluated + 1}: {exc}") from exc
+        finally:
+            if input_file is not sys.stdin:
+                input_file.close()
+            if output_file is not self.stdout:
+                output_file.close()
+        elapsed = time.perf_counter() - start
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Evaluated {evaluated} records ({invalid} invalid) in {elapsed:.2f}s, \
+{evaluated / elapsed if elapsed else 0:.1f} records/second."
+            )
+        )
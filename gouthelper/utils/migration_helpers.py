@@ -0,0 +1,105 @@
+"""Frozen copies of the code the data migrations run, so that later changes to the application
+code don't change what historical migrations do. Don't edit these functions; add new ones for
+new migrations instead."""
+
+import json
+import re
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder  # pylint: disable=E0401  # type: ignore
+from django.db.models import CharField, F, Func, Model  # pylint: disable=E0401  # type: ignore
+
+DECISIONAID_V2_DECIMAL_KEYS = frozenset(("dose", "dose2", "dose3", "dose_adj"))
+DECISIONAID_V2_DURATION_KEYS = frozenset(("duration", "duration2", "duration3"))
+
+
+def _normalize_fraction(d: Decimal) -> Decimal:
+    normalized = d.normalize()
+    _, _, exponent = normalized.as_tuple()
+    return normalized if exponent <= 0 else normalized.quantize(1)
+
+
+def _decisionaid_v1_object_hook(json_dict: dict) -> dict:
+    duration_regex = re.compile("P*[1-9]?[0-7]DT00H00M00S")
+    decimal_regex = re.compile("[1-9]?[1-9]?[0-9]?[0-9].?[0-9]?")
+    for key, value in json_dict.items():
+        if isinstance(value, str) and duration_regex.fullmatch(value):
+            duration = datetime.strptime(value, "P%dDT%HH%MM%SS")
+            json_dict[key] = timedelta(
+                days=duration.day,
+                hours=duration.hour,
+                minutes=duration.minute,
+                seconds=duration.second,
+            )
+        elif isinstance(value, str) and decimal_regex.fullmatch(value):
+            json_dict[key] = _normalize_fraction(Decimal(value))
+    return json_dict
+
+
+def _decisionaid_v2_encode_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        value = _normalize_fraction(value)
+        return int(value) if value == value.to_integral_value() else float(value)
+    elif isinstance(value, timedelta):
+        days = value / timedelta(days=1)
+        return int(days) if days.is_integer() else days
+    elif isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _decisionaid_v2_decode_value(key: str, value: Any) -> Any:
+    if value is not None and key in DECISIONAID_V2_DECIMAL_KEYS:
+        return _normalize_fraction(Decimal(str(value)))
+    elif value is not None and key in DECISIONAID_V2_DURATION_KEYS:
+        return timedelta(days=value)
+    return value
+
+
+def decisionaid_v1_to_v2(decisionaid: str) -> dict[str, Any]:
+    """Converts a version 1 decisionaid, the trt_dict as a JSON string, to the version 2
+    native JSON schema, {"version": 2, "trts": {treatment: {dosing}}}."""
+    trt_dict = json.loads(decisionaid, object_hook=_decisionaid_v1_object_hook)
+    return {
+        "version": 2,
+        "trts": {
+            str(trt): {key: _decisionaid_v2_encode_value(value) for key, value in dosing.items()}
+            for trt, dosing in trt_dict.items()
+        },
+    }
+
+
+def decisionaid_v2_to_v1(decisionaid: dict[str, Any]) -> str:
+    """Converts a version 2 decisionaid back to the version 1 JSON string."""
+    trt_dict = {
+        trt: {key: _decisionaid_v2_decode_value(key, value) for key, value in dosing.items()}
+        for trt, dosing in decisionaid.get("trts", {}).items()
+    }
+    return json.dumps(trt_dict, indent=4, cls=DjangoJSONEncoder)
+
+
+def decisionaids_migrate_v1_v2(model: type[Model], to_v2: bool = True, batch_size: int = 1000) -> int:
+    """Converts the version 1 decisionaids of a (historical) FlareAid, PpxAid, or UltAid model
+    to version 2, or, if not to_v2, back, updating them every batch_size rows so that no more than
+    batch_size objects are held in memory. Returns the number of decisionaids converted."""
+    queryset = model.objects.alias(
+        decisionaid_type=Func(F("decisionaid"), function="jsonb_typeof", output_field=CharField())
+    )
+    if to_v2:
+        queryset = queryset.filter(decisionaid_type="string")
+    else:
+        queryset = queryset.filter(decisionaid_type="object", decisionaid__has_key="version")
+    converted, batch = 0, []
+    for obj in queryset.only("pk", "decisionaid").iterator(chunk_size=batch_size):
+        obj.decisionaid = decisionaid_v1_to_v2(obj.decisionaid) if to_v2 else decisionaid_v2_to_v1(obj.decisionaid)
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model.objects.bulk_update(batch, ["decisionaid"])
+            converted += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ["decisionaid"])
+        converted += len(batch)
+    return converted
@@ -1,7 +1,12 @@
+import copy
+import hashlib
+import json
 import uuid
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any, Literal, Union
 
 from django.apps import apps  # type: ignore
+from django.core.exceptions import ValidationError  # type: ignore
 from django.db import models  # type: ignore
 from django.urls import reverse  # type: ignore
 from django.utils.functional import cached_property  # type: ignore
@@ -14,22 +19,24 @@ from ..ethnicitys.helpers import ethnicitys_hlab5801_risk
 from ..genders.helpers import get_gender_abbreviation
 from ..goalurates.choices import GoalUrates
 from ..goalurates.helpers import goalurates_get_object_goal_urate
-from ..labs.helpers import (
-    labs_urate_is_newer_than_goutdetail_set_date,
-    labs_urate_within_90_days,
-    labs_urate_within_last_month,
-    labs_urates_at_goal,
-    labs_urates_six_months_at_goal,
-)
+from ..labs.helpers import labs_urate_is_newer_than_goutdetail_set_date
 from ..labs.selectors import urates_dated_qs
-from ..medallergys.helpers import medallergy_attr
+from ..labs.series import UrateSeries
+from ..medallergys.helpers import MedAllergysList, medallergy_attr, medallergys_get
 from ..medhistorys.choices import Contraindications, CVDiseases, MedHistoryTypes
-from ..medhistorys.helpers import medhistory_attr, medhistorys_get, medhistorys_get_cvdiseases_str
+from ..medhistorys.helpers import MedHistorysList, medhistory_attr, medhistorys_get, medhistorys_get_cvdiseases_str
 from ..medhistorys.lists import OTHER_NSAID_CONTRAS
 from ..treatments.choices import FlarePpxChoices, NsaidChoices, SteroidChoices, Treatments, TrtTypes
 from ..treatments.helpers import treatments_stringify_trt_tuple
-from ..utils.helpers import add_indicator_badge_and_samepage_link, wrap_in_samepage_links_anchor
+from ..utils.helpers import (
+    add_indicator_badge_and_samepage_link,
+    constraint_field_names,
+    wrap_in_samepage_links_anchor,
+)
 from .helpers import TrtDictStr, get_str_attrs
+from .indexes import IndexedListAttribute
+from .instrumentation import instrument
+from .links import links_constant_html, links_reverse
 from .services import (
     aids_colchicine_ckd_contra,
     aids_hlab5801_contra,
@@ -87,10 +94,14 @@ class GoutHelperBaseModel(GoalUrateMixin):
 
     GoalUrates = GoalUrates
 
+    # Prefetched with to_attr and indexed by MedHistoryType / Treatment
+    medallergys_qs = IndexedListAttribute(MedAllergysList)
+    medhistorys_qs = IndexedListAttribute(MedHistorysList)
+
     @classmethod
     def about_allopurinol_url(cls) -> str:
         """Gets the URL: gouthelper/treatments/about-ult/#allopurinol."""
-        return reverse("treatments:about-ult") + "#allopurinol"
+        return links_reverse("treatments:about-ult", "allopurinol")
 
     @classmethod
     def about_celecoxib_url(cls) -> str:
@@ -100,7 +111,7 @@ class GoutHelperBaseModel(GoalUrateMixin):
     @classmethod
     def about_colchicine_url(cls) -> str:
         """Gets the URL: gouthelper/treatments/about-flare/#colchicine."""
-        return reverse("treatments:about-flare") + "#colchicine"
+        return links_reverse("treatments:about-flare", "colchicine")
 
     @classmethod
     def about_diclofenac_url(cls) -> str:
@@ -110,7 +121,7 @@ class GoutHelperBaseModel(GoalUrateMixin):
     @classmethod
     def about_febuxostat_url(cls) -> str:
         """Gets the URL: gouthelper/treatments/about-ult/#febuxostat."""
-        return reverse("treatments:about-ult") + "#febuxostat"
+        return links_reverse("treatments:about-ult", "febuxostat")
 
     @classmethod
     def about_ibuprofen_url(cls) -> str:
@@ -140,7 +151,7 @@ class GoutHelperBaseModel(GoalUrateMixin):
     @classmethod
     def about_nsaids_url(cls) -> str:
         """Gets the URL: gouthelper/treatments/about-flare/#nsaids."""
-        return reverse("treatments:about-flare") + "#nsaids"
+        return links_reverse("treatments:about-flare", "nsaids")
 
     @classmethod
     def about_prednisone_url(cls) -> str:
@@ -150,12 +161,12 @@ class GoutHelperBaseModel(GoalUrateMixin):
     @classmethod
     def about_probenecid_url(cls) -> str:
         """Gets the URL: gouthelper/treatments/about-ult/#probenecid."""
-        return reverse("treatments:about-ult") + "#probenecid"
+        return links_reverse("treatments:about-ult", "probenecid")
 
     @classmethod
     def about_steroids_url(cls) -> str:
         """Gets the URL: gouthelper/treatments/about-flare/#steroids."""
-        return reverse("treatments:about-flare") + "#steroids"
+        return links_reverse("treatments:about-flare", "steroids")
 
     @cached_property
     def age(self) -> int | None:
@@ -174,7 +185,7 @@ class GoutHelperBaseModel(GoalUrateMixin):
         main_str = format_lazy(
             """People over age 65 have a higher rate of side effects with use of non-steroidal \
 anti-inflammatory drugs (<a target='_next' href={}>NSAIDs</a>). <strong>{} {} over age 65</strong>""",
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
             Subject_the,
             tobe if self.age > 65 else tobe_neg,
         )
@@ -258,8 +269,8 @@ and it should always be stopped immediately and the healthcare provider contacte
         return next(
             iter(
                 ma
-                for ma in self.medallergys
-                if ma.treatment == Treatments.ALLOPURINOL and ma.matype == ma.MaTypes.HYPERSENSITIVITY
+                for ma in medallergys_get(self.medallergys, [Treatments.ALLOPURINOL])
+                if ma.matype == ma.MaTypes.HYPERSENSITIVITY
             ),
             False,
         )
@@ -279,7 +290,7 @@ anyone with a history of allopurinol hypersensitivity shouldn't take allopurinol
 though, in some cases individuals can be de-sensitized. This should be done under the direction of a \
 rheumatologist. Risk of allopurinol hypersensitivity is increased in individuals with the \
 <a target='_next' href={}>HLA-B*58:01</a> genotype.""",
-            reverse("labs:about-hlab5801"),
+            links_reverse("labs:about-hlab5801"),
         )
         return mark_safe(main_str)
 
@@ -304,7 +315,7 @@ rheumatologist. Risk of allopurinol hypersensitivity is increased in individuals
             """Anticoagulation is a relative contraindication to non-steroidal \
 anti-inflammatory drugs (<a target='_next' href={}>NSAIDs</a>). <strong>{} {} on anticoagulation</strong>, \
 so""",
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
             Subject_the,
             tobe if self.anticoagulation else tobe_neg,
         )
@@ -371,7 +382,7 @@ so""",
             """History of a life-threatening bleeding event is an absolute contraindication to non-steroidal \
 anti-inflammatory drugs (<a target='_next' href={}>NSAIDs</a>). <strong>{} {} a history of major bleeding </strong> \
 , so""",
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
             Subject_the,
             pos if self.bleed else pos_neg,
         )
@@ -516,6 +527,7 @@ beyond the capabilities of this tool to manage safely."
         return info_dict
 
     @classmethod
+    @links_constant_html
     def colchicine_interactions(cls) -> str:
         return "simvastatin, 'azole' antifungals (fluconazole, itraconazole, ketoconazole), \
 macrolide antibiotics (clarithromycin, erythromycin), and P-glycoprotein inhibitors (cyclosporine, \
@@ -579,8 +591,8 @@ cardiovascular disease prevention should be optimized.""",
             """ are a leading cause of death worldwide, and some gout (<a target='_next" href={}>NSAIDs</a>, \
 <a target='_next' href={}>febuxostat</a> mediactions are associated with an increased risk of \
 cardiovascular events.""",
-            reverse("treatments:about-flare") + "#nsaids",
-            reverse("treatments:about-ult") + "#febuxostat",
+            links_reverse("treatments:about-flare", "nsaids"),
+            links_reverse("treatments:about-ult", "febuxostat"),
         )
         Subject_the, pos, pos_neg = self.get_str_attrs("Subject_the", "pos", "pos_neg")
         if self.cvdiseases:
@@ -630,7 +642,7 @@ cardiovascular events.""",
             """<a target='_next' href={}>Corticosteroids</a>, such as prednisone \
 or methylprednisolone, can raise blood sugar levels. This can be dramatic or even \
 dangerous in people with diabetes.""",
-            reverse("treatments:about-flare") + "#steroids",
+            links_reverse("treatments:about-flare", "steroids"),
         )
 
         if self.diabetes:
@@ -667,6 +679,7 @@ certainly possible to unmask or precipitate diabetes in non-diabetic individuals
         )
 
     @classmethod
+    @links_constant_html
     def dose_reduced_for_ckd_info(cls, samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -778,8 +791,8 @@ and it should always be stopped immediately and the healthcare provider contacte
         return next(
             iter(
                 ma
-                for ma in self.medallergys
-                if ma.treatment == Treatments.FEBUXOSTAT and ma.matype == ma.MaTypes.HYPERSENSITIVITY
+                for ma in medallergys_get(self.medallergys, [Treatments.FEBUXOSTAT])
+                if ma.matype == ma.MaTypes.HYPERSENSITIVITY
             ),
             False,
         )
@@ -815,7 +828,7 @@ reported (scientifically) than hypersensitivity to allopurinol."
                     """{} is {} experiencing symptoms attributed to gout <a href={}>flares</a>.""",
                     Subject_the,
                     "not" if not self.flaring else "",
-                    reverse("flares:about"),
+                    links_reverse("flares:about"),
                 )
             )
         else:
@@ -827,7 +840,7 @@ reported (scientifically) than hypersensitivity to allopurinol."
                     subject_the,
                     reverse("flares:pseudopatient-create", kwargs={"username": self.user.username})
                     if self.user
-                    else reverse("flares:create"),
+                    else links_reverse("flares:create"),
                 )
             )
 
@@ -846,7 +859,7 @@ reported (scientifically) than hypersensitivity to allopurinol."
             """Having had a gastric bypass puts an individual at risk for gastroinestinal (GI) bleeding. \
 Because <a target='_next' href={}>NSAIDs</a> are also a risk factor for GI bleeding, they are relatively \
 contraindicated in individuals who have had a gastric bypass.""",
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
         )
         if self.gastricbypass:
             main_str += f" <strong>{Subject_the} {pos_past} a gastric bypass</strong>, so NSAIDs are relatively \
@@ -1006,6 +1019,7 @@ monitoring of {gender_pos} LFTs is appropriate."
         return mark_safe(main_str)
 
     @classmethod
+    @links_constant_html
     def hepatitis_warning(cls, samepage_links: bool = True) -> str:
         return mark_safe(
             format_lazy(
@@ -1064,7 +1078,7 @@ increased risk of allopurinol hypersensitivity syndrome. It is more common in in
 ancestries, such as those of African American, Korean, Han Chinese, or Thai descent. The American \
 College of Rheumatology recommends checking individuals of these descents for this gene before \
 starting allopurinol.""",
-            reverse("labs:about-hlab5801"),
+            links_reverse("labs:about-hlab5801"),
         )
         main_str += " <br> <br> "
         main_str += self.hlab5801_contra_interp()
@@ -1114,9 +1128,9 @@ greater than {} <a href={}>goal urate</a>: {}.
                         """,
                     Subject_the,
                     tobe if self.hyperuricemic else tobe_neg,
-                    reverse("labs:about-urate"),
+                    links_reverse("labs:about-urate"),
                     gender_pos,
-                    reverse("goalurates:about"),
+                    links_reverse("goalurates:about"),
                     self.goalurate_get_display,
                 )
             )
@@ -1140,7 +1154,7 @@ be checked."
         main_str = format_lazy(
             """Some evidence suggests that <a target='_next' href={}>NSAIDs</a> can exacerbate inflammatory bowel \
 disease (IBD) and thus they are relatively contraindicated in this setting.""",
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
         )
         if self.ibd:
             main_str += f" <strong>{subject} {pos} IBD</strong> and as a result \
@@ -1374,7 +1388,7 @@ rash, fluid retention, and decreased kidney function",
                 """{} is {} on flare <a href={}>prophylaxis</a>.""",
                 Subject_the,
                 "not" if not self.on_ppx else "",
-                reverse("treatments:about-ppx"),
+                links_reverse("treatments:about-ppx"),
             )
         )
 
@@ -1405,7 +1419,7 @@ rash, fluid retention, and decreased kidney function",
             """{} is {} on urate-lowering therapy (<a href={}>ULT</a>).""",
             Subject_the,
             "not" if not self.on_ult else "",
-            reverse("treatments:about-ult"),
+            links_reverse("treatments:about-ult"),
         )
         if self.starting_ult:
             on_ult_str += f" {Gender_subject} is in the initiation phase of ULT."
@@ -1446,7 +1460,7 @@ this phase."
                     f" to figure out if ULT is indicated for {subject_the}."
                 )
         else:
-            on_ult_str += f" Use a <a href='{reverse('ults:create')}'>Ult</a> to determine if ULT is indicated."
+            on_ult_str += f" Use a <a href='{links_reverse('ults:create')}'>Ult</a> to determine if ULT is indicated."
         return mark_safe(on_ult_str)
 
     @cached_property
@@ -1577,7 +1591,7 @@ transplant providers, including a pharmacist, prior to starting any new or stopp
         main_str = format_lazy(
             """Uric acid kidney stones can be exacerbated by medications that increase \
 urinary uric acid filtration, such as <a target='_next' href={}>probenecid</a>. """,
-            reverse("treatments:about-ult") + "#probenecid",
+            links_reverse("treatments:about-ult", "probenecid"),
         )
         if self.uratestones:
             return mark_safe(
@@ -1606,7 +1620,7 @@ and as such shouldn't be prescribed probenecid."
         main_str = format_lazy(
             """Peptic ulcer disease causes stomach pain and sometimes stomach bleeding. \
 <a target='_next' href={}>NSAIDs</a> can worsen peptic ulcer disease.""",
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
         )
         if self.pud:
             main_str += f" <strong>{Subject_the} {pos} peptic ulcer disease</strong>, so NSAIDs are contraindicated."
@@ -1673,7 +1687,7 @@ and as such shouldn't be prescribed probenecid."
 , dose adjustment of the treatments until serum uric acid is at goal, and frequent lab monitoring.""",
                 Subject_the,
                 "not" if not self.starting_ult else "",
-                reverse("treatments:about-ult"),
+                links_reverse("treatments:about-ult"),
             )
         )
 
@@ -1771,7 +1785,7 @@ gout and are associated with more severe disease. Tophi are actually little clum
 <a target='_blank' href={}>uric acid</a> in and around joints. They require more aggressive \
 treatment with ULT in order to eliminate them. If left untreated, they can cause permanent joint damage.""",
             f"{wrap_in_samepage_links_anchor('erosions', 'erosions')}" if samepage_links else "erosions",
-            reverse("labs:about-urate"),
+            links_reverse("labs:about-urate"),
         )
         if self.tophi:
             main_str += f" <strong>{Subject_the} has tophi, and {gender_subject} should be treated \
@@ -1805,12 +1819,27 @@ aggressively with ULT.</strong>"
         )
         return urates_dated_qs().filter(**kwargs)
 
+    @property
+    def urate_series(self) -> UrateSeries:
+        """Returns a UrateSeries of the object's dated_urates, which the urates_at_goal* and
+        urate_within_* properties share rather than each iterating over the Urates. It is rebuilt
+        if dated_urates has been reset or Urates have been added to or removed from it."""
+        dated_urates = self.dated_urates
+        urate_series = self.__dict__.get("_urate_series")
+        if (
+            urate_series is None
+            or urate_series.urates_source is not dated_urates
+            or (len(urate_series) != len(dated_urates))
+        ):
+            urate_series = self._urate_series = UrateSeries(dated_urates)
+        return urate_series
+
     @cached_property
     def urates_at_goal(
         self,
     ) -> bool:
         """Returns True if the object's most recent Urate object is at goal."""
-        return labs_urates_at_goal(self.dated_urates, self.goal_urate)
+        return self.urate_series.at_goal(self.goal_urate)
 
     @cached_property
     def urates_at_goal_within_last_month(self) -> bool:
@@ -1823,7 +1852,7 @@ aggressively with ULT.</strong>"
     @cached_property
     def urates_at_goal_long_term(self) -> bool:
         """Returns True if the object has had urates at goal for at least 6 months."""
-        return labs_urates_six_months_at_goal(self.dated_urates, self.goal_urate)
+        return self.urate_series.at_goal_x_months(6, self.goal_urate)
 
     @cached_property
     def urates_at_goal_long_term_within_last_month(self) -> bool:
@@ -1846,12 +1875,12 @@ aggressively with ULT.</strong>"
     @cached_property
     def urate_within_last_month(self) -> bool:
         """Returns True if the object has a Urate object within the last month."""
-        return labs_urate_within_last_month(self.dated_urates)
+        return self.urate_series.within_x_days(30)
 
     @cached_property
     def urate_within_90_days(self) -> bool:
         """Returns True if the object has a Urate object within the last 3 months."""
-        return labs_urate_within_90_days(self.dated_urates)
+        return self.urate_series.within_x_days(90)
 
     @cached_property
     def uratestones(self) -> Union["MedHistory", bool]:
@@ -1882,6 +1911,7 @@ and should not be prescribed probenecid."
         return medhistory_attr(MedHistoryTypes.XOIINTERACTION, self)
 
     @classmethod
+    @links_constant_html
     def xoi_interactions(cls, treatment: str | None = None) -> str:
         return mark_safe(
             f"{treatment if treatment else 'Xanthine oxidase inhibitors'} (<a target='_next' \
@@ -1980,7 +2010,7 @@ class FlarePpxMixin(GoutHelperBaseModel):
                 """<br> <br> Non-steroidal anti-inflammatory drugs (<a target='_next' href={}>NSAIDs</a>) \
 are associated with acute kidney injury and chronic kidney disease and thus are not recommended for patients \
 with CKD.""",
-                reverse("treatments:about-flare") + "#nsaids",
+                links_reverse("treatments:about-flare", "nsaids"),
             )
         )
         if self.ckd:
@@ -1991,7 +2021,7 @@ with CKD.""",
                 """<br> <br> <a href={}>Colchicine</a> is heavily processed by the kidneys and \
 should be used cautiously in patients with early CKD (less than or equal to stage 3). If a patient has CKD stage \
 4 or 5, or is on dialysis, colchicine should be avoided.""",
-                reverse("treatments:about-flare") + "#colchicine",
+                links_reverse("treatments:about-flare", "colchicine"),
             )
         )
         if self.ckd:
@@ -2013,7 +2043,7 @@ colchicine can be used by {subject_the}, but at reduced doses."
             """Non-steroidal anti-inflammatory drugs (<a target='_blank' href={}>NSAIDs</a>) are associated \
 with an increased risk of cardiovascular events and mortality with long-term use. For that reason, \
 cardiovascular disease is a relative contraindication to using NSAIDs. """,
-            reverse("treatments:about-flare") + "#nsaids",
+            links_reverse("treatments:about-flare", "nsaids"),
         )
         if self.cvdiseases:
             main_str += f"Because of <strong>{subject_the}'s cardiovascular disease(s) ({self.cvdiseases_str.lower()})\
@@ -2053,10 +2083,120 @@ reasonable to use."
         return mark_safe(main_str)
 
 
-class GoutHelperAidModel(GoutHelperBaseModel, models.Model):
+class DirtyFieldsMixin(models.Model):
+    """Model mixin that tracks the values of an object's concrete fields as they were when it was loaded
+    from or last saved to the database, so that the fields that have changed since can be validated
+    and saved without validating and saving the whole row."""
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.set_saved_field_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.set_saved_field_values(fields)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.set_saved_field_values(kwargs.get("update_fields"))
+
+    def set_saved_field_values(self, fields: Iterable[str] | None = None) -> None:
+        """Records the current values of fields (names or attnames), or of all the loaded concrete fields,
+        as the values saved in the database."""
+        saved_field_values = self.__dict__.setdefault("_saved_field_values", {})
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (fields is None or field.name in fields or field.attname in fields):
+                saved_field_values[field.attname] = copy.deepcopy(self.__dict__[field.attname])
+
+    def get_dirty_fields(self) -> list[str]:
+        """Returns the names of the concrete fields that have changed since the object was loaded or last saved,
+        or of all of them if it hasn't been saved. Deferred fields that haven't been loaded or set are clean."""
+        if self._state.adding:
+            return [field.name for field in self._meta.concrete_fields]
+        saved_field_values = self.__dict__.get("_saved_field_values", {})
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                field.attname not in saved_field_values
+                or saved_field_values[field.attname] != self.__dict__[field.attname]
+            )
+        ]
+
+    def full_clean_dirty(self, fields: Iterable[str] | None = None) -> None:
+        """Like full_clean(), but only validates fields (defaults to the dirty fields), their unique checks, and
+        the constraints that reference any of them, the latter with the values of all the fields they reference.
+        The unique checks and constraints of the fields that haven't changed are already enforced by the database
+        for the saved row, so aren't queried again."""
+        fields = set(self.get_dirty_fields() if fields is None else fields)
+        exclude = {field.name for field in self._meta.concrete_fields if field.name not in fields}
+        errors = {}
+        try:
+            self.clean_fields(exclude=exclude)
+        except ValidationError as exc:
+            errors = exc.update_error_dict(errors)
+        try:
+            self.clean()
+        except ValidationError as exc:
+            errors = exc.update_error_dict(errors)
+        try:
+            self.validate_unique(exclude=exclude | errors.keys())
+        except ValidationError as exc:
+            errors = exc.update_error_dict(errors)
+        constrained = set()
+        for _, model_constraints in self.get_constraints():
+            for constraint in model_constraints:
+                constraint_fields = constraint_field_names(constraint, self._meta)
+                if constraint_fields & fields:
+                    constrained |= constraint_fields
+        try:
+            self.validate_constraints(exclude=(exclude - constrained) | errors.keys())
+        except ValidationError as exc:
+            errors = exc.update_error_dict(errors)
+        if errors:
+            raise ValidationError(errors)
+
+    def save_dirty(self, validate: bool = True) -> list[str]:
+        """Validates (if validate) and saves only the fields that have changed, plus any auto_now fields
+        (i.e. modified), with save(update_fields=...). Objects that haven't been saved are cleaned and saved
+        in full. Returns the names of the fields that were saved, which are empty if none had changed."""
+        if self._state.adding:
+            if validate:
+                self.full_clean()
+            self.save()
+            return [field.name for field in self._meta.concrete_fields]
+        dirty_fields = self.get_dirty_fields()
+        if not dirty_fields:
+            return []
+        if validate:
+            self.full_clean_dirty(dirty_fields)
+        update_fields = dirty_fields + [
+            field.name
+            for field in self._meta.concrete_fields
+            if getattr(field, "auto_now", False) and field.name not in dirty_fields
+        ]
+        self.save(update_fields=update_fields)
+        return update_fields
+
+
+class GoutHelperAidModel(GoutHelperBaseModel, DirtyFieldsMixin):
     class Meta:
         abstract = True
 
+    inputs_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Hash of the inputs used the last time the aid was calculated.",
+    )
+
     decision_aid_service: Union[
         "FlareAidDecisionAid",
         "FlareDecisionAid",
@@ -2087,14 +2227,60 @@ class GoutHelperAidModel(GoutHelperBaseModel, models.Model):
         else:
             return get_rel_objs(self)
 
+    def get_fragment_cache_key(self, name: str, *args, **kwargs) -> str | None:
+        """Returns a cache key for a rendered fragment (i.e. explanations) of the aid, or None if the
+        aid hasn't been calculated with an inputs_fingerprint or was only evaluated in memory (unsaved).
+        The key combines the fingerprint and modified time of the aid and its get_fragment_cache_objects(),
+        the method arguments, and the str_attrs (subject / pronoun) perspective the fragment is written from."""
+        if not self.inputs_fingerprint or self._state.adding:
+            return None
+        self.get_str_attrs("subject")
+        key_inputs = [
+            name,
+            [str(arg) for arg in args],
+            sorted((key, str(val)) for key, val in kwargs.items()),
+            sorted(self.str_attrs.items()),
+        ]
+        for obj in [self, *self.get_fragment_cache_objects()]:
+            key_inputs.append(
+                [
+                    obj._meta.label_lower,
+                    str(obj.pk),
+                    getattr(obj, "inputs_fingerprint", None),
+                    obj.modified.isoformat() if getattr(obj, "modified", None) else None,
+                ]
+            )
+        return f"fragments:{hashlib.sha256(json.dumps(key_inputs, default=str).encode()).hexdigest()}"
+
+    def get_fragment_cache_objects(self) -> list[models.Model]:
+        """Returns a list of the other objects whose changes should invalidate the aid's cached fragments."""
+        return self.get_related_objects()
+
     def update_aid(
         self,
         qs: Union["Aids", "Pseudopatient", None] = None,
+        stale_only: bool = False,
     ) -> "Aids":
+        """Updates the aid with its decision_aid_service. If stale_only is True,
+        the aid is only re-calculated and saved when the fingerprint of its inputs
+        has changed since it was last calculated."""
         if qs is None:
             qs = self.get_update_qs()
-        decisionaid = self.decision_aid_service(qs=qs)
-        return decisionaid._update()
+        with instrument("service_init"):
+            decisionaid = self.decision_aid_service(qs=qs)
+        if stale_only and not decisionaid.aid_is_stale():
+            return decisionaid.model_attr
+        with instrument("service_update"):
+            return decisionaid._update()
+
+    def evaluate_aid(self, qs: Union["Aids", "Pseudopatient", None] = None) -> "Aids":
+        """Calculates the aid in memory with its decision_aid_service without saving it. Unlike update_aid(),
+        qs defaults to the aid itself, which needs to have its related objects (i.e. medhistorys_qs) set on it,
+        so that an aid that was never saved can be evaluated."""
+        with instrument("service_init"):
+            decisionaid = self.decision_aid_service(qs=self if qs is None else qs)
+        with instrument("service_update"):
+            return decisionaid.evaluate()
 
     def get_update_qs(self) -> "QuerySet[Union[Aids, Pseudopatient]]":
         if self.user:
@@ -2105,11 +2291,12 @@ class GoutHelperAidModel(GoutHelperBaseModel, models.Model):
     def update_related_objects(
         self,
         qs: Union["Aids", "Pseudopatient", None] = None,
+        stale_only: bool = False,
     ) -> None:
         if qs is None:
             qs = self.get_update_qs()
         for related_obj in self.related_objects_list:
-            related_obj.update_aid(qs=self.user if self.user else related_obj)
+            related_obj.update_aid(qs=self.user if self.user else related_obj, stale_only=stale_only)
 
 
 class GoutHelperModel(models.Model):
@@ -0,0 +1,105 @@
+import base64
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+from django.core.exceptions import ValidationError  # type: ignore
+from django.core.paginator import InvalidPage  # type: ignore
+from django.db.models import F, Field, Func, Value  # type: ignore
+from django.db.models.lookups import GreaterThan, LessThan  # type: ignore
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet  # type: ignore
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class Row(Func):
+    """Row constructor, i.e. ROW(modified, id), so that the (field, pk) keyset can be compared to a cursor with
+    a single row comparison, which, unlike the equivalent OR of comparisons, Postgres uses as an index bound."""
+
+    function = "ROW"
+    output_field = Field()
+
+
+class KeysetPage(NamedTuple):
+    object_list: list["Model"]
+    next_cursor: str | None
+    previous_cursor: str | None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def get_page_size(value: Any, default: int, max_page_size: int) -> int:
+    """Returns value (i.e. a page_size query parameter) as an int between 1 and max_page_size,
+    or default if value isn't a positive integer."""
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return min(page_size, max_page_size) if page_size > 0 else default
+
+
+class KeysetPaginator:
+    """Paginates a QuerySet, most recent first, by (field, pk) keyset (seek) pagination rather
+    than by OFFSET, so that no COUNT query is needed and the rows before a page aren't read and
+    discarded. The page is sought with a row comparison, (field, pk) < (cursor field, cursor pk),
+    so with an index on the QuerySet's equality filters followed by (field, pk), i.e.
+    users_user_provider_modified_id_idx for a provider's panel, a page is read by scanning the
+    index from the cursor for per_page + 1 rows, however deep the page is.
+
+    Pages are fetched with an opaque cursor, which encodes the direction and the field and pk
+    of the last (next) or first (previous) object of the page it was created from."""
+
+    def __init__(self, queryset: "QuerySet", per_page: int, field: str = "modified"):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.model_field = queryset.model._meta.get_field(field)
+        self.pk_field = queryset.model._meta.pk
+
+    def encode_cursor(self, direction: Literal["n", "p"], obj: "Model") -> str:
+        value = getattr(obj, self.field)
+        value = value.isoformat() if hasattr(value, "isoformat") else str(value)
+        return base64.urlsafe_b64encode(f"{direction}|{value}|{obj.pk}".encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[Literal["n", "p"], Any, Any]:
+        try:
+            direction, value, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            if direction not in ("n", "p"):
+                raise ValueError(direction)
+            return direction, self.model_field.to_python(value), self.pk_field.to_python(pk)
+        except (ValueError, TypeError, UnicodeDecodeError, ValidationError) as exc:
+            raise InvalidCursor("Invalid cursor.") from exc
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        """Returns the first page or the page before or after the one the cursor was created from."""
+        direction, value, pk = self.decode_cursor(cursor) if cursor else ("n", None, None)
+        keyset = Row(F(self.field), F("pk"))
+        if cursor:
+            cursor_keyset = Row(Value(value, output_field=self.model_field), Value(pk, output_field=self.pk_field))
+        if direction == "n":
+            queryset = self.queryset.order_by(f"-{self.field}", "-pk")
+            if cursor:
+                queryset = queryset.filter(LessThan(keyset, cursor_keyset))
+        else:
+            queryset = self.queryset.order_by(self.field, "pk").filter(GreaterThan(keyset, cursor_keyset))
+        object_list = list(queryset[: self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+        if direction == "p":
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+        return KeysetPage(
+            object_list=object_list,
+            next_cursor=self.encode_cursor("n", object_list[-1]) if has_next and object_list else None,
+            previous_cursor=self.encode_cursor("p", object_list[0]) if has_previous and object_list else None,
+        )
@@ -0,0 +1,134 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Literal
+
+from django.db import router, transaction  # type: ignore
+from django.db.models.deletion import Collector  # type: ignore
+from django.utils import timezone  # type: ignore
+from simple_history.utils import get_change_reason_from_object, get_history_manager_for_model  # type: ignore
+
+from .history import history_batch_current, history_changed_objs
+
+if TYPE_CHECKING:
+    from django.db.models import Model  # type: ignore
+
+
+def bulk_history_create(
+    model: type["Model"],
+    objs: list["Model"],
+    history_type: Literal["+", "~", "-"],
+) -> None:
+    """Creates the simple_history records for objs with a single query. The records are
+    the same as those HistoricalRecords.create_historical_record() creates one at a time,
+    but unlike HistoryManager.bulk_history_create() this can create records of deletions.
+    Like GoutHelperHistoricalRecords, updates of objs that haven't changed since their latest
+    record don't create one, and records are queued if a history_batch() is active."""
+    history_model = get_history_manager_for_model(model).model
+    if history_type == "~":
+        objs = history_changed_objs(history_model, objs)
+    records = [
+        history_model(
+            history_date=getattr(obj, "_history_date", timezone.now()),
+            history_type=history_type,
+            history_user=history_model.get_default_history_user(obj),
+            history_change_reason=get_change_reason_from_object(obj),
+            **{
+                field.attname: getattr(obj, field.attname)
+                for field in obj._meta.fields
+                if field.name not in history_model._history_excluded_fields
+            },
+        )
+        for obj in objs
+    ]
+    batch = history_batch_current()
+    if batch is not None:
+        for record in records:
+            batch.add(record)
+    elif records:
+        history_model.objects.bulk_create(records)
+
+
+class UnitOfWork:
+    """Collects the objects to be saved or deleted by an edit view and, when flushed, writes
+    them with a bulk_create, a bulk_update, and a DELETE ... WHERE id IN per model, each with
+    a single bulk insert of their simple_history records, rather than a save() or delete()
+    (and its historical record) per object.
+
+    Objects are grouped by their concrete model, so proxy models (i.e. the MedHistory
+    proxies) are written together. Objects can define a prepare_save() method that is
+    called before they are written, for anything their save() method does to them first.
+    No save() or delete() methods are called and no post_save or post_delete signals
+    are sent, other than for deletes that cascade to related objects, which are deleted
+    with Django's Collector as they would be by delete()."""
+
+    def __init__(self, using: str | None = None):
+        self.using = using
+        self.saves: dict[type["Model"], dict[Any, "Model"]] = defaultdict(dict)
+        self.deletes: dict[type["Model"], dict[Any, "Model"]] = defaultdict(dict)
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def save(self, obj: "Model") -> None:
+        self.saves[obj._meta.concrete_model][obj.pk if obj.pk is not None else id(obj)] = obj
+
+    def delete(self, obj: "Model") -> None:
+        self.deletes[obj._meta.concrete_model][obj.pk] = obj
+
+    def flush(self) -> None:
+        """Writes the pending saves, then the pending deletes, in a single transaction."""
+        saves, deletes = self.saves, self.deletes
+        self.saves, self.deletes = defaultdict(dict), defaultdict(dict)
+        with transaction.atomic(using=self.using, savepoint=False):
+            for model, objs in saves.items():
+                self.flush_saves(model, list(objs.values()), self.using or router.db_for_write(model))
+            for model, objs in deletes.items():
+                self.flush_deletes(model, list(objs.values()), self.using or router.db_for_write(model))
+
+    @classmethod
+    def flush_saves(cls, model: type["Model"], objs: list["Model"], using: str) -> None:
+        for obj in objs:
+            if hasattr(obj, "prepare_save"):
+                obj.prepare_save()
+        creates = [obj for obj in objs if obj._state.adding]
+        updates = [obj for obj in objs if not obj._state.adding]
+        if creates:
+            model._base_manager.using(using).bulk_create(creates)
+            bulk_history_create(model, creates, "+")
+        if updates:
+            fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+            for obj in updates:
+                # Sets auto_now fields (i.e. modified) the same way save() does
+                for field in fields:
+                    setattr(obj, field.attname, field.pre_save(obj, False))
+            model._base_manager.using(using).bulk_update(updates, [field.name for field in fields])
+            bulk_history_create(model, updates, "~")
+        for obj in objs:
+            if hasattr(obj, "set_saved_field_values"):
+                obj.set_saved_field_values()
+
+    @classmethod
+    def flush_deletes(cls, model: type["Model"], objs: list["Model"], using: str) -> None:
+        # The Collector sends signals with the class of the objects, which for proxy models
+        # would skip the simple_history receivers, so the objects are collected as the concrete model
+        classes = [obj.__class__ for obj in objs]
+        for obj in objs:
+            obj.__class__ = model
+        try:
+            collector = Collector(using=using, origin=objs)
+            collector.collect(objs)
+            if list(collector.data.keys()) == [model] and not collector.fast_deletes and not collector.field_updates:
+                bulk_history_create(model, objs, "-")
+                # Nothing else needs to be deleted or updated, so the objects can be deleted without the
+                # Collector sending a post_delete signal, and therefore simple_history record, for each
+                model._base_manager.using(using).filter(pk__in=[obj.pk for obj in objs])._raw_delete(using)
+                for obj in objs:
+                    setattr(obj, model._meta.pk.attname, None)
+            else:
+                collector.delete()
+        finally:
+            for obj, obj_class in zip(objs, classes):
+                obj.__class__ = obj_class
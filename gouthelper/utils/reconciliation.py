@@ -0,0 +1,105 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable
+
+if TYPE_CHECKING:
+    from django.db.models import Model  # type: ignore
+    from django.forms import BaseModelFormSet  # type: ignore
+
+
+def reconcile_key(obj: "Model") -> Hashable:
+    """Returns the key objects are matched on: their pk, or, like Model.__eq__, their
+    identity if they don't have one."""
+    return obj.pk if obj.pk is not None else id(obj)
+
+
+class IndexedList:
+    """Wraps a list, in place, with a set of the keys of its objects so that checking
+    for and adding an object doesn't require scanning the list."""
+
+    def __init__(self, objs: list[Any], key: Callable[[Any], Hashable] = reconcile_key):
+        self.objs = objs
+        self.key = key
+        self.keys = {key(obj) for obj in objs}
+
+    def __contains__(self, obj: Any) -> bool:
+        return self.key(obj) in self.keys
+
+    def add(self, obj: Any) -> None:
+        """Appends obj to the list if it isn't already in it."""
+        if obj not in self:
+            self.objs.append(obj)
+            self.keys.add(self.key(obj))
+
+    def discard(self, obj: Any) -> None:
+        """Removes obj from the list if it is in it."""
+        if obj in self:
+            self.objs.remove(obj)
+            self.keys.discard(self.key(obj))
+
+
+def index_by(objs: Iterable[Any], attr: str) -> dict[Any, Any]:
+    """Returns a dict of objs keyed by attr. If more than one obj has the same value
+    for attr, the first is kept."""
+    index: dict[Any, Any] = {}
+    for obj in objs:
+        index.setdefault(getattr(obj, attr), obj)
+    return index
+
+
+@dataclass
+class ReconciliationPlan:
+    """The result of reconciling a formset against the existing objects it edits.
+
+    Attributes:
+        save: objects from the formset that are new, changed, or need a relation set
+        set_relation: existing objects the formset didn't change, but need a relation set
+        delete: existing objects that are deleted in or missing from the formset
+        current: the objects that remain after the plan is carried out"""
+
+    save: list["Model"] = field(default_factory=list)
+    set_relation: list["Model"] = field(default_factory=list)
+    delete: list["Model"] = field(default_factory=list)
+    current: list["Model"] = field(default_factory=list)
+
+    @property
+    def to_save(self) -> list["Model"]:
+        """Returns the set_relation and save objects, without duplicates."""
+        to_save = IndexedList([])
+        for obj in self.set_relation + self.save:
+            to_save.add(obj)
+        return to_save.objs
+
+
+def reconcile_formset(
+    existing: list["Model"],
+    formset: "BaseModelFormSet",
+    needs_relation_set: Callable[["Model"], bool],
+) -> ReconciliationPlan:
+    """Diffs the forms of a valid model formset, whose forms have an instance_should_persist
+    property, against the list of existing objects it edits by pk, in linear time.
+
+    An existing object is kept if a form for it was submitted and not deleted, otherwise it is
+    deleted. A form's instance is saved if it should persist and is new, changed, or
+    needs_relation_set(instance) is True, and is added to the current objects."""
+    plan = ReconciliationPlan()
+    forms_by_pk = {}
+    for cleaned_data in formset.cleaned_data:
+        try:
+            if not cleaned_data["DELETE"] and cleaned_data["id"] is not None:
+                forms_by_pk.setdefault(cleaned_data["id"].pk, cleaned_data)
+        except KeyError:
+            pass
+    for obj in existing:
+        if obj.pk in forms_by_pk:
+            if needs_relation_set(obj):
+                plan.set_relation.append(obj)
+            plan.current.append(obj)
+        else:
+            plan.delete.append(obj)
+    current = IndexedList(plan.current)
+    for form in formset:
+        if form.instance_should_persist:
+            if (form.instance and form.has_changed()) or form.instance is None or needs_relation_set(form.instance):
+                plan.save.append(form.instance)
+            current.add(form.instance)
+    return plan
@@ -1,15 +1,20 @@
+import hashlib
 import json
-from typing import TYPE_CHECKING, Literal, Union
+from datetime import timedelta
+from decimal import Decimal
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal, Union
 
 from django.apps import apps  # pylint: disable=E0401  # type: ignore
 from django.contrib.auth import get_user_model  # pylint: disable=E0401  # type: ignore
 from django.core.serializers.json import DjangoJSONEncoder  # pylint: disable=E0401  # type: ignore
-from django.db.models import OneToOneField, QuerySet  # pylint: disable=E0401  # type: ignore
+from django.db.models import Model, OneToOneField, QuerySet  # pylint: disable=E0401  # type: ignore
 from django.utils.functional import cached_property  # type: ignore  # pylint: disable=E0401
 
 from ..dateofbirths.helpers import age_calc
-from ..defaults.helpers import defaults_treatments_create_dosing_dict
+from ..defaults.helpers import defaults_compile_contraindication_index, defaults_treatments_create_dosing_dict
 from ..defaults.selectors import (
+    defaults_contraindication_index,
     defaults_defaultmedhistorys_trttype,
     defaults_defaulttrts_trttype,
     defaults_flareaidsettings,
@@ -17,6 +22,7 @@ from ..defaults.selectors import (
     defaults_ultaidsettings,
 )
 from ..ethnicitys.helpers import ethnicitys_hlab5801_risk
+from ..medallergys.helpers import medallergys_get
 from ..medhistorydetails.choices import DialysisChoices, Stages
 from ..medhistorys.choices import Contraindications, MedHistoryTypes
 from ..medhistorys.dicts import CVD_CONTRAS
@@ -30,11 +36,11 @@ from ..treatments.choices import (
     Treatments,
     TrtTypes,
 )
-from .helpers import duration_decimal_parser
+from .helpers import duration_decimal_parser, explanations_render, normalize_fraction
 
 if TYPE_CHECKING:
     from ..dateofbirths.models import DateOfBirth
-    from ..defaults.models import FlareAidSettings, PpxAidSettings, UltAidSettings
+    from ..defaults.models import DefaultMedHistory, DefaultTrt, FlareAidSettings, PpxAidSettings, UltAidSettings
     from ..ethnicitys.models import Ethnicity
     from ..flareaids.models import FlareAid
     from ..flares.models import Flare
@@ -48,6 +54,7 @@ if TYPE_CHECKING:
     from ..ppxs.models import Ppx
     from ..ultaids.models import UltAid
     from ..ults.models import Ult
+    from .types import Aids, TrtDosingDict
 
     User = get_user_model()
 
@@ -141,6 +148,18 @@ def aids_get_colchicine_contraindication_for_stage(
         return Contraindications.ABSOLUTE
 
 
+def aids_contraindication_index(
+    default_medhistorys: Union[list["DefaultMedHistory"], "QuerySet[DefaultMedHistory]"],
+) -> MappingProxyType:
+    """Method that compiles an iterable of DefaultMedHistorys into an immutable contraindication index.
+    The aid services use the index cached per User and TrtType, defaults_contraindication_index(), instead.
+
+    Returns:
+        MappingProxyType: {MedHistoryTypes: tuple of (Treatments, Contraindications, TrtTypes)}
+    """
+    return MappingProxyType(defaults_compile_contraindication_index(default_medhistorys))
+
+
 def aids_create_trts_dosing_dict(default_trts: "QuerySet") -> dict:
     """Method that takes a list of DefaultTrt objects, typically for a type of
     Gout Treatment (Flare, PPx, ULT), and returns a dictionary with dosing info.
@@ -307,6 +326,35 @@ def aids_hlab5801_contra(
     return False
 
 
+def aids_inputs_fingerprint(inputs: dict[str, Any]) -> str:
+    """Method that hashes a dict of decision aid inputs into a sha256 hexdigest.
+    Model instances are represented by their concrete field values, excluding the
+    TimeStampedModel fields, and lists / QuerySets are sorted so that the order in
+    which related objects were fetched doesn't change the fingerprint.
+
+    Args:
+        inputs (dict): {str: Model, list[Model], QuerySet, or JSON-serializable value}
+
+    Returns:
+        str: sha256 hexdigest of the inputs
+    """
+
+    def _serialize(value: Any) -> Any:
+        if isinstance(value, Model):
+            return aids_model_fingerprint_dict(value)
+        elif isinstance(value, (list, tuple, QuerySet)):
+            return sorted(json.dumps(_serialize(val), cls=DjangoJSONEncoder, sort_keys=True) for val in value)
+        return value
+
+    return hashlib.sha256(
+        json.dumps(
+            {key: _serialize(val) for key, val in inputs.items()},
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        ).encode()
+    ).hexdigest()
+
+
 def aids_json_to_trt_dict(decisionaid: str) -> dict:
     """Method that converts a trt_dict json and converts it to a python dict.
     Converts duration and decimal strings into their native Python types.
@@ -320,6 +368,115 @@ def aids_json_to_trt_dict(decisionaid: str) -> dict:
     return json.loads(decisionaid, object_hook=duration_decimal_parser)
 
 
+# Version of the native JSON schema of the FlareAid, PpxAid, and UltAid decisionaid field,
+# {"version": 2, "trts": {Treatments: {dosing}}}. Version 1 was the trt_dict as a JSON string.
+DECISIONAID_VERSION = 2
+DECISIONAID_DECIMAL_KEYS = frozenset(("dose", "dose2", "dose3", "dose_adj"))
+DECISIONAID_DURATION_KEYS = frozenset(("duration", "duration2", "duration3"))
+
+
+def aids_decisionaid_encode_value(value: Any) -> Any:
+    """Returns a trt_dict value in its canonical JSON form: Decimals as numbers, timedeltas
+    as numbers of days, and Choices as their values."""
+    if isinstance(value, Decimal):
+        value = normalize_fraction(value)
+        return int(value) if value == value.to_integral_value() else float(value)
+    elif isinstance(value, timedelta):
+        days = value / timedelta(days=1)
+        return int(days) if days.is_integer() else days
+    elif isinstance(value, str):
+        return str(value)
+    return value
+
+
+def aids_trt_dict_to_decisionaid(trt_dict: dict) -> dict[str, Any]:
+    """Converts a trt_dict to the native JSON schema of the decisionaid field.
+
+    Args:
+        trt_dict {dict}: keys = Treatments, vals = dosing + contraindications
+
+    Returns:
+        dict: {"version": DECISIONAID_VERSION, "trts": {treatment: {dosing}}}
+    """
+    return {
+        "version": DECISIONAID_VERSION,
+        "trts": {
+            str(trt): {key: aids_decisionaid_encode_value(value) for key, value in dosing.items()}
+            for trt, dosing in trt_dict.items()
+        },
+    }
+
+
+def aids_decisionaid_decode_dosing(dosing: dict[str, Any]) -> "TrtDosingDict":
+    """Converts the canonical JSON dosing of a treatment in a decisionaid to its Python types."""
+    decoded = {}
+    for key, value in dosing.items():
+        if value is not None and key in DECISIONAID_DECIMAL_KEYS:
+            value = normalize_fraction(Decimal(str(value)))
+        elif value is not None and key in DECISIONAID_DURATION_KEYS:
+            value = timedelta(days=value)
+        decoded[key] = value
+    return decoded
+
+
+def aids_decisionaid_to_trt_dict(decisionaid: dict[str, Any] | str) -> dict[str, "TrtDosingDict"]:
+    """Converts a decisionaid field to a trt_dict with Decimal doses and timedelta durations,
+    without re-parsing any JSON. decisionaids that haven't been migrated from the version 1
+    JSON string are parsed with aids_json_to_trt_dict.
+
+    Args:
+        decisionaid: native (version 2) dict or version 1 JSON str of the trt_dict
+
+    Returns:
+        {dict}: trt_dict for Aid
+    """
+    if isinstance(decisionaid, str):
+        return aids_json_to_trt_dict(decisionaid)
+    return {trt: aids_decisionaid_decode_dosing(dosing) for trt, dosing in decisionaid.get("trts", {}).items()}
+
+
+def aids_evaluation_dict(aid: "Aids") -> dict[str, Any]:
+    """Returns a JSON-serializable dict of an aid that was calculated (i.e. evaluated in memory) by
+    its decision_aid_service: the result_fields it calculated, its recommendation, if the aid makes
+    one, and its rendered explanations.
+
+    Returns:
+        dict: {"aid": model_name, "results": {field: value}, "recommendation": {treatment, dosing} | None,
+        "explanations": [{id, label, value, interp}]}
+    """
+    recommendation = getattr(aid, "recommendation", None)
+    # UltAid.explanations() is a method rather than a cached_property
+    explanations = aid.explanations() if callable(aid.explanations) else aid.explanations
+    return {
+        "aid": aid._meta.model_name,
+        "results": {
+            field: aids_decisionaid_encode_value(getattr(aid, field))
+            for field in aid.decision_aid_service.result_fields
+        },
+        "recommendation": (
+            {
+                "treatment": aids_decisionaid_encode_value(recommendation[0]),
+                "dosing": {key: aids_decisionaid_encode_value(val) for key, val in recommendation[1].items()},
+            }
+            if recommendation
+            else None
+        ),
+        "explanations": [
+            {"id": exp_id, "label": str(label), "value": value, "interp": str(interp)}
+            for exp_id, label, value, interp in explanations_render(explanations)
+        ],
+    }
+
+
+def aids_model_fingerprint_dict(obj: Model, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+    """Returns a dict of a model instance's concrete field values for fingerprinting,
+    excluding the created / modified fields and any field names in exclude."""
+    exclude = exclude + ("created", "modified", "inputs_fingerprint")
+    return {
+        field.attname: field.value_from_object(obj) for field in obj._meta.concrete_fields if field.name not in exclude
+    }
+
+
 def aids_not_options(
     trt_dict: dict, defaultsettings: Union["FlareAidSettings", "PpxAidSettings", "UltAidSettings"]
 ) -> dict:
@@ -436,12 +593,14 @@ def aids_process_medhistorys(
     trt_dict: dict,
     medhistorys: Union[list["MedHistory"], "QuerySet[MedHistory]"],
     ckddetail: Union["CkdDetail", None],
-    default_medhistorys: "QuerySet",
+    default_medhistorys: Union[list["DefaultMedHistory"], "QuerySet[DefaultMedHistory]"],
     defaulttrtsettings: Union["FlareAidSettings", "PpxAidSettings", "UltAidSettings"],
+    contraindication_index: MappingProxyType | None = None,
 ) -> dict:
     """Method that takes a trt_dict, cross-references a QuerySet of MedHistorys
     and a queryset of DefaultMedHistorys, and adds MedHistorys and Contraindications to
-    trt_dict before returning.
+    trt_dict before returning. The DefaultMedHistorys are looked up in an index by
+    medhistorytype so that the MedHistorys are processed in a single pass.
 
     Takes optional args (CkdDetail, etc.) to process certain combinations of MedHistorys and Treatments.
 
@@ -449,100 +608,96 @@ def aids_process_medhistorys(
         trt_dict (dict): {TrtTypes: {TrtInfo}}
         medhistorys (QuerySet): QuerySet of MedHistory objects.
         ckddetail (CkdDetail or None): CkdDetail object or None
-        default_medhistorys (QuerySet): QuerySet of DefaultMedHistory objects.
+        default_medhistorys (QuerySet): QuerySet or list of DefaultMedHistory objects.
         defaulttrtsettings (DefaultFlare/Ppx/UltTrtSettings): FlareAidSettings or \
 PpxAidSettings or UltAidSettings object.
+        contraindication_index (MappingProxyType or None): precompiled index of the DefaultMedHistorys
+            (see defaults_contraindication_index()), used instead of compiling default_medhistorys
 
     Returns:
         dict: {TrtTypes: {treatment dosing + "contra": True/False}}
     """
+    if contraindication_index is None:
+        contraindication_index = aids_contraindication_index(default_medhistorys)
     for medhistory in medhistorys:
-        contraindications = [
-            default_medhistory
-            for default_medhistory in default_medhistorys
-            if default_medhistory.medhistorytype == medhistory.medhistorytype
-        ]
-        if contraindications:
-            for contraindication in contraindications:
-                if medhistory.medhistorytype == MedHistoryTypes.CKD:
-                    if contraindication.treatment == Treatments.ALLOPURINOL:
-                        allo_ckd_contra = aids_xois_ckd_contra(
-                            ckd=medhistory,
-                            ckddetail=ckddetail,
+        for treatment, contraindication, trttype in contraindication_index.get(medhistory.medhistorytype, ()):
+            if medhistory.medhistorytype == MedHistoryTypes.CKD:
+                if treatment == Treatments.ALLOPURINOL:
+                    allo_ckd_contra = aids_xois_ckd_contra(
+                        ckd=medhistory,
+                        ckddetail=ckddetail,
+                    )
+                    if allo_ckd_contra[0] == Contraindications.DOSEADJ:
+                        trt_dict = aids_dose_adjust_allopurinol_ckd(
+                            trt_dict=trt_dict,
+                            defaulttrtsettings=defaulttrtsettings,
+                            dialysis=allo_ckd_contra[1],
+                            stage=allo_ckd_contra[2],
                         )
-                        if allo_ckd_contra[0] == Contraindications.DOSEADJ:
-                            trt_dict = aids_dose_adjust_allopurinol_ckd(
-                                trt_dict=trt_dict,
-                                defaulttrtsettings=defaulttrtsettings,
-                                dialysis=allo_ckd_contra[1],
-                                stage=allo_ckd_contra[2],
-                            )
-                    elif contraindication.treatment == Treatments.COLCHICINE:
-                        colch_ckd_contra = aids_colchicine_ckd_contra(
-                            ckd=medhistory,
-                            ckddetail=ckddetail,
+                elif treatment == Treatments.COLCHICINE:
+                    colch_ckd_contra = aids_colchicine_ckd_contra(
+                        ckd=medhistory,
+                        ckddetail=ckddetail,
+                        defaulttrtsettings=defaulttrtsettings,
+                    )
+                    # colch_ckd_contra is a Contraindications enum or None
+                    # So, only attempt to modify the trt_dict if not None
+                    if (
+                        colch_ckd_contra is not None
+                        and colch_ckd_contra == Contraindications.DOSEADJ
+                        and not trt_dict[Treatments.COLCHICINE]["contra"]
+                    ):
+                        trt_dict = aids_dose_adjust_colchicine(
+                            trt_dict=trt_dict,
+                            aid_type=trttype,
                             defaulttrtsettings=defaulttrtsettings,
                         )
-                        # colch_ckd_contra is a Contraindications enum or None
-                        # So, only attempt to modify the trt_dict if not None
-                        if (
-                            colch_ckd_contra is not None
-                            and colch_ckd_contra == Contraindications.DOSEADJ
-                            and not trt_dict[Treatments.COLCHICINE]["contra"]
-                        ):
-                            trt_dict = aids_dose_adjust_colchicine(
-                                trt_dict=trt_dict,
-                                aid_type=contraindication.trttype,
-                                defaulttrtsettings=defaulttrtsettings,
-                            )
-                        elif (
-                            colch_ckd_contra is not None
-                            and (
-                                colch_ckd_contra == Contraindications.ABSOLUTE
-                                or colch_ckd_contra == Contraindications.RELATIVE
-                            )
-                            and trt_dict[Treatments.COLCHICINE]["contra"] is not True
-                        ):
-                            trt_dict[Treatments.COLCHICINE]["contra"] = True
-                    elif contraindication.treatment == Treatments.FEBUXOSTAT:
-                        febu_ckd_contra = aids_xois_ckd_contra(
-                            ckd=medhistory,
-                            ckddetail=ckddetail,
+                    elif (
+                        colch_ckd_contra is not None
+                        and (
+                            colch_ckd_contra == Contraindications.ABSOLUTE
+                            or colch_ckd_contra == Contraindications.RELATIVE
                         )
-                        if febu_ckd_contra[0] == Contraindications.DOSEADJ:
-                            trt_dict = aids_dose_adjust_febuxostat_ckd(
-                                trt_dict=trt_dict,
-                                defaulttrtsettings=defaulttrtsettings,
-                            )
-                    elif contraindication.treatment == Treatments.PROBENECID:
-                        prob_ckd_contra = aids_probenecid_ckd_contra(
-                            ckd=medhistory,
-                            ckddetail=ckddetail,
+                        and trt_dict[Treatments.COLCHICINE]["contra"] is not True
+                    ):
+                        trt_dict[Treatments.COLCHICINE]["contra"] = True
+                elif treatment == Treatments.FEBUXOSTAT:
+                    febu_ckd_contra = aids_xois_ckd_contra(
+                        ckd=medhistory,
+                        ckddetail=ckddetail,
+                    )
+                    if febu_ckd_contra[0] == Contraindications.DOSEADJ:
+                        trt_dict = aids_dose_adjust_febuxostat_ckd(
+                            trt_dict=trt_dict,
                             defaulttrtsettings=defaulttrtsettings,
                         )
-                        # prob_ckd_contra is a bool, so only switch if True
-                        if prob_ckd_contra and not trt_dict[Treatments.PROBENECID]["contra"]:
-                            trt_dict[Treatments.PROBENECID]["contra"] = True
-                    elif (
-                        contraindication.contraindication == Contraindications.ABSOLUTE
-                        or contraindication.contraindication == Contraindications.RELATIVE
-                    ) and trt_dict[contraindication.treatment]["contra"] is not True:
-                        trt_dict[contraindication.treatment]["contra"] = True
-                # Check if the contraindication is for febuxostat and cardiovascular disease
-                # If so, if the defaulttrtsettings indicate that febuxostat should be contraindicated
-                # for CV disease, then set the trt_dict[Treatments.FEBUXOSTAT]["contra"] to True
-                elif (
-                    contraindication.treatment == Treatments.FEBUXOSTAT
-                    and contraindication.contraindication == Contraindications.RELATIVE
-                    and medhistory.medhistorytype in CVD_CONTRAS
-                ):
-                    if not defaulttrtsettings.febu_cv_disease and not trt_dict[Treatments.FEBUXOSTAT]["contra"]:
-                        trt_dict[Treatments.FEBUXOSTAT]["contra"] = True
+                elif treatment == Treatments.PROBENECID:
+                    prob_ckd_contra = aids_probenecid_ckd_contra(
+                        ckd=medhistory,
+                        ckddetail=ckddetail,
+                        defaulttrtsettings=defaulttrtsettings,
+                    )
+                    # prob_ckd_contra is a bool, so only switch if True
+                    if prob_ckd_contra and not trt_dict[Treatments.PROBENECID]["contra"]:
+                        trt_dict[Treatments.PROBENECID]["contra"] = True
                 elif (
-                    contraindication.contraindication == Contraindications.ABSOLUTE
-                    or contraindication.contraindication == Contraindications.RELATIVE
-                ) and trt_dict[contraindication.treatment]["contra"] is not True:
-                    trt_dict[contraindication.treatment]["contra"] = True
+                    contraindication == Contraindications.ABSOLUTE or contraindication == Contraindications.RELATIVE
+                ) and trt_dict[treatment]["contra"] is not True:
+                    trt_dict[treatment]["contra"] = True
+            # Check if the contraindication is for febuxostat and cardiovascular disease
+            # If so, if the defaulttrtsettings indicate that febuxostat should be contraindicated
+            # for CV disease, then set the trt_dict[Treatments.FEBUXOSTAT]["contra"] to True
+            elif (
+                treatment == Treatments.FEBUXOSTAT
+                and contraindication == Contraindications.RELATIVE
+                and medhistory.medhistorytype in CVD_CONTRAS
+            ):
+                if not defaulttrtsettings.febu_cv_disease and not trt_dict[Treatments.FEBUXOSTAT]["contra"]:
+                    trt_dict[Treatments.FEBUXOSTAT]["contra"] = True
+            elif (
+                contraindication == Contraindications.ABSOLUTE or contraindication == Contraindications.RELATIVE
+            ) and trt_dict[treatment]["contra"] is not True:
+                trt_dict[treatment]["contra"] = True
     return trt_dict
 
 
@@ -727,6 +882,9 @@ class AidService:
     """Base class for Aid service class methods."""
 
     aid_needs_2_be_saved: bool
+    # Fields on the model that are calculated by the service and are therefore
+    # excluded from the fingerprint of the aid's inputs
+    result_fields: tuple[str, ...] = ()
 
     class Meta:
         abstract = True
@@ -796,6 +954,7 @@ class AidService:
         )
         # TODO: Add side effects back in at later stage, kept here to avoid breaking other code
         self.sideeffects = None
+        self.initial_inputs_fingerprint = self.model_attr.inputs_fingerprint
 
     @cached_property
     def qs_is_user(self) -> bool:
@@ -803,21 +962,13 @@ class AidService:
 
     def get_medallergys_from_medallergys_qs(self):
         if self.user:
-            return [
-                medallergy
-                for medallergy in self.qs.medallergys_qs
-                if medallergy.treatment in self.model.aid_treatments()
-            ]
+            return medallergys_get(self.qs.medallergys_qs, self.model.aid_treatments())
         else:
             return self.qs.medallergys_qs
 
     def get_medhistorys_from_medhistorys_qs(self):
         if self.user:
-            return [
-                medhistory
-                for medhistory in self.qs.medhistorys_qs
-                if medhistory.medhistorytype in self.model.aid_medhistorys()
-            ]
+            return medhistorys_get(self.qs.medhistorys_qs, self.model.aid_medhistorys())
         else:
             return self.qs.medhistorys_qs
 
@@ -825,16 +976,59 @@ class AidService:
         """Updates the model object's decisionaid field.
 
         Args:
-            commit (bool): defaults to True, True will clean/save, False will not
+            commit (bool): defaults to True, True will clean/save the changed fields, False will not
 
         Returns:
             str: decisionaid field JSON representation of trt_dict
         """
-        if commit and self.aid_needs_2_be_saved():
-            self.model_attr.full_clean()
-            self.model_attr.save()
+        self.model_attr.inputs_fingerprint = self.get_inputs_fingerprint()
+        if commit and (self.aid_needs_2_be_saved() or self.inputs_fingerprint_has_changed()):
+            self.model_attr.save_dirty()
         return self.model_attr
 
+    def related_objs_2_be_saved(self) -> list[Model]:
+        """Returns the saved objects other than the aid that _update() changed, which it only saves
+        itself when commit is True, so that callers using commit=False can write them."""
+        return []
+
+    def evaluate(self) -> Union["FlareAid", "Flare", "GoalUrate", "PpxAid", "Ppx", "UltAid", "Ult"]:
+        """Calculates the aid's result_fields in memory, without cleaning or saving the model object
+        or any of its inputs, so that an aid can be evaluated for objects that were never saved.
+
+        Returns:
+            Union[FlareAid, Flare, GoalUrate, PpxAid, Ppx, UltAid, Ult]: the unsaved model object
+        """
+        return self._update(commit=False)
+
+    def aid_is_stale(self) -> bool:
+        """Returns True if the aid has never been fingerprinted or if its inputs have
+        changed since it was last calculated, False if not."""
+        return self.initial_inputs_fingerprint is None or self.initial_inputs_fingerprint != (
+            self.get_inputs_fingerprint()
+        )
+
+    def get_fingerprint_inputs(self) -> dict[str, Any]:
+        """Returns a dict of the objects and values the service uses to calculate the aid.
+        Subclasses extend this with inputs specific to their aid."""
+        return {
+            "age": self.age,
+            "aid": aids_model_fingerprint_dict(self.model_attr, exclude=self.result_fields),
+            "baselinecreatinine": getattr(self, "baselinecreatinine", None),
+            "ckddetail": getattr(self, "ckddetail", None),
+            "dateofbirth": self.dateofbirth,
+            "defaultsettings": self.defaultsettings,
+            "ethnicity": self.ethnicity,
+            "gender": self.gender,
+            "medallergys": self.medallergys,
+            "medhistorys": self.medhistorys,
+        }
+
+    def get_inputs_fingerprint(self) -> str:
+        return aids_inputs_fingerprint(self.get_fingerprint_inputs())
+
+    def inputs_fingerprint_has_changed(self) -> bool:
+        return self.model_attr.inputs_fingerprint != self.initial_inputs_fingerprint
+
     def get_aid_object_from_user_qs(
         self,
         model_attr_str: Literal["flareaid", "flare", "ppxaid", "ppx", "ultaid", "ult"],
@@ -849,6 +1043,7 @@ class TreatmentAidService(AidService):
 
     ckddetail: Union["CkdDetail", None]
     trttype: TrtTypes.FLARE | TrtTypes.PPX | TrtTypes.ULT
+    result_fields = ("decisionaid",)
 
     def __init__(
         self,
@@ -856,11 +1051,7 @@ class TreatmentAidService(AidService):
         model: type[Union["FlareAid", "Flare", "GoalUrate", "PpxAid", "Ppx", "UltAid", "Ult"]],
     ):
         super().__init__(qs=qs, model=model)
-        self.initial_decisionaid_dict = (
-            self.model_attr.decisionaid
-            if isinstance(self.model_attr.decisionaid, dict)
-            else aids_json_to_trt_dict(self.model_attr.decisionaid)
-        )
+        self.initial_decisionaid = self.model_attr.decisionaid
 
     def _create_trts_dict(self):
         """Returns a dict {Treatments: {dose/freq/duration + contra=False}}."""
@@ -877,35 +1068,45 @@ class TreatmentAidService(AidService):
             ckddetail=self.ckddetail,
             default_medhistorys=self.default_medhistorys,
             defaulttrtsettings=self.defaultsettings,
+            contraindication_index=defaults_contraindication_index(trttype=self.trttype, user=self.user),
         )
         trt_dict = aids_process_medallergys(trt_dict=trt_dict, medallergys=self.medallergys)
         trt_dict = aids_process_sideeffects(trt_dict=trt_dict, sideeffects=self.sideeffects)
         return trt_dict
 
+    def get_fingerprint_inputs(self) -> dict[str, Any]:
+        inputs = super().get_fingerprint_inputs()
+        inputs.update(
+            {
+                "default_medhistorys": self.default_medhistorys,
+                "default_trts": self.default_trts,
+            }
+        )
+        return inputs
+
     @cached_property
-    def default_medhistorys(self) -> QuerySet:
-        """Returns a QuerySet of DefaultMedHistorys filtered for the class User and treatment type."""
+    def default_medhistorys(self) -> list["DefaultMedHistory"]:
+        """Returns a list of DefaultMedHistorys filtered for the class User and treatment type."""
         return defaults_defaultmedhistorys_trttype(medhistorys=self.medhistorys, trttype=self.trttype, user=self.user)
 
     @cached_property
-    def default_trts(self) -> QuerySet:
-        """Returns a QuerySet of DefaultTrts filtered for the class User and treatment type."""
+    def default_trts(self) -> list["DefaultTrt"]:
+        """Returns a list of DefaultTrts filtered for the class User and treatment type."""
         return defaults_defaulttrts_trttype(trttype=self.trttype, user=self.user)
 
-    def _save_decisionaid_dict_to_decisionaid(self, decisionaid_dict: dict, commit=True) -> str:
-        """Saves the trt_dict to the model object's decisionaid field as a JSON string.
+    def _save_decisionaid_dict_to_decisionaid(self, decisionaid_dict: dict, commit=True) -> dict[str, Any]:
+        """Saves the trt_dict to the model object's decisionaid field in its native JSON schema.
 
         Args:
             decisionaid_dict {dict}: keys = Treatments, vals = dosing + contraindications.
-            commit (bool): defaults to True, True will clean/save, False will not
+            commit (bool): defaults to True, True will clean/save the changed fields, False will not
 
         Returns:
-            str: decisionaid field JSON representation fo the trt_dict
+            dict: decisionaid field representation of the trt_dict
         """
-        self.model_attr.decisionaid = aids_dict_to_json(aid_dict=decisionaid_dict)
+        self.model_attr.decisionaid = aids_trt_dict_to_decisionaid(trt_dict=decisionaid_dict)
         if commit:
-            self.model_attr.full_clean()
-            self.model_attr.save()
+            self.model_attr.save_dirty()
         return self.model_attr.decisionaid
 
     def _update(self, commit=True) -> Union["FlareAid", "PpxAid", "UltAid"]:
@@ -927,8 +1128,9 @@ class TreatmentAidService(AidService):
         )
 
     def decisionaid_has_changed(self) -> bool:
-        """Returns True if the decisionaid_dict has changed since the initial_decisionaid_dict."""
-        return self.decisionaid_dict != self.initial_decisionaid_dict
+        """Returns True if the decisionaid field has changed since it was initially fetched,
+        comparing the native JSON values."""
+        return self.model_attr.decisionaid != self.initial_decisionaid
 
     def aid_needs_2_be_saved(self) -> bool:
         return self.decisionaid_has_changed()
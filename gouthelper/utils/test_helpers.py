@@ -13,3 +13,12 @@ def dummy_get_response(request: "HttpRequest"):
 
 def date_days_ago(days: int) -> date:
     return (timezone.now() - timezone.timedelta(days=days)).date()
+
+
+def captured_writes(captured_queries: list[dict]) -> list[str]:
+    """Returns the SQL of the INSERT, UPDATE, and DELETE queries in a CaptureQueriesContext's captured_queries."""
+    return [
+        query["sql"]
+        for query in captured_queries
+        if query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+    ]
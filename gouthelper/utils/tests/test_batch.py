@@ -0,0 +1,101 @@
+import json
+from io import StringIO
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.core.serializers.json import DjangoJSONEncoder  # pylint: disable=E0401 # type: ignore
+from django.db import connection  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=E0401 # type: ignore
+from django.urls import reverse  # pylint: disable=E0401 # type: ignore
+
+from ...flareaids.tests.factories import flareaid_data_factory
+from ...ultaids.models import UltAid
+from ...ultaids.tests.factories import ultaid_data_factory
+from ..batch import batch_evaluate, batch_evaluate_record, batch_read_records, batch_record_data
+from ..test_helpers import captured_writes
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBatchReadRecords(TestCase):
+    def test__csv(self):
+        file = StringIO("id,aid,joints,onset\n1,flare,MTP1L|ANKLER,True\n2,flare,,\n")
+        self.assertEqual(
+            list(batch_read_records(file, "csv")),
+            [
+                {"id": "1", "aid": "flare", "joints": ["MTP1L", "ANKLER"], "onset": "True"},
+                {"id": "2", "aid": "flare", "joints": "", "onset": ""},
+            ],
+        )
+
+    def test__ndjson(self):
+        file = StringIO('{"id": 1, "joints": ["MTP1L"]}\n\n{"id": 2, "onset": null}\n')
+        self.assertEqual(
+            list(batch_read_records(file, "ndjson")),
+            [{"id": 1, "joints": ["MTP1L"]}, {"id": 2, "onset": None}],
+        )
+
+    def test__ndjson_invalid(self):
+        with self.assertRaisesMessage(ValueError, "Line 2"):
+            list(batch_read_records(StringIO('{"id": 1}\n[1, 2]\n'), "ndjson"))
+
+
+class TestBatchRecordData(TestCase):
+    def test__lists_and_none(self):
+        data = batch_record_data({"joints": ["MTP1L", "ANKLER"], "onset": None, "urate_check": True})
+        self.assertEqual(data.getlist("joints"), ["MTP1L", "ANKLER"])
+        self.assertEqual(data["onset"], "")
+        self.assertEqual(data["urate_check"], "True")
+
+
+class TestBatchEvaluateRecord(TestCase):
+    def test__matches_evaluate_view_without_saving(self):
+        for _ in range(3):
+            data = ultaid_data_factory()
+            with CaptureQueriesContext(connection) as context:
+                result = batch_evaluate_record({"id": "a", **data}, aid="ultaid")
+            self.assertFalse(captured_writes(context.captured_queries))
+            self.assertEqual(result["id"], "a")
+            self.assertEqual(result["aid"], "ultaid")
+            self.assertEqual(result["status"], 200)
+            self.assertTrue(result["valid"])
+            evaluation = self.client.post(reverse("ultaids:evaluate"), data).json()
+            self.assertEqual(result["results"], evaluation["results"])
+            self.assertEqual(result["explanations"], evaluation["explanations"])
+        self.assertFalse(UltAid.objects.exists())
+
+    def test__record_aid_takes_precedence(self):
+        result = batch_evaluate_record({"aid": "flareaid", **flareaid_data_factory()}, aid="ultaid")
+        self.assertEqual(result["aid"], "flareaid")
+        self.assertTrue(result["valid"])
+
+    def test__invalid_record_returns_errors(self):
+        result = batch_evaluate_record({"id": 1}, aid="ultaid")
+        self.assertEqual(result["status"], 400)
+        self.assertFalse(result["valid"])
+        self.assertIn("errors", result)
+
+    def test__no_aid_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            batch_evaluate_record({"id": 1})
+        with self.assertRaises(ValueError):
+            batch_evaluate_record({"id": 1}, aid="goalurate")
+
+
+class TestBatchEvaluate(TestCase):
+    def setUp(self):
+        self.records = [
+            json.loads(json.dumps({"id": i, **ultaid_data_factory()}, cls=DjangoJSONEncoder)) for i in range(6)
+        ]
+
+    def test__workers_match_inline_and_preserve_order(self):
+        inline = list(batch_evaluate(self.records, aid="ultaid"))
+        pooled = list(batch_evaluate(iter(self.records), aid="ultaid", workers=2, chunk_size=2))
+        self.assertEqual([result["id"] for result in pooled], list(range(6)))
+        self.assertEqual(pooled, inline)
+
+    def test__invalid_workers_or_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(batch_evaluate(self.records, aid="ultaid", workers=0))
+        with self.assertRaises(ValueError):
+            list(batch_evaluate(self.records, aid="ultaid", chunk_size=0))
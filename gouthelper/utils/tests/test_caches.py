@@ -0,0 +1,47 @@
+from unittest.mock import Mock, patch
+
+import pytest  # pylint: disable=E0401  # type: ignore
+from django.core.cache import cache  # pylint: disable=E0401  # type: ignore
+from django.test import TestCase  # pylint: disable=E0401  # type: ignore
+
+from ..caches import VersionedCache
+
+pytestmark = pytest.mark.django_db
+
+
+class TestVersionedCache(TestCase):
+    def setUp(self):
+        self.versioned_cache = VersionedCache("test:version", timeout=60)
+        self.versioned_cache.clear()
+
+    def test__get_or_set(self):
+        resolve = Mock(return_value="value")
+        self.assertEqual(self.versioned_cache.get_or_set("test:key", resolve), "value")
+        self.assertEqual(self.versioned_cache.get_or_set("test:key", resolve), "value")
+        resolve.assert_called_once()
+        # Another process, without the local value, reads it from the Django cache
+        other_process = VersionedCache("test:version", timeout=60)
+        self.assertEqual(other_process.get_or_set("test:key", resolve), "value")
+        resolve.assert_called_once()
+
+    def test__local_hits_dont_read_the_django_cache(self):
+        self.versioned_cache.get_or_set("test:key", lambda: "value")
+        with patch("gouthelper.utils.caches.cache") as mock_cache:
+            self.assertEqual(self.versioned_cache.get_or_set("test:key", lambda: "other"), "value")
+        mock_cache.get.assert_not_called()
+        mock_cache.add.assert_not_called()
+
+    def test__clear_is_read_by_other_processes_after_version_ttl(self):
+        self.versioned_cache.get_or_set("test:key", lambda: "value")
+        VersionedCache("test:version", timeout=60).clear()
+        self.assertEqual(self.versioned_cache.get_or_set("test:key", lambda: "new value"), "value")
+        self.versioned_cache.checked = 0.0
+        self.assertEqual(self.versioned_cache.get_or_set("test:key", lambda: "new value"), "new value")
+
+    def test__evicted_version_is_restarted(self):
+        self.versioned_cache.get_or_set("test:key", lambda: "value")
+        version = self.versioned_cache.version
+        cache.delete("test:version")
+        self.versioned_cache.checked = 0.0
+        self.assertEqual(self.versioned_cache.get_or_set("test:key", lambda: "new value"), "new value")
+        self.assertNotEqual(self.versioned_cache.version, version)
@@ -1,11 +1,14 @@
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest  # type: ignore
 from django.test import TestCase  # type: ignore
 from django.utils import timezone  # type: ignore
 
+from ...flareaids.models import FlareAid
+from ...ultaids.models import UltAid
 from ...users.tests.factories import UserFactory, create_psp
-from ..helpers import calculate_duration, get_str_attrs
+from ..helpers import calculate_duration, explanations_cache_version, get_str_attrs
 
 pytestmark = pytest.mark.django_db
 
@@ -73,3 +76,15 @@ class TestCreateStrAttrs(TestCase):
         attrs = get_str_attrs(patient=self.psp, request_user=self.user)
         for str_attr_key in self.str_attr_keys:
             self.assertIn(str_attr_key, attrs)
+
+
+class TestExplanationsCacheVersion(TestCase):
+    def test__hashes_the_sources_of_the_models_modules(self):
+        version = explanations_cache_version(FlareAid)
+        self.assertEqual(version, explanations_cache_version(FlareAid))
+        self.assertNotEqual(version, explanations_cache_version(UltAid))
+        explanations_cache_version.cache_clear()
+        with patch("gouthelper.utils.helpers.Path.read_bytes", return_value=b"edited"):
+            self.assertNotEqual(explanations_cache_version(FlareAid), version)
+        explanations_cache_version.cache_clear()
+        self.assertEqual(explanations_cache_version(FlareAid), version)
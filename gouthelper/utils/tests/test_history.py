@@ -0,0 +1,141 @@
+from decimal import Decimal
+
+import pytest  # pylint: disable=E0401  # type: ignore
+from django.db import connection  # pylint: disable=E0401  # type: ignore
+from django.test import TestCase, override_settings  # pylint: disable=E0401  # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=E0401  # type: ignore
+
+from ...labs.models import Urate
+from ...labs.tests.factories import UrateFactory
+from ...medhistorys.choices import MedHistoryTypes
+from ...medhistorys.models import MedHistory
+from ...medhistorys.tests.factories import AnginaFactory
+from ..history import history_batch, history_compact, history_redundant_ids
+from ..test_helpers import captured_writes
+
+pytestmark = pytest.mark.django_db
+
+
+class TestGoutHelperHistoricalRecords(TestCase):
+    def setUp(self):
+        self.urate = UrateFactory(value=Decimal("10"))
+
+    def test__unchanged_save_skips_history(self):
+        self.urate.save()
+        # modified changes on every save() and isn't tracked
+        Urate.objects.get(pk=self.urate.pk).save()
+        self.assertEqual(self.urate.history.count(), 1)
+
+    def test__diff_check_does_not_query_history(self):
+        urate = Urate.objects.get(pk=self.urate.pk)
+        table = Urate.history.model._meta.db_table
+        for value in (urate.value, Decimal("8")):
+            urate.value = value
+            with CaptureQueriesContext(connection) as context:
+                urate.save()
+            self.assertFalse([query for query in context.captured_queries if f'FROM "{table}"' in query["sql"]])
+        self.assertEqual(
+            [query["sql"].split()[2] for query in context.captured_queries if query["sql"].startswith("INSERT")],
+            [f'"{table}"'],
+        )
+
+    def test__changed_save_creates_history(self):
+        self.urate.value = Decimal("8")
+        self.urate.save()
+        self.assertEqual(list(self.urate.history.values_list("history_type", "value")), [("~", 8), ("+", 10)])
+
+    def test__save_without_historical_record(self):
+        self.urate.value = Decimal("8")
+        self.urate.save_without_historical_record()
+        self.assertEqual(self.urate.history.count(), 1)
+
+    @override_settings(HISTORY_DIFF_ONLY=False)
+    def test__unchanged_save_creates_history_without_diff_only(self):
+        self.urate.save()
+        self.assertEqual(self.urate.history.count(), 2)
+
+
+class TestHistoryBatch(TestCase):
+    def test__writes_history_in_bulk_on_exit(self):
+        with history_batch():
+            urates = [UrateFactory(value=Decimal("10")) for _ in range(3)]
+            urates[0].value = Decimal("8")
+            urates[0].save()
+            # Compared to the pending record, not the database
+            urates[0].save()
+            angina = AnginaFactory()
+            self.assertFalse(Urate.history.exists())
+        self.assertEqual(Urate.history.count(), 4)
+        self.assertEqual(urates[0].history.filter(history_type="~").count(), 1)
+        self.assertTrue(MedHistory.history.filter(id=angina.pk, medhistorytype=MedHistoryTypes.ANGINA).exists())
+
+    def test__one_insert_per_history_model(self):
+        urates = [UrateFactory(value=Decimal("10")) for _ in range(3)]
+        with CaptureQueriesContext(connection) as context:
+            with history_batch():
+                for urate in urates:
+                    urate.value = Decimal("8")
+                    urate.save()
+                for urate in urates[:2]:
+                    urate.delete()
+        history_table = Urate.history.model._meta.db_table
+        self.assertEqual(
+            len([sql for sql in captured_writes(context.captured_queries) if f'INSERT INTO "{history_table}"' in sql]),
+            1,
+        )
+        self.assertEqual(Urate.history.filter(history_type="~").count(), 3)
+        self.assertEqual(Urate.history.filter(history_type="-").count(), 2)
+
+    def test__nothing_written_on_exception(self):
+        with self.assertRaises(ValueError):
+            with history_batch():
+                urate = UrateFactory()
+                raise ValueError
+        self.assertFalse(urate.history.exists())
+
+    def test__nested_batches_write_on_outermost_exit(self):
+        with history_batch() as outer:
+            with history_batch() as inner:
+                urate = UrateFactory()
+            self.assertIs(inner, outer)
+            self.assertFalse(urate.history.exists())
+        self.assertTrue(urate.history.exists())
+
+
+@override_settings(HISTORY_DIFF_ONLY=False)
+class TestHistoryCompact(TestCase):
+    def setUp(self):
+        self.urate = UrateFactory(value=Decimal("10"))
+        self.urate.save()
+        self.urate.value = Decimal("8")
+        self.urate.save()
+        self.urate.save()
+        self.urate._change_reason = "Reviewed"
+        self.urate.save()
+        other = UrateFactory(value=Decimal("8"))
+        other.save()
+        self.other_pk = other.pk
+        other.delete()
+        self.history_model = Urate.history.model
+
+    def test__redundant_ids(self):
+        history = list(self.urate.history.order_by("history_date", "history_id"))
+        other_update = self.history_model.objects.get(id=self.other_pk, history_type="~")
+        self.assertEqual(
+            set(history_redundant_ids(self.history_model)),
+            {history[1].history_id, history[3].history_id, other_update.history_id},
+        )
+
+    def test__compact(self):
+        count = self.history_model.objects.count()
+        deleted, size = history_compact(self.history_model, chunk_size=1, dry_run=True)
+        self.assertEqual(deleted, 3)
+        self.assertGreater(size, 0)
+        self.assertEqual(self.history_model.objects.count(), count)
+        self.assertEqual(history_compact(self.history_model, chunk_size=1), (deleted, size))
+        self.assertEqual(self.history_model.objects.count(), count - 3)
+        self.assertEqual(
+            list(self.urate.history.order_by("history_date").values_list("history_type", "value")),
+            [("+", 10), ("~", 8), ("~", 8)],
+        )
+        self.assertEqual(history_compact(self.history_model), (0, 0))
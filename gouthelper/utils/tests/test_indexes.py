@@ -0,0 +1,113 @@
+import pickle
+
+import pytest  # pylint: disable=E0401  # type: ignore
+from django.test import TestCase  # pylint: disable=E0401  # type: ignore
+
+from ...medallergys.helpers import MedAllergysList, medallergys_get
+from ...medallergys.models import MedAllergy
+from ...medhistorys.choices import MedHistoryTypes
+from ...medhistorys.helpers import MedHistorysList, medhistorys_get
+from ...medhistorys.models import Angina, MedHistory
+from ...treatments.choices import Treatments
+from ...users.models import Pseudopatient
+from ...users.selectors import pseudopatient_qs
+from ...users.tests.factories import create_psp
+
+pytestmark = pytest.mark.django_db
+
+
+class TestMedHistorysList(TestCase):
+    def setUp(self):
+        self.gout = MedHistory(medhistorytype=MedHistoryTypes.GOUT)
+        self.ckd = MedHistory(medhistorytype=MedHistoryTypes.CKD)
+        self.angina = MedHistory(medhistorytype=MedHistoryTypes.ANGINA)
+        self.ckd_2 = MedHistory(medhistorytype=MedHistoryTypes.CKD)
+        self.medhistorys = MedHistorysList([self.gout, self.ckd, self.angina, self.ckd_2])
+
+    def test__get(self):
+        self.assertEqual(self.medhistorys.get(MedHistoryTypes.CKD), self.ckd)
+        self.assertEqual(self.medhistorys.get("GOUT"), self.gout)
+        self.assertIsNone(self.medhistorys.get(MedHistoryTypes.TOPHI))
+        self.assertFalse(self.medhistorys.get(MedHistoryTypes.TOPHI, False))
+
+    def test__filter_keeps_list_order(self):
+        self.assertEqual(
+            self.medhistorys.filter([MedHistoryTypes.ANGINA, MedHistoryTypes.CKD, MedHistoryTypes.GOUT, "CKD"]),
+            [self.gout, self.ckd, self.angina, self.ckd_2],
+        )
+        self.assertEqual(self.medhistorys.filter([MedHistoryTypes.TOPHI]), [])
+
+    def test__any_of(self):
+        self.assertTrue(self.medhistorys.any_of([MedHistoryTypes.TOPHI, MedHistoryTypes.ANGINA]))
+        self.assertFalse(self.medhistorys.any_of([MedHistoryTypes.TOPHI]))
+
+    def test__by_key_is_read_only(self):
+        with self.assertRaises(TypeError):
+            self.medhistorys.by_key["TOPHI"] = ()
+        self.assertEqual(self.medhistorys.by_key["CKD"], ((1, self.ckd), (3, self.ckd_2)))
+
+    def test__list_index(self):
+        self.assertEqual(self.medhistorys.index(self.ckd_2), 3)
+
+    def test__mutating_updates_index(self):
+        self.assertEqual(self.medhistorys.get(MedHistoryTypes.CKD), self.ckd)
+        self.medhistorys.remove(self.ckd)
+        self.assertEqual(self.medhistorys.get(MedHistoryTypes.CKD), self.ckd_2)
+        tophi = MedHistory(medhistorytype=MedHistoryTypes.TOPHI)
+        self.medhistorys.insert(0, tophi)
+        self.assertEqual(self.medhistorys.filter([MedHistoryTypes.TOPHI, MedHistoryTypes.GOUT]), [tophi, self.gout])
+        self.medhistorys[:] = [self.angina]
+        self.assertIsNone(self.medhistorys.get(MedHistoryTypes.GOUT))
+        self.medhistorys.clear()
+        self.assertFalse(self.medhistorys.any_of([MedHistoryTypes.ANGINA]))
+
+    def test__indexes_medhistorytype_once_set(self):
+        angina = Angina()
+        medhistorys = MedHistorysList([angina])
+        self.assertIsNone(medhistorys.get(MedHistoryTypes.ANGINA))
+        angina.set_medhistorytype()
+        self.assertEqual(medhistorys.get(MedHistoryTypes.ANGINA), angina)
+
+    def test__pickles(self):
+        self.medhistorys.get(MedHistoryTypes.CKD)
+        unpickled = pickle.loads(pickle.dumps(self.medhistorys))
+        self.assertIsInstance(unpickled, MedHistorysList)
+        self.assertEqual(unpickled.get(MedHistoryTypes.CKD).medhistorytype, MedHistoryTypes.CKD)
+
+    def test__medhistorys_get(self):
+        self.assertEqual(medhistorys_get(self.medhistorys, MedHistoryTypes.CKD), self.ckd)
+        self.assertFalse(medhistorys_get(self.medhistorys, MedHistoryTypes.TOPHI))
+        self.assertEqual(
+            medhistorys_get(self.medhistorys, [MedHistoryTypes.CKD, MedHistoryTypes.GOUT]),
+            medhistorys_get(list(self.medhistorys), [MedHistoryTypes.CKD, MedHistoryTypes.GOUT]),
+        )
+
+
+class TestMedAllergysList(TestCase):
+    def test__medallergys_get(self):
+        colch = MedAllergy(treatment=Treatments.COLCHICINE)
+        pred = MedAllergy(treatment=Treatments.PREDNISONE)
+        medallergys = MedAllergysList([colch, pred])
+        self.assertEqual(medallergys_get(medallergys, Treatments.PREDNISONE), pred)
+        self.assertIsNone(medallergys_get(medallergys, Treatments.ALLOPURINOL))
+        self.assertEqual(medallergys_get(medallergys, [Treatments.PREDNISONE, Treatments.COLCHICINE]), [colch, pred])
+
+
+class TestIndexedListAttribute(TestCase):
+    def test__prefetch_attaches_index(self):
+        psp = create_psp()
+        psp = pseudopatient_qs(psp.username).get()
+        self.assertIsInstance(psp.medhistorys_qs, MedHistorysList)
+        with self.assertNumQueries(0):
+            self.assertTrue(psp.gout)
+
+    def test__keeps_shared_lists(self):
+        psp = Pseudopatient()
+        self.assertFalse(hasattr(psp, "medhistorys_qs"))
+        medhistorys = MedHistorysList()
+        psp.medhistorys_qs = medhistorys
+        self.assertIs(psp.medhistorys_qs, medhistorys)
+        psp.medallergys_qs = []
+        self.assertIsInstance(psp.medallergys_qs, MedAllergysList)
+        del psp.medhistorys_qs
+        self.assertFalse(hasattr(psp, "medhistorys_qs"))
@@ -0,0 +1,121 @@
+import json
+import logging
+
+import pytest  # pylint: disable=E0401  # type: ignore
+from django.test import TestCase, override_settings  # pylint: disable=E0401  # type: ignore
+from django.urls import reverse  # pylint: disable=E0401  # type: ignore
+
+from ...flares.tests.factories import create_flare
+from ...ults.tests.factories import create_ult
+from ..instrumentation import (
+    INSTRUMENTATION_HEADER,
+    QueryBudgetExceeded,
+    capture_view_metrics,
+    current_view_metrics,
+    instrument,
+    query_budget,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+class TestInstrument(TestCase):
+    def test__does_nothing_outside_of_request(self):
+        self.assertIsNone(current_view_metrics())
+        with instrument("test"):
+            pass
+        self.assertIsNone(current_view_metrics())
+
+
+class TestInstrumentationMiddleware(TestCase):
+    def setUp(self):
+        self.ult = create_ult()
+        self.url = reverse("ults:detail", kwargs={"pk": self.ult.pk})
+
+    def test__records_view_metrics(self):
+        with capture_view_metrics() as captured:
+            self.client.get(self.url)
+        self.assertEqual(len(captured), 1)
+        metrics = captured[0]
+        self.assertEqual(metrics.view_name, "ults:detail")
+        self.assertEqual(metrics.method, "GET")
+        self.assertEqual(metrics.status_code, 200)
+        self.assertGreater(metrics.queries, 0)
+        self.assertGreater(metrics.db_time, 0)
+        self.assertGreaterEqual(metrics.total_time, metrics.db_time)
+        for section in ["view", "render", "service_init", "service_update"]:
+            self.assertIn(section, metrics.sections)
+        self.assertLessEqual(metrics.sections["service_update"].queries, metrics.sections["view"].queries)
+
+    def test__stale_only_skips_service_update(self):
+        self.client.get(self.url)
+        with capture_view_metrics() as captured:
+            self.client.get(self.url)
+        self.assertIn("service_init", captured[0].sections)
+        self.assertNotIn("service_update", captured[0].sections)
+
+    def test__records_post_forms(self):
+        with capture_view_metrics() as captured:
+            self.client.post(reverse("ults:update", kwargs={"pk": self.ult.pk}), data={})
+        self.assertEqual(captured[0].view_name, "ults:update")
+        self.assertIn("forms", captured[0].sections)
+
+    def test__no_header_by_default(self):
+        response = self.client.get(self.url)
+        self.assertNotIn(INSTRUMENTATION_HEADER, response.headers)
+
+    @override_settings(INSTRUMENTATION_HEADER=True)
+    def test__adds_header(self):
+        response = self.client.get(self.url)
+        self.assertIn(INSTRUMENTATION_HEADER, response.headers)
+        self.assertIn("queries=", response.headers[INSTRUMENTATION_HEADER])
+        self.assertIn("service_update=", response.headers[INSTRUMENTATION_HEADER])
+
+    def test__logs_json(self):
+        with self.assertLogs("gouthelper.utils.instrumentation", level=logging.INFO) as logs:
+            self.client.get(self.url)
+        logged = json.loads(logs.records[0].getMessage())
+        self.assertEqual(logged["view_name"], "ults:detail")
+        self.assertEqual(logged["status_code"], 200)
+        self.assertIn("view", logged["sections"])
+        self.assertEqual(logs.records[0].metrics, logged)
+
+
+class TestQueryBudget(TestCase):
+    def setUp(self):
+        self.flare = create_flare()
+        self.url = reverse("flares:detail", kwargs={"pk": self.flare.pk})
+
+    def test__within_budget(self):
+        with query_budget(100) as captured:
+            self.client.get(self.url)
+        self.assertEqual(len(captured), 1)
+
+    def test__exceeds_budget(self):
+        with self.assertRaises(QueryBudgetExceeded) as exc:
+            with query_budget(1):
+                self.client.get(self.url)
+        self.assertIn("flares:detail (GET)", str(exc.exception))
+
+    def test__only_checks_view_name(self):
+        with query_budget(1, view_name="ults:detail"):
+            self.client.get(self.url)
+
+
+def test__flare_detail_query_budget(client, query_budget):
+    flare = create_flare()
+    url = reverse("flares:detail", kwargs={"pk": flare.pk})
+    with query_budget(25, view_name="flares:detail"):
+        client.get(url)
+    # Once updated, the Flare is not stale and the detail page skips the service
+    with query_budget(8, view_name="flares:detail"):
+        client.get(url)
+
+
+def test__ult_detail_query_budget(client, query_budget):
+    ult = create_ult()
+    url = reverse("ults:detail", kwargs={"pk": ult.pk})
+    with query_budget(20, view_name="ults:detail"):
+        client.get(url)
+    with query_budget(6, view_name="ults:detail"):
+        client.get(url)
@@ -0,0 +1,76 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest  # type: ignore
+from django.core.management import call_command  # type: ignore
+from django.test import SimpleTestCase, override_settings  # type: ignore
+from django.urls import reverse  # type: ignore
+from django.utils.safestring import SafeString  # type: ignore
+
+from ...flares.models import Flare
+from ..links import _links_reverse, links_constant_html, links_reverse
+from ..models import GoutHelperBaseModel
+
+pytestmark = pytest.mark.django_db
+
+
+class TestLinksReverse(SimpleTestCase):
+    def setUp(self):
+        _links_reverse.cache_clear()
+
+    def test__links_reverse(self):
+        self.assertEqual(links_reverse("treatments:about-flare"), reverse("treatments:about-flare"))
+        self.assertEqual(
+            links_reverse("treatments:about-flare", "nsaids"), reverse("treatments:about-flare") + "#nsaids"
+        )
+        self.assertEqual(GoutHelperBaseModel.about_allopurinol_url(), reverse("treatments:about-ult") + "#allopurinol")
+
+    def test__reverse_called_once(self):
+        with patch("gouthelper.utils.links.reverse", wraps=reverse) as mock_reverse:
+            for _ in range(3):
+                links_reverse("treatments:about-ult", "febuxostat")
+        mock_reverse.assert_called_once_with("treatments:about-ult")
+
+    def test__cache_cleared_when_urlconf_changes(self):
+        links_reverse("treatments:about-ult")
+        self.assertEqual(_links_reverse.cache_info().currsize, 1)
+        with override_settings(ROOT_URLCONF="config.urls"):
+            self.assertEqual(_links_reverse.cache_info().currsize, 0)
+
+
+class TestLinksConstantHtml(SimpleTestCase):
+    def test__served_from_table(self):
+        calls = []
+
+        @links_constant_html
+        def constant(samepage_links: bool = True) -> str:
+            calls.append(samepage_links)
+            return "links" if samepage_links else "no links"
+
+        self.assertEqual(constant(), "links")
+        self.assertEqual(constant(), "links")
+        self.assertEqual(constant(samepage_links=False), "no links")
+        self.assertEqual(calls, [True, False])
+
+    def test__matches_uncached(self):
+        for method, args in [
+            (GoutHelperBaseModel.hepatitis_warning, (GoutHelperBaseModel,)),
+            (GoutHelperBaseModel.dose_reduced_for_ckd_info, (GoutHelperBaseModel,)),
+            (GoutHelperBaseModel.colchicine_interactions, (GoutHelperBaseModel,)),
+            (GoutHelperBaseModel.xoi_interactions, (GoutHelperBaseModel,)),
+            (Flare.less_likely_demographics_explanation, ()),
+            (Flare.more_likely_crystals_explanation, ()),
+        ]:
+            uncached = method.__wrapped__(*args)
+            self.assertEqual(method(), str(uncached))
+            self.assertEqual(isinstance(method(), SafeString), isinstance(str(uncached), SafeString))
+        self.assertIsInstance(GoutHelperBaseModel.hepatitis_warning(samepage_links=False), SafeString)
+
+
+class TestBenchmarkLinks(SimpleTestCase):
+    def test__command_output(self):
+        out = StringIO()
+        call_command("benchmark_links", "--number", "2", stdout=out)
+        self.assertIn("uncached:", out.getvalue())
+        self.assertIn("registry:", out.getvalue())
+        self.assertIn("per render", out.getvalue())
@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.core.management import CommandError, call_command  # pylint: disable=E0401 # type: ignore
+from django.core.serializers.json import DjangoJSONEncoder  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase, override_settings  # pylint: disable=E0401 # type: ignore
+
+from ...labs.tests.factories import UrateFactory
+from ...ultaids.models import UltAid
+from ...ultaids.tests.factories import ultaid_data_factory
+from ...users.models import Pseudopatient
+from ..benchmarks import benchmarks_compare
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBenchmarkAids(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "benchmark.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test__writes_results_and_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_aids", "--sizes", "1", "2", "--view-sample", "1", "--output", self.output, stdout=out)
+        with open(self.output) as file:
+            output = json.load(file)
+        self.assertEqual(output["meta"]["sizes"], [1, 2])
+        self.assertEqual(output["meta"]["seed"], 0)
+        names = {result["name"] for result in output["results"]}
+        for service in [
+            "FlareAidDecisionAid",
+            "PpxAidDecisionAid",
+            "UltAidDecisionAid",
+            "FlareDecisionAid",
+            "PpxDecisionAid",
+            "UltDecisionAid",
+            "GoalUrateDecisionAid",
+        ]:
+            self.assertIn(f"{service}.__init__", names)
+            self.assertIn(f"{service}._update", names)
+        self.assertIn("view users:pseudopatients", names)
+        self.assertIn("view flares:pseudopatient-detail", names)
+        self.assertEqual(
+            [result["n"] for result in output["results"] if result["name"] == "UltDecisionAid._update"], [1, 2]
+        )
+        self.assertIn("Wrote results", out.getvalue())
+        self.assertFalse(Pseudopatient.objects.exists())
+
+    def test__compare_fail_on_regression(self):
+        call_command(
+            "benchmark_aids", "--sizes", "1", "--view-sample", "0", "--output", self.output, stdout=StringIO()
+        )
+        with open(self.output) as file:
+            output = json.load(file)
+        for result in output["results"]:
+            result["median_ms"] = result["median_ms"] / 100
+        with open(self.output, "w") as file:
+            json.dump(output, file)
+        with self.assertRaises(CommandError):
+            call_command(
+                "benchmark_aids",
+                "--sizes",
+                "1",
+                "--view-sample",
+                "0",
+                "--compare",
+                self.output,
+                "--fail-on-regression",
+                stdout=StringIO(),
+            )
+
+    def test__invalid_sizes(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_aids", "--sizes", "0")
+
+
+class TestBenchmarksCompare(TestCase):
+    def test__regressions(self):
+        baseline = [
+            {"name": "a", "size": 10, "median_ms": 1.0, "queries_mean": 5},
+            {"name": "b", "size": 10, "median_ms": 1.0, "queries_mean": 5},
+            {"name": "c", "size": 10, "median_ms": 1.0, "queries_mean": 5},
+        ]
+        results = [
+            {"name": "a", "size": 10, "median_ms": 1.05, "queries_mean": 5},
+            {"name": "b", "size": 10, "median_ms": 1.5, "queries_mean": 5},
+            {"name": "c", "size": 10, "median_ms": 0.5, "queries_mean": 6},
+            {"name": "d", "size": 10, "median_ms": 1.0, "queries_mean": 5},
+        ]
+        comparisons = benchmarks_compare(results, baseline, threshold=0.1)
+        self.assertEqual(
+            [(comparison["name"], comparison["regression"]) for comparison in comparisons],
+            [("a", False), ("b", True), ("c", True)],
+        )
+
+
+class TestEvaluateRecords(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.tmpdir.name, "records.ndjson")
+        self.output = os.path.join(self.tmpdir.name, "results.ndjson")
+        with open(self.input, "w") as file:
+            for i in range(3):
+                file.write(json.dumps({"id": i, **ultaid_data_factory()}, cls=DjangoJSONEncoder) + "\n")
+            file.write(json.dumps({"id": 3, "aid": "flareaid"}) + "\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test__writes_results_in_order(self):
+        err = StringIO()
+        call_command("evaluate_records", self.input, "--aid", "ultaid", "--output", self.output, stderr=err)
+        with open(self.output) as file:
+            results = [json.loads(line) for line in file]
+        self.assertEqual([result["id"] for result in results], [0, 1, 2, 3])
+        self.assertEqual([result["aid"] for result in results], ["ultaid", "ultaid", "ultaid", "flareaid"])
+        self.assertEqual([result["valid"] for result in results], [True, True, True, False])
+        self.assertIn("Evaluated 4 records (1 invalid)", err.getvalue())
+        self.assertIn("records/second", err.getvalue())
+        self.assertFalse(UltAid.objects.exists())
+
+    def test__csv_to_stdout(self):
+        csv_input = os.path.join(self.tmpdir.name, "records.csv")
+        with open(csv_input, "w") as file:
+            file.write("id,aid\n1,ultaid\n")
+        out = StringIO()
+        call_command("evaluate_records", csv_input, stdout=out, stderr=StringIO())
+        self.assertEqual(json.loads(out.getvalue())["id"], "1")
+
+    def test__invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command("evaluate_records", self.input, "--aid", "ultaid", "--chunk-size", "0")
+        with self.assertRaises(CommandError):
+            call_command("evaluate_records", os.path.join(self.tmpdir.name, "records.txt"))
+        with self.assertRaises(CommandError):
+            call_command("evaluate_records", self.input, stderr=StringIO())
+
+
+@override_settings(HISTORY_DIFF_ONLY=False)
+class TestCompactHistory(TestCase):
+    def setUp(self):
+        self.urate = UrateFactory()
+        self.urate.save()
+        self.urate.save()
+
+    def test__dry_run(self):
+        out = StringIO()
+        call_command("compact_history", "labs.Urate", "--dry-run", stdout=out)
+        self.assertIn("labs.Urate: 2 redundant records", out.getvalue())
+        self.assertIn("Found 2 redundant historical records", out.getvalue())
+        self.assertEqual(self.urate.history.count(), 3)
+
+    def test__compacts_all_models(self):
+        out = StringIO()
+        call_command("compact_history", "--chunk-size", "10", stdout=out)
+        self.assertIn("labs.Urate: 2 redundant records", out.getvalue())
+        self.assertIn("KiB).", out.getvalue())
+        self.assertEqual(list(self.urate.history.values_list("history_type", flat=True)), ["+"])
+        out = StringIO()
+        call_command("compact_history", stdout=out)
+        self.assertEqual(out.getvalue(), "Deleted 0 redundant historical records (0.0 KiB).\n")
+
+    def test__invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command("compact_history", "--chunk-size", "0")
+        with self.assertRaises(CommandError):
+            call_command("compact_history", "treatments.Treatment")
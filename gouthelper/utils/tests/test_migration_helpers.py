@@ -0,0 +1,49 @@
+import json
+from unittest.mock import patch
+
+import pytest  # type: ignore
+from django.test import TestCase  # type: ignore
+
+from ...flareaids.models import FlareAid
+from ...flareaids.tests.factories import create_flareaid
+from ..migration_helpers import decisionaid_v1_to_v2, decisionaid_v2_to_v1, decisionaids_migrate_v1_v2
+from ..services import aids_dict_to_json, aids_trt_dict_to_decisionaid
+
+pytestmark = pytest.mark.django_db
+
+
+class TestDecisionaidsMigrateV1V2(TestCase):
+    def setUp(self):
+        self.flareaid = create_flareaid(mas=[], mhs=[])
+        self.trt_dict = self.flareaid.aid_dict
+
+    def test__decisionaid_v1_to_v2(self):
+        self.assertEqual(
+            decisionaid_v1_to_v2(aids_dict_to_json(self.trt_dict)), aids_trt_dict_to_decisionaid(self.trt_dict)
+        )
+
+    def test__decisionaid_v2_to_v1(self):
+        self.assertEqual(
+            decisionaid_v2_to_v1(aids_trt_dict_to_decisionaid(self.trt_dict)), aids_dict_to_json(self.trt_dict)
+        )
+
+    def test__decisionaids_migrate_v1_v2(self):
+        FlareAid.objects.filter(pk=self.flareaid.pk).update(decisionaid=aids_dict_to_json(self.trt_dict))
+        self.assertEqual(decisionaids_migrate_v1_v2(FlareAid), 1)
+        self.flareaid.refresh_from_db()
+        self.assertEqual(self.flareaid.decisionaid, aids_trt_dict_to_decisionaid(self.trt_dict))
+        # Already converted decisionaids aren't converted again
+        self.assertEqual(decisionaids_migrate_v1_v2(FlareAid), 0)
+        self.assertEqual(decisionaids_migrate_v1_v2(FlareAid, to_v2=False), 1)
+        self.flareaid.refresh_from_db()
+        # jsonb doesn't keep the order of the treatments, so compare the parsed JSON
+        self.assertEqual(json.loads(self.flareaid.decisionaid), json.loads(aids_dict_to_json(self.trt_dict)))
+
+    def test__decisionaids_migrate_v1_v2_updates_every_batch(self):
+        create_flareaid(mas=[], mhs=[])
+        create_flareaid(mas=[], mhs=[])
+        FlareAid.objects.update(decisionaid=aids_dict_to_json(self.trt_dict))
+        with patch.object(FlareAid.objects, "bulk_update", wraps=FlareAid.objects.bulk_update) as bulk_update:
+            self.assertEqual(decisionaids_migrate_v1_v2(FlareAid, batch_size=2), 3)
+        self.assertEqual([len(call.args[0]) for call in bulk_update.call_args_list], [2, 1])
+        self.assertEqual(FlareAid.objects.filter(decisionaid__has_key="version").count(), 3)
@@ -1,9 +1,27 @@
+from datetime import timedelta
+from unittest.mock import patch
+
 import pytest  # type: ignore
+from django.core.exceptions import ValidationError  # type: ignore
+from django.db import connection  # type: ignore
 from django.test import TestCase  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.utils.html import conditional_escape  # type: ignore
 
+from ...flareaids.models import FlareAid
+from ...flareaids.tests.factories import create_flareaid
+from ...flares.models import Flare
+from ...flares.tests.factories import create_flare
 from ...goalurates.tests.factories import create_goalurate
+from ...medhistorydetails.models import GoutDetail
+from ...medhistorys.tests.factories import GoutFactory
 from ...ppxs.tests.factories import create_ppx
+from ...ultaids.models import UltAid
 from ...ultaids.tests.factories import create_ultaid
+from ...ults.choices import FlareFreqs, FlareNums, Indications
+from ...ults.models import Ult
+from ...ults.tests.factories import create_ult
 from ...users.tests.factories import create_psp
 
 pytestmark = pytest.mark.django_db
@@ -56,3 +74,132 @@ class TestGoutHelperBaseModel(TestCase):
         self.assertEqual(self.ppx.starting_ult, self.ppx.goutdetail.starting_ult)
         self.assertIsNotNone(self.pseudopatient_ppx.starting_ult)
         self.assertEqual(self.pseudopatient_ppx.starting_ult, self.pseudopatient.goutdetail.starting_ult)
+
+
+class TestExplanationsCached(TestCase):
+    def setUp(self):
+        self.flareaid = create_flareaid()
+        self.flareaid.update_aid()
+
+    def get_flareaid(self) -> FlareAid:
+        return FlareAid.related_objects.get(pk=self.flareaid.pk)
+
+    def test__explanations_rendered(self):
+        uncached = FlareAid.explanations.func.__wrapped__(self.get_flareaid())
+        cached = self.get_flareaid().explanations
+        self.assertEqual(len(cached), len(uncached))
+        for (exp_id, label, value, interp), (c_exp_id, c_label, c_value, c_interp) in zip(uncached, cached):
+            self.assertEqual((exp_id, label), (c_exp_id, c_label))
+            self.assertEqual(bool(value), c_value)
+            self.assertEqual(conditional_escape(interp), c_interp)
+
+    def test__explanations_served_from_cache(self):
+        self.get_flareaid().explanations
+        with patch.object(FlareAid, "ckd_interp") as ckd_interp:
+            self.get_flareaid().explanations
+        ckd_interp.assert_not_called()
+
+    def test__explanations_not_cached_without_inputs_fingerprint(self):
+        FlareAid.objects.filter(pk=self.flareaid.pk).update(inputs_fingerprint=None)
+        flareaid = self.get_flareaid()
+        self.assertIsNone(flareaid.get_fragment_cache_key("explanations"))
+        flareaid.explanations
+        with patch.object(FlareAid, "ckd_interp") as ckd_interp:
+            self.get_flareaid().explanations
+        ckd_interp.assert_called_once()
+
+    def test__get_fragment_cache_key(self):
+        key = self.get_flareaid().get_fragment_cache_key("explanations")
+        self.assertEqual(key, self.get_flareaid().get_fragment_cache_key("explanations"))
+        self.assertNotEqual(key, self.get_flareaid().get_fragment_cache_key("explanations", False))
+        FlareAid.objects.filter(pk=self.flareaid.pk).update(inputs_fingerprint="changed")
+        self.assertNotEqual(key, self.get_flareaid().get_fragment_cache_key("explanations"))
+
+    def test__get_fragment_cache_key_unsaved(self):
+        self.assertIsNone(FlareAid(inputs_fingerprint="evaluated").get_fragment_cache_key("explanations"))
+
+    def test__get_fragment_cache_key_perspective(self):
+        flareaid = self.get_flareaid()
+        key = flareaid.get_fragment_cache_key("explanations")
+        flareaid.set_str_attrs(patient=create_psp())
+        self.assertNotEqual(key, flareaid.get_fragment_cache_key("explanations"))
+
+
+class TestDirtyFieldsMixin(TestCase):
+    def setUp(self):
+        self.ult = Ult.objects.get(pk=create_ult(num_flares=FlareNums.ONE, freq_flares=None).pk)
+
+    def test__get_dirty_fields(self):
+        self.assertEqual(self.ult.get_dirty_fields(), [])
+        self.ult.indication = Indications.INDICATED if self.ult.indication != Indications.INDICATED else 0
+        self.assertEqual(self.ult.get_dirty_fields(), ["indication"])
+        self.ult.refresh_from_db()
+        self.assertEqual(self.ult.get_dirty_fields(), [])
+        self.assertEqual(Ult().get_dirty_fields(), [field.name for field in Ult._meta.concrete_fields])
+
+    def test__get_dirty_fields_json_changed_in_place(self):
+        ultaid = UltAid.objects.get(pk=create_ultaid().pk)
+        ultaid.decisionaid["trts"] = {}
+        self.assertEqual(ultaid.get_dirty_fields(), ["decisionaid"])
+
+    def test__save_dirty_updates_only_dirty_fields(self):
+        self.ult.num_flares = FlareNums.TWOPLUS
+        self.ult.freq_flares = FlareFreqs.TWOORMORE
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.ult.save_dirty(), ["freq_flares", "num_flares", "modified"])
+        updates = [query["sql"] for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('SET "modified" = ', updates[0])
+        self.assertNotIn('"indication"', updates[0])
+        # No uniqueness query for the primary key and no queries for constraints that don't reference the fields
+        self.assertFalse(
+            [query for query in context.captured_queries if '"ults_ult"."id"' in query["sql"].split("WHERE")[0]]
+        )
+        self.assertEqual(self.ult.get_dirty_fields(), [])
+        self.ult.refresh_from_db()
+        self.assertEqual((self.ult.num_flares, self.ult.freq_flares), (FlareNums.TWOPLUS, FlareFreqs.TWOORMORE))
+        self.assertEqual(self.ult.history.first().num_flares, FlareNums.TWOPLUS)
+
+    def test__save_dirty_without_changes(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.ult.save_dirty(), [])
+
+    def test__save_dirty_enforces_the_same_constraints_as_full_clean(self):
+        for changes in [
+            {"indication": 5},
+            {"num_flares": FlareNums.TWOPLUS},
+            {"freq_flares": FlareFreqs.TWOORMORE},
+            {"num_flares": 7, "freq_flares": FlareFreqs.TWOORMORE},
+        ]:
+            ult = Ult.objects.get(pk=self.ult.pk)
+            for attr, value in changes.items():
+                setattr(ult, attr, value)
+            with self.assertRaises(ValidationError) as full_clean_error:
+                ult.full_clean()
+            with self.assertRaises(ValidationError) as save_dirty_error:
+                ult.save_dirty()
+            self.assertEqual(save_dirty_error.exception.message_dict, full_clean_error.exception.message_dict)
+        self.ult.refresh_from_db()
+        self.assertEqual((self.ult.num_flares, self.ult.freq_flares), (FlareNums.ONE, None))
+
+    def test__save_dirty_enforces_unique_constraints(self):
+        psp = create_psp()
+        today = timezone.now().date()
+        create_flare(user=psp, date_started=today - timedelta(days=5), date_ended=None)
+        flare = Flare.objects.get(
+            pk=create_flare(
+                user=psp, date_started=today - timedelta(days=100), date_ended=today - timedelta(days=90)
+            ).pk
+        )
+        flare.date_ended = None
+        with self.assertRaises(ValidationError) as full_clean_error:
+            flare.full_clean()
+        with self.assertRaises(ValidationError) as save_dirty_error:
+            flare.save_dirty()
+        self.assertEqual(save_dirty_error.exception.messages, full_clean_error.exception.messages)
+
+    def test__save_dirty_unsaved_object(self):
+        goutdetail = GoutDetail(medhistory=GoutFactory(), flaring=True)
+        self.assertIn("flaring", goutdetail.save_dirty())
+        self.assertFalse(goutdetail._state.adding)
+        self.assertEqual(goutdetail.get_dirty_fields(), [])
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest  # pylint: disable=E0401 # type: ignore
+from django.db import connection  # pylint: disable=E0401 # type: ignore
+from django.test import TestCase  # pylint: disable=E0401 # type: ignore
+from django.test.utils import CaptureQueriesContext  # pylint: disable=E0401 # type: ignore
+from django.utils import timezone  # pylint: disable=E0401 # type: ignore
+
+from ...users.models import Pseudopatient
+from ...users.tests.factories import UserFactory, create_psp
+from ..pagination import InvalidCursor, KeysetPaginator, get_page_size
+
+pytestmark = pytest.mark.django_db
+
+
+class TestKeysetPaginator(TestCase):
+    def setUp(self):
+        psps = [create_psp() for _ in range(7)]
+        # Give some of the Pseudopatients the same modified so that the pk decides their order
+        now = timezone.now()
+        for psp_i, psp in enumerate(psps):
+            Pseudopatient.objects.filter(pk=psp.pk).update(modified=now - timedelta(days=psp_i // 2))
+        self.ordered = list(Pseudopatient.objects.order_by("-modified", "-pk"))
+        self.paginator = KeysetPaginator(Pseudopatient.objects.all(), per_page=3)
+
+    def test__pages_forward(self):
+        page = self.paginator.page()
+        self.assertEqual(page.object_list, self.ordered[:3])
+        self.assertFalse(page.has_previous)
+        page = self.paginator.page(page.next_cursor)
+        self.assertEqual(page.object_list, self.ordered[3:6])
+        self.assertTrue(page.has_previous)
+        page = self.paginator.page(page.next_cursor)
+        self.assertEqual(page.object_list, self.ordered[6:])
+        self.assertFalse(page.has_next)
+
+    def test__pages_backward(self):
+        last_page = self.paginator.page(self.paginator.page(self.paginator.page().next_cursor).next_cursor)
+        page = self.paginator.page(last_page.previous_cursor)
+        self.assertEqual(page.object_list, self.ordered[3:6])
+        self.assertTrue(page.has_next)
+        page = self.paginator.page(page.previous_cursor)
+        self.assertEqual(page.object_list, self.ordered[:3])
+        self.assertFalse(page.has_previous)
+        self.assertEqual(self.paginator.page(page.next_cursor).object_list, self.ordered[3:6])
+
+    def test__one_query_per_page(self):
+        cursor = self.paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            self.paginator.page(cursor)
+
+    def test__page_seeks_the_panel_index(self):
+        provider = UserFactory()
+        for _ in range(3):
+            create_psp(provider=provider)
+        paginator = KeysetPaginator(Pseudopatient.objects.filter(panel_provider=provider), per_page=1)
+        cursor = paginator.page().next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            paginator.page(cursor)
+        with connection.cursor() as db_cursor:
+            # The tables are too small for the planner to prefer the index on its own
+            db_cursor.execute("SET LOCAL enable_seqscan = off")
+            db_cursor.execute(f"EXPLAIN {queries.captured_queries[0]['sql']}")
+            plan = "\n".join(row[0] for row in db_cursor.fetchall())
+        self.assertIn("users_user_provider_modified_id_idx", plan)
+        self.assertRegex(plan, r"Index Cond: .*ROW\(modified, id\) < ROW\(")
+
+    def test__invalid_cursor(self):
+        for cursor in ["not-a-cursor", "eHx5fHo=", "bnxub3QtYS1kYXRlfDE="]:
+            with self.assertRaises(InvalidCursor):
+                self.paginator.page(cursor)
+
+    def test__get_page_size(self):
+        self.assertEqual(get_page_size("10", 25, 100), 10)
+        self.assertEqual(get_page_size("1000", 25, 100), 100)
+        self.assertEqual(get_page_size("0", 25, 100), 25)
+        self.assertEqual(get_page_size("ten", 25, 100), 25)
+        self.assertEqual(get_page_size(None, 25, 100), 25)
@@ -0,0 +1,98 @@
+import pytest  # pylint: disable=E0401  # type: ignore
+from django.test import TestCase  # pylint: disable=E0401  # type: ignore
+
+from ...medallergys.models import MedAllergy
+from ...medallergys.tests.factories import MedAllergyFactory
+from ...medhistorydetails.models import CkdDetail
+from ...medhistorydetails.tests.factories import CkdDetailFactory
+from ...medhistorys.choices import MedHistoryTypes
+from ...medhistorys.models import Angina, Gout, MedHistory
+from ...medhistorys.tests.factories import AnginaFactory, CkdFactory
+from ...treatments.choices import Treatments
+from ...users.tests.factories import create_psp
+from ..persistence import UnitOfWork
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUnitOfWork(TestCase):
+    def setUp(self):
+        self.psp = create_psp()
+
+    def test__save_creates_in_bulk_with_history(self):
+        angina = Angina(user=self.psp)
+        gout = Gout(user=None)
+        uow = UnitOfWork()
+        uow.save(angina)
+        uow.save(gout)
+        # One insert for the MedHistorys and one for their history
+        with self.assertNumQueries(2):
+            uow.flush()
+        self.assertFalse(angina._state.adding)
+        self.assertEqual(angina.medhistorytype, MedHistoryTypes.ANGINA)
+        self.assertEqual(MedHistory.objects.get(pk=gout.pk).medhistorytype, MedHistoryTypes.GOUT)
+        self.assertIsInstance(gout, Gout)
+        self.assertIsNotNone(MedHistory.objects.get(pk=angina.pk).created)
+        history = MedHistory.history.filter(id__in=[angina.pk, gout.pk])
+        self.assertEqual(history.count(), 2)
+        self.assertTrue(all(record.history_type == "+" for record in history))
+
+    def test__save_updates_in_bulk_with_history(self):
+        angina = AnginaFactory(user=self.psp)
+        medallergy = MedAllergyFactory(treatment=Treatments.COLCHICINE)
+        modified = angina.modified
+        angina.user = None
+        medallergy.treatment = Treatments.PREDNISONE
+        with UnitOfWork() as uow:
+            uow.save(angina)
+            uow.save(angina)
+            uow.save(medallergy)
+        angina.refresh_from_db()
+        self.assertIsNone(angina.user)
+        self.assertGreater(angina.modified, modified)
+        self.assertEqual(MedAllergy.objects.get(pk=medallergy.pk).treatment, Treatments.PREDNISONE)
+        self.assertEqual(MedHistory.history.filter(id=angina.pk, history_type="~").count(), 1)
+        self.assertEqual(MedAllergy.history.filter(id=medallergy.pk, history_type="~").count(), 1)
+
+    def test__save_unchanged_updates_without_history(self):
+        angina = AnginaFactory(user=self.psp)
+        medallergy = MedAllergyFactory(treatment=Treatments.COLCHICINE)
+        medallergy.treatment = Treatments.PREDNISONE
+        with UnitOfWork() as uow:
+            uow.save(angina)
+            uow.save(medallergy)
+        self.assertFalse(MedHistory.history.filter(id=angina.pk, history_type="~").exists())
+        self.assertEqual(MedAllergy.history.filter(id=medallergy.pk, history_type="~").count(), 1)
+
+    def test__delete_in_bulk_with_history(self):
+        anginas = [AnginaFactory(), AnginaFactory()]
+        pks = [angina.pk for angina in anginas]
+        uow = UnitOfWork()
+        for angina in anginas:
+            uow.delete(angina)
+        # A select for each of the three models related to MedHistory, one insert for the history, and one delete
+        with self.assertNumQueries(5):
+            uow.flush()
+        self.assertFalse(MedHistory.objects.filter(pk__in=pks).exists())
+        self.assertEqual(MedHistory.history.filter(id__in=pks, history_type="-").count(), 2)
+        self.assertTrue(all(angina.pk is None for angina in anginas))
+        self.assertTrue(all(isinstance(angina, Angina) for angina in anginas))
+
+    def test__delete_cascades(self):
+        ckd = CkdFactory()
+        ckddetail = CkdDetailFactory(medhistory=ckd)
+        ckd_pk, ckddetail_pk = ckd.pk, ckddetail.pk
+        with UnitOfWork() as uow:
+            uow.delete(ckd)
+        self.assertFalse(MedHistory.objects.filter(pk=ckd_pk).exists())
+        self.assertFalse(CkdDetail.objects.filter(pk=ckddetail_pk).exists())
+        self.assertEqual(MedHistory.history.filter(id=ckd_pk, history_type="-").count(), 1)
+        self.assertEqual(CkdDetail.history.filter(id=ckddetail_pk, history_type="-").count(), 1)
+
+    def test__does_not_flush_on_exception(self):
+        angina = Angina(user=self.psp)
+        with self.assertRaises(ValueError):
+            with UnitOfWork() as uow:
+                uow.save(angina)
+                raise ValueError
+        self.assertFalse(MedHistory.objects.filter(pk=angina.pk).exists())
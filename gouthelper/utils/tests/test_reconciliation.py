@@ -0,0 +1,99 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest  # pylint: disable=E0401  # type: ignore
+from django.test import TestCase  # pylint: disable=E0401  # type: ignore
+from django.utils import timezone  # pylint: disable=E0401  # type: ignore
+
+from ...labs.forms import PpxUrateFormSet
+from ...labs.models import Urate
+from ...labs.tests.factories import UrateFactory
+from ...medallergys.tests.factories import MedAllergyFactory
+from ...treatments.choices import Treatments
+from ..reconciliation import IndexedList, index_by, reconcile_formset
+
+pytestmark = pytest.mark.django_db
+
+
+class TestIndexedList(TestCase):
+    def test__add_and_discard_modify_list_in_place(self):
+        urates = [UrateFactory.build(), UrateFactory.build()]
+        objs = list(urates)
+        indexed = IndexedList(objs)
+        new_urate = UrateFactory.build()
+        self.assertIn(urates[0], indexed)
+        self.assertNotIn(new_urate, indexed)
+        indexed.add(new_urate)
+        indexed.add(new_urate)
+        indexed.discard(urates[0])
+        indexed.discard(urates[0])
+        self.assertEqual(objs, [urates[1], new_urate])
+
+
+class TestIndexBy(TestCase):
+    def test__keeps_first(self):
+        colch = MedAllergyFactory.build(treatment=Treatments.COLCHICINE)
+        colch_2 = MedAllergyFactory.build(treatment=Treatments.COLCHICINE)
+        pred = MedAllergyFactory.build(treatment=Treatments.PREDNISONE)
+        self.assertEqual(
+            index_by([colch, pred, colch_2], "treatment"),
+            {Treatments.COLCHICINE: colch, Treatments.PREDNISONE: pred},
+        )
+
+
+class TestReconcileFormset(TestCase):
+    def setUp(self):
+        self.date = timezone.now() - timedelta(days=30)
+        self.kept, self.deleted, self.missing, self.related = [
+            UrateFactory(value=Decimal("6.0"), date_drawn=self.date) for _ in range(4)
+        ]
+        self.existing = [self.kept, self.deleted, self.missing, self.related]
+
+    def get_formset(self) -> PpxUrateFormSet:
+        date_str = self.date.date().isoformat()
+        data = {
+            "urate-TOTAL_FORMS": 4,
+            "urate-INITIAL_FORMS": 3,
+            "urate-0-id": str(self.kept.pk),
+            "urate-0-value": "6.0",
+            "urate-0-date_drawn": date_str,
+            "urate-1-id": str(self.deleted.pk),
+            "urate-1-value": "6.0",
+            "urate-1-date_drawn": date_str,
+            "urate-1-DELETE": "on",
+            "urate-2-id": str(self.related.pk),
+            "urate-2-value": "7.0",
+            "urate-2-date_drawn": date_str,
+            "urate-3-id": "",
+            "urate-3-value": "8.0",
+            "urate-3-date_drawn": date_str,
+        }
+        formset = PpxUrateFormSet(
+            data, queryset=Urate.objects.filter(pk__in=[urate.pk for urate in self.existing]), prefix="urate"
+        )
+        self.assertTrue(formset.is_valid(), formset.errors)
+        return formset
+
+    def test__plan(self):
+        plan = reconcile_formset(
+            existing=self.existing,
+            formset=self.get_formset(),
+            needs_relation_set=lambda urate: urate == self.kept,
+        )
+        self.assertEqual(plan.delete, [self.deleted, self.missing])
+        self.assertEqual(plan.set_relation, [self.kept])
+        # The changed urate and the new urate are saved
+        self.assertEqual(len(plan.save), 3)
+        self.assertIn(self.related, plan.save)
+        new_urate = plan.save[-1]
+        self.assertTrue(new_urate._state.adding)
+        self.assertEqual(new_urate.value, Decimal("8.0"))
+        self.assertEqual(plan.current, [self.kept, self.related, new_urate])
+        # The kept urate is in both set_relation and save but only saved once
+        self.assertEqual(plan.to_save, [self.kept, self.related, new_urate])
+
+    def test__no_existing(self):
+        plan = reconcile_formset(existing=[], formset=self.get_formset(), needs_relation_set=lambda urate: False)
+        self.assertEqual(plan.delete, [])
+        self.assertEqual(plan.set_relation, [])
+        self.assertEqual(len(plan.current), 3)
@@ -1,5 +1,7 @@
+from copy import deepcopy
 from datetime import date, timedelta
 from decimal import Decimal
+from types import MappingProxyType
 
 import pytest  # type: ignore
 from django.test import TestCase  # type: ignore
@@ -7,6 +9,7 @@ from django.test import TestCase  # type: ignore
 from ...dateofbirths.tests.factories import DateOfBirthFactory
 from ...defaults.models import DefaultTrt, FlareAidSettings, PpxAidSettings, UltAidSettings
 from ...defaults.selectors import (
+    defaults_contraindication_index,
     defaults_defaultmedhistorys_trttype,
     defaults_flareaidsettings,
     defaults_ppxaidsettings,
@@ -14,6 +17,8 @@ from ...defaults.selectors import (
 )
 from ...ethnicitys.choices import Ethnicitys
 from ...ethnicitys.tests.factories import EthnicityFactory
+from ...flareaids.selectors import flareaid_user_qs, flareaid_userless_qs
+from ...flareaids.services import FlareAidDecisionAid
 from ...flareaids.tests.factories import create_flareaid
 from ...labs.tests.factories import BaselineCreatinineFactory, Hlab5801Factory
 from ...medallergys.models import MedAllergy
@@ -21,6 +26,7 @@ from ...medallergys.tests.factories import MedAllergyFactory
 from ...medhistorydetails.choices import DialysisChoices, DialysisDurations, Stages
 from ...medhistorydetails.tests.factories import CkdDetailFactory, GoutDetailFactory
 from ...medhistorys.choices import Contraindications, MedHistoryTypes
+from ...medhistorys.dicts import CVD_CONTRAS
 from ...medhistorys.models import MedHistory
 from ...medhistorys.tests.factories import (
     ChfFactory,
@@ -29,6 +35,8 @@ from ...medhistorys.tests.factories import (
     GoutFactory,
     HeartattackFactory,
 )
+from ...ppxaids.selectors import ppxaid_user_qs, ppxaid_userless_qs
+from ...ppxaids.services import PpxAidDecisionAid
 from ...ppxaids.tests.factories import create_ppxaid
 from ...treatments.choices import (
     AllopurinolDoses,
@@ -40,26 +48,34 @@ from ...treatments.choices import (
     Treatments,
     TrtTypes,
 )
+from ...ultaids.selectors import ultaid_user_qs, ultaid_userless_qs
 from ...ultaids.services import UltAidDecisionAid
 from ...ultaids.tests.factories import create_ultaid
+from ...users.tests.factories import create_psp
 from ..services import (
+    DECISIONAID_VERSION,
     aids_assign_baselinecreatinine,
     aids_assign_ckddetail,
     aids_assign_goutdetail,
     aids_colchicine_ckd_contra,
+    aids_contraindication_index,
     aids_create_trts_dosing_dict,
+    aids_decisionaid_to_trt_dict,
     aids_dict_to_json,
     aids_dose_adjust_allopurinol_ckd,
     aids_dose_adjust_colchicine,
     aids_dose_adjust_febuxostat_ckd,
     aids_get_colchicine_contraindication_for_stage,
     aids_hlab5801_contra,
+    aids_inputs_fingerprint,
     aids_json_to_trt_dict,
     aids_options,
+    aids_probenecid_ckd_contra,
     aids_process_hlab5801,
     aids_process_medallergys,
     aids_process_medhistorys,
     aids_process_nsaids,
+    aids_trt_dict_to_decisionaid,
     aids_xois_ckd_contra,
 )
 
@@ -560,6 +576,29 @@ class TestAidsDoseAdjustFebuxostatCkd(TestCase):
         self.assertEqual(febu_dict["dose"], Decimal("40"))
 
 
+class TestAidsInputsFingerprint(TestCase):
+    def setUp(self):
+        self.medhistorys = [HeartattackFactory(), ChfFactory()]
+
+    def test__returns_same_fingerprint_regardless_of_order(self):
+        self.assertEqual(
+            aids_inputs_fingerprint({"age": 50, "medhistorys": self.medhistorys}),
+            aids_inputs_fingerprint({"medhistorys": list(reversed(self.medhistorys)), "age": 50}),
+        )
+
+    def test__ignores_modified(self):
+        fingerprint = aids_inputs_fingerprint({"medhistorys": self.medhistorys})
+        self.medhistorys[0].save()
+        self.assertEqual(fingerprint, aids_inputs_fingerprint({"medhistorys": self.medhistorys}))
+
+    def test__changes_with_inputs(self):
+        fingerprint = aids_inputs_fingerprint({"age": 50, "medhistorys": self.medhistorys})
+        self.assertNotEqual(fingerprint, aids_inputs_fingerprint({"age": 51, "medhistorys": self.medhistorys}))
+        self.assertNotEqual(
+            fingerprint, aids_inputs_fingerprint({"age": 50, "medhistorys": self.medhistorys + [CkdFactory()]})
+        )
+
+
 class TestAidsJsonToTrtDict(TestCase):
     def test__converts_json_to_dict_simple(self):
         user_flareaid = create_flareaid(mas=[], mhs=[])
@@ -568,7 +607,7 @@ class TestAidsJsonToTrtDict(TestCase):
         user_ppxaid = create_ppxaid(mas=[], mhs=[])
         user_ppxaid.update_aid()
         user_ppxaid.refresh_from_db()
-        flareaid_json = user_flareaid.decisionaid
+        flareaid_json = aids_dict_to_json(user_flareaid.aid_dict)
         flareaid_dict = aids_json_to_trt_dict(flareaid_json)
         self.assertTrue(isinstance(flareaid_dict, dict))
         for key, value_dict in flareaid_dict.items():
@@ -583,7 +622,7 @@ class TestAidsJsonToTrtDict(TestCase):
             duration2 = value_dict.get("duration2", None)
             if duration2:
                 self.assertTrue(isinstance(duration2, timedelta))
-        ppxaid_json = user_ppxaid.decisionaid
+        ppxaid_json = aids_dict_to_json(user_ppxaid.aid_dict)
         ppxaid_dict = aids_json_to_trt_dict(ppxaid_json)
         self.assertTrue(isinstance(ppxaid_dict, dict))
         for key, value_dict in ppxaid_dict.items():
@@ -600,6 +639,58 @@ class TestAidsJsonToTrtDict(TestCase):
                 self.assertTrue(isinstance(duration2, timedelta))
 
 
+class TestAidsDecisionaidToTrtDict(TestCase):
+    def setUp(self):
+        self.flareaid = create_flareaid(mas=[], mhs=[])
+        self.flareaid.update_aid()
+        self.flareaid.refresh_from_db()
+
+    def test__decisionaid_is_native_versioned_json(self):
+        decisionaid = self.flareaid.decisionaid
+        self.assertEqual(decisionaid["version"], DECISIONAID_VERSION)
+        for dosing in decisionaid["trts"].values():
+            self.assertTrue(isinstance(dosing["dose"], (int, float)))
+            if dosing["duration"] is not None:
+                self.assertTrue(isinstance(dosing["duration"], int))
+
+    def test__matches_json_string_trt_dict(self):
+        trt_dict = aids_decisionaid_to_trt_dict(self.flareaid.decisionaid)
+        self.assertEqual(trt_dict, aids_json_to_trt_dict(aids_dict_to_json(trt_dict)))
+        self.assertEqual(aids_decisionaid_to_trt_dict(aids_dict_to_json(trt_dict)), trt_dict)
+
+    def test__round_trip(self):
+        trt_dict = {
+            Treatments.COLCHICINE: {
+                "dose": Decimal("0.60"),
+                "dose2": Decimal("1.2"),
+                "dose_adj": None,
+                "freq": Freqs.BID,
+                "duration": timedelta(days=7),
+                "duration2": None,
+                "contra": False,
+            }
+        }
+        decisionaid = aids_trt_dict_to_decisionaid(trt_dict)
+        self.assertEqual(
+            decisionaid["trts"]["COLCHICINE"],
+            {
+                "dose": 0.6,
+                "dose2": 1.2,
+                "dose_adj": None,
+                "freq": "BID",
+                "duration": 7,
+                "duration2": None,
+                "contra": False,
+            },
+        )
+        self.assertEqual(aids_decisionaid_to_trt_dict(decisionaid), trt_dict)
+
+    def test__unchanged_decisionaid_is_not_saved(self):
+        decisionaid = FlareAidDecisionAid(qs=self.flareaid)
+        decisionaid.update_decision_aid_dict_and_model_attr(commit=False)
+        self.assertFalse(decisionaid.decisionaid_has_changed())
+
+
 class TestAidsProcessAllopurinolCkdContraindication(TestCase):
     def setUp(self):
         self.userless_ultaid = create_ultaid(mas=None, mhs=None)
@@ -1057,6 +1148,155 @@ class TestAidsOptions(TestCase):
         self.assertNotIn(Treatments.ALLOPURINOL, options)
 
 
+def aids_process_medhistorys_nested_loop(trt_dict, medhistorys, ckddetail, default_medhistorys, defaulttrtsettings):
+    """Reference copy of the nested loop that aids_process_medhistorys used before the
+    contraindication index, kept to check that both produce the same trt_dict."""
+    for medhistory in medhistorys:
+        contraindications = [
+            default_medhistory
+            for default_medhistory in default_medhistorys
+            if default_medhistory.medhistorytype == medhistory.medhistorytype
+        ]
+        for contraindication in contraindications:
+            if medhistory.medhistorytype == MedHistoryTypes.CKD:
+                if contraindication.treatment == Treatments.ALLOPURINOL:
+                    allo_ckd_contra = aids_xois_ckd_contra(ckd=medhistory, ckddetail=ckddetail)
+                    if allo_ckd_contra[0] == Contraindications.DOSEADJ:
+                        trt_dict = aids_dose_adjust_allopurinol_ckd(
+                            trt_dict=trt_dict,
+                            defaulttrtsettings=defaulttrtsettings,
+                            dialysis=allo_ckd_contra[1],
+                            stage=allo_ckd_contra[2],
+                        )
+                elif contraindication.treatment == Treatments.COLCHICINE:
+                    colch_ckd_contra = aids_colchicine_ckd_contra(
+                        ckd=medhistory, ckddetail=ckddetail, defaulttrtsettings=defaulttrtsettings
+                    )
+                    if (
+                        colch_ckd_contra is not None
+                        and colch_ckd_contra == Contraindications.DOSEADJ
+                        and not trt_dict[Treatments.COLCHICINE]["contra"]
+                    ):
+                        trt_dict = aids_dose_adjust_colchicine(
+                            trt_dict=trt_dict,
+                            aid_type=contraindication.trttype,
+                            defaulttrtsettings=defaulttrtsettings,
+                        )
+                    elif (
+                        colch_ckd_contra is not None
+                        and (
+                            colch_ckd_contra == Contraindications.ABSOLUTE
+                            or colch_ckd_contra == Contraindications.RELATIVE
+                        )
+                        and trt_dict[Treatments.COLCHICINE]["contra"] is not True
+                    ):
+                        trt_dict[Treatments.COLCHICINE]["contra"] = True
+                elif contraindication.treatment == Treatments.FEBUXOSTAT:
+                    febu_ckd_contra = aids_xois_ckd_contra(ckd=medhistory, ckddetail=ckddetail)
+                    if febu_ckd_contra[0] == Contraindications.DOSEADJ:
+                        trt_dict = aids_dose_adjust_febuxostat_ckd(
+                            trt_dict=trt_dict, defaulttrtsettings=defaulttrtsettings
+                        )
+                elif contraindication.treatment == Treatments.PROBENECID:
+                    prob_ckd_contra = aids_probenecid_ckd_contra(
+                        ckd=medhistory, ckddetail=ckddetail, defaulttrtsettings=defaulttrtsettings
+                    )
+                    if prob_ckd_contra and not trt_dict[Treatments.PROBENECID]["contra"]:
+                        trt_dict[Treatments.PROBENECID]["contra"] = True
+                elif (
+                    contraindication.contraindication == Contraindications.ABSOLUTE
+                    or contraindication.contraindication == Contraindications.RELATIVE
+                ) and trt_dict[contraindication.treatment]["contra"] is not True:
+                    trt_dict[contraindication.treatment]["contra"] = True
+            elif (
+                contraindication.treatment == Treatments.FEBUXOSTAT
+                and contraindication.contraindication == Contraindications.RELATIVE
+                and medhistory.medhistorytype in CVD_CONTRAS
+            ):
+                if not defaulttrtsettings.febu_cv_disease and not trt_dict[Treatments.FEBUXOSTAT]["contra"]:
+                    trt_dict[Treatments.FEBUXOSTAT]["contra"] = True
+            elif (
+                contraindication.contraindication == Contraindications.ABSOLUTE
+                or contraindication.contraindication == Contraindications.RELATIVE
+            ) and trt_dict[contraindication.treatment]["contra"] is not True:
+                trt_dict[contraindication.treatment]["contra"] = True
+    return trt_dict
+
+
+class TestAidsContraindicationIndex(TestCase):
+    def test__index_is_immutable_and_grouped_by_medhistorytype(self):
+        default_medhistorys = defaults_defaultmedhistorys_trttype(
+            medhistorys=[HeartattackFactory(), CkdFactory()], trttype=TrtTypes.FLARE, user=None
+        )
+        index = aids_contraindication_index(default_medhistorys)
+        self.assertTrue(isinstance(index, MappingProxyType))
+        self.assertEqual(set(index.keys()), {MedHistoryTypes.HEARTATTACK, MedHistoryTypes.CKD})
+        self.assertEqual(sum(len(rules) for rules in index.values()), len(default_medhistorys))
+        with self.assertRaises(TypeError):
+            index[MedHistoryTypes.GOUT] = ()  # type: ignore
+
+    def test__matches_the_cached_index(self):
+        heartattack = HeartattackFactory()
+        default_medhistorys = defaults_defaultmedhistorys_trttype(
+            medhistorys=[heartattack], trttype=TrtTypes.ULT, user=None
+        )
+        self.assertEqual(
+            aids_contraindication_index(default_medhistorys)[MedHistoryTypes.HEARTATTACK],
+            defaults_contraindication_index(trttype=TrtTypes.ULT, user=None)[MedHistoryTypes.HEARTATTACK],
+        )
+
+
+class TestAidsProcessMedhistorysParity(TestCase):
+    """Checks that aids_process_medhistorys produces the same trt_dict as the previous
+    nested loop implementation for factory-generated FlareAids, PpxAids, and UltAids."""
+
+    def assert_parity(self, decisionaid):
+        trt_dict = decisionaid._create_trts_dict()  # pylint: disable=w0212
+        kwargs = {
+            "medhistorys": decisionaid.medhistorys,
+            "ckddetail": decisionaid.ckddetail,
+            "default_medhistorys": decisionaid.default_medhistorys,
+            "defaulttrtsettings": decisionaid.defaultsettings,
+        }
+        expected = aids_process_medhistorys_nested_loop(trt_dict=deepcopy(trt_dict), **kwargs)
+        self.assertEqual(aids_process_medhistorys(trt_dict=deepcopy(trt_dict), **kwargs), expected)
+        self.assertEqual(
+            aids_process_medhistorys(
+                trt_dict=deepcopy(trt_dict),
+                contraindication_index=defaults_contraindication_index(
+                    trttype=decisionaid.trttype, user=decisionaid.user
+                ),
+                **kwargs,
+            ),
+            expected,
+        )
+
+    def test__flareaids(self):
+        for _ in range(10):
+            self.assert_parity(FlareAidDecisionAid(qs=flareaid_userless_qs(pk=create_flareaid().pk)))
+            user_flareaid = create_flareaid(user=True)
+            self.assert_parity(FlareAidDecisionAid(qs=flareaid_user_qs(pseudopatient=user_flareaid.user.pk)))
+
+    def test__ppxaids(self):
+        for _ in range(10):
+            self.assert_parity(PpxAidDecisionAid(qs=ppxaid_userless_qs(pk=create_ppxaid().pk)))
+            user_ppxaid = create_ppxaid(user=True)
+            self.assert_parity(PpxAidDecisionAid(qs=ppxaid_user_qs(pseudopatient=user_ppxaid.user.pk)))
+
+    def test__ultaids(self):
+        for _ in range(10):
+            self.assert_parity(UltAidDecisionAid(qs=ultaid_userless_qs(pk=create_ultaid().pk)))
+            user_ultaid = create_ultaid(user=create_psp(plus=True))
+            self.assert_parity(UltAidDecisionAid(qs=ultaid_user_qs(pseudopatient=user_ultaid.user.pk)))
+
+    def test__ckd_stages(self):
+        for stage in Stages:
+            ultaid = create_ultaid(mhs=[MedHistoryTypes.CKD], ckddetail={"stage": stage})
+            self.assert_parity(UltAidDecisionAid(qs=ultaid_userless_qs(pk=ultaid.pk)))
+            flareaid = create_flareaid(mhs=[MedHistoryTypes.CKD], ckddetail={"stage": stage})
+            self.assert_parity(FlareAidDecisionAid(qs=flareaid_userless_qs(pk=flareaid.pk)))
+
+
 class TestAidsProcessNsaids(TestCase):
     def test__returns_unchanged_dictionary(self):
         self.medhistorys = MedHistory.objects.none()
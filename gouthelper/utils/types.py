@@ -1,3 +1,5 @@
+from datetime import timedelta
+from decimal import Decimal
 from typing import TYPE_CHECKING, Literal, TypedDict, Union
 
 if TYPE_CHECKING:
@@ -9,6 +11,7 @@ if TYPE_CHECKING:
     from ..goalurates.models import GoalUrate
     from ..ppxaids.models import PpxAid
     from ..ppxs.models import Ppx
+    from ..treatments.choices import Freqs
     from ..ultaids.models import UltAid
     from ..ults.models import Ult
     from .forms import OneToOneForm
@@ -19,6 +22,22 @@ class FormModelDict(TypedDict):
     model: type["Model"]
 
 
+class TrtDosingDict(TypedDict):
+    """Dosing and contraindication of a Treatment in a FlareAid, PpxAid, or UltAid trt_dict."""
+
+    dose: Decimal | None
+    dose2: Decimal | None
+    dose3: Decimal | None
+    dose_adj: Decimal | None
+    freq: Union["Freqs", str, None]
+    freq2: Union["Freqs", str, None]
+    freq3: Union["Freqs", str, None]
+    duration: timedelta | None
+    duration2: timedelta | None
+    duration3: timedelta | None
+    contra: bool
+
+
 Aids = Union[
     "FlareAid",
     "Flare",
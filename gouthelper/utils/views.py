@@ -3,12 +3,14 @@ from typing import TYPE_CHECKING, Any, Union
 
 from django.contrib import messages  # type: ignore
 from django.contrib.auth import get_user_model  # type: ignore
+from django.contrib.auth.models import AnonymousUser  # type: ignore
 from django.core.exceptions import ValidationError  # type: ignore
 from django.db import transaction  # type: ignore
 from django.db.models import Model  # type: ignore
-from django.forms import ModelForm  # type: ignore
-from django.http import HttpResponseRedirect  # type: ignore
+from django.forms import BaseForm, BaseFormSet, ModelForm  # type: ignore
+from django.http import HttpRequest, HttpResponseRedirect, JsonResponse  # type: ignore
 from django.urls import reverse
+from django.utils import timezone  # type: ignore
 from django.utils.functional import cached_property  # type: ignore
 from django.views.generic import CreateView, DetailView
 from rules.contrib.views import AutoPermissionRequiredMixin
@@ -16,6 +18,7 @@ from rules.contrib.views import AutoPermissionRequiredMixin
 from ..dateofbirths.helpers import age_calc
 from ..genders.choices import Genders
 from ..labs.models import BaselineCreatinine
+from ..medallergys.helpers import medallergys_get
 from ..medallergys.models import MedAllergy
 from ..medhistorydetails.models import CkdDetail, GoutDetail
 from ..medhistorydetails.services import CkdDetailFormProcessor
@@ -25,21 +28,29 @@ from ..medhistorys.helpers import medhistorys_get, medhistorys_get_default_medhi
 from ..medhistorys.models import Gout
 from ..profiles.helpers import get_provider_alias
 from ..profiles.models import PseudopatientProfile
+from ..treatments.choices import Treatments
 from ..users.choices import Roles
+from ..users.deferred import aids_recompute_enqueue, aids_recompute_is_deferred
 from ..users.models import Pseudopatient
 from ..utils.exceptions import Continue, EmptyRelatedModel
 from ..utils.helpers import (
     attr_is_in_model_fields,
+    cache_empty_reverse_onetoones,
     get_or_create_qs_attr,
     get_str_attrs,
     list_of_objects_related_objects,
     list_of_possible_related_object_attrs,
 )
+from ..utils.history import history_batch
+from ..utils.instrumentation import instrument
+from ..utils.persistence import UnitOfWork
+from ..utils.reconciliation import IndexedList, index_by, reconcile_formset
+from ..utils.services import aids_evaluation_dict
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
     from django.forms import BaseModelFormSet  # type: ignore
-    from django.http import HttpRequest, HttpResponse  # type: ignore
+    from django.http import HttpResponse, QueryDict  # type: ignore
 
     from ..akis.models import Aki
     from ..dateofbirths.forms import DateOfBirthForm
@@ -125,10 +136,18 @@ class GoutHelperDetailMixinBase(AutoPermissionRequiredMixin, DetailView, Patient
 
     def get(self, request, *args, **kwargs):
         """Overwritten to avoid calling get_object again, which is instead
-        called on dispatch()."""
-        if not request.GET.get("updated", None):
-            self.object.update_aid(qs=self.user if getattr(self, "user", False) else self.object)
-            self.object.update_related_objects(qs=self.user if getattr(self, "user", False) else self.object)
+        called on dispatch(). Aids are only re-calculated if their inputs have
+        changed since they were last saved. After a form submission (?updated=True)
+        the object itself is fresh, but its related aids are still refreshed if the
+        AIDS_RECOMPUTE_BACKEND defers them, because the redirect can arrive before
+        the backend has run."""
+        updated = request.GET.get("updated", None)
+        if not updated or aids_recompute_is_deferred():
+            qs = self.user if getattr(self, "user", False) else self.object
+            with history_batch():
+                if not updated:
+                    self.object.update_aid(qs=qs, stale_only=True)
+                self.object.update_related_objects(qs=qs, stale_only=True)
         context = self.get_context_data(object=self.object)
         return self.render_to_response(context)
 
@@ -172,9 +191,6 @@ class GoutHelperPseudopatientDetailMixin(GoutHelperDetailMixinBase):
             messages.error(request, "Baseline information is needed to use GoutHelper Decision and Treatment Aids.")
             return HttpResponseRedirect(reverse("users:pseudopatient-update", kwargs={"pseudopatient": self.user.pk}))
         else:
-            if not request.GET.get("updated", None):
-                self.object.update_aid(qs=self.user)
-                self.object.update_related_objects(qs=self.user)
             return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
@@ -254,12 +270,24 @@ class GoutHelperEditMixin:
         return response
 
     def form_valid(self, **kwargs) -> Union["HttpResponseRedirect", "HttpResponse"]:
-        """Method to be called if all forms are valid."""
-        self.form_valid_init()
-        self.form_valid_update_fks_and_related_object()
-        self.form_valid_end(**kwargs)
+        """Method to be called if all forms are valid. The historical records of the objects
+        saved are written in bulk once they have all been saved."""
+        with history_batch():
+            self.form_valid_init()
+            self.form_valid_update_fks_and_related_object()
+            self.form_valid_end(**kwargs)
         return self.form_valid_return(**kwargs)
 
+    def form_valid_attach_in_memory(self) -> None:
+        """Called by GoutHelperEvaluateMixin.form_valid() in place of form_valid_init() and
+        form_valid_update_fks_and_related_object(). Sets the objects created from the forms
+        on the form's instance without saving any of them."""
+        self.object = self.form.instance
+        # The aid's str (i.e. FlareAid: {created}) is used in its explanations
+        if hasattr(self.object, "created") and self.object.created is None:
+            self.object.created = timezone.now()
+        cache_empty_reverse_onetoones(self.object)
+
     def form_valid_init(self) -> None:
         if self.form_valid_form_should_save():
             self.object = self.form.save(commit=False)
@@ -297,7 +325,7 @@ class GoutHelperEditMixin:
             self.object.update_aid(qs=self.user)
         else:
             self.object.update_aid(qs=self.object)
-        self.object.update_related_objects(qs=self.user if self.user else self.object)
+        aids_recompute_enqueue(self.object)
 
     def form_valid_return(self, **kwargs) -> Union["HttpResponseRedirect", "HttpResponse"]:
         messages.success(self.request, self.get_success_message(self.form.cleaned_data))
@@ -508,9 +536,12 @@ class GoutHelperEditMixin:
         return self.object.__class__.__name__.lower() if not isinstance(self.object, Pseudopatient) else "user"
 
     def post(self, request, *args, **kwargs):
-        self.post_init()
-        if self.post_forms_valid():
-            self.post_process_forms()
+        with instrument("forms"):
+            self.post_init()
+            forms_valid = self.post_forms_valid()
+        if forms_valid:
+            with instrument("process_forms"):
+                self.post_process_forms()
             self.post_errors()
         else:
             self.errors_bool = False
@@ -784,6 +815,7 @@ class LabFormSetsMixin(GoutHelperEditMixin):
         return self.query_obj_attr in self.oto_forms[oto_attr].model.related_models()
 
     def form_valid_save_and_delete_labs(self) -> None:
+        uow = UnitOfWork()
         if self.labs_2_save:
             # Modify and remove labs from the object
             for lab in self.labs_2_save:
@@ -797,10 +829,11 @@ class LabFormSetsMixin(GoutHelperEditMixin):
                 lab_related_onetoone_attr = self.lab_belongs_to_onetoone(lab.__class__.__name__.lower())
                 if lab_related_onetoone_attr and getattr(lab, lab_related_onetoone_attr, None) is None:
                     setattr(lab, lab_related_onetoone_attr, getattr(self.object, lab_related_onetoone_attr))
-                lab.save()
+                uow.save(lab)
         if self.labs_2_rem:
             for lab in self.labs_2_rem:
-                lab.delete()
+                uow.delete(lab)
+        uow.flush()
 
     def post_init(self) -> None:
         super().post_init()
@@ -847,8 +880,8 @@ class LabFormSetsMixin(GoutHelperEditMixin):
 
     def post_process_lab_formsets(self) -> None:
         """Method to process the forms in a Lab formset for the post() method.
-        Requires a list of existing labs (can be empty) to iterate over and compare to the forms in the
-        formset to identify labs that need to be removed.
+        Requires a list of existing labs (can be empty) that reconcile_formset() compares, by pk, to the
+        forms in the formset to identify labs that need to be saved or removed.
 
         Args:
             lab_formset (BaseModelFormSet): A formset of LabForms
@@ -886,35 +919,18 @@ class LabFormSetsMixin(GoutHelperEditMixin):
                     lab_name,
                     self.query_object,
                 )
-                # Check for and iterate over the existing queryset of labs to catch objects that
-                # are not changed in the formset but NEED to be saved for the view (i.e. to add relations)
-                if qs_attr:
-                    cleaned_data = lab_tup[0].cleaned_data
-                    # NOTE: FOR FUTURE SELF: COPY A LIST WHEN ITERATING OVER IT AND ADDING/REMOVING ELEMENTS
-                    for lab in qs_attr.copy():
-                        for lab_form in cleaned_data:
-                            try:
-                                if lab_form["id"] == lab:
-                                    if not lab_form["DELETE"]:
-                                        if _lab_needs_relation_set(lab):
-                                            self.labs_2_save.append(lab)
-                                        if lab not in qs_attr:
-                                            qs_attr.append(lab)
-                                        break
-                            except KeyError:
-                                pass
-                        else:
-                            self.labs_2_rem.append(lab)
-                            qs_attr.remove(lab)
-                for form in lab_tup[0]:
-                    if form.instance_should_persist and (
-                        (form.instance and form.has_changed())
-                        or form.instance is None
-                        or _lab_needs_relation_set(form.instance)
-                    ):
-                        self.labs_2_save.append(form.instance)
-                    if form.instance_should_persist and form.instance not in qs_attr:
-                        qs_attr.append(form.instance)
+                # Existing labs that are not changed in the formset may still NEED to be saved
+                # for the view (i.e. to add relations)
+                plan = reconcile_formset(
+                    existing=qs_attr or [],
+                    formset=lab_tup[0],
+                    needs_relation_set=_lab_needs_relation_set,
+                )
+                self.labs_2_save.extend(plan.to_save)
+                self.labs_2_rem.extend(plan.delete)
+                if qs_attr is not None:
+                    # Modified in place, as the list is the qs_attr on the post_qs_target
+                    qs_attr[:] = plan.current
 
     def populate_a_lab_formset(
         self,
@@ -961,16 +977,7 @@ class MedAllergyFormMixin(GoutHelperEditMixin):
             form_str = f"medallergy_{treatment}_form"
             if form_str not in kwargs:
                 ma_obj = (
-                    next(
-                        iter(
-                            [
-                                ma
-                                for ma in getattr(self.query_object, "medallergys_qs", [])
-                                if ma.treatment == treatment
-                            ]
-                        ),
-                        None,
-                    )
+                    medallergys_get(getattr(self.query_object, "medallergys_qs", []), Treatments(treatment))
                     if self.query_object
                     else None
                 )
@@ -1015,16 +1022,7 @@ class MedAllergyFormMixin(GoutHelperEditMixin):
         if self.medallergy_forms:
             for treatment, medallergy_form in self.medallergy_forms.items():
                 ma_obj = (
-                    next(
-                        iter(
-                            [
-                                ma
-                                for ma in getattr(self.query_object, "medallergys_qs", [])
-                                if ma.treatment == treatment
-                            ]
-                        ),
-                        None,
-                    )
+                    medallergys_get(getattr(self.query_object, "medallergys_qs", []), Treatments(treatment))
                     if self.query_object
                     else None
                 )
@@ -1050,25 +1048,16 @@ class MedAllergyFormMixin(GoutHelperEditMixin):
         self.ma_2_save: list["MedAllergy"] = []
         self.ma_2_rem: list["MedAllergy"] = []
         get_or_create_qs_attr(post_qs_target, "medallergy")
+        # Index the existing MedAllergys by treatment and the target's medallergys_qs by pk
+        # so that each treatment's form is reconciled without scanning either list
+        mas_by_treatment = index_by(getattr(self.query_object, "medallergys_qs", []), "treatment")
+        target_medallergys = IndexedList(getattr(post_qs_target, "medallergys_qs", []))
         for treatment, medallergy_form in self.medallergy_forms.items():
             if f"medallergy_{treatment}" in medallergy_form.cleaned_data:
-                ma_obj = (
-                    next(
-                        iter(
-                            [
-                                ma
-                                for ma in getattr(self.query_object, "medallergys_qs", [])
-                                if ma.treatment == treatment
-                            ]
-                        ),
-                        None,
-                    )
-                    if self.query_object
-                    else None
-                )
+                ma_obj = mas_by_treatment.get(treatment, None)
                 if ma_obj and not medallergy_form.cleaned_data[f"medallergy_{treatment}"]:
                     self.ma_2_rem.append(ma_obj)
-                    getattr(post_qs_target, "medallergys_qs", []).remove(ma_obj)
+                    target_medallergys.discard(ma_obj)
                 else:
                     if medallergy_form.cleaned_data[f"medallergy_{treatment}"]:
                         # If there is already an instance, it will not have changed so it doesn't need to be changed
@@ -1079,18 +1068,17 @@ class MedAllergyFormMixin(GoutHelperEditMixin):
                             ma.matype = medallergy_form.cleaned_data.get(f"{treatment}_matype", None)
                             self.ma_2_save.append(ma)
                             # Add the medallergy to the form instance's medallergys_qs if it's not already there
-                            if ma not in getattr(post_qs_target, "medallergys_qs", []):
-                                getattr(post_qs_target, "medallergys_qs", []).append(ma)
+                            target_medallergys.add(ma)
                         else:
                             if ma_obj.matype != medallergy_form.cleaned_data[f"{treatment}_matype"]:
                                 ma_obj.matype = medallergy_form.cleaned_data[f"{treatment}_matype"]
                                 self.ma_2_save.append(ma_obj)
                             # Add the medallergy to the form instance's medallergys_qs if it's not already there
-                            if ma_obj not in getattr(post_qs_target, "medallergys_qs", []):
-                                getattr(post_qs_target, "medallergys_qs", []).append(ma_obj)
+                            target_medallergys.add(ma_obj)
 
     def form_valid_save_medallergys(self) -> None:
         if self.ma_2_save:
+            uow = UnitOfWork()
             for ma in self.ma_2_save:
                 if self.user:
                     if ma.user is None:
@@ -1098,12 +1086,15 @@ class MedAllergyFormMixin(GoutHelperEditMixin):
                 else:
                     if getattr(ma, self.object_attr, None) is None:
                         setattr(ma, self.object_attr, self.object)
-                ma.save()
+                uow.save(ma)
+            uow.flush()
 
     def form_valid_delete_medallergys(self) -> None:
         if self.ma_2_rem:
+            uow = UnitOfWork()
             for ma in self.ma_2_rem:
-                ma.delete()
+                uow.delete(ma)
+            uow.flush()
 
 
 class MedHistoryFormMixin(GoutHelperEditMixin):
@@ -1189,6 +1180,18 @@ class MedHistoryFormMixin(GoutHelperEditMixin):
                     )
                 )
 
+    def form_valid_attach_in_memory(self) -> None:
+        super().form_valid_attach_in_memory()
+        for mh_det in self.mhdets_2_save:
+            mh_det = mh_det.instance if isinstance(mh_det, ModelForm) else mh_det
+            medhistory = getattr(mh_det, "medhistory", None)
+            if medhistory:
+                setattr(medhistory, mh_det.__class__.__name__.lower(), mh_det)
+        for mh in self.object.medhistorys_qs:
+            # medhistorytype is otherwise set when the MedHistory is saved
+            mh.set_medhistorytype()
+            cache_empty_reverse_onetoones(mh)
+
     def form_valid_update_fks_and_related_object(self) -> None:
         super().form_valid_update_fks_and_related_object()
         self.form_valid_save_medhistorys()
@@ -1569,17 +1572,21 @@ menopause status to evaluate their flare."
 
     def form_valid_save_medhistorys(self) -> None:
         if self.mhs_2_save:
+            uow = UnitOfWork()
             if self.user:
                 for mh in self.mhs_2_save:
                     if mh.user is None:
                         mh.user = self.user
-                    mh.update_set_date_and_save()
+                    mh.update_set_date_and_save(commit=False)
+                    uow.save(mh)
             else:
                 for mh in self.mhs_2_save:
                     if getattr(mh, self.object_attr, None) is None:
                         setattr(mh, self.object_attr, self.object)
                     self.form_valid_update_medhistory_related_objects(mh)
-                    mh.update_set_date_and_save()
+                    mh.update_set_date_and_save(commit=False)
+                    uow.save(mh)
+            uow.flush()
 
     def form_valid_update_medhistory_related_objects(self, mh: "MedHistory") -> None:
         for related_object in self.related_objects:
@@ -1645,21 +1652,18 @@ menopause status to evaluate their flare."
 
     def form_valid_delete_medhistorys(self) -> None:
         if self.mhs_2_remove:
+            uow = UnitOfWork()
             for mh in self.mhs_2_remove:
                 mh.update_set_date_and_save(commit=False)
-                mh.delete()
+                uow.delete(mh)
                 self.form_valid_remove_medhistory_from_related_objects(mh)
+            uow.flush()
 
     def form_valid_remove_medhistory_from_related_objects(self, mh: "MedHistory") -> None:
         for related_object in self.related_objects:
             if mh.medhistorytype in related_object.aid_medhistorys():
-                related_object_medhistory = next(
-                    iter(
-                        related_mh
-                        for related_mh in related_object.medhistorys_qs
-                        if related_mh.medhistorytype == mh.medhistorytype
-                    ),
-                    None,
+                related_object_medhistory = medhistorys_get(
+                    related_object.medhistorys_qs, MedHistoryTypes(mh.medhistorytype), null_return=None
                 )
                 if related_object_medhistory:
                     related_object.medhistorys_qs.remove(related_object_medhistory)
@@ -1737,6 +1741,14 @@ class OneToOneFormMixin(GoutHelperEditMixin):
     def dispatch_user_missing_requirements(self, request: "HttpRequest") -> bool:
         return not self.user_has_required_otos or super().dispatch_user_missing_requirements(request)
 
+    def form_valid_attach_in_memory(self) -> None:
+        super().form_valid_attach_in_memory()
+        for oto in self.oto_2_save:
+            oto_attr = f"{oto.__class__.__name__.lower()}"
+            if getattr(self.object, oto_attr, None) is None:
+                setattr(self.object, oto_attr, oto)
+            cache_empty_reverse_onetoones(oto)
+
     def form_valid_init(self) -> None:
         super().form_valid_init()
         self.form_valid_save_otos()
@@ -1905,6 +1917,67 @@ class OneToOneFormMixin(GoutHelperEditMixin):
                     self.oto_2_rem.append(oto_form.instance)
 
 
+class GoutHelperEvaluateMixin:
+    """Mixin for an anonymous aid CreateView that, rather than saving the aid and the objects created
+    from the POSTed forms, evaluates the aid in memory and returns it as JSON. Nothing is written to
+    the database, so the CreateView the mixin is combined with remains the way to save an aid."""
+
+    http_method_names = ["post"]
+    evaluation: dict[str, Any] | None = None
+
+    @classmethod
+    def evaluate_post_data(cls, data: "QueryDict") -> dict[str, Any]:
+        """Validates data, the POST data of the view's create form, with the view's forms and evaluates the aid
+        in memory, without building an HTTP request or response or dispatching it, for evaluating records in bulk
+        (see utils.batch). The forms and the view's post() are the only place the POST data is validated and turned
+        into the aid's unsaved inputs, so they are used rather than duplicated. Returns the aid's evaluation, or
+        {"errors": ...} if the forms are invalid."""
+        request = HttpRequest()
+        request.method = "POST"
+        request.POST = data
+        request.user = AnonymousUser()
+        view = cls()
+        view.setup(request)
+        view.object = view.get_object()
+        view.post(request)
+        return view.evaluation if view.evaluation is not None else {"errors": view.get_form_errors()}
+
+    def evaluate(self) -> dict[str, Any]:
+        """Evaluates the aid in memory with the objects created from the valid forms and returns
+        its aids_evaluation_dict(), which is also set as the view's evaluation."""
+        self.form_valid_attach_in_memory()
+        self.evaluation = aids_evaluation_dict(self.object.evaluate_aid())
+        return self.evaluation
+
+    def form_valid(self, **kwargs) -> JsonResponse:
+        return JsonResponse(self.evaluate())
+
+    def get_form_errors(self) -> dict[str, Any]:
+        """Returns a dict of the errors of each of the view's forms and lab formsets, keyed by the form's name."""
+        forms = {
+            self.model._meta.model_name: self.form,
+            **self.oto_forms,
+            **self.medhistory_forms,
+            **self.medhistory_detail_forms,
+            **self.medallergy_forms,
+        }
+        errors = {
+            str(name): form.errors.get_json_data()
+            for name, form in forms.items()
+            if isinstance(form, BaseForm) and form.errors
+        }
+        for lab, (formset, _) in self.lab_formsets.items():
+            if isinstance(formset, BaseFormSet) and formset.total_error_count():
+                errors[lab] = {
+                    "forms": [form_errors.get_json_data() for form_errors in formset.errors],
+                    "non_form_errors": formset.non_form_errors().get_json_data(),
+                }
+        return errors
+
+    def render_errors(self) -> JsonResponse:
+        return JsonResponse({"errors": self.get_form_errors()}, status=400)
+
+
 class GoutHelperUserDetailMixin(PatientSessionMixin):
     @cached_property
     def user(self) -> User | None:
@@ -1956,26 +2029,27 @@ class GoutHelperUserEditMixin(
                     ),
                 )
 
-        if self.create_view:  # pylint: disable=W0125
-            self.object = create_pseudopatient()
-        self.user = self.object
-        self.form_valid_process_related_objects()
-        # Save the OneToOne related models
-        if self.oto_forms:
-            self.form_valid_save_otos()
-            self.form_valid_delete_otos()
-        if self.req_otos and self.related_object:
-            self.form_valid_related_object_otos()
-        if self.medhistory_forms:
-            self.form_valid_save_medhistorys()
-            self.form_valid_save_medhistory_details()
-            self.form_valid_delete_medhistorys()
-            self.form_valid_delete_medhistory_details()
-        if self.medallergy_forms:
-            self.form_valid_save_medallergys()
-            self.form_valid_delete_medallergys()
-        if self.create_view:  # pylint: disable=W0125
-            create_pseudopatientprofile()
+        with history_batch():
+            if self.create_view:  # pylint: disable=W0125
+                self.object = create_pseudopatient()
+            self.user = self.object
+            self.form_valid_process_related_objects()
+            # Save the OneToOne related models
+            if self.oto_forms:
+                self.form_valid_save_otos()
+                self.form_valid_delete_otos()
+            if self.req_otos and self.related_object:
+                self.form_valid_related_object_otos()
+            if self.medhistory_forms:
+                self.form_valid_save_medhistorys()
+                self.form_valid_save_medhistory_details()
+                self.form_valid_delete_medhistorys()
+                self.form_valid_delete_medhistory_details()
+            if self.medallergy_forms:
+                self.form_valid_save_medallergys()
+                self.form_valid_delete_medallergys()
+            if self.create_view:  # pylint: disable=W0125
+                create_pseudopatientprofile()
         return HttpResponseRedirect(self.get_success_url())
 
     def form_valid_process_related_objects(self) -> None: